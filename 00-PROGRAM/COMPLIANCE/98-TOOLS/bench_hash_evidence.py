@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Script: bench_hash_evidence.py
+Purpose: Benchmark evidence hash verification modes on a synthetic evidence store
+Author: Compliance Office
+Date: 2025-01-01
+
+Usage:
+    python bench_hash_evidence.py --entries 2000 --noise 20000 --size-kb 256
+
+Functionality:
+    - Build a temporary evidence tree with registered and unrelated files
+    - Run glob-per-entry verification, indexed verification with a cold
+      digest cache, and indexed verification with a warm cache
+    - Report files/s and MB/s for each mode and check that all modes agree
+
+Exit codes:
+    0 - All modes produced the same verification result
+    1 - Modes disagreed
+"""
+
+import argparse
+import csv
+import hashlib
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from hash_evidence import EvidenceHashManager
+
+
+def build_store(root, entries, noise, size_kb, mismatches):
+    """Create an evidence tree and EVIDENCE_INDEX.csv under root."""
+    evidence_dir = root / "06-EVIDENCE"
+    evidence_dir.mkdir(parents=True)
+    rows = []
+    for i in range(entries):
+        evidence_id = f"EV-{i:06d}"
+        folder = root / "evidence" / f"batch_{i % 50:02d}"
+        folder.mkdir(parents=True, exist_ok=True)
+        data = os.urandom(size_kb * 1024)
+        (folder / f"{evidence_id}_report.pdf").write_bytes(data)
+        digest = hashlib.sha256(data).hexdigest()
+        if i < mismatches:
+            digest = "0" * 64
+        rows.append({
+            'Evidence_ID': evidence_id, 'Title': f"Report {i}", 'UTCS': '',
+            'Hash(SHA256)': digest, 'Related_Req_ID': '', 'Owner': 'bench',
+            'Rev': '1.0', 'Date': '2025-01-01',
+        })
+    for i in range(noise):
+        folder = root / "records" / f"dir_{i % 200:03d}"
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / f"record_{i:07d}.txt").write_bytes(b"x" * 64)
+
+    index_path = evidence_dir / "EVIDENCE_INDEX.csv"
+    with open(index_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+    return index_path
+
+
+def run(index_path, **kwargs):
+    manager = EvidenceHashManager(index_path)
+    manager.load_index()
+    start = time.perf_counter()
+    manager.verify_evidence(index_path.parent.parent, **kwargs)
+    elapsed = time.perf_counter() - start
+    return manager, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark evidence hash verification')
+    parser.add_argument('--entries', type=int, default=1000,
+                       help='Registered evidence files')
+    parser.add_argument('--noise', type=int, default=10000,
+                       help='Unrelated files in the tree')
+    parser.add_argument('--size-kb', type=int, default=256,
+                       help='Size of each evidence file')
+    parser.add_argument('--mismatches', type=int, default=3,
+                       help='Entries with a wrong stored hash')
+    parser.add_argument('--workers', type=int,
+                       help='Hashing threads for indexed mode')
+    parser.add_argument('--skip-glob', action='store_true',
+                       help='Skip the glob-per-entry baseline')
+    args = parser.parse_args()
+
+    logging.getLogger('hash_evidence').setLevel(logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        index_path = build_store(root, args.entries, args.noise, args.size_kb, args.mismatches)
+        cache_path = root / "hash_cache.json"
+        total_mb = args.entries * args.size_kb / 1024
+
+        modes = []
+        if not args.skip_glob:
+            modes.append(("glob", {}))
+        modes.append(("indexed-cold", {'indexed': True, 'workers': args.workers, 'cache_path': cache_path}))
+        modes.append(("indexed-warm", {'indexed': True, 'workers': args.workers, 'cache_path': cache_path}))
+
+        print(f"{args.entries} entries ({total_mb:.0f} MB), {args.noise} unrelated files")
+        print(f"{'mode':<14} {'seconds':>9} {'files/s':>10} {'MB/s':>10} {'hashed':>8} {'hits':>6}")
+        results = []
+        for name, kwargs in modes:
+            manager, elapsed = run(index_path, **kwargs)
+            stats = manager.stats
+            print(f"{name:<14} {elapsed:>9.2f} {args.entries / elapsed:>10.0f} "
+                  f"{total_mb / elapsed:>10.1f} {stats['files_hashed']:>8} {stats['cache_hits']:>6}")
+            results.append((manager.verified_count, manager.issues))
+
+    if any(r != results[0] for r in results[1:]):
+        print("✗ Verification results differ between modes")
+        return 1
+    print(f"✓ All modes agree: {results[0][0]} verified, {len(results[0][1])} issues")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,6 +11,10 @@ Usage:
     
     # Verify hash against EVIDENCE_INDEX.csv
     python hash_evidence.py --index ../06-EVIDENCE/EVIDENCE_INDEX.csv --verify
+
+    # Indexed, parallel verification with a persistent digest cache
+    python hash_evidence.py --index ../06-EVIDENCE/EVIDENCE_INDEX.csv --verify --indexed \
+        --workers 8 --hash-cache .evidence_hash_cache.json
     
     # Update EVIDENCE_INDEX.csv with computed hashes
     python hash_evidence.py --index ../06-EVIDENCE/EVIDENCE_INDEX.csv --update
@@ -20,6 +24,8 @@ Functionality:
     - Verify hashes match EVIDENCE_INDEX.csv
     - Update EVIDENCE_INDEX.csv with new hashes
     - Bulk verification of all evidence files
+    - Indexed mode: one walk of the evidence tree, parallel hashing and a
+      (path, size, mtime) -> digest cache so unchanged files are not re-hashed
 
 Exit codes:
     0 - All checks passed
@@ -27,10 +33,16 @@ Exit codes:
 """
 
 import argparse
+import bisect
 import csv
+import glob
 import hashlib
+import json
 import logging
+import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
@@ -42,15 +54,25 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def compute_file_hash(file_path):
+# Read size for hashing; large reads keep syscalls low and let hashlib
+# release the GIL for most of the work when hashing in threads
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def compute_file_hash(file_path, chunk_size=HASH_CHUNK_SIZE):
     """Compute SHA-256 hash of a file."""
     sha256_hash = hashlib.sha256()
     
     try:
-        with open(file_path, "rb") as f:
-            # Read file in chunks to handle large files
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
+        with open(file_path, "rb", buffering=0) as f:
+            # Read file in chunks into a reused buffer to handle large files
+            buf = bytearray(chunk_size)
+            view = memoryview(buf)
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                sha256_hash.update(view[:n])
         
         return sha256_hash.hexdigest()
     except Exception as e:
@@ -58,6 +80,121 @@ def compute_file_hash(file_path):
         return None
 
 
+class HashCache:
+    """
+    Persistent (path, size, mtime) -> SHA-256 digest cache.
+
+    Stored as JSON; an entry is reused only while the file's size and
+    mtime (ns) are unchanged.
+    """
+    
+    def __init__(self, cache_path=None):
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.entries = {}
+        self.hits = 0
+        self.dirty = False
+    
+    def load(self):
+        """Load cache file if present; a corrupt cache is ignored."""
+        if not self.cache_path or not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)['files']
+            if not isinstance(entries, dict):
+                raise ValueError("'files' is not an object")
+            self.entries = entries
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable hash cache {self.cache_path}: {e}")
+            self.entries = {}
+    
+    def get(self, path, stat):
+        """Return cached digest for path if size and mtime match."""
+        entry = self.entries.get(str(path))
+        if (isinstance(entry, list) and len(entry) == 3
+                and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns
+                and isinstance(entry[2], str)):
+            self.hits += 1
+            return entry[2]
+        return None
+    
+    def put(self, path, stat, digest):
+        self.entries[str(path)] = [stat.st_size, stat.st_mtime_ns, digest]
+        self.dirty = True
+    
+    def save(self):
+        """Write cache atomically."""
+        if not self.cache_path or not self.dirty:
+            return
+        tmp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'files': self.entries}, f)
+        os.replace(tmp_path, self.cache_path)
+        self.dirty = False
+
+
+def glob_evidence_files(base_path, evidence_id):
+    """
+    Files under base_path whose name contains evidence_id, in sorted path order.
+
+    The ID is matched literally (glob metacharacters are escaped), so
+    this returns the same files as EvidenceFileIndex.find.
+    """
+    if not evidence_id or "\n" in evidence_id:
+        return []
+    pattern = f"**/*{glob.escape(evidence_id)}*"
+    return sorted(p for p in Path(base_path).glob(pattern) if p.is_file())
+
+
+class EvidenceFileIndex:
+    """
+    Filename index of an evidence tree, built with a single walk.
+
+    Lookups return the files whose name contains the evidence ID, the
+    same files as glob_evidence_files, in sorted path order. Names are
+    kept in one newline-joined string so each lookup is a C-level
+    substring scan instead of a directory walk.
+    """
+    
+    def __init__(self, base_path, exclude=()):
+        self.base_path = Path(base_path)
+        exclude = {Path(p).resolve() for p in exclude}
+        paths = []
+        for root, _dirs, files in os.walk(self.base_path):
+            for name in files:
+                path = Path(root) / name
+                if exclude and path.resolve() in exclude:
+                    continue
+                paths.append(path)
+        paths.sort()
+        self.paths = paths
+        self._names = "\n".join(p.name for p in paths)
+        # Start offset of each name in the joined string
+        self._starts = []
+        offset = 0
+        for p in paths:
+            self._starts.append(offset)
+            offset += len(p.name) + 1
+    
+    def __len__(self):
+        return len(self.paths)
+    
+    def find(self, evidence_id):
+        """Return paths whose filename contains evidence_id."""
+        if not evidence_id or "\n" in evidence_id:
+            return []
+        matches = []
+        last = -1
+        pos = self._names.find(evidence_id)
+        while pos != -1:
+            idx = bisect.bisect_right(self._starts, pos) - 1
+            if idx != last:
+                matches.append(self.paths[idx])
+                last = idx
+            pos = self._names.find(evidence_id, pos + 1)
+        return matches
+
+
 class EvidenceHashManager:
     """Manages hashing and verification of evidence files."""
     
@@ -66,6 +203,7 @@ class EvidenceHashManager:
         self.evidence_entries = []
         self.issues = []
         self.verified_count = 0
+        self.stats = {}
     
     def load_index(self):
         """Load evidence index CSV."""
@@ -83,8 +221,17 @@ class EvidenceHashManager:
             self.issues.append(f"Failed to read index: {e}")
             return False
     
-    def verify_evidence(self, base_path=None):
-        """Verify hashes of all evidence files in index."""
+    def verify_evidence(self, base_path=None, indexed=False, workers=None, cache_path=None):
+        """
+        Verify hashes of all evidence files in index.
+        
+        Args:
+            base_path: Root of the evidence tree (defaults to COMPLIANCE dir)
+            indexed: Walk the tree once and hash matched files in parallel
+                instead of globbing the tree for every entry
+            workers: Hashing threads for indexed mode (default: CPU count, max 32)
+            cache_path: Optional digest cache file for indexed mode
+        """
         logger.info("Verifying evidence hashes...")
         
         if base_path is None:
@@ -92,6 +239,13 @@ class EvidenceHashManager:
         else:
             base_path = Path(base_path)
         
+        if indexed:
+            return self._verify_indexed(base_path, workers, cache_path)
+        
+        start = time.perf_counter()
+        files_hashed = 0
+        bytes_hashed = 0
+        
         for entry in self.evidence_entries:
             evidence_id = entry.get('Evidence_ID', 'Unknown')
             utcs = entry.get('UTCS', '')
@@ -104,7 +258,7 @@ class EvidenceHashManager:
             # Try to find the file based on UTCS or Evidence_ID
             # This is a simplified lookup - in production, you'd have a proper mapping
             file_pattern = f"**/*{evidence_id}*"
-            files = list(base_path.glob(file_pattern))
+            files = glob_evidence_files(base_path, evidence_id)
             
             if not files:
                 logger.warning(f"{evidence_id}: Evidence file not found (searched: {file_pattern})")
@@ -119,16 +273,107 @@ class EvidenceHashManager:
             if computed_hash is None:
                 continue
             
-            if computed_hash == stored_hash:
-                logger.info(f"✓ {evidence_id}: Hash verified")
-                self.verified_count += 1
-            else:
-                self.issues.append(
-                    f"{evidence_id}: Hash mismatch!\n"
-                    f"  Expected: {stored_hash}\n"
-                    f"  Computed: {computed_hash}"
-                )
+            files_hashed += 1
+            bytes_hashed += file_path.stat().st_size
+            self._check_hash(evidence_id, stored_hash, computed_hash)
+        
+        self.stats = {
+            'mode': 'glob',
+            'files_hashed': files_hashed,
+            'bytes_hashed': bytes_hashed,
+            'cache_hits': 0,
+            'elapsed_s': time.perf_counter() - start,
+        }
+        return len(self.issues) == 0
+    
+    def _check_hash(self, evidence_id, stored_hash, computed_hash):
+        if computed_hash == stored_hash:
+            logger.info(f"✓ {evidence_id}: Hash verified")
+            self.verified_count += 1
+        else:
+            self.issues.append(
+                f"{evidence_id}: Hash mismatch!\n"
+                f"  Expected: {stored_hash}\n"
+                f"  Computed: {computed_hash}"
+            )
+    
+    def _verify_indexed(self, base_path, workers=None, cache_path=None):
+        """Indexed, parallel, cached variant of verify_evidence."""
+        start = time.perf_counter()
+        cache = HashCache(cache_path)
+        cache.load()
         
+        exclude = [cache.cache_path] if cache.cache_path else []
+        file_index = EvidenceFileIndex(base_path, exclude=exclude)
+        logger.info(f"Indexed {len(file_index)} files under {base_path}")
+        
+        # Resolve every entry to a file first; issues are reported
+        # afterwards in index order, as in the glob mode
+        resolved = []
+        for entry in self.evidence_entries:
+            evidence_id = entry.get('Evidence_ID', 'Unknown')
+            stored_hash = entry.get('Hash(SHA256)', '').strip()
+            
+            if not stored_hash:
+                resolved.append((evidence_id, None, None))
+                continue
+            
+            files = file_index.find(evidence_id)
+            if not files:
+                logger.warning(f"{evidence_id}: Evidence file not found (searched: **/*{evidence_id}*)")
+                continue
+            
+            if len(files) > 1:
+                logger.warning(f"{evidence_id}: Multiple files match, using first: {files[0]}")
+            
+            resolved.append((evidence_id, stored_hash, files[0]))
+        
+        # Hash each distinct file once, skipping files unchanged since the cache was written
+        digests = {}
+        to_hash = []
+        for _, _, file_path in resolved:
+            if file_path is None or file_path in digests:
+                continue
+            try:
+                stat = file_path.stat()
+            except OSError as e:
+                logger.error(f"Failed to compute hash for {file_path}: {e}")
+                digests[file_path] = None
+                continue
+            digests[file_path] = cache.get(file_path, stat)
+            if digests[file_path] is None:
+                to_hash.append((file_path, stat))
+        
+        workers = workers or min(32, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            hashed = pool.map(compute_file_hash, [path for path, _ in to_hash])
+            for (file_path, stat), digest in zip(to_hash, hashed):
+                digests[file_path] = digest
+                if digest is not None:
+                    cache.put(file_path, stat, digest)
+        
+        for evidence_id, stored_hash, file_path in resolved:
+            if file_path is None:
+                self.issues.append(f"{evidence_id}: No hash stored")
+                continue
+            computed_hash = digests[file_path]
+            if computed_hash is None:
+                continue
+            self._check_hash(evidence_id, stored_hash, computed_hash)
+        
+        try:
+            cache.save()
+        except Exception as e:
+            logger.warning(f"Failed to write hash cache {cache.cache_path}: {e}")
+        
+        self.stats = {
+            'mode': 'indexed',
+            'files_indexed': len(file_index),
+            'files_hashed': len(to_hash),
+            'bytes_hashed': sum(stat.st_size for _, stat in to_hash),
+            'cache_hits': cache.hits,
+            'elapsed_s': time.perf_counter() - start,
+        }
         return len(self.issues) == 0
     
     def update_hash(self, file_path, evidence_id=None):
@@ -199,6 +444,16 @@ class EvidenceHashManager:
             logger.info(f"Total entries: {len(self.evidence_entries)}")
             logger.info(f"Verified: {self.verified_count}")
         
+        if self.stats:
+            elapsed = max(self.stats['elapsed_s'], 1e-9)
+            logger.info(
+                f"Hashed {self.stats['files_hashed']} files "
+                f"({self.stats['bytes_hashed'] / 1e6:.1f} MB, "
+                f"{self.stats['cache_hits']} cache hits) in {elapsed:.2f}s: "
+                f"{self.stats['files_hashed'] / elapsed:.1f} files/s, "
+                f"{self.stats['bytes_hashed'] / 1e6 / elapsed:.1f} MB/s"
+            )
+        
         if not self.issues:
             logger.info("✓ All checks passed!")
             return True
@@ -231,6 +486,12 @@ def main():
                        help='Update hash in index')
     parser.add_argument('--base-path',
                        help='Base path to search for evidence files')
+    parser.add_argument('--indexed', action='store_true',
+                       help='Index the evidence tree once and hash files in parallel')
+    parser.add_argument('--workers', type=int,
+                       help='Hashing threads for --indexed (default: CPU count)')
+    parser.add_argument('--hash-cache',
+                       help='Digest cache file for --indexed; unchanged files are not re-hashed')
     
     args = parser.parse_args()
     
@@ -267,7 +528,12 @@ def main():
             if not manager.load_index():
                 return 1
             
-            manager.verify_evidence(args.base_path)
+            manager.verify_evidence(
+                args.base_path,
+                indexed=args.indexed,
+                workers=args.workers,
+                cache_path=args.hash_cache,
+            )
             success = manager.generate_report()
             
             return 0 if success else 1
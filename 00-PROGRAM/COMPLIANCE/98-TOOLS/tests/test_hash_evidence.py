@@ -0,0 +1,152 @@
+"""
+Tests for hash_evidence.py glob and indexed verification modes.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from hash_evidence import (
+    EvidenceFileIndex, EvidenceHashManager, HashCache, glob_evidence_files
+)
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+
+def write_index(root, rows):
+    index_path = root / "06-EVIDENCE" / "EVIDENCE_INDEX.csv"
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(index_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["Evidence_ID", "UTCS", "Hash(SHA256)"])
+        writer.writeheader()
+        for evidence_id, digest in rows:
+            writer.writerow({"Evidence_ID": evidence_id, "UTCS": "", "Hash(SHA256)": digest})
+    return index_path
+
+
+def verify(index_path, base_path, **kwargs):
+    manager = EvidenceHashManager(index_path)
+    assert manager.load_index()
+    ok = manager.verify_evidence(base_path, **kwargs)
+    return ok, manager
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Evidence tree with multi-match IDs, glob metacharacters and a matching directory."""
+    base = tmp_path / "store"
+    # Created out of sorted order: "b/" before "a/"
+    write(base / "b" / "EV-001_report.pdf", b"second")
+    write(base / "a" / "EV-001_scan.pdf", b"first")
+    write(base / "EV-[2]_note.txt", b"bracket")
+    write(base / "EV-2_note.txt", b"plain")
+    write(base / "EV-*3.txt", b"star")
+    write(base / "EV-X3.txt", b"other")
+    (base / "EV-004_dir").mkdir()
+    write(base / "EV-004_dir" / "readme.txt", b"not evidence")
+    write(base / "c" / "EV-004.bin", b"four")
+    return base
+
+
+class TestFileLookup:
+    """Test that both modes select the same file."""
+
+    @pytest.mark.parametrize("evidence_id", ["EV-001", "EV-[2]", "EV-2", "EV-*3", "EV-004", "EV-9", ""])
+    def test_glob_matches_index(self, tree, evidence_id):
+        assert glob_evidence_files(tree, evidence_id) == EvidenceFileIndex(tree).find(evidence_id)
+
+    def test_multi_match_uses_sorted_first(self, tree):
+        files = glob_evidence_files(tree, "EV-001")
+        assert files == [tree / "a" / "EV-001_scan.pdf", tree / "b" / "EV-001_report.pdf"]
+
+    def test_metacharacters_are_literal(self, tree):
+        assert glob_evidence_files(tree, "EV-[2]") == [tree / "EV-[2]_note.txt"]
+        assert glob_evidence_files(tree, "EV-*3") == [tree / "EV-*3.txt"]
+
+    def test_directories_are_not_evidence(self, tree):
+        assert glob_evidence_files(tree, "EV-004") == [tree / "c" / "EV-004.bin"]
+
+    @pytest.mark.parametrize("indexed", [False, True])
+    def test_modes_verify_same_entries(self, tree, tmp_path, indexed):
+        index_path = write_index(tmp_path, [
+            ("EV-001", sha256(b"first")),
+            ("EV-[2]", sha256(b"bracket")),
+            ("EV-*3", sha256(b"star")),
+            ("EV-004", sha256(b"four")),
+        ])
+        ok, manager = verify(index_path, tree, indexed=indexed)
+        assert ok, manager.issues
+        assert manager.verified_count == 4
+
+
+class TestHashCache:
+    """Test the persistent digest cache used by indexed mode."""
+
+    def setup_evidence(self, tmp_path):
+        base = tmp_path / "store"
+        evidence = write(base / "EV-001.pdf", b"content")
+        index_path = write_index(tmp_path, [("EV-001", sha256(b"content"))])
+        return base, evidence, index_path, tmp_path / "cache.json"
+
+    def test_second_run_hits_cache(self, tmp_path):
+        base, _, index_path, cache_path = self.setup_evidence(tmp_path)
+        ok, manager = verify(index_path, base, indexed=True, cache_path=cache_path)
+        assert ok and manager.stats["files_hashed"] == 1 and manager.stats["cache_hits"] == 0
+        assert cache_path.exists()
+
+        ok, manager = verify(index_path, base, indexed=True, cache_path=cache_path)
+        assert ok and manager.stats["files_hashed"] == 0 and manager.stats["cache_hits"] == 1
+
+    def test_mtime_change_invalidates(self, tmp_path):
+        base, evidence, index_path, cache_path = self.setup_evidence(tmp_path)
+        verify(index_path, base, indexed=True, cache_path=cache_path)
+        stat = evidence.stat()
+        os.utime(evidence, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        ok, manager = verify(index_path, base, indexed=True, cache_path=cache_path)
+        assert ok and manager.stats["files_hashed"] == 1 and manager.stats["cache_hits"] == 0
+
+    def test_size_change_invalidates(self, tmp_path):
+        base, evidence, index_path, cache_path = self.setup_evidence(tmp_path)
+        verify(index_path, base, indexed=True, cache_path=cache_path)
+        stat = evidence.stat()
+        evidence.write_bytes(b"tampered content")
+        # Same mtime: only the size tells the entries apart
+        os.utime(evidence, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        ok, manager = verify(index_path, base, indexed=True, cache_path=cache_path)
+        assert not ok
+        assert manager.stats["files_hashed"] == 1
+        assert "Hash mismatch" in manager.issues[0]
+
+    @pytest.mark.parametrize("content", ["{not json", "[]", '{"files": []}', '{"files": {"x": 5}}'])
+    def test_corrupt_cache_is_ignored_and_rewritten(self, tmp_path, content):
+        base, evidence, index_path, cache_path = self.setup_evidence(tmp_path)
+        cache_path.write_text(content)
+
+        ok, manager = verify(index_path, base, indexed=True, cache_path=cache_path)
+        assert ok and manager.stats["files_hashed"] == 1
+        assert str(evidence) in json.loads(cache_path.read_text())["files"]
+
+    def test_malformed_entry_is_a_miss(self, tmp_path):
+        _, evidence, _, cache_path = self.setup_evidence(tmp_path)
+        stat = evidence.stat()
+        cache_path.write_text(json.dumps({"files": {str(evidence): [stat.st_size]}}))
+        cache = HashCache(cache_path)
+        cache.load()
+        assert cache.get(evidence, stat) is None and cache.hits == 0
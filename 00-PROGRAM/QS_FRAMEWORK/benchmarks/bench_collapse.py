@@ -0,0 +1,105 @@
+"""
+Collapse and Pareto Benchmark
+
+Compares the batch evaluation engine (qs_batch) with the per-candidate
+reference path for collapse scoring and Pareto frontier extraction.
+
+Usage:
+    cd benchmarks
+    python bench_collapse.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import qs_batch
+from qs_field import Candidate, QSField
+
+OBJECTIVES = ["performance", "cost", "risk"]
+
+
+def build_field(n, seed=42):
+    """Build a frozen field of n random candidates."""
+    rng = random.Random(seed)
+    candidates = []
+    for i in range(n):
+        score_vector = {obj: rng.random() for obj in OBJECTIVES}
+        score_vector["aggregate"] = rng.random()
+        candidates.append(Candidate(
+            id=f"x_{i + 1}",
+            configuration={"param_1": rng.uniform(0, 100)},
+            utcs_manifest={},
+            score_vector=score_vector,
+            uncertainty={},
+            bounds={},
+            constraints_satisfied={"C0_safety": rng.random() > 0.1},
+            provenance={},
+        ))
+    field = QSField(
+        version="QS_BENCH_v1",
+        candidates=candidates,
+        scores=[c.score_vector["aggregate"] for c in candidates],
+        bounds={},
+        priors={},
+        constraints={},
+    )
+    field.freeze()
+    return field
+
+
+def timed(fn):
+    """Run fn once and return (result, seconds)."""
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def run(sizes, legacy_limit):
+    criteria = {
+        "evaluation_method": "weighted_sum",
+        "weights": {"performance": 0.5, "cost": 0.3, "risk": 0.2},
+    }
+
+    print(f"{'n':>8} {'stage':<12} {'reference_s':>12} {'batch_s':>10} {'speedup':>8}")
+    for n in sizes:
+        field = build_field(n)
+
+        ref_scores, t_ref = timed(
+            lambda: [field._evaluate_criteria(c, criteria) for c in field.candidates]
+        )
+        batch_scores, t_batch = timed(
+            lambda: qs_batch.evaluate_criteria_batch(field.candidates, criteria)
+        )
+        assert ref_scores == batch_scores
+        print(f"{n:>8} {'collapse':<12} {t_ref:>12.4f} {t_batch:>10.4f} {t_ref / t_batch:>7.1f}x")
+
+        for objectives in (OBJECTIVES[:2], OBJECTIVES):
+            label = f"pareto-{len(objectives)}d"
+            columns = qs_batch.score_columns(field.candidates, objectives)
+            front, t_batch = timed(lambda: qs_batch.pareto_front_indices(columns))
+            if n <= legacy_limit:
+                ref_front, t_ref = timed(lambda: qs_batch._pareto_indices_pairwise(columns))
+                assert ref_front == front
+                print(f"{n:>8} {label:<12} {t_ref:>12.4f} {t_batch:>10.4f} {t_ref / t_batch:>7.1f}x")
+            else:
+                print(f"{n:>8} {label:<12} {'skipped':>12} {t_batch:>10.4f} {'-':>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument(
+        "--legacy-limit", type=int, default=10000,
+        help="Largest n for the O(n^2) pairwise Pareto reference",
+    )
+    args = parser.parse_args()
+    run(args.sizes, args.legacy_limit)
+
+
+if __name__ == "__main__":
+    main()
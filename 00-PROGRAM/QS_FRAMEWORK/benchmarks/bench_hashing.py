@@ -0,0 +1,114 @@
+"""
+Candidate Hashing Benchmark
+
+Compares the previous eager JSON hashing (json.dumps(sort_keys=True) over
+every field on each construction) with the lazy, per-section cached hash
+over the canonical binary encoding, for constructing candidates, hashing
+them (freeze) and an evidence update followed by a re-freeze.
+
+Usage:
+    cd benchmarks
+    python bench_hashing.py --sizes 1000 10000 100000 --params 50
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from qs_api import QSAPI
+from qs_field import HASH_SECTIONS, Candidate
+
+
+def legacy_hash(candidate):
+    """Hash as computed before the canonical encoding."""
+    data = {name: getattr(candidate, name) for name in HASH_SECTIONS}
+    json_str = json.dumps(data, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(json_str.encode()).hexdigest()
+
+
+def candidate_rows(n, params, seed=42):
+    """Field values for n candidates with a params-wide configuration."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        rows.append(dict(
+            id=f"x_{i + 1}",
+            configuration={f"param_{p}": rng.uniform(0, 100) for p in range(params)},
+            utcs_manifest={"context": "bench", "content": {"ata": "57-10", "revision": i % 7}},
+            score_vector={"performance": rng.random(), "cost": rng.random(), "aggregate": rng.random()},
+            uncertainty={f"sigma_param_{p}": rng.random() for p in range(params // 5)},
+            bounds={f"param_{p}": (0.0, 100.0) for p in range(params)},
+            constraints_satisfied={f"C{c}": rng.random() > 0.1 for c in range(10)},
+            provenance={"generated_by": "bench", "evidence_refs": []},
+        ))
+    return rows
+
+
+def timed(fn):
+    """Run fn once and return (result, seconds)."""
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def legacy_update(candidate, evidence):
+    """The previous evidence update: rebuild, then hash every field."""
+    updated = Candidate(
+        id=candidate.id,
+        configuration=candidate.configuration,
+        utcs_manifest={**candidate.utcs_manifest, "evidence_update": evidence["description"]},
+        score_vector={**candidate.score_vector, "aggregate": candidate.score_vector["aggregate"] * 1.01},
+        uncertainty=candidate.uncertainty,
+        bounds=candidate.bounds,
+        constraints_satisfied=candidate.constraints_satisfied,
+        provenance={**candidate.provenance, "evidence_refs": [*candidate.provenance["evidence_refs"], "wt"]},
+    )
+    return updated, legacy_hash(updated)
+
+
+def run(sizes, params):
+    api = QSAPI()
+    evidence = {"description": "wind tunnel run 12", "wt": [1.0, 2.0]}
+
+    print(f"{'n':>8} {'stage':<16} {'legacy_s':>10} {'cached_s':>10} {'speedup':>8}")
+    for n in sizes:
+        rows = candidate_rows(n, params)
+
+        def construct_legacy():
+            candidates = [Candidate(**row) for row in rows]
+            return candidates, [legacy_hash(c) for c in candidates]
+
+        (legacy_candidates, _), t_legacy = timed(construct_legacy)
+        candidates, t_cached = timed(lambda: [Candidate(**row) for row in rows])
+        print(f"{n:>8} {'construct':<16} {t_legacy:>10.4f} {t_cached:>10.4f} {t_legacy / t_cached:>7.1f}x")
+
+        _, t_legacy = timed(lambda: [legacy_hash(c) for c in legacy_candidates])
+        _, t_cached = timed(lambda: [c.hash for c in candidates])
+        print(f"{n:>8} {'hash (freeze)':<16} {t_legacy:>10.4f} {t_cached:>10.4f} {t_legacy / t_cached:>7.1f}x")
+
+        _, t_cached = timed(lambda: [c.hash for c in candidates])
+        print(f"{n:>8} {'hash (cached)':<16} {'-':>10} {t_cached:>10.4f} {'-':>8}")
+
+        _, t_legacy = timed(lambda: [legacy_update(c, evidence) for c in legacy_candidates])
+        _, t_cached = timed(lambda: [
+            api._update_candidate_with_evidence(c, evidence).hash for c in candidates
+        ])
+        print(f"{n:>8} {'update + freeze':<16} {t_legacy:>10.4f} {t_cached:>10.4f} {t_legacy / t_cached:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--params", type=int, default=50, help="Configuration parameters per candidate")
+    args = parser.parse_args()
+    run(args.sizes, args.params)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+QS Field History Benchmark
+
+Traced memory while a field goes through many evidence updates, with the
+previous unbounded history (every QSField kept in a list) and with the
+bounded, delta-encoded FieldHistory, plus reconstruction latency of
+random retained versions.
+
+The previous history grows by a full field per update, so it is run for
+fewer updates (--legacy-updates) and its growth rate reported.
+
+Updates re-score every candidate and tag its manifest, like
+update_evidence, but do not extend provenance evidence_refs:
+update_evidence appends to that list on every call, so over 10k updates
+the field itself grows quadratically and would dominate both modes.
+
+Usage:
+    cd benchmarks
+    python bench_history.py --candidates 200 --updates 10000 --legacy-updates 1000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from qs_api import QSAPI
+from qs_field import QSField
+from qs_history import FieldHistory
+
+
+def rescore(qs_field, update, rng):
+    """Next field version: new aggregate scores and evidence tag per candidate."""
+    candidates = [
+        c.evolve(
+            score_vector={**c.score_vector, "aggregate": c.score_vector["aggregate"] * rng.uniform(0.95, 1.05)},
+            utcs_manifest={**c.utcs_manifest, "evidence_update": f"run {update}"},
+        )
+        for c in qs_field.candidates
+    ]
+    return QSField(
+        version=f"QS_BENCH_v{update + 1}",
+        candidates=candidates,
+        scores=[c.score_vector["aggregate"] for c in candidates],
+        bounds=qs_field.bounds,
+        priors=qs_field.priors,
+        constraints=qs_field.constraints,
+        metadata={**qs_field.metadata, "parent_version": qs_field.version},
+    )
+
+
+def run_updates(history, field, updates, keep, checkpoints):
+    """Apply updates, sampling traced memory; keep is the legacy list or None."""
+    rng = random.Random(2)
+    samples = []
+    start = time.perf_counter()
+    for i in range(1, updates + 1):
+        field = rescore(field, i, rng)
+        if keep is not None:
+            keep.append(field)
+        else:
+            history.record(field, event="update")
+        if i % checkpoints == 0:
+            samples.append((i, tracemalloc.get_traced_memory()[0] / 1e6))
+    return field, samples, time.perf_counter() - start
+
+
+def run(args):
+    random.seed(0)
+    design_space = {"num_candidates": args.candidates}
+    checkpoints = max(1, args.updates // 10)
+
+    print(f"{'mode':<10} {'updates':>8} {'traced_mb':>10} {'entries':>8} {'history_mb':>11} {'ms/update':>10}")
+
+    tracemalloc.start()
+    # Previous behaviour: a list holding every field object
+    base = tracemalloc.get_traced_memory()[0]
+    field = QSAPI(history=FieldHistory(max_entries=1)).create(design_space, {}, {}, version="QS_BENCH_v1")
+    legacy = [field]
+    _, samples, elapsed = run_updates(None, field, args.legacy_updates, legacy, max(1, args.legacy_updates // 5))
+    for i, mb in samples:
+        print(f"{'legacy':<10} {i:>8} {mb - base / 1e6:>10.1f} {i + 1:>8} {'-':>11} "
+              f"{elapsed / args.legacy_updates * 1e3:>10.2f}")
+    growth = (samples[-1][1] - samples[0][1]) / (samples[-1][0] - samples[0][0]) if len(samples) > 1 else 0.0
+    print(f"{'legacy':<10} {args.updates:>8} {growth * args.updates:>10.1f} {'':>8} {'':>11} {'':>10}  (extrapolated)")
+    del legacy, field
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    history = FieldHistory(max_entries=args.max_entries, max_bytes=args.max_mb * 1024 * 1024,
+                           snapshot_interval=args.snapshot_interval)
+    api = QSAPI(history=history)
+    base = tracemalloc.get_traced_memory()[0]
+    field = api.create(design_space, {}, {}, version="QS_BENCH_v1")
+    field, samples, elapsed = run_updates(history, field, args.updates, None, checkpoints)
+    for i, mb in samples:
+        print(f"{'history':<10} {i:>8} {mb - base / 1e6:>10.1f} {'':>8} {'':>11} {'':>10}")
+    print(f"{'history':<10} {args.updates:>8} {'':>10} {len(history):>8} {(history.nbytes + history.tip_bytes) / 1e6:>11.2f} "
+          f"{elapsed / args.updates * 1e3:>10.2f}")
+    tracemalloc.stop()
+
+    entry_ids = [entry["id"] for entry in history.entries()]
+    rng = random.Random(1)
+    latencies = []
+    for entry_id in (rng.choice(entry_ids) for _ in range(args.reads)):
+        start = time.perf_counter()
+        history.get(entry_id)
+        latencies.append((time.perf_counter() - start) * 1e3)
+    latencies.sort()
+    print(f"\nreconstruct {args.reads} random versions: "
+          f"p50 {latencies[len(latencies) // 2]:.2f} ms, "
+          f"p95 {latencies[int(len(latencies) * 0.95)]:.2f} ms, max {latencies[-1]:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=200)
+    parser.add_argument("--updates", type=int, default=10000)
+    parser.add_argument("--legacy-updates", type=int, default=1000)
+    parser.add_argument("--max-entries", type=int, default=1000)
+    parser.add_argument("--max-mb", type=int, default=256)
+    parser.add_argument("--snapshot-interval", type=int, default=32)
+    parser.add_argument("--reads", type=int, default=200)
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
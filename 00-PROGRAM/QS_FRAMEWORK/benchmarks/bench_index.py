@@ -0,0 +1,137 @@
+"""
+QS Field Index Benchmark
+
+Per-query latency of point (id), range/box and k-nearest-neighbour
+lookups with the QSField indexes, against the linear scans they replace.
+Index build time is reported separately; indexes are built on first use
+and reused by every later query.
+
+Usage:
+    cd benchmarks
+    python bench_index.py --sizes 10000 100000 --queries 1000 --k 10
+"""
+
+import argparse
+import heapq
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from qs_field import Candidate, QSField
+
+SPAN = "configuration.span_m"
+CHORD = "configuration.chord_m"
+MASS = "score_vector.mass_kg"
+
+
+def build_field(n, seed=42):
+    """Field of n wing candidates."""
+    rng = random.Random(seed)
+    candidates = [
+        Candidate(
+            id=f"x_{i + 1}",
+            configuration={"span_m": rng.uniform(28, 40), "chord_m": rng.uniform(1.5, 3.0)},
+            utcs_manifest={},
+            score_vector={"mass_kg": rng.uniform(1150, 1450), "cost": rng.random()},
+            uncertainty={},
+            bounds={},
+            constraints_satisfied={},
+            provenance={},
+        )
+        for i in range(n)
+    ]
+    return QSField(version="QS_BENCH_v1", candidates=candidates, scores=[0.0] * n,
+                   bounds={}, priors={}, constraints={})
+
+
+def per_query_us(fn, queries):
+    """Mean microseconds per query."""
+    start = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def scan_by_id(field, candidate_id):
+    for candidate in field.candidates:
+        if candidate.id == candidate_id:
+            return candidate
+    return None
+
+
+def scan_box(field, box):
+    (span_lo, span_hi), mass_max = box
+    return [c for c in field.candidates
+            if span_lo <= c.configuration["span_m"] <= span_hi and c.score_vector["mass_kg"] < mass_max]
+
+
+def scan_nearest(field, point, k):
+    span, chord = point
+    return heapq.nsmallest(k, field.candidates, key=lambda c: math.hypot(
+        (c.configuration["span_m"] - span) / 12.0, (c.configuration["chord_m"] - chord) / 1.5
+    ))
+
+
+def run(sizes, queries, k, scan_limit):
+    rng = random.Random(1)
+    print(f"{'n':>8} {'query':<8} {'build_ms':>9} {'scan_us':>10} {'index_us':>9} {'speedup':>8}")
+    for n in sizes:
+        field = build_field(n)
+        ids = [f"x_{rng.randrange(n) + 1}" for _ in range(queries)]
+        boxes = []
+        for _ in range(queries):
+            lo = rng.uniform(28, 39)
+            boxes.append(((lo, lo + rng.uniform(0.1, 1.0)), rng.uniform(1200, 1400)))
+        points = [(rng.uniform(28, 40), rng.uniform(1.5, 3.0)) for _ in range(queries)]
+        scan_queries = max(1, min(queries, scan_limit // n))
+
+        start = time.perf_counter()
+        field.get_candidate_by_id("x_1")
+        build = (time.perf_counter() - start) * 1e3
+        t_scan = per_query_us(lambda q: scan_by_id(field, q), ids[:scan_queries])
+        t_index = per_query_us(field.get_candidate_by_id, ids)
+        print(f"{n:>8} {'point':<8} {build:>9.1f} {t_scan:>10.1f} {t_index:>9.2f} {t_scan / t_index:>7.0f}x")
+
+        start = time.perf_counter()
+        field.query_candidates({SPAN: (30, 31), MASS: {"lt": 1300}})
+        build = (time.perf_counter() - start) * 1e3
+
+        def box_query(box):
+            return field.query_candidates({SPAN: box[0], MASS: {"lt": box[1]}})
+
+        assert box_query(boxes[0]) == scan_box(field, boxes[0])
+        t_scan = per_query_us(lambda q: scan_box(field, q), boxes[:scan_queries])
+        t_index = per_query_us(box_query, boxes)
+        print(f"{n:>8} {'box':<8} {build:>9.1f} {t_scan:>10.1f} {t_index:>9.2f} {t_scan / t_index:>7.0f}x")
+
+        start = time.perf_counter()
+        field.nearest_candidates({SPAN: 34.0, CHORD: 2.0}, k=k)
+        build = (time.perf_counter() - start) * 1e3
+
+        def knn_query(point):
+            return field.nearest_candidates({SPAN: point[0], CHORD: point[1]}, k=k)
+
+        t_scan = per_query_us(lambda q: scan_nearest(field, q, k), points[:scan_queries])
+        t_index = per_query_us(knn_query, points)
+        print(f"{n:>8} {f'{k}-nn':<8} {build:>9.1f} {t_scan:>10.1f} {t_index:>9.2f} {t_scan / t_index:>7.0f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument(
+        "--scan-limit", type=int, default=20_000_000,
+        help="Candidate visits budget for the linear-scan baselines",
+    )
+    args = parser.parse_args()
+    run(args.sizes, args.queries, args.k, args.scan_limit)
+
+
+if __name__ == "__main__":
+    main()
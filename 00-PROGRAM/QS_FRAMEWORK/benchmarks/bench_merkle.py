@@ -0,0 +1,73 @@
+"""
+Merkle Tree Benchmark
+
+Compares one-shot compute_merkle_root with the incremental MerkleTree for
+leaf updates, appends and proof generation.
+
+Usage:
+    cd benchmarks
+    python bench_merkle.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from merkle import MerkleTree, compute_merkle_root, verify_merkle_proof
+
+
+def leaf(i, tag="leaf"):
+    return hashlib.sha256(f"{tag}_{i}".encode()).hexdigest()
+
+
+def run(sizes, ops):
+    print(f"{'n':>8} {'build_s':>9} {'rebuild_per_update_ms':>22} "
+          f"{'update_us':>10} {'append_us':>10} {'proof_us':>9}")
+    for n in sizes:
+        hashes = [leaf(i) for i in range(n)]
+
+        start = time.perf_counter()
+        tree = MerkleTree.from_leaves(hashes)
+        t_build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for k in range(3):
+            hashes[k] = leaf(k, "rebuild")
+            compute_merkle_root(hashes)
+        t_rebuild = (time.perf_counter() - start) / 3
+
+        start = time.perf_counter()
+        for k in range(ops):
+            tree.update((k * 7919) % n, leaf(k, "update"))
+        t_update = (time.perf_counter() - start) / ops
+
+        start = time.perf_counter()
+        for k in range(ops):
+            tree.append(leaf(n + k))
+        t_append = (time.perf_counter() - start) / ops
+
+        start = time.perf_counter()
+        for k in range(ops):
+            idx = (k * 104729) % len(tree)
+            proof = tree.get_proof(idx)
+        t_proof = (time.perf_counter() - start) / ops
+        assert verify_merkle_proof(tree.leaves[idx], proof, tree.root, index=idx)
+
+        print(f"{n:>8} {t_build:>9.4f} {t_rebuild * 1e3:>22.2f} "
+              f"{t_update * 1e6:>10.1f} {t_append * 1e6:>10.1f} {t_proof * 1e6:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--ops", type=int, default=1000, help="Operations per measurement")
+    args = parser.parse_args()
+    run(args.sizes, args.ops)
+
+
+if __name__ == "__main__":
+    main()
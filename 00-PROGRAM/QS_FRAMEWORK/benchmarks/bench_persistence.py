@@ -0,0 +1,104 @@
+"""
+QS Field Persistence Benchmark
+
+Compares the JSON export (QSAPI.export_field, indent=2) with the columnar
+binary format (qs_store) for file size, write time, full load time and
+partial loads of a few score columns and a row range.
+
+Usage:
+    cd benchmarks
+    python bench_persistence.py --sizes 10000 200000 --params 20
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import qs_store
+from qs_api import QSAPI
+from qs_field import Candidate, QSField
+
+
+def build_field(n, params, seed=42):
+    """Frozen field of n candidates with a params-wide configuration."""
+    rng = random.Random(seed)
+    candidates = []
+    for i in range(n):
+        candidates.append(Candidate(
+            id=f"x_{i + 1}",
+            configuration={f"param_{p}": rng.uniform(0, 100) for p in range(params)},
+            utcs_manifest={"context": "bench", "ata": "57-10"},
+            score_vector={"performance": rng.random(), "cost": rng.random(), "aggregate": rng.random()},
+            uncertainty={"sigma_performance": rng.random() * 0.1},
+            bounds={"weight_kg": (1200.0, 1350.0 + rng.random())},
+            constraints_satisfied={"C0_safety": rng.random() > 0.1, "C1_cost": rng.random() > 0.2},
+            provenance={"generated_by": "bench", "seed": seed},
+        ))
+    field = QSField(
+        version="QS_BENCH_v1",
+        candidates=candidates,
+        scores=[c.score_vector["aggregate"] for c in candidates],
+        bounds={},
+        priors={},
+        constraints={},
+    )
+    field.freeze()
+    return field
+
+
+def timed(fn):
+    """Run fn once and return (result, seconds)."""
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def run(sizes, params, chunk_rows):
+    api = QSAPI()
+    print(f"{'n':>8} {'format':<12} {'size_mb':>8} {'write_s':>8} {'load_s':>8} "
+          f"{'3_cols_s':>9} {'1k_rows_s':>10}")
+    for n in sizes:
+        field = build_field(n, params)
+        columns = ["score_vector.performance", "score_vector.cost", "score_vector.aggregate"]
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = os.path.join(tmp, "field.json")
+            _, t_write = timed(lambda: api.export_field(field, json_path))
+            loaded, t_load = timed(lambda: api.import_field(json_path))
+            assert loaded.merkle_root == field.merkle_root
+            size = os.path.getsize(json_path) / 1e6
+            print(f"{n:>8} {'json':<12} {size:>8.1f} {t_write:>8.2f} {t_load:>8.2f} "
+                  f"{'-':>9} {'-':>10}")
+
+            for compression in ("zlib", None):
+                path = os.path.join(tmp, f"field_{compression}.qsf")
+                _, t_write = timed(lambda: qs_store.write_field(
+                    field, path, chunk_rows=chunk_rows, compression=compression
+                ))
+                loaded, t_load = timed(lambda: qs_store.read_field(path))
+                assert loaded.candidates == field.candidates
+                with qs_store.QSFieldReader(path) as reader:
+                    _, t_cols = timed(lambda: reader.read_columns(columns))
+                    middle = n // 2
+                    _, t_rows = timed(lambda: reader.read_candidates(middle, middle + 1000))
+                size = os.path.getsize(path) / 1e6
+                label = f"qsf-{compression or 'raw'}"
+                print(f"{n:>8} {label:<12} {size:>8.1f} {t_write:>8.2f} {t_load:>8.2f} "
+                      f"{t_cols:>9.3f} {t_rows:>10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 200000])
+    parser.add_argument("--params", type=int, default=20, help="Configuration parameters per candidate")
+    parser.add_argument("--chunk-rows", type=int, default=65536)
+    args = parser.parse_args()
+    run(args.sizes, args.params, args.chunk_rows)
+
+
+if __name__ == "__main__":
+    main()
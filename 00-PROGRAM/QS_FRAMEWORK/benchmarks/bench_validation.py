@@ -0,0 +1,158 @@
+"""
+Batch Validation Benchmark
+
+Compares a nightly-style loop (QSAPI.validate per measurement set and
+compute_coverage_metrics per field, using the original per-candidate
+code) with qs_validation.validate_fields on 1..N worker processes.
+
+Usage:
+    cd benchmarks
+    python bench_validation.py --fields 300 --candidates 5000 --sets 20 --workers 1 2 4 8
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import qs_validation
+from qs_field import Candidate, QSField
+
+
+def build_fields(count, n, seed=42):
+    """Build count fields of n random candidates."""
+    rng = random.Random(seed)
+    fields = []
+    for f in range(count):
+        candidates = []
+        for i in range(n):
+            weight = rng.uniform(900, 1500)
+            candidates.append(Candidate(
+                id=f"x_{i + 1}",
+                configuration={"param_1": rng.uniform(0, 100)},
+                utcs_manifest={},
+                score_vector={
+                    "weight_kg": weight,
+                    "cost_usd": rng.uniform(3e5, 6e5),
+                    "lead_time_days": rng.uniform(150, 250),
+                },
+                uncertainty={},
+                bounds={"weight_kg": (weight * 0.95, weight * 1.05)},
+                constraints_satisfied={
+                    "C0_safety": rng.random() > 0.1,
+                    "C1_cert": rng.random() > 0.05,
+                },
+                provenance={},
+            ))
+        fields.append(QSField(
+            version=f"QS_NIGHTLY_{f}",
+            candidates=candidates,
+            scores=[0.0] * n,
+            bounds={},
+            priors={},
+            constraints={},
+        ))
+    return fields
+
+
+def build_measurements(fields, sets, seed=7):
+    """sets measured candidates per field, with noisy outcomes."""
+    rng = random.Random(seed)
+    measurements = []
+    for field in fields:
+        pairs = []
+        for c in rng.sample(field.candidates, sets):
+            pairs.append((c.id, {
+                metric: value * rng.uniform(0.9, 1.1)
+                for metric, value in c.score_vector.items()
+            }))
+        measurements.append(pairs)
+    return measurements
+
+
+def legacy_validate(qs_field, x_star, actual_performance):
+    """Original QSAPI.validate: linear candidate search, then per-metric loops."""
+    candidate_idx = None
+    for idx, c in enumerate(qs_field.candidates):
+        if c.id == x_star.id:
+            candidate_idx = idx
+            break
+    if candidate_idx is None:
+        raise ValueError(f"Candidate {x_star.id} not found in QS field")
+    deltas = {}
+    for metric, actual_value in actual_performance.items():
+        predicted_value = x_star.score_vector.get(metric)
+        if predicted_value is not None:
+            delta = actual_value - predicted_value
+            deltas[metric] = {
+                "delta_pct": (delta / predicted_value * 100) if predicted_value != 0 else 0.0,
+            }
+    bounds_violations = {}
+    for metric, actual_value in actual_performance.items():
+        if metric in x_star.bounds:
+            lower, upper = x_star.bounds[metric]
+            if not (lower <= actual_value <= upper):
+                bounds_violations[metric] = actual_value
+    squared_errors = [d["delta_pct"] ** 2 for d in deltas.values()]
+    return math.sqrt(sum(squared_errors) / len(squared_errors)) if squared_errors else 0.0
+
+
+def legacy_coverage(qs_field):
+    """Original three-pass compute_coverage_metrics."""
+    candidates = qs_field.candidates
+    feasible = sum(1 for c in candidates if all(c.constraints_satisfied.values()))
+    total = sum(len(c.constraints_satisfied) for c in candidates)
+    satisfied = sum(sum(c.constraints_satisfied.values()) for c in candidates)
+    return feasible / len(candidates), satisfied / total if total else 0.0
+
+
+def legacy_run(fields, measurements):
+    rmse = []
+    for field, pairs in zip(fields, measurements):
+        for candidate_id, actual in pairs:
+            x_star = next(c for c in field.candidates if c.id == candidate_id)
+            rmse.append(legacy_validate(field, x_star, actual))
+        legacy_coverage(field)
+    return rmse
+
+
+def timed(fn):
+    """Run fn once and return (result, seconds)."""
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def run(num_fields, n, sets, workers):
+    print(f"building {num_fields} fields x {n} candidates, {sets} measurement sets each "
+          f"({os.cpu_count()} CPUs)")
+    fields = build_fields(num_fields, n)
+    measurements = build_measurements(fields, sets)
+
+    legacy_rmse, t_legacy = timed(lambda: legacy_run(fields, measurements))
+    print(f"{'mode':<14} {'seconds':>9} {'speedup':>8}")
+    print(f"{'per-call':<14} {t_legacy:>9.3f} {'1.0x':>8}")
+
+    for count in workers:
+        report, t = timed(lambda: qs_validation.validate_fields(fields, measurements, workers=count))
+        batch_rmse = [v["metrics"]["rmse_pct"] for r in report["fields"] for v in r["validations"]]
+        assert batch_rmse == legacy_rmse
+        print(f"{f'batch w={count}':<14} {t:>9.3f} {t_legacy / t:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fields", type=int, default=300)
+    parser.add_argument("--candidates", type=int, default=5000)
+    parser.add_argument("--sets", type=int, default=20, help="Measurement sets per field")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+    run(args.fields, args.candidates, args.sets, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,11 +13,19 @@ __status__ = "Canonical"
 
 from .qs_field import Candidate, QSField
 from .qs_api import QSAPI
-from .merkle import compute_merkle_root
+from .merkle import compute_merkle_root, verify_merkle_proof, MerkleTree
+from .qs_store import QSFieldReader, read_field, write_field
+from .qs_history import FieldHistory
 
 __all__ = [
     "Candidate",
     "QSField",
     "QSAPI",
     "compute_merkle_root",
+    "verify_merkle_proof",
+    "MerkleTree",
+    "QSFieldReader",
+    "read_field",
+    "write_field",
+    "FieldHistory",
 ]
@@ -0,0 +1,157 @@
+"""
+Canonical Binary Encoding for Content Hashing
+
+Encodes JSON-like values (None, bool, int, float, str, bytes, lists,
+tuples and dicts) into a unique byte string, so that equal content always
+hashes to the same digest regardless of dict insertion order, and values
+that JSON would conflate or render differently across versions
+(1 vs 1.0 vs True, float formatting) stay distinct and stable.
+
+Encoding (scheme version 1):
+    None        b"N"
+    bool        b"T" / b"F"
+    int         b"i" + length + ASCII decimal
+    float       b"f" + IEEE 754 big-endian double (NaN canonicalized)
+    str         b"s" + length + UTF-8
+    bytes       b"b" + length + raw bytes
+    list/tuple  b"l" + count + items
+    dict        b"d" + count + (key, value) pairs sorted by key, keys
+                converted to strings as json.dumps would
+
+Lengths and counts are unsigned 32-bit big-endian. The scheme is frozen:
+digests computed today must be reproducible by future releases, so any
+change needs a new SCHEME_VERSION rather than an edit.
+"""
+
+import hashlib
+import struct
+from operator import itemgetter
+from typing import Any, Dict, List
+
+SCHEME_VERSION = 1
+
+_U32 = struct.Struct(">I").pack
+_F64 = struct.Struct(">d").pack
+_NAN = b"f" + _F64(float("nan"))
+_FIRST = itemgetter(0)
+
+# Dict keys repeat across candidates (parameter and metric names), so their
+# encodings are memoized up to a bound
+_KEY_CACHE: Dict[str, bytes] = {}
+_KEY_CACHE_MAX = 65536
+
+
+def _json_key(key: Any) -> str:
+    """Dict key as json.dumps would write it, so JSON round trips keep digests."""
+    if isinstance(key, str):
+        return str.__str__(key)
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, float):
+        return float.__repr__(key)
+    if isinstance(key, int):
+        return int.__repr__(key)
+    raise TypeError(f"Keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+def _encode_str(value: str) -> bytes:
+    data = value.encode("utf-8")
+    return b"s" + _U32(len(data)) + data
+
+
+def _encode_key(key: str) -> bytes:
+    encoded = _KEY_CACHE.get(key)
+    if encoded is None:
+        encoded = _encode_str(key)
+        if len(_KEY_CACHE) < _KEY_CACHE_MAX:
+            _KEY_CACHE[key] = encoded
+    return encoded
+
+
+def _encode_float(value: float) -> bytes:
+    return b"f" + _F64(value) if value == value else _NAN
+
+
+def _encode_int(value: int) -> bytes:
+    data = str(value).encode("ascii")
+    return b"i" + _U32(len(data)) + data
+
+
+def _encode_bytes(value: bytes) -> bytes:
+    return b"b" + _U32(len(value)) + value
+
+
+_SCALARS = {
+    str: _encode_str,
+    float: _encode_float,
+    bool: lambda value: b"T" if value else b"F",
+    int: _encode_int,
+    type(None): lambda value: b"N",
+    bytes: _encode_bytes,
+}
+
+
+def _sorted_items(value: dict) -> List:
+    """Items sorted by string key; keys are unique, so values never compare."""
+    for key in value:
+        if type(key) is not str:
+            break
+    else:
+        return sorted(value.items(), key=_FIRST)
+
+    items = sorted(((_json_key(k), v) for k, v in value.items()), key=_FIRST)
+    for (key, _), (previous, _) in zip(items[1:], items):
+        if key == previous:
+            raise ValueError(f"Duplicate key after string conversion: {key!r}")
+    return items
+
+
+def _encode_into(value: Any, out: List[bytes]):
+    scalar = _SCALARS.get(type(value))
+    if scalar is not None:
+        out.append(scalar(value))
+        return
+
+    kind = type(value)
+    append = out.append
+    if kind is dict:
+        append(b"d" + _U32(len(value)))
+        for key, item in _sorted_items(value):
+            append(_encode_key(key))
+            # Scalars inline: most section values are flat
+            scalar = _SCALARS.get(type(item))
+            if scalar is not None:
+                append(scalar(item))
+            else:
+                _encode_into(item, out)
+    elif kind is list or kind is tuple:
+        append(b"l" + _U32(len(value)))
+        for item in value:
+            scalar = _SCALARS.get(type(item))
+            if scalar is not None:
+                append(scalar(item))
+            else:
+                _encode_into(item, out)
+    else:
+        # Subclasses (str/int enums, named tuples, OrderedDict) encode as their base type
+        for base in (str, float, int, dict, list, tuple, bytes):
+            if isinstance(value, base):
+                _encode_into(base(value), out)
+                return
+        raise TypeError(f"Object of type {kind.__name__} has no canonical encoding")
+
+
+def canonical_encode(value: Any) -> bytes:
+    """Canonical binary encoding of a JSON-like value."""
+    out: List[bytes] = []
+    _encode_into(value, out)
+    return b"".join(out)
+
+
+def canonical_digest(value: Any) -> bytes:
+    """SHA-256 digest of the canonical encoding."""
+    return hashlib.sha256(canonical_encode(value)).digest()
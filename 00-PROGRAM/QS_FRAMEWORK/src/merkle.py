@@ -5,7 +5,7 @@ Provides cryptographic proof of field completeness and tamper-evidence.
 """
 
 import hashlib
-from typing import List
+from typing import Any, Dict, List, Optional
 
 
 def compute_merkle_root(hashes: List[str]) -> str:
@@ -41,25 +41,198 @@ def compute_merkle_root(hashes: List[str]) -> str:
     return compute_merkle_root(next_level)
 
 
-def verify_merkle_proof(leaf_hash: str, proof: List[str], root: str) -> bool:
+def _hash_pair(left: str, right: str) -> str:
+    """Hash two child nodes into their parent node."""
+    return hashlib.sha256((left + right).encode()).hexdigest()
+
+
+def verify_merkle_proof(
+    leaf_hash: str,
+    proof: List[str],
+    root: str,
+    index: Optional[int] = None,
+) -> bool:
     """
     Verify that a leaf hash is part of a Merkle tree with the given root.
     
+    Without an index, sibling pairs are combined in sorted order. With the
+    leaf index, pairs are combined by position, which matches the roots
+    produced by compute_merkle_root and MerkleTree.
+    
     Args:
         leaf_hash: Hash of the leaf to verify
         proof: List of sibling hashes from leaf to root
         root: Expected Merkle root
+        index: Position of the leaf in the tree (optional)
         
     Returns:
         True if verification succeeds, False otherwise
     """
     current = leaf_hash
     for sibling in proof:
+        if index is not None:
+            # Combine by position: even index is the left child
+            if index % 2 == 0:
+                combined = _hash_pair(current, sibling)
+            else:
+                combined = _hash_pair(sibling, current)
+            index //= 2
         # Combine in sorted order to ensure deterministic results
-        if current <= sibling:
-            combined = hashlib.sha256((current + sibling).encode()).hexdigest()
+        elif current <= sibling:
+            combined = _hash_pair(current, sibling)
         else:
-            combined = hashlib.sha256((sibling + current).encode()).hexdigest()
+            combined = _hash_pair(sibling, current)
         current = combined
     
     return current == root
+
+
+class MerkleTree:
+    """
+    Persistent Merkle tree with incremental updates.
+    
+    Stores every level of the tree so that appending or updating a leaf
+    only rehashes the path to the root (O(log n)). Roots are identical to
+    compute_merkle_root over the same leaves: odd nodes are paired with
+    themselves and a single leaf is its own root.
+    
+    Example:
+        >>> tree = MerkleTree.from_leaves(["abc...", "def..."])
+        >>> tree.append("ghi...")
+        >>> proof = tree.get_proof(2)
+        >>> verify_merkle_proof("ghi...", proof, tree.root, index=2)
+        True
+    """
+    
+    def __init__(self, levels: Optional[List[List[str]]] = None):
+        """
+        Initialize tree from precomputed levels.
+        
+        Args:
+            levels: Levels from leaves (index 0) to root, as produced by to_dict
+        """
+        self.levels: List[List[str]] = levels if levels else [[]]
+    
+    @classmethod
+    def from_leaves(cls, leaves: List[str]) -> 'MerkleTree':
+        """Build a tree from leaf hashes in O(n)."""
+        levels = [list(leaves)]
+        while len(levels[-1]) > 1:
+            level = levels[-1]
+            levels.append([
+                _hash_pair(level[i], level[i + 1] if i + 1 < len(level) else level[i])
+                for i in range(0, len(level), 2)
+            ])
+        return cls(levels)
+    
+    @property
+    def leaves(self) -> List[str]:
+        """Leaf hashes in insertion order."""
+        return self.levels[0]
+    
+    @property
+    def root(self) -> str:
+        """Merkle root hash as hex string."""
+        if not self.levels[0]:
+            return hashlib.sha256(b"").hexdigest()
+        return self.levels[-1][0]
+    
+    def __len__(self) -> int:
+        return len(self.levels[0])
+    
+    def append(self, leaf_hash: str) -> str:
+        """
+        Append a leaf and rehash its path to the root.
+        
+        Args:
+            leaf_hash: Hash of the new leaf
+            
+        Returns:
+            New Merkle root
+        """
+        self.levels[0].append(leaf_hash)
+        self._rehash_path(len(self.levels[0]) - 1)
+        return self.root
+    
+    def update(self, index: int, leaf_hash: str) -> str:
+        """
+        Replace the leaf at index and rehash its path to the root.
+        
+        Args:
+            index: Position of the leaf
+            leaf_hash: New hash for the leaf
+            
+        Returns:
+            New Merkle root
+            
+        Raises:
+            IndexError: If index is out of range
+        """
+        if not 0 <= index < len(self.levels[0]):
+            raise IndexError(f"Leaf index {index} out of range")
+        if self.levels[0][index] != leaf_hash:
+            self.levels[0][index] = leaf_hash
+            self._rehash_path(index)
+        return self.root
+    
+    def get_proof(self, index: int) -> List[str]:
+        """
+        Generate an inclusion proof for the leaf at index.
+        
+        The proof is accepted by verify_merkle_proof when called with the
+        same index.
+        
+        Args:
+            index: Position of the leaf
+            
+        Returns:
+            List of sibling hashes from leaf to root
+            
+        Raises:
+            IndexError: If index is out of range
+        """
+        if not 0 <= index < len(self.levels[0]):
+            raise IndexError(f"Leaf index {index} out of range")
+        
+        proof = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            proof.append(level[sibling] if sibling < len(level) else level[index])
+            index //= 2
+        return proof
+    
+    def _rehash_path(self, index: int):
+        """Recompute parents of the node at index up to the root."""
+        depth = 0
+        while len(self.levels[depth]) > 1:
+            level = self.levels[depth]
+            left = index & ~1
+            right = left + 1 if left + 1 < len(level) else left
+            parent = _hash_pair(level[left], level[right])
+            
+            if depth + 1 == len(self.levels):
+                self.levels.append([])
+            parents = self.levels[depth + 1]
+            index //= 2
+            if index < len(parents):
+                parents[index] = parent
+            else:
+                parents.append(parent)
+            depth += 1
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary representation."""
+        return {"root": self.root, "levels": [list(level) for level in self.levels]}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MerkleTree':
+        """
+        Reload tree from dictionary without rehashing.
+        
+        Raises:
+            ValueError: If the stored root does not match the stored levels
+        """
+        tree = cls([list(level) for level in data["levels"]])
+        if "root" in data and data["root"] != tree.root:
+            raise ValueError("Merkle tree root does not match stored levels")
+        return tree
@@ -10,14 +10,19 @@ API for managing Quantum Superposition field lifecycle including:
 
 from typing import Dict, Any, List, Optional, Tuple, Callable
 import random
-import math
 from datetime import datetime
 
 # Import qs_field module - handle both package and standalone imports
 try:
     from .qs_field import Candidate, QSField
+    from .qs_history import FieldHistory
+    from . import qs_store
+    from . import qs_validation
 except ImportError:
     import qs_field
+    import qs_store
+    import qs_validation
+    from qs_history import FieldHistory
     Candidate = qs_field.Candidate
     QSField = qs_field.QSField
 
@@ -34,10 +39,17 @@ class QSAPI:
     - Validating predictions against actual outcomes
     """
     
-    def __init__(self):
-        """Initialize QS API."""
+    def __init__(self, *, history: Optional[FieldHistory] = None):
+        """
+        Initialize QS API.
+        
+        Args:
+            history: History store for created, updated, frozen and
+                collapsed fields (default: FieldHistory() with its
+                default retention bounds)
+        """
         self.version = "2.0.0"
-        self._field_history: List[QSField] = []
+        self.history = history if history is not None else FieldHistory()
     
     def create(
         self,
@@ -110,7 +122,7 @@ class QSAPI:
             metadata=metadata,
         )
         
-        self._field_history.append(qs_field)
+        self.history.record(qs_field, event="create")
         return qs_field
     
     def update_evidence(
@@ -173,7 +185,7 @@ class QSAPI:
             },
         )
         
-        self._field_history.append(new_qs_field)
+        self.history.record(new_qs_field, event="update")
         return new_qs_field
     
     def freeze(self, qs_field: QSField) -> str:
@@ -190,7 +202,9 @@ class QSAPI:
             >>> merkle_root = api.freeze(qs_field)
             >>> print(f"Frozen with root: {merkle_root}")
         """
-        return qs_field.freeze()
+        merkle_root = qs_field.freeze()
+        self.history.record(qs_field, event="freeze")
+        return merkle_root
     
     def collapse(
         self,
@@ -215,7 +229,12 @@ class QSAPI:
             ... }
             >>> x_star, collapse_record = api.collapse(qs_field, criteria)
         """
-        return qs_field.collapse(criteria)
+        x_star, collapse_record = qs_field.collapse(criteria)
+        self.history.record(qs_field, event="collapse", detail={
+            "selected_candidate": x_star.id,
+            "collapse_hash": collapse_record["collapse_hash"],
+        })
+        return x_star, collapse_record
     
     def validate(
         self,
@@ -242,66 +261,47 @@ class QSAPI:
             ... }
             >>> validation = api.validate(qs_field, x_star, actual)
         """
-        # Find the candidate in the field
-        candidate_idx = None
-        for idx, c in enumerate(qs_field.candidates):
-            if c.id == x_star.id:
-                candidate_idx = idx
-                break
-        
-        if candidate_idx is None:
+        if qs_field.get_candidate_by_id(x_star.id) is None:
             raise ValueError(f"Candidate {x_star.id} not found in QS field")
         
-        # Compute deltas
-        deltas = {}
-        for metric, actual_value in actual_performance.items():
-            predicted_value = x_star.score_vector.get(metric)
-            if predicted_value is not None:
-                delta = actual_value - predicted_value
-                delta_pct = (delta / predicted_value * 100) if predicted_value != 0 else 0.0
-                deltas[metric] = {
-                    "predicted": predicted_value,
-                    "actual": actual_value,
-                    "delta": delta,
-                    "delta_pct": delta_pct,
-                }
-        
-        # Check if actual values are within predicted bounds
-        bounds_violations = {}
-        for metric, actual_value in actual_performance.items():
-            if metric in x_star.bounds:
-                lower, upper = x_star.bounds[metric]
-                if not (lower <= actual_value <= upper):
-                    bounds_violations[metric] = {
-                        "actual": actual_value,
-                        "bounds": [lower, upper],
-                        "violation": "below" if actual_value < lower else "above",
-                    }
-        
-        # Compute RMSE across all metrics
-        squared_errors = []
-        for metric, delta_info in deltas.items():
-            if "delta_pct" in delta_info:
-                squared_errors.append(delta_info["delta_pct"] ** 2)
-        
-        rmse = math.sqrt(sum(squared_errors) / len(squared_errors)) if squared_errors else 0.0
-        
-        # Generate validation report
-        validation_report = {
-            "qs_version": qs_field.version,
-            "candidate_id": x_star.id,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "deltas": deltas,
-            "bounds_violations": bounds_violations,
-            "metrics": {
-                "rmse_pct": rmse,
-                "within_bounds": len(bounds_violations) == 0,
-                "prediction_accuracy": 100.0 - rmse if rmse < 100 else 0.0,
-            },
-            "recommendation": self._generate_recommendation(rmse, bounds_violations),
-        }
+        return qs_validation.validation_report(
+            qs_field.version,
+            x_star,
+            actual_performance,
+            datetime.utcnow().isoformat() + "Z",
+        )
+    
+    def validate_batch(
+        self,
+        fields: List[QSField],
+        measurements: List[Any],
+        *,
+        workers: Optional[int] = 1,
+        coverage: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Validate many QS fields against their measurement sets at once.
+        
+        Args:
+            fields: QS fields to validate
+            measurements: One entry per field: {candidate_id: actual_performance},
+                a list of (candidate_id, actual_performance) pairs, or None
+            workers: Worker processes; 1 runs in this process, None uses every CPU
+            coverage: Also compute coverage metrics per field
         
-        return validation_report
+        Returns:
+            Consolidated report: one entry per field with validate() reports
+            and coverage, plus a summary across all fields
+            
+        Example:
+            >>> report = api.validate_batch(
+            ...     nightly_fields,
+            ...     [{"x_12": actual} for actual in nightly_measurements],
+            ...     workers=8,
+            ... )
+            >>> report["summary"]["rmse_pct"]["p95"]
+        """
+        return qs_validation.validate_fields(fields, measurements, workers=workers, coverage=coverage)
     
     def _default_candidate_generation(
         self,
@@ -439,17 +439,14 @@ class QSAPI:
             "aggregate": candidate.score_vector["aggregate"] * random.uniform(0.95, 1.05),
         }
         
-        return Candidate(
-            id=candidate.id,
-            configuration=candidate.configuration,
+        # Only the evidence-bearing sections change; the rest keep their
+        # cached digests
+        return candidate.evolve(
             utcs_manifest={
                 **candidate.utcs_manifest,
                 "evidence_update": new_evidence.get("description", "Updated"),
             },
             score_vector=updated_score_vector,
-            uncertainty=candidate.uncertainty,
-            bounds=candidate.bounds,
-            constraints_satisfied=candidate.constraints_satisfied,
             provenance={
                 **candidate.provenance,
                 "updated_timestamp": datetime.utcnow().isoformat() + "Z",
@@ -474,27 +471,43 @@ class QSAPI:
         bounds_violations: Dict[str, Any]
     ) -> str:
         """Generate recommendation based on validation results."""
-        if rmse < 5.0 and not bounds_violations:
-            return "Excellent prediction accuracy. Model is performing well."
-        elif rmse < 10.0 and not bounds_violations:
-            return "Good prediction accuracy. Minor improvements possible."
-        elif rmse < 15.0 or (bounds_violations and len(bounds_violations) <= 2):
-            return "Moderate prediction accuracy. Consider model refinement."
-        else:
-            return "Poor prediction accuracy. Model requires significant refinement or retraining."
+        return qs_validation.recommendation(rmse, bounds_violations)
     
     def get_field_history(self) -> List[QSField]:
-        """Get history of all QS fields created in this session."""
-        return self._field_history.copy()
+        """
+        Reconstruct every retained history entry, oldest first.
+        
+        Each entry is rebuilt from its snapshot and deltas; use
+        self.history.entries() and self.history.get(entry_id) to list
+        entries and load single versions.
+        """
+        return [self.history.get(entry["id"]) for entry in self.history.entries()]
     
-    def export_field(self, qs_field: QSField, filepath: str):
-        """Export QS field to JSON file."""
+    def export_field(self, qs_field: QSField, filepath: str, *, format: str = "json"):
+        """
+        Export QS field to a file.
+        
+        Args:
+            qs_field: Field to export
+            filepath: Output path
+            format: "json" (indented JSON) or "binary" (columnar format,
+                see qs_store; much smaller and faster to load)
+        """
+        if format == "binary":
+            qs_store.write_field(qs_field, filepath)
+            return
+        if format != "json":
+            raise ValueError(f"Unknown export format: {format}")
         import json
         with open(filepath, 'w') as f:
             json.dump(qs_field.to_dict(), f, indent=2)
     
     def import_field(self, filepath: str) -> QSField:
-        """Import QS field from JSON file."""
+        """Import QS field from a JSON or binary columnar file."""
+        with open(filepath, 'rb') as f:
+            binary = f.read(len(qs_store.MAGIC)) == qs_store.MAGIC
+        if binary:
+            return qs_store.read_field(filepath)
         import json
         with open(filepath, 'r') as f:
             data = json.load(f)
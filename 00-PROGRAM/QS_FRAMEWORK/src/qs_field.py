@@ -4,7 +4,7 @@ QS Field Data Structures
 Core data structures for Quantum Superposition fields and candidates.
 """
 
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, asdict, replace
 from typing import List, Dict, Optional, Any, Tuple
 import hashlib
 import json
@@ -12,14 +12,43 @@ from datetime import datetime
 
 # Import merkle module - handle both package and standalone imports
 try:
-    from .merkle import compute_merkle_root
+    from .merkle import MerkleTree
+    from . import qs_batch
+    from .canonical import canonical_digest, canonical_encode
+    from .qs_index import CandidateIndex
 except ImportError:
     import merkle
-    compute_merkle_root = merkle.compute_merkle_root
+    import qs_batch
+    from qs_index import CandidateIndex
+    from canonical import canonical_digest, canonical_encode
+    MerkleTree = merkle.MerkleTree
 
 
-def _compute_hash(data: Dict) -> str:
-    """Compute SHA-256 hash of data dictionary."""
+# Candidate fields covered by the content hash, in digest order
+HASH_SECTIONS = (
+    "id",
+    "configuration",
+    "utcs_manifest",
+    "score_vector",
+    "uncertainty",
+    "bounds",
+    "constraints_satisfied",
+    "provenance",
+)
+
+_HASH_DOMAIN = b"QS-CANDIDATE-v1"
+_SECTION_TAGS = tuple((name, canonical_encode(name)) for name in HASH_SECTIONS)
+
+# Hash scheme of Candidate.hash; recorded in exports
+HASH_SCHEME = "canonical-v1"
+# Scheme of releases before the canonical encoding: SHA-256 of the sorted,
+# compact JSON of the hashed sections. Exports without a scheme use it.
+LEGACY_HASH_SCHEME = "json-v0"
+
+
+def legacy_candidate_hash(candidate: 'Candidate') -> str:
+    """Candidate hash under LEGACY_HASH_SCHEME."""
+    data = {name: getattr(candidate, name) for name in HASH_SECTIONS}
     json_str = json.dumps(data, sort_keys=True, separators=(',', ':'))
     return hashlib.sha256(json_str.encode()).hexdigest()
 
@@ -29,6 +58,12 @@ class Candidate:
     """
     A single candidate configuration in the QS field.
     
+    The hash is computed on first access over the canonical binary encoding
+    (see canonical.py) and cached. Each section (field) has its own cached
+    digest, and the candidate hash is the SHA-256 of the section digests,
+    so reassigning one field only re-encodes that field. In-place mutation
+    of a field's dict is not detected; call invalidate_hash() afterwards.
+    
     Attributes:
         id: Unique identifier for this candidate
         configuration: Design parameters and settings
@@ -38,7 +73,7 @@ class Candidate:
         bounds: Parameter bounds (lower, upper) for each metric
         constraints_satisfied: Boolean flags for hard constraints
         provenance: Generation metadata and evidence references
-        hash: SHA-256 hash of this candidate
+        hash: SHA-256 hash of this candidate (lazy, read-only)
     """
     id: str
     configuration: Dict[str, Any]
@@ -48,35 +83,75 @@ class Candidate:
     bounds: Dict[str, Tuple[float, float]]
     constraints_satisfied: Dict[str, bool]
     provenance: Dict[str, Any]
-    hash: str = field(default="", init=False)
     
     def __post_init__(self):
-        """Compute hash after initialization."""
-        self._compute_hash()
+        """Reset cached digests; the hash is computed on first access."""
+        self.invalidate_hash()
+    
+    def __setattr__(self, name: str, value: Any):
+        object.__setattr__(self, name, value)
+        if name in HASH_SECTIONS and "_digests" in self.__dict__:
+            self.invalidate_hash(name)
+    
+    @property
+    def hash(self) -> str:
+        """SHA-256 hex digest of this candidate's content."""
+        if self._hash is None:
+            self._compute_hash()
+        return self._hash
+    
+    def invalidate_hash(self, *sections: str):
+        """
+        Drop cached digests for the given sections (all when none given).
+        
+        Needed only after mutating a field in place; reassigning a field
+        invalidates its section automatically.
+        """
+        if sections and "_digests" in self.__dict__:
+            for name in sections:
+                if name not in HASH_SECTIONS:
+                    raise ValueError(f"Unknown hash section: {name}")
+                self._digests.pop(name, None)
+        else:
+            object.__setattr__(self, "_digests", {})
+        object.__setattr__(self, "_hash", None)
     
     def _compute_hash(self):
-        """Compute/recompute hash for this candidate."""
-        data = {
-            "id": self.id,
-            "configuration": self.configuration,
-            "utcs_manifest": self.utcs_manifest,
-            "score_vector": self.score_vector,
-            "uncertainty": self.uncertainty,
-            "bounds": self.bounds,
-            "constraints_satisfied": self.constraints_satisfied,
-            "provenance": self.provenance,
-        }
-        self.hash = _compute_hash(data)
+        """Compute the hash, re-encoding only sections without a cached digest."""
+        digests = self._digests
+        hasher = hashlib.sha256(_HASH_DOMAIN)
+        for name, tag in _SECTION_TAGS:
+            digest = digests.get(name)
+            if digest is None:
+                digest = digests[name] = canonical_digest(getattr(self, name))
+            hasher.update(tag)
+            hasher.update(digest)
+        object.__setattr__(self, "_hash", hasher.hexdigest())
+    
+    def evolve(self, **changes: Any) -> 'Candidate':
+        """
+        Copy with some fields replaced, reusing cached digests of the rest.
+        
+        Unchanged fields are shared with this candidate, not copied.
+        """
+        updated = replace(self, **changes)
+        for name, digest in self._digests.items():
+            if name not in changes:
+                updated._digests[name] = digest
+        return updated
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary representation."""
-        return asdict(self)
+        data = asdict(self)
+        data["hash"] = self.hash
+        data["hash_scheme"] = HASH_SCHEME
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Candidate':
         """Create Candidate from dictionary."""
         # Remove hash if present - it will be recomputed
-        data_copy = {k: v for k, v in data.items() if k != 'hash'}
+        data_copy = {k: v for k, v in data.items() if k not in ('hash', 'hash_scheme')}
         return cls(**data_copy)
 
 
@@ -99,6 +174,8 @@ class QSField:
         timestamp: ISO 8601 timestamp of field creation/freeze
         frozen: Whether this field is frozen (immutable)
         metadata: Additional metadata (problem description, etc.)
+        hash_scheme: Candidate hash scheme the Merkle root was built with;
+            LEGACY_HASH_SCHEME for fields exported by earlier releases
     """
     version: str
     candidates: List[Candidate]
@@ -110,6 +187,13 @@ class QSField:
     timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat() + "Z")
     frozen: bool = False
     metadata: Dict[str, Any] = field(default_factory=dict)
+    hash_scheme: str = HASH_SCHEME
+    _merkle_tree: Optional[MerkleTree] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _index: Optional[CandidateIndex] = field(
+        default=None, init=False, repr=False, compare=False
+    )
     
     def freeze(self) -> str:
         """
@@ -126,8 +210,9 @@ class QSField:
         if self.frozen:
             raise ValueError("QS field is already frozen")
         
-        hashes = [c.hash for c in self.candidates]
-        self.merkle_root = compute_merkle_root(hashes)
+        self.hash_scheme = HASH_SCHEME
+        self._merkle_tree = MerkleTree.from_leaves([c.hash for c in self.candidates])
+        self.merkle_root = self._merkle_tree.root
         self.frozen = True
         self.timestamp = datetime.utcnow().isoformat() + "Z"
         return self.merkle_root
@@ -148,11 +233,13 @@ class QSField:
         if not self.frozen:
             raise ValueError("QS must be frozen before collapse")
         
-        # Evaluate J_K(x) for each candidate
-        scores_K = [self._evaluate_criteria(c, criteria) for c in self.candidates]
+        # Evaluate J_K(x) for all candidates in columnar form
+        scores_K = qs_batch.evaluate_criteria_batch(
+            self.candidates, criteria, self._evaluate_criteria
+        )
         
         # Select best candidate (minimize objective)
-        idx_star = min(range(len(scores_K)), key=lambda i: scores_K[i])
+        idx_star = qs_batch.argmin(scores_K)
         x_star = self.candidates[idx_star]
         
         # Record collapse event
@@ -247,110 +334,208 @@ class QSField:
             "timestamp": self.timestamp,
             "frozen": self.frozen,
             "metadata": self.metadata,
+            "hash_scheme": self.hash_scheme,
         }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'QSField':
-        """Create QSField from dictionary."""
+        """
+        Create QSField from dictionary.
+        
+        Dictionaries without a hash_scheme come from earlier releases and
+        are verified under LEGACY_HASH_SCHEME.
+        
+        Raises:
+            ValueError: If the hash scheme is unknown
+        """
+        hash_scheme = data.pop("hash_scheme", LEGACY_HASH_SCHEME)
+        if hash_scheme not in (HASH_SCHEME, LEGACY_HASH_SCHEME):
+            raise ValueError(f"Unknown hash scheme: {hash_scheme}")
         candidates = [Candidate.from_dict(c) for c in data.pop("candidates", [])]
-        return cls(candidates=candidates, **data)
+        return cls(candidates=candidates, hash_scheme=hash_scheme, **data)
     
     def validate_integrity(self) -> bool:
         """
         Validate Merkle root matches current candidates.
         
+        The tree built at freeze time is kept, so only leaves whose candidate
+        hash changed are rehashed up to the root.
+        
         Returns:
             True if integrity check passes, False otherwise
         """
         if not self.frozen:
             return True  # Unfrozen fields don't have integrity constraints
         
-        hashes = [c.hash for c in self.candidates]
-        computed_root = compute_merkle_root(hashes)
-        return computed_root == self.merkle_root
+        tree = self._get_merkle_tree()
+        for i, c in enumerate(self.candidates):
+            leaf = self._leaf_hash(c)
+            if tree.leaves[i] != leaf:
+                tree.update(i, leaf)
+        return tree.root == self.merkle_root
+    
+    def upgrade_hash_scheme(self) -> str:
+        """
+        Re-root a field from an earlier release under the current hash scheme.
+        
+        A frozen field must pass validate_integrity under its recorded
+        scheme first; its Merkle root is then rebuilt from Candidate.hash.
+        
+        Returns:
+            Merkle root ("" for unfrozen fields)
+            
+        Raises:
+            ValueError: If the field fails its integrity check
+        """
+        if self.hash_scheme == HASH_SCHEME:
+            return self.merkle_root
+        if self.frozen:
+            if not self.validate_integrity():
+                raise ValueError(f"QS field failed integrity check under hash scheme {self.hash_scheme}")
+            self._merkle_tree = MerkleTree.from_leaves([c.hash for c in self.candidates])
+            self.merkle_root = self._merkle_tree.root
+        self.hash_scheme = HASH_SCHEME
+        return self.merkle_root
+    
+    def _leaf_hash(self, candidate: Candidate) -> str:
+        """Merkle leaf of a candidate under this field's hash scheme."""
+        if self.hash_scheme == HASH_SCHEME:
+            return candidate.hash
+        if self.hash_scheme == LEGACY_HASH_SCHEME:
+            return legacy_candidate_hash(candidate)
+        raise ValueError(f"Unknown hash scheme: {self.hash_scheme}")
+    
+    def get_inclusion_proof(self, candidate_id: str) -> Tuple[int, List[str]]:
+        """
+        Generate a Merkle inclusion proof for a candidate.
+        
+        Verify with verify_merkle_proof(candidate.hash, proof, merkle_root, index);
+        for LEGACY_HASH_SCHEME fields use legacy_candidate_hash(candidate).
+        
+        Args:
+            candidate_id: ID of the candidate to prove
+            
+        Returns:
+            Tuple of (leaf_index, proof)
+            
+        Raises:
+            ValueError: If field is not frozen or candidate is not found
+        """
+        if not self.frozen:
+            raise ValueError("QS must be frozen before generating proofs")
+        
+        index = self._position(candidate_id)
+        if index is None:
+            raise ValueError(f"Candidate {candidate_id} not found in QS field")
+        return index, self._get_merkle_tree().get_proof(index)
+    
+    def _get_merkle_tree(self) -> MerkleTree:
+        """Return the cached Merkle tree, rebuilding it if candidates were added or removed."""
+        if self._merkle_tree is None or len(self._merkle_tree) != len(self.candidates):
+            self._merkle_tree = MerkleTree.from_leaves([self._leaf_hash(c) for c in self.candidates])
+        return self._merkle_tree
     
     def get_pareto_frontier(self, objectives: List[str]) -> List[Candidate]:
         """
         Get Pareto-optimal candidates for specified objectives.
         
+        All objectives are minimized; missing objectives count as +inf.
+        Candidates are returned in field order.
+        
         Args:
             objectives: List of objective names from score_vector to consider
             
         Returns:
             List of non-dominated candidates
         """
-        pareto_set = []
-        
-        for candidate in self.candidates:
-            is_dominated = False
-            for other in self.candidates:
-                if candidate.id == other.id:
-                    continue
-                
-                # Check if 'other' dominates 'candidate'
-                dominates = True
-                strictly_better_in_one = False
-                
-                for obj in objectives:
-                    cand_score = candidate.score_vector.get(obj, float('inf'))
-                    other_score = other.score_vector.get(obj, float('inf'))
-                    
-                    # Assuming minimization (lower is better)
-                    if other_score > cand_score:
-                        dominates = False
-                        break
-                    if other_score < cand_score:
-                        strictly_better_in_one = True
-                
-                if dominates and strictly_better_in_one:
-                    is_dominated = True
-                    break
-            
-            if not is_dominated:
-                pareto_set.append(candidate)
+        if not objectives:
+            return list(self.candidates)
         
-        return pareto_set
+        columns = qs_batch.score_columns(self.candidates, objectives)
+        return [self.candidates[i] for i in qs_batch.pareto_front_indices(columns)]
+    
+    def _get_index(self) -> CandidateIndex:
+        """Return the cached candidate index, rebuilding it if candidates were added or removed."""
+        index = self._index
+        if index is None or index.candidates is not self.candidates or index.size != len(self.candidates):
+            index = self._index = CandidateIndex(self.candidates)
+        return index
+    
+    def reindex(self):
+        """Drop cached indexes after editing candidates in place."""
+        self._index = None
+    
+    def _position(self, candidate_id: str) -> Optional[int]:
+        """Position of the first candidate with this id, via the index."""
+        cached = self._index
+        index = self._get_index()
+        position = index.position(candidate_id)
+        if position is not None and self.candidates[position].id == candidate_id:
+            return position
+        if index is not cached:
+            # Just built from the current candidates: a real miss
+            return None
+        # Candidates were replaced in place since the index was built
+        self.reindex()
+        return self._get_index().position(candidate_id)
     
     def get_candidate_by_id(self, candidate_id: str) -> Optional[Candidate]:
         """Get candidate by ID."""
-        for candidate in self.candidates:
-            if candidate.id == candidate_id:
-                return candidate
-        return None
+        position = self._position(candidate_id)
+        return None if position is None else self.candidates[position]
     
-    def compute_coverage_metrics(self) -> Dict[str, float]:
+    def query_candidates(self, ranges: Dict[str, Any]) -> List[Candidate]:
         """
-        Compute coverage metrics for the QS field.
+        Candidates whose attributes fall inside every range.
+        
+        Uses a sorted index per attribute, built on first use.
         
+        Args:
+            ranges: {"section.key": condition}; a condition is an inclusive
+                (lower, upper) pair with None for an open side, a dict of
+                gt/gte/lt/lte, or a single value for equality
+            
         Returns:
-            Dictionary with coverage statistics
+            Matching candidates in field order
+            
+        Example:
+            >>> qs_field.query_candidates({
+            ...     "configuration.span_m": (30.0, 36.0),
+            ...     "score_vector.mass_kg": {"lt": 1300.0},
+            ... })
         """
-        if not self.candidates:
-            return {
-                "total_candidates": 0,
-                "feasible_candidates": 0,
-                "coverage_ratio": 0.0,
-                "constraint_satisfaction_rate": 0.0,
-            }
+        return [self.candidates[i] for i in self._get_index().query(ranges)]
+    
+    def nearest_candidates(
+        self,
+        point: Dict[str, float],
+        k: int = 1,
+        normalize: bool = True,
+    ) -> List[Tuple[Candidate, float]]:
+        """
+        k nearest candidates to a point in parameter/metric space.
         
-        feasible_count = sum(
-            1 for c in self.candidates 
-            if all(c.constraints_satisfied.values())
-        )
+        Uses a k-d tree over the point's attributes, built on first use.
+        Candidates missing any of the attributes are skipped.
         
-        total_constraints = sum(
-            len(c.constraints_satisfied) for c in self.candidates
-        )
-        satisfied_constraints = sum(
-            sum(c.constraints_satisfied.values()) for c in self.candidates
-        )
+        Args:
+            point: {"section.key": value} coordinates
+            k: Number of neighbours
+            normalize: Scale each attribute by its range across the field
+            
+        Returns:
+            (candidate, distance) pairs, closest first
+        """
+        return [
+            (self.candidates[i], distance)
+            for i, distance in self._get_index().nearest(point, k, normalize)
+        ]
+    
+    def compute_coverage_metrics(self) -> Dict[str, float]:
+        """
+        Compute coverage metrics for the QS field.
         
-        return {
-            "total_candidates": len(self.candidates),
-            "feasible_candidates": feasible_count,
-            "coverage_ratio": feasible_count / len(self.candidates),
-            "constraint_satisfaction_rate": (
-                satisfied_constraints / total_constraints 
-                if total_constraints > 0 else 0.0
-            ),
-        }
+        Returns:
+            Dictionary with coverage statistics
+        """
+        return qs_batch.coverage_metrics(self.candidates)
@@ -0,0 +1,352 @@
+"""
+QS Field History Store
+
+Bounded, delta-encoded record of QS field versions.
+
+Each recorded field is stored either as a snapshot (every candidate
+section plus field attributes) or as a delta against the latest earlier
+entry with the same candidate ids: only candidate sections that changed,
+reduced to the changed keys of dict sections, and field attributes that
+changed. Every snapshot_interval entries of a lineage a fresh snapshot
+is taken, so reconstructing a version applies at most that many deltas.
+Payloads are pickled and zlib-compressed.
+
+Changes are found by comparing pickled candidate rows with those of the
+latest entry of the lineage (its "tip"), so recording never computes
+candidate hashes and in-place edits are always seen. Tips of up to 8
+lineages are kept, as uncompressed row pickles.
+
+Retention is bounded by entry count and by bytes: compressed payloads
+plus tip pickles. Tips of other lineages are dropped first, then the
+oldest entries are evicted; an entry whose base is evicted is re-encoded
+as a snapshot, so every retained entry can be reconstructed.
+"""
+
+import pickle
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# Import QS modules - handle both package and standalone imports
+try:
+    from .qs_field import Candidate, QSField, HASH_SECTIONS
+except ImportError:
+    from qs_field import Candidate, QSField, HASH_SECTIONS
+
+# QSField attributes recorded with each version
+FIELD_ATTRIBUTES = (
+    "version",
+    "scores",
+    "bounds",
+    "priors",
+    "constraints",
+    "merkle_root",
+    "timestamp",
+    "frozen",
+    "metadata",
+    "hash_scheme",
+)
+
+# Lineage tips kept for delta encoding
+_MAX_TIPS = 8
+
+# Section change markers in deltas
+_FULL, _KEYS = 0, 1
+_SCALARS = (str, int, float, bool, type(None))
+
+
+@dataclass
+class HistoryEntry:
+    """
+    One recorded field version.
+
+    Attributes:
+        id: Entry id, increasing in recording order
+        version: QS field version at recording time
+        event: What produced the entry (create, update, freeze, collapse)
+        base: Entry this delta applies to; None for snapshots
+        payload: Compressed pickled snapshot or delta
+        recorded_at: ISO 8601 recording time
+        detail: Small event details (e.g. selected candidate on collapse)
+    """
+    id: int
+    version: str
+    event: str
+    base: Optional[int]
+    payload: bytes = field(repr=False)
+    recorded_at: str
+    detail: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        """Payload bytes."""
+        return len(self.payload)
+
+
+@dataclass
+class _Tip:
+    """Latest entry of a lineage: what the next delta is taken against."""
+    entry_id: int
+    depth: int
+    rows: List[bytes]
+    attributes: Dict[str, bytes]
+
+    @property
+    def size(self) -> int:
+        """Bytes held by the pickles."""
+        return sum(map(len, self.rows)) + sum(map(len, self.attributes.values()))
+
+
+def _dumps(value: Any) -> bytes:
+    return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _pack(data: Any, level: int) -> bytes:
+    return zlib.compress(_dumps(data), level)
+
+
+def _unpack(payload: bytes) -> Any:
+    return pickle.loads(zlib.decompress(payload))
+
+
+def _section_change(new: Any, old: Any) -> Tuple:
+    """Changed keys of a dict section, or the full value for other types."""
+    if type(new) is not dict or type(old) is not dict:
+        return (_FULL, new)
+    changed = {}
+    for key, value in new.items():
+        if key in old:
+            previous = old[key]
+            # Only same-typed scalars compare safely; 1 == 1.0 == True
+            if type(value) in _SCALARS:
+                if type(previous) is type(value) and previous == value:
+                    continue
+            elif _dumps(previous) == _dumps(value):
+                continue
+        changed[key] = value
+    removed = [key for key in old if key not in new]
+    return (_KEYS, changed, removed)
+
+
+def _apply_section_change(value: Any, change: Tuple) -> Any:
+    if change[0] == _FULL:
+        return change[1]
+    _, changed, removed = change
+    updated = {key: item for key, item in value.items() if key not in changed}
+    for key in removed:
+        del updated[key]
+    updated.update(changed)
+    return updated
+
+
+class FieldHistory:
+    """
+    Bounded history of QS field versions with reconstruction by entry id.
+
+    Example:
+        >>> history = FieldHistory(max_entries=500, max_bytes=64 * 1024 * 1024)
+        >>> entry_id = history.record(qs_field, event="update")
+        >>> past = history.get(entry_id)
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1000,
+        max_bytes: int = 256 * 1024 * 1024,
+        snapshot_interval: int = 32,
+        compress_level: int = 1,
+    ):
+        """
+        Initialize history store.
+
+        Args:
+            max_entries: Entries retained; older ones are evicted
+            max_bytes: Bytes retained (payloads plus lineage tips); the
+                latest entry and its tip are always kept
+            snapshot_interval: Maximum deltas between snapshots of a lineage
+            compress_level: zlib level for payloads
+        """
+        if max_entries < 1 or max_bytes < 1 or snapshot_interval < 1:
+            raise ValueError("max_entries, max_bytes and snapshot_interval must be >= 1")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.snapshot_interval = snapshot_interval
+        self.compress_level = compress_level
+        self._entries: Dict[int, HistoryEntry] = {}
+        self._tips: Dict[Tuple[str, ...], _Tip] = {}
+        self._next_id = 0
+        self.nbytes = 0
+        self.tip_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, entry_id: int) -> bool:
+        return entry_id in self._entries
+
+    def record(self, qs_field: QSField, event: str = "update", detail: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Record the current state of a field.
+
+        Args:
+            qs_field: Field to record; it is not retained
+            event: Label for the entry (create, update, freeze, collapse)
+            detail: Small JSON-like details kept uncompressed on the entry
+
+        Returns:
+            Entry id for get()
+        """
+        candidates = qs_field.candidates
+        ids = tuple(c.id for c in candidates)
+        rows = [_dumps(tuple(getattr(c, name) for name in HASH_SECTIONS)) for c in candidates]
+        attributes = {name: _dumps(getattr(qs_field, name)) for name in FIELD_ATTRIBUTES}
+
+        tip = self._tips.pop(ids, None)
+        if tip is not None:
+            self.tip_bytes -= tip.size
+            if tip.entry_id not in self._entries or tip.depth + 1 >= self.snapshot_interval:
+                tip = None
+
+        if tip is None:
+            base, depth = None, 0
+            payload = _pack({"attributes": attributes, "rows": rows}, self.compress_level)
+        else:
+            base, depth = tip.entry_id, tip.depth + 1
+            changed_attributes = {
+                name: blob for name, blob in attributes.items() if tip.attributes.get(name) != blob
+            }
+            changed_candidates = {}
+            for position, (new, old) in enumerate(zip(rows, tip.rows)):
+                if new != old:
+                    candidate, recorded = candidates[position], pickle.loads(old)
+                    sections = {}
+                    for s, name in enumerate(HASH_SECTIONS):
+                        value = getattr(candidate, name)
+                        if _dumps(value) != _dumps(recorded[s]):
+                            sections[s] = _section_change(value, recorded[s])
+                    changed_candidates[position] = sections
+            payload = _pack({"attributes": changed_attributes, "candidates": changed_candidates},
+                            self.compress_level)
+
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = HistoryEntry(
+            id=entry_id,
+            version=qs_field.version,
+            event=event,
+            base=base,
+            payload=payload,
+            recorded_at=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            detail=dict(detail or {}),
+        )
+        self.nbytes += len(payload)
+
+        tip = self._tips[ids] = _Tip(entry_id, depth, rows, attributes)
+        self.tip_bytes += tip.size
+        while len(self._tips) > _MAX_TIPS:
+            self._drop_oldest_tip()
+        self._enforce_bounds()
+        return entry_id
+
+    def _state(self, entry_id: int) -> Dict[str, Any]:
+        """Decoded snapshot-form state of an entry."""
+        chain = []
+        entry = self._entry(entry_id)
+        while entry.base is not None:
+            chain.append(entry)
+            entry = self._entries[entry.base]
+        snapshot = _unpack(entry.payload)
+        attributes = {name: pickle.loads(blob) for name, blob in snapshot["attributes"].items()}
+        rows = [pickle.loads(row) for row in snapshot["rows"]]
+        for delta_entry in reversed(chain):
+            delta = _unpack(delta_entry.payload)
+            attributes.update((name, pickle.loads(blob)) for name, blob in delta["attributes"].items())
+            for position, sections in delta["candidates"].items():
+                row = list(rows[position])
+                for s, change in sections.items():
+                    row[s] = _apply_section_change(row[s], change)
+                rows[position] = tuple(row)
+        return {"attributes": attributes, "rows": rows}
+
+    def _entry(self, entry_id: int) -> HistoryEntry:
+        try:
+            return self._entries[entry_id]
+        except KeyError:
+            raise KeyError(f"History entry {entry_id} not found (never recorded or evicted)") from None
+
+    def get(self, entry_id: int) -> QSField:
+        """
+        Reconstruct the field as recorded in an entry.
+
+        Returns a new QSField with its own candidates on every call.
+
+        Raises:
+            KeyError: If the entry was never recorded or has been evicted
+        """
+        state = self._state(entry_id)
+        candidates = [Candidate(**dict(zip(HASH_SECTIONS, row))) for row in state["rows"]]
+        return QSField(candidates=candidates, **state["attributes"])
+
+    def find(self, version: str) -> Optional[int]:
+        """Latest retained entry id recorded for a field version, or None."""
+        for entry_id in reversed(self._entries):
+            if self._entries[entry_id].version == version:
+                return entry_id
+        return None
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Metadata of retained entries, oldest first."""
+        return [
+            {
+                "id": e.id,
+                "version": e.version,
+                "event": e.event,
+                "kind": "snapshot" if e.base is None else "delta",
+                "bytes": e.size,
+                "recorded_at": e.recorded_at,
+                "detail": e.detail,
+            }
+            for e in self._entries.values()
+        ]
+
+    def clear(self):
+        """Drop all entries."""
+        self._entries.clear()
+        self._tips.clear()
+        self.nbytes = 0
+        self.tip_bytes = 0
+
+    def _drop_oldest_tip(self):
+        tip = self._tips.pop(next(iter(self._tips)))
+        self.tip_bytes -= tip.size
+
+    def _enforce_bounds(self):
+        # The newest tip belongs to the latest entry and is kept with it
+        while len(self._tips) > 1 and self.nbytes + self.tip_bytes > self.max_bytes:
+            self._drop_oldest_tip()
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self.nbytes + self.tip_bytes > self.max_bytes
+        ):
+            self._evict_oldest()
+
+    def _evict_oldest(self):
+        oldest_id = next(iter(self._entries))
+        # Dependents are later entries; rebase them onto full snapshots
+        for entry in self._entries.values():
+            if entry.base == oldest_id:
+                state = self._state(entry.id)
+                payload = _pack({
+                    "attributes": {name: _dumps(value) for name, value in state["attributes"].items()},
+                    "rows": [_dumps(row) for row in state["rows"]],
+                }, self.compress_level)
+                self.nbytes += len(payload) - entry.size
+                entry.payload = payload
+                entry.base = None
+        oldest = self._entries.pop(oldest_id)
+        self.nbytes -= oldest.size
+        for ids, tip in list(self._tips.items()):
+            if tip.entry_id == oldest_id:
+                del self._tips[ids]
+                self.tip_bytes -= tip.size
@@ -0,0 +1,271 @@
+"""
+QS Field Secondary Indexes
+
+Indexes over a candidate list for interactive lookups: a hash index on
+candidate id, a sorted index per numeric attribute for range queries, and
+a k-d tree over several attributes for nearest-neighbour queries.
+
+Attributes are addressed as "section.key", the same names the columnar
+store uses (e.g. "configuration.span_m", "score_vector.cost"). Only
+numeric values (int, float, bool) are indexed; candidates where an
+attribute is missing, non-numeric or NaN never match a condition on it.
+
+Indexes are built on first use and cached. They describe the candidate
+list at build time; QSField rebuilds them when the number of candidates
+changes, and QSField.reindex() covers in-place edits.
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# (lower, lower inclusive, upper, upper inclusive); None means unbounded
+RangeBounds = Tuple[Optional[float], bool, Optional[float], bool]
+
+_LEAF_SIZE = 16
+
+
+def _numeric(value: Any) -> Optional[float]:
+    if type(value) in (float, int, bool) and value == value:
+        return float(value)
+    return None
+
+
+def attribute_values(candidates: Sequence[Any], attribute: str) -> List[Optional[float]]:
+    """
+    Numeric value of a "section.key" attribute for each candidate.
+
+    Missing or non-numeric values are None.
+    """
+    section, sep, key = attribute.partition(".")
+    if not sep or not key:
+        raise ValueError(f"Attribute must be 'section.key', got {attribute!r}")
+    values = []
+    for c in candidates:
+        data = getattr(c, section)
+        values.append(_numeric(data.get(key)) if isinstance(data, dict) else None)
+    return values
+
+
+def parse_range(condition: Any) -> RangeBounds:
+    """
+    Normalize a range condition.
+
+    Accepts a (lower, upper) pair, inclusive, with None for an open side;
+    a dict with any of gt, gte, lt, lte; or a single number for equality.
+    """
+    if isinstance(condition, dict):
+        unknown = set(condition) - {"gt", "gte", "lt", "lte"}
+        if unknown:
+            raise ValueError(f"Unknown range operators: {sorted(unknown)}")
+        if "gt" in condition and "gte" in condition or "lt" in condition and "lte" in condition:
+            raise ValueError("Use only one of gt/gte and one of lt/lte")
+        lower, lower_inclusive = (condition["gt"], False) if "gt" in condition else (condition.get("gte"), True)
+        upper, upper_inclusive = (condition["lt"], False) if "lt" in condition else (condition.get("lte"), True)
+        return lower, lower_inclusive, upper, upper_inclusive
+    if isinstance(condition, (tuple, list)):
+        if len(condition) != 2:
+            raise ValueError("Range tuples must be (lower, upper)")
+        return condition[0], True, condition[1], True
+    if _numeric(condition) is None:
+        raise ValueError(f"Invalid range condition: {condition!r}")
+    return condition, True, condition, True
+
+
+def _in_range(value: Optional[float], bounds: RangeBounds) -> bool:
+    if value is None:
+        return False
+    lower, lower_inclusive, upper, upper_inclusive = bounds
+    if lower is not None and (value < lower or not lower_inclusive and value == lower):
+        return False
+    if upper is not None and (value > upper or not upper_inclusive and value == upper):
+        return False
+    return True
+
+
+class SortedIndex:
+    """Positions sorted by one attribute's value, for bisect range lookups."""
+
+    def __init__(self, values: Sequence[Optional[float]]):
+        pairs = sorted((v, i) for i, v in enumerate(values) if v is not None)
+        self.values = values
+        self.keys = [v for v, _ in pairs]
+        self.positions = [i for _, i in pairs]
+
+    def span(self, bounds: RangeBounds) -> Tuple[int, int]:
+        """[start, stop) slice of keys/positions inside the range."""
+        lower, lower_inclusive, upper, upper_inclusive = bounds
+        start = 0 if lower is None else (
+            bisect_left if lower_inclusive else bisect_right
+        )(self.keys, lower)
+        stop = len(self.keys) if upper is None else (
+            bisect_right if upper_inclusive else bisect_left
+        )(self.keys, upper)
+        return start, max(start, stop)
+
+
+class KDTree:
+    """
+    k-d tree over points, splitting on the widest dimension at the median.
+
+    Leaves hold up to 16 points and are scanned directly.
+    """
+
+    def __init__(self, points: Sequence[Tuple[float, ...]], positions: Sequence[int]):
+        self.points = list(points)
+        self.positions = list(positions)
+        self._root = self._build(list(range(len(self.points))))
+
+    def _build(self, order: List[int]):
+        if len(order) <= _LEAF_SIZE:
+            return order
+        points = self.points
+        dims = len(points[order[0]])
+        spreads = [
+            max(points[i][d] for i in order) - min(points[i][d] for i in order)
+            for d in range(dims)
+        ]
+        dim = spreads.index(max(spreads))
+        order.sort(key=lambda i: points[i][dim])
+        mid = len(order) // 2
+        # Left holds values <= split and right values >= split
+        return (dim, points[order[mid]][dim], self._build(order[:mid]), self._build(order[mid:]))
+
+    def nearest(self, query: Sequence[float], k: int) -> List[Tuple[float, int]]:
+        """
+        The k nearest points as (squared distance, position), closest first.
+
+        Ties are broken by position, so results match a brute-force sort.
+        """
+        if k < 1 or not self.points:
+            return []
+        points, positions = self.points, self.positions
+        # Max-heap on (distance, position) via negation
+        heap: List[Tuple[float, int]] = []
+
+        def visit(node):
+            if type(node) is list:
+                for i in node:
+                    point = points[i]
+                    d2 = 0.0
+                    for a, b in zip(point, query):
+                        d2 += (a - b) * (a - b)
+                    entry = (-d2, -positions[i])
+                    if len(heap) < k:
+                        heapq.heappush(heap, entry)
+                    elif entry > heap[0]:
+                        heapq.heapreplace(heap, entry)
+                return
+            dim, split, left, right = node
+            diff = query[dim] - split
+            near, far = (left, right) if diff < 0 else (right, left)
+            visit(near)
+            if len(heap) < k or diff * diff <= -heap[0][0]:
+                visit(far)
+
+        visit(self._root)
+        return sorted((-d2, -position) for d2, position in heap)
+
+
+class CandidateIndex:
+    """
+    Lazily built indexes over a candidate list.
+
+    Example:
+        >>> index = CandidateIndex(candidates)
+        >>> index.query({"configuration.span_m": (30, 36), "score_vector.mass": {"lt": 1300}})
+        >>> index.nearest({"configuration.span_m": 33.0, "configuration.chord_m": 2.1}, k=5)
+    """
+
+    def __init__(self, candidates: Sequence[Any]):
+        self.candidates = candidates
+        self.size = len(candidates)
+        self._ids: Dict[str, int] = {}
+        for position, c in enumerate(candidates):
+            # First occurrence wins, like a linear scan
+            self._ids.setdefault(c.id, position)
+        self._sorted: Dict[str, SortedIndex] = {}
+        self._trees: Dict[Tuple[Tuple[str, ...], bool], Tuple[KDTree, List[float], List[float]]] = {}
+
+    def position(self, candidate_id: str) -> Optional[int]:
+        """Position of the first candidate with this id, or None."""
+        return self._ids.get(candidate_id)
+
+    def sorted_index(self, attribute: str) -> SortedIndex:
+        """Sorted index on one attribute, built on first use."""
+        index = self._sorted.get(attribute)
+        if index is None:
+            index = self._sorted[attribute] = SortedIndex(attribute_values(self.candidates, attribute))
+        return index
+
+    def query(self, ranges: Dict[str, Any]) -> List[int]:
+        """
+        Positions of candidates inside every range, in field order.
+
+        The most selective range is read from its sorted index and the
+        other conditions are checked on that slice only.
+        """
+        if not ranges:
+            return list(range(self.size))
+        conditions = []
+        for attribute, condition in ranges.items():
+            index = self.sorted_index(attribute)
+            bounds = parse_range(condition)
+            start, stop = index.span(bounds)
+            conditions.append((stop - start, start, stop, index, bounds))
+        conditions.sort(key=lambda item: item[0])
+
+        _, start, stop, index, _ = conditions[0]
+        positions = index.positions[start:stop]
+        for _, _, _, other, bounds in conditions[1:]:
+            values = other.values
+            positions = [p for p in positions if _in_range(values[p], bounds)]
+        positions.sort()
+        return positions
+
+    def _tree(self, attributes: Tuple[str, ...], normalize: bool):
+        key = (attributes, normalize)
+        entry = self._trees.get(key)
+        if entry is None:
+            columns = [self.sorted_index(a) for a in attributes]
+            offsets, scales = [], []
+            for index in columns:
+                if normalize and index.keys:
+                    low, high = index.keys[0], index.keys[-1]
+                    offsets.append(low)
+                    scales.append((high - low) or 1.0)
+                else:
+                    offsets.append(0.0)
+                    scales.append(1.0)
+            points, positions = [], []
+            for position in range(self.size):
+                row = [index.values[position] for index in columns]
+                if None in row:
+                    continue
+                points.append(tuple((v - o) / s for v, o, s in zip(row, offsets, scales)))
+                positions.append(position)
+            entry = self._trees[key] = (KDTree(points, positions), offsets, scales)
+        return entry
+
+    def nearest(
+        self,
+        point: Dict[str, float],
+        k: int = 1,
+        normalize: bool = True,
+    ) -> List[Tuple[int, float]]:
+        """
+        The k candidates nearest to point, as (position, distance).
+
+        Args:
+            point: Attribute values, e.g. {"configuration.span_m": 33.0}
+            k: Number of neighbours
+            normalize: Scale each attribute by its range over the field,
+                so attributes in different units weigh equally. Distances
+                are then in those scaled units.
+        """
+        if not point:
+            raise ValueError("nearest needs at least one attribute")
+        attributes = tuple(point)
+        tree, offsets, scales = self._tree(attributes, normalize)
+        query = [(float(point[a]) - o) / s for a, o, s in zip(attributes, offsets, scales)]
+        return [(position, d2 ** 0.5) for d2, position in tree.nearest(query, k)]
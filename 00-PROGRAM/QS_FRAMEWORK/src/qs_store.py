@@ -0,0 +1,475 @@
+"""
+QS Field Columnar Storage
+
+Compact binary on-disk format for QS fields, as an alternative to the
+indented JSON written by QSAPI.export_field.
+
+Each candidate section key (configuration.param_1, score_vector.cost, ...)
+becomes one typed column, split into row chunks that are compressed
+independently. Reads go through mmap and only decode the chunks that
+overlap the requested rows and columns, so loading a few score columns or
+a row range of a large field does not parse the whole file.
+
+Layout (little-endian):
+    header      72 bytes: magic "QSCF", format version, flags, row count,
+                chunk rows, Merkle root (32 raw bytes, zero if unfrozen),
+                index offset and length
+    chunks      column chunks, 8-byte aligned, each optionally zlib
+                compressed; masked columns start with one presence byte
+                per row
+    index       zlib-compressed JSON: field attributes, section key order
+                and, per column, its kind and chunk (offset, length) list
+
+Column kinds:
+    f8, i8      float64 / int64 values
+    b1          booleans, one byte each
+    f8x2, i8x2  (lower, upper) tuples of float64 / int64
+    str         UTF-8 strings with uint32 offsets
+    json        anything else, as compact JSON text per value
+    h32         raw 32-byte digests (candidate hashes of frozen fields)
+
+A key whose values mix kinds is stored as json. Values stored as json
+round-trip like the JSON export does (tuples come back as lists).
+"""
+
+import json
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from collections import Counter
+from itertools import chain
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Sequence
+
+# Import QS modules - handle both package and standalone imports
+try:
+    from .qs_field import Candidate, QSField
+except ImportError:
+    from qs_field import Candidate, QSField
+
+MAGIC = b"QSCF"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHHQII32sQQ")
+_FLAG_ZLIB = 1
+_ALIGN = 8
+
+_SECTIONS = (
+    "configuration",
+    "utcs_manifest",
+    "score_vector",
+    "uncertainty",
+    "bounds",
+    "constraints_satisfied",
+    "provenance",
+)
+
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+_FILL = {"f8": 0.0, "i8": 0, "b1": False, "f8x2": (0.0, 0.0), "i8x2": (0, 0), "str": "", "json": None}
+_TYPECODES = {"f8": "d", "i8": "q", "f8x2": "d", "i8x2": "q"}
+_SWAP = sys.byteorder == "big"
+
+
+def _column_kind(values: List) -> str:
+    """Storage kind for all present values of one key."""
+    types = set(map(type, values))
+    if len(types) != 1:
+        return "json"
+    kind = types.pop()
+    if kind is float:
+        return "f8"
+    if kind is bool:
+        return "b1"
+    if kind is str:
+        return "str"
+    if kind is int:
+        return "i8" if _INT64_MIN <= min(values) and max(values) <= _INT64_MAX else "json"
+    if kind is tuple and all(len(v) == 2 for v in values):
+        flat = list(chain.from_iterable(values))
+        element = _column_kind(flat)
+        if element in ("f8", "i8"):
+            return element + "x2"
+    return "json"
+
+
+def _infer_columns(candidates: Sequence[Candidate]) -> List[Dict[str, Any]]:
+    """One column spec per section key, in first-seen key order."""
+    columns = []
+    for section in _SECTIONS:
+        dicts = [getattr(c, section) for c in candidates]
+        if not all(type(d) is dict for d in dicts):
+            # Not a dict everywhere: keep the whole section as one json column
+            columns.append({"name": section, "section": section, "key": None, "kind": "json", "masked": False})
+            continue
+        for key, count in Counter(chain.from_iterable(dicts)).items():
+            masked = count < len(dicts)
+            if masked:
+                values = [d[key] for d in dicts if key in d]
+            else:
+                values = list(map(itemgetter(key), dicts))
+            columns.append({
+                "name": f"{section}.{key}",
+                "section": section,
+                "key": key,
+                "kind": _column_kind(values),
+                "masked": masked,
+            })
+    return columns
+
+
+def _pack_numbers(values: List, typecode: str) -> bytes:
+    packed = array(typecode, values)
+    if _SWAP:
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack_numbers(data, typecode: str) -> List:
+    values = array(typecode)
+    values.frombytes(data)
+    if _SWAP:
+        values.byteswap()
+    return values.tolist()
+
+
+def _pack_strings(values: List[str]) -> bytes:
+    encoded = [v.encode("utf-8") for v in values]
+    offsets = [0]
+    total = 0
+    for item in encoded:
+        total += len(item)
+        offsets.append(total)
+    return _pack_numbers(offsets, "I") + b"".join(encoded)
+
+
+def _unpack_strings(data, count: int) -> List[str]:
+    split = 4 * (count + 1)
+    offsets = _unpack_numbers(data[:split], "I")
+    blob = bytes(data[split:])
+    return [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(count)]
+
+
+def _encode_values(kind: str, values: List) -> bytes:
+    if kind in ("f8", "i8"):
+        return _pack_numbers(values, _TYPECODES[kind])
+    if kind in ("f8x2", "i8x2"):
+        return _pack_numbers(list(chain.from_iterable(values)), _TYPECODES[kind])
+    if kind == "b1":
+        return bytes(values)
+    if kind == "str":
+        return _pack_strings(values)
+    if kind == "h32":
+        return b"".join(bytes.fromhex(v) for v in values)
+    return _pack_strings([json.dumps(v, separators=(",", ":")) for v in values])
+
+
+def _decode_values(kind: str, data, count: int) -> List:
+    if kind in ("f8", "i8"):
+        return _unpack_numbers(data, _TYPECODES[kind])
+    if kind in ("f8x2", "i8x2"):
+        flat = _unpack_numbers(data, _TYPECODES[kind])
+        return list(zip(flat[0::2], flat[1::2]))
+    if kind == "b1":
+        return [b != 0 for b in bytes(data)]
+    if kind == "str":
+        return _unpack_strings(data, count)
+    if kind == "h32":
+        raw = bytes(data)
+        return [raw[i:i + 32].hex() for i in range(0, 32 * count, 32)]
+    return [json.loads(v) for v in _unpack_strings(data, count)]
+
+
+def _restore_bounds(bounds: Dict[str, Any]) -> Dict[str, Any]:
+    """Field bounds are lists of (lower, upper) tuples; JSON turns them into lists."""
+    return {
+        key: [tuple(b) if isinstance(b, list) else b for b in value] if isinstance(value, list) else value
+        for key, value in bounds.items()
+    }
+
+
+def write_field(
+    qs_field: QSField,
+    filepath: str,
+    *,
+    chunk_rows: int = 65536,
+    compression: Optional[str] = "zlib",
+    level: int = 6,
+):
+    """
+    Write a QS field in the columnar binary format.
+
+    Args:
+        qs_field: Field to write
+        filepath: Output path (conventionally *.qsf)
+        chunk_rows: Rows per column chunk; the unit of partial reads
+        compression: "zlib" or None. Uncompressed chunks are decoded
+            straight from the memory map on read
+        level: zlib compression level
+    """
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be >= 1")
+    if compression not in ("zlib", None):
+        raise ValueError(f"Unknown compression: {compression}")
+
+    candidates = qs_field.candidates
+    n = len(candidates)
+    columns = [{"name": "id", "section": None, "key": None, "kind": "str", "masked": False}]
+    if qs_field.frozen:
+        columns.append({"name": "hash", "section": None, "key": None, "kind": "h32", "masked": False})
+    scores_column = len(qs_field.scores) == n
+    if scores_column:
+        columns.append({"name": "scores", "section": None, "key": None, "kind": "f8", "masked": False})
+    columns.extend(_infer_columns(candidates))
+    for column in columns:
+        column["chunks"] = []
+
+    field_attrs = {
+        "version": qs_field.version,
+        "bounds": qs_field.bounds,
+        "priors": qs_field.priors,
+        "constraints": qs_field.constraints,
+        "merkle_root": qs_field.merkle_root,
+        "timestamp": qs_field.timestamp,
+        "frozen": qs_field.frozen,
+        "metadata": qs_field.metadata,
+        "hash_scheme": qs_field.hash_scheme,
+    }
+    if not scores_column:
+        field_attrs["scores"] = qs_field.scores
+
+    with open(filepath, "wb") as f:
+        f.write(b"\0" * _HEADER.size)
+        offset = _HEADER.size
+
+        for start in range(0, n, chunk_rows):
+            chunk = candidates[start:start + chunk_rows]
+            sections = {section: [getattr(c, section) for c in chunk] for section in _SECTIONS}
+            for column in columns:
+                name, section, key, kind = column["name"], column["section"], column["key"], column["kind"]
+                if section is None:
+                    if name == "id":
+                        values = [c.id for c in chunk]
+                    elif name == "hash":
+                        values = [c.hash for c in chunk]
+                    else:
+                        values = qs_field.scores[start:start + chunk_rows]
+                    mask = b""
+                elif key is None:
+                    values, mask = sections[section], b""
+                else:
+                    dicts = sections[section]
+                    fill = _FILL[kind]
+                    values = [d.get(key, fill) for d in dicts]
+                    mask = bytes(key in d for d in dicts) if column["masked"] else b""
+
+                payload = mask + _encode_values(kind, values)
+                if compression == "zlib":
+                    payload = zlib.compress(payload, level)
+                pad = -offset % _ALIGN
+                if pad:
+                    f.write(b"\0" * pad)
+                    offset += pad
+                f.write(payload)
+                column["chunks"].append([offset, len(payload)])
+                offset += len(payload)
+
+        index = zlib.compress(json.dumps({
+            "rows": n,
+            "chunk_rows": chunk_rows,
+            "compression": compression,
+            "field": field_attrs,
+            "columns": columns,
+        }, separators=(",", ":")).encode("utf-8"), level)
+        f.write(index)
+
+        merkle_root = bytes.fromhex(qs_field.merkle_root) if len(qs_field.merkle_root) == 64 else b"\0" * 32
+        f.seek(0)
+        f.write(_HEADER.pack(
+            MAGIC, FORMAT_VERSION, _FLAG_ZLIB if compression == "zlib" else 0,
+            n, chunk_rows, 0, merkle_root, offset, len(index),
+        ))
+
+
+class QSFieldReader:
+    """
+    Memory-mapped reader for the columnar QS field format.
+
+    Example:
+        >>> with QSFieldReader("field.qsf") as reader:
+        ...     costs = reader.read_columns(["score_vector.cost"])
+        ...     head = reader.read_candidates(0, 1000)
+    """
+
+    def __init__(self, filepath: str):
+        self._file = open(filepath, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Not a QS columnar file: {filepath}")
+        try:
+            self._load_index(filepath)
+        except Exception:
+            self.close()
+            raise
+
+    def _load_index(self, filepath: str):
+        if len(self._mm) < _HEADER.size:
+            raise ValueError(f"Not a QS columnar file: {filepath}")
+        (magic, version, flags, rows, chunk_rows, _, merkle_root,
+         index_offset, index_length) = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a QS columnar file: {filepath}")
+        if version > FORMAT_VERSION:
+            raise ValueError(f"Unsupported QS columnar format version {version}")
+
+        index = json.loads(zlib.decompress(self._mm[index_offset:index_offset + index_length]))
+        self.rows = rows
+        self.chunk_rows = chunk_rows
+        self.compressed = bool(flags & _FLAG_ZLIB)
+        self.merkle_root = merkle_root.hex() if any(merkle_root) else ""
+        self._field = index["field"]
+        self._columns = {column["name"]: column for column in index["columns"]}
+
+    @property
+    def version(self) -> str:
+        """QS field version identifier."""
+        return self._field["version"]
+
+    @property
+    def columns(self) -> List[str]:
+        """Column names in file order."""
+        return list(self._columns)
+
+    def column_kind(self, name: str) -> str:
+        """Storage kind of a column (f8, i8, b1, str, json, ...)."""
+        return self._column(name)["kind"]
+
+    def _column(self, name: str) -> Dict[str, Any]:
+        try:
+            return self._columns[name]
+        except KeyError:
+            raise KeyError(f"Column {name} not found") from None
+
+    def _range(self, start: int, stop: Optional[int]):
+        stop = self.rows if stop is None else min(stop, self.rows)
+        start = max(0, min(start, stop))
+        return start, stop
+
+    def _read_column(self, column: Dict[str, Any], start: int, stop: int):
+        """Values and presence flags (None when unmasked) for rows [start, stop)."""
+        values: List = []
+        present: Optional[List[bool]] = [] if column["masked"] else None
+        if start >= stop:
+            return values, present
+        view = memoryview(self._mm)
+        try:
+            first, last = start // self.chunk_rows, (stop - 1) // self.chunk_rows
+            for number in range(first, last + 1):
+                chunk_start = number * self.chunk_rows
+                count = min(self.chunk_rows, self.rows - chunk_start)
+                offset, length = column["chunks"][number]
+                data = view[offset:offset + length]
+                if self.compressed:
+                    data = memoryview(zlib.decompress(data))
+                if present is not None:
+                    mask, data = bytes(data[:count]), data[count:]
+                decoded = _decode_values(column["kind"], data, count)
+                lo = max(start - chunk_start, 0)
+                hi = min(stop - chunk_start, count)
+                values.extend(decoded[lo:hi])
+                if present is not None:
+                    present.extend(b != 0 for b in mask[lo:hi])
+                del data
+        finally:
+            view.release()
+        return values, present
+
+    def read_column(self, name: str, start: int = 0, stop: Optional[int] = None) -> List:
+        """
+        Values of one column for rows [start, stop).
+
+        Rows where a masked column's key is absent read as None.
+        """
+        start, stop = self._range(start, stop)
+        values, present = self._read_column(self._column(name), start, stop)
+        if present is not None:
+            values = [v if p else None for v, p in zip(values, present)]
+        return values
+
+    def read_columns(
+        self,
+        names: Sequence[str],
+        start: int = 0,
+        stop: Optional[int] = None,
+    ) -> Dict[str, List]:
+        """Several columns for rows [start, stop), keyed by column name."""
+        return {name: self.read_column(name, start, stop) for name in names}
+
+    def read_candidates(self, start: int = 0, stop: Optional[int] = None) -> List[Candidate]:
+        """Rebuild the candidates in rows [start, stop)."""
+        start, stop = self._range(start, stop)
+        count = stop - start
+        ids, _ = self._read_column(self._columns["id"], start, stop)
+        sections: Dict[str, List] = {}
+        for column in self._columns.values():
+            section = column["section"]
+            if section is None:
+                continue
+            values, present = self._read_column(column, start, stop)
+            if column["key"] is None:
+                sections[section] = values
+                continue
+            rows = sections.setdefault(section, [{} for _ in range(count)])
+            key = column["key"]
+            if present is None:
+                for row, value in zip(rows, values):
+                    row[key] = value
+            else:
+                for row, value, p in zip(rows, values, present):
+                    if p:
+                        row[key] = value
+
+        for section in _SECTIONS:
+            # A section with no keys in any candidate has no columns
+            if section not in sections:
+                sections[section] = [{} for _ in range(count)]
+        return [
+            Candidate(id=ids[i], **{section: sections[section][i] for section in _SECTIONS})
+            for i in range(count)
+        ]
+
+    def read_field(self, start: int = 0, stop: Optional[int] = None) -> QSField:
+        """
+        Rebuild the QS field, or the field restricted to rows [start, stop).
+
+        The stored Merkle root and frozen flag describe the whole field; a
+        partial load keeps them, so validate_integrity on it fails.
+        """
+        start, stop = self._range(start, stop)
+        attrs = dict(self._field)
+        if "scores" in self._columns:
+            attrs["scores"] = self.read_column("scores", start, stop)
+        elif (start, stop) != (0, self.rows):
+            attrs["scores"] = attrs["scores"][start:stop]
+        attrs["bounds"] = _restore_bounds(attrs["bounds"])
+        return QSField(candidates=self.read_candidates(start, stop), **attrs)
+
+    def close(self):
+        """Unmap and close the file."""
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_field(filepath: str, start: int = 0, stop: Optional[int] = None) -> QSField:
+    """Load a QS field (or the rows [start, stop)) from the columnar format."""
+    with QSFieldReader(filepath) as reader:
+        return reader.read_field(start, stop)
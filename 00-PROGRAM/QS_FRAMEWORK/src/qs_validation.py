@@ -0,0 +1,331 @@
+"""
+QS Batch Validation Engine
+
+Validates many QS fields against their measurement sets in one call and
+consolidates the results into a single report.
+
+Work is split by field. For each field the measured candidates are
+resolved in one scan, every measurement set gets the same report as
+QSAPI.validate (same arithmetic, so identical deltas and RMSE), and
+coverage is computed with the single-pass kernel from qs_batch.
+
+With workers > 1 fields are processed in worker processes. Where the
+fork start method is available the fields are inherited by the workers
+instead of being pickled, so only the (small) reports cross process
+boundaries; elsewhere each chunk of fields is pickled to its worker.
+"""
+
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+# Import QS modules - handle both package and standalone imports
+try:
+    from . import qs_batch
+except ImportError:
+    import qs_batch
+
+# Measurements for one field: {candidate_id: actual_performance}, or
+# (candidate_id, actual_performance) pairs when a candidate is measured
+# more than once
+MeasurementSets = Union[Mapping[str, Dict[str, float]], Sequence[Tuple[str, Dict[str, float]]]]
+
+# Chunks per worker, so uneven fields still balance across processes
+_CHUNKS_PER_WORKER = 4
+
+# Fields shared with forked workers for the duration of one batch
+_SHARED: Optional[Tuple[Sequence[Any], Sequence[Any], str, bool]] = None
+_SHARED_LOCK = threading.Lock()
+
+
+def recommendation(rmse: float, bounds_violations: Dict[str, Any]) -> str:
+    """Recommendation text for a validation RMSE and its bounds violations."""
+    if rmse < 5.0 and not bounds_violations:
+        return "Excellent prediction accuracy. Model is performing well."
+    elif rmse < 10.0 and not bounds_violations:
+        return "Good prediction accuracy. Minor improvements possible."
+    elif rmse < 15.0 or (bounds_violations and len(bounds_violations) <= 2):
+        return "Moderate prediction accuracy. Consider model refinement."
+    else:
+        return "Poor prediction accuracy. Model requires significant refinement or retraining."
+
+
+def validation_report(
+    qs_version: str,
+    candidate: Any,
+    actual_performance: Dict[str, float],
+    timestamp: str,
+) -> Dict[str, Any]:
+    """
+    Validation report for one candidate against measured outcomes.
+
+    Args:
+        qs_version: Version of the field the candidate belongs to
+        candidate: Candidate whose predictions are checked
+        actual_performance: Measured outcomes
+        timestamp: Report timestamp (ISO 8601)
+
+    Returns:
+        Report with deltas, bounds_violations, metrics and recommendation
+    """
+    predicted = candidate.score_vector
+    candidate_bounds = candidate.bounds
+    deltas = {}
+    bounds_violations = {}
+    squared_errors = []
+
+    for metric, actual_value in actual_performance.items():
+        predicted_value = predicted.get(metric)
+        if predicted_value is not None:
+            delta = actual_value - predicted_value
+            delta_pct = (delta / predicted_value * 100) if predicted_value != 0 else 0.0
+            deltas[metric] = {
+                "predicted": predicted_value,
+                "actual": actual_value,
+                "delta": delta,
+                "delta_pct": delta_pct,
+            }
+            squared_errors.append(delta_pct ** 2)
+
+        if metric in candidate_bounds:
+            lower, upper = candidate_bounds[metric]
+            if not (lower <= actual_value <= upper):
+                bounds_violations[metric] = {
+                    "actual": actual_value,
+                    "bounds": [lower, upper],
+                    "violation": "below" if actual_value < lower else "above",
+                }
+
+    rmse = math.sqrt(sum(squared_errors) / len(squared_errors)) if squared_errors else 0.0
+
+    return {
+        "qs_version": qs_version,
+        "candidate_id": candidate.id,
+        "timestamp": timestamp,
+        "deltas": deltas,
+        "bounds_violations": bounds_violations,
+        "metrics": {
+            "rmse_pct": rmse,
+            "within_bounds": len(bounds_violations) == 0,
+            "prediction_accuracy": 100.0 - rmse if rmse < 100 else 0.0,
+        },
+        "recommendation": recommendation(rmse, bounds_violations),
+    }
+
+
+def _measurement_pairs(measurements: Optional[MeasurementSets]) -> List[Tuple[str, Dict[str, float]]]:
+    if not measurements:
+        return []
+    if isinstance(measurements, Mapping):
+        return list(measurements.items())
+    return list(measurements)
+
+
+def _validate_field(
+    qs_field: Any,
+    measurements: Optional[MeasurementSets],
+    timestamp: str,
+    coverage: bool,
+) -> Dict[str, Any]:
+    """Validation reports and coverage for one field."""
+    pairs = _measurement_pairs(measurements)
+    wanted = {candidate_id for candidate_id, _ in pairs}
+    found: Dict[str, Any] = {}
+    if wanted:
+        for c in qs_field.candidates:
+            # First occurrence wins, like QSField.get_candidate_by_id
+            if c.id in wanted and c.id not in found:
+                found[c.id] = c
+                if len(found) == len(wanted):
+                    break
+
+    reports = []
+    for candidate_id, actual_performance in pairs:
+        candidate = found.get(candidate_id)
+        if candidate is None:
+            raise ValueError(f"Candidate {candidate_id} not found in QS field {qs_field.version}")
+        reports.append(validation_report(qs_field.version, candidate, actual_performance, timestamp))
+
+    result = {"qs_version": qs_field.version, "validations": reports}
+    if coverage:
+        result["coverage"] = qs_batch.coverage_metrics(qs_field.candidates)
+    return result
+
+
+def _run_shared(indices: Sequence[int]) -> List[Dict[str, Any]]:
+    fields, measurements, timestamp, coverage = _SHARED
+    return [_validate_field(fields[i], measurements[i], timestamp, coverage) for i in indices]
+
+
+def _run_pickled(items: Sequence[Tuple[Any, Any, str, bool]]) -> List[Dict[str, Any]]:
+    return [_validate_field(*item) for item in items]
+
+
+def _chunks(n: int, count: int) -> List[range]:
+    size = max(1, -(-n // count))
+    return [range(start, min(start + size, n)) for start in range(0, n, size)]
+
+
+def _run_fields(
+    fields: Sequence[Any],
+    measurements: Sequence[Optional[MeasurementSets]],
+    timestamp: str,
+    coverage: bool,
+    workers: Optional[int],
+) -> List[Dict[str, Any]]:
+    """Per-field results in field order, using up to workers processes."""
+    global _SHARED
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+    workers = min(workers, len(fields))
+    if workers <= 1:
+        return [
+            _validate_field(f, m, timestamp, coverage)
+            for f, m in zip(fields, measurements)
+        ]
+
+    chunks = _chunks(len(fields), workers * _CHUNKS_PER_WORKER)
+    results: List[Dict[str, Any]] = []
+    if "fork" in multiprocessing.get_all_start_methods():
+        with _SHARED_LOCK:
+            _SHARED = (fields, measurements, timestamp, coverage)
+            try:
+                # Workers are forked when the pool starts, inheriting _SHARED
+                with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork")) as pool:
+                    for chunk_results in pool.map(_run_shared, chunks):
+                        results.extend(chunk_results)
+            finally:
+                _SHARED = None
+    else:
+        payloads = [
+            [(fields[i], measurements[i], timestamp, coverage) for i in chunk]
+            for chunk in chunks
+        ]
+        with ProcessPoolExecutor(workers) as pool:
+            for chunk_results in pool.map(_run_pickled, payloads):
+                results.extend(chunk_results)
+    return results
+
+
+def _percentile(ordered: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def _summarize(results: Sequence[Dict[str, Any]], coverage: bool) -> Dict[str, Any]:
+    reports = [report for result in results for report in result["validations"]]
+    summary: Dict[str, Any] = {"fields": len(results), "validations": len(reports)}
+
+    rmse = sorted(report["metrics"]["rmse_pct"] for report in reports)
+    summary["rmse_pct"] = {
+        "mean": sum(rmse) / len(rmse),
+        "p50": _percentile(rmse, 50),
+        "p95": _percentile(rmse, 95),
+        "max": rmse[-1],
+    } if rmse else {"mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    summary["within_bounds_rate"] = (
+        sum(report["metrics"]["within_bounds"] for report in reports) / len(reports)
+        if reports else 0.0
+    )
+
+    per_metric: Dict[str, List[float]] = {}
+    violations: Dict[str, int] = {}
+    recommendations: Dict[str, int] = {}
+    for report in reports:
+        for metric, delta in report["deltas"].items():
+            per_metric.setdefault(metric, []).append(delta["delta_pct"])
+        for metric in report["bounds_violations"]:
+            violations[metric] = violations.get(metric, 0) + 1
+        text = report["recommendation"]
+        recommendations[text] = recommendations.get(text, 0) + 1
+    summary["metrics"] = {
+        metric: {
+            "count": len(values),
+            "mean_delta_pct": sum(values) / len(values),
+            "rmse_pct": math.sqrt(sum(v * v for v in values) / len(values)),
+            "bounds_violations": violations.get(metric, 0),
+        }
+        for metric, values in per_metric.items()
+    }
+    summary["recommendations"] = recommendations
+
+    if coverage:
+        totals = [result["coverage"] for result in results]
+        total_candidates = sum(c["total_candidates"] for c in totals)
+        feasible_candidates = sum(c["feasible_candidates"] for c in totals)
+        summary["coverage"] = {
+            "total_candidates": total_candidates,
+            "feasible_candidates": feasible_candidates,
+            "coverage_ratio": feasible_candidates / total_candidates if total_candidates else 0.0,
+            "min_coverage_ratio": min((c["coverage_ratio"] for c in totals), default=0.0),
+        }
+    return summary
+
+
+def validate_fields(
+    fields: Sequence[Any],
+    measurements: Sequence[Optional[MeasurementSets]],
+    *,
+    workers: Optional[int] = 1,
+    coverage: bool = True,
+) -> Dict[str, Any]:
+    """
+    Validate many fields against their measurement sets.
+
+    Args:
+        fields: QS fields to validate
+        measurements: One entry per field: {candidate_id: actual_performance},
+            a list of (candidate_id, actual_performance) pairs, or None
+            for coverage only
+        workers: Worker processes; 1 runs in this process, None uses
+            every CPU
+        coverage: Also compute coverage metrics per field
+
+    Returns:
+        Consolidated report with timestamp, one entry per field
+        (qs_version, validations as returned by QSAPI.validate, coverage)
+        and a summary across all fields
+
+    Raises:
+        ValueError: If lengths differ, workers < 1, or a measured
+            candidate is not in its field
+
+    Example:
+        >>> report = validate_fields(
+        ...     [field_a, field_b],
+        ...     [{"x_12": {"weight_kg": 1285.0}}, {"x_3": {"weight_kg": 990.0}}],
+        ...     workers=4,
+        ... )
+        >>> report["summary"]["rmse_pct"]["p95"]
+    """
+    if len(fields) != len(measurements):
+        raise ValueError(f"Got {len(fields)} fields but {len(measurements)} measurement entries")
+    timestamp = datetime.utcnow().isoformat() + "Z"
+    results = _run_fields(fields, measurements, timestamp, coverage, workers)
+    return {
+        "timestamp": timestamp,
+        "fields": results,
+        "summary": _summarize(results, coverage),
+    }
+
+
+def coverage_batch(fields: Sequence[Any], *, workers: Optional[int] = 1) -> List[Dict[str, float]]:
+    """
+    QSField.compute_coverage_metrics for many fields.
+
+    Args:
+        fields: QS fields
+        workers: Worker processes; 1 runs in this process, None uses
+            every CPU
+
+    Returns:
+        Coverage metrics, one dict per field in order
+    """
+    results = _run_fields(fields, [None] * len(fields), "", True, workers)
+    return [result["coverage"] for result in results]
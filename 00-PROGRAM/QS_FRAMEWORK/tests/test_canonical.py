@@ -0,0 +1,77 @@
+"""
+Unit tests for the canonical binary encoding
+"""
+
+import sys
+import os
+
+# Add src directory to path
+src_path = os.path.join(os.path.dirname(__file__), '..', 'src')
+sys.path.insert(0, src_path)
+
+import json
+import unittest
+from collections import OrderedDict
+
+# Import modules directly (not as package)
+import canonical
+
+canonical_encode = canonical.canonical_encode
+canonical_digest = canonical.canonical_digest
+
+
+class TestCanonicalEncode(unittest.TestCase):
+    """Test canonical_encode"""
+    
+    def test_pinned_encoding(self):
+        """Scheme v1 bytes must never change; a new scheme needs a new version"""
+        value = {"b": [1, 2.5, None, True, "x"], "a": b"\x00"}
+        self.assertEqual(
+            canonical_encode(value).hex(),
+            "64000000027300000001616200000001007300000001626c00000005"
+            "6900000001316640040000000000004e54730000000178",
+        )
+    
+    def test_pinned_digest(self):
+        """Digest of a nested value is stable across releases"""
+        value = {"weight_kg": (1200, 1350), "ok": False, "label": "été"}
+        self.assertEqual(
+            canonical_digest(value).hex(),
+            "f4b85368564ba32230e8467992611a6982eead96cce7c5cbe08f32cf876ee398",
+        )
+    
+    def test_dict_order_independent(self):
+        """Key insertion order does not affect the encoding"""
+        self.assertEqual(
+            canonical_encode({"a": 1, "b": 2}),
+            canonical_encode(OrderedDict([("b", 2), ("a", 1)])),
+        )
+    
+    def test_types_are_distinct(self):
+        """1, 1.0, True and "1" encode differently"""
+        encodings = {canonical_encode(v) for v in (1, 1.0, True, "1")}
+        self.assertEqual(len(encodings), 4)
+    
+    def test_tuple_matches_list(self):
+        """Tuples encode as lists so JSON round trips keep the digest"""
+        value = {"bounds": (1.5, 2.5), 3: [(), ("x",)]}
+        round_tripped = json.loads(json.dumps(value))
+        self.assertEqual(canonical_encode(value), canonical_encode(round_tripped))
+    
+    def test_nan_is_canonical(self):
+        """All NaN payloads encode the same"""
+        self.assertEqual(canonical_encode(float("nan")), canonical_encode(-float("nan")))
+    
+    def test_unsupported_type_raises(self):
+        """Objects without a canonical form are rejected"""
+        with self.assertRaises(TypeError):
+            canonical_encode({"when": object()})
+    
+    def test_colliding_keys_raise(self):
+        """Keys that collide after string conversion are rejected"""
+        with self.assertRaises(ValueError):
+            canonical_encode({1: "a", "1": "b"})
+
+
+if __name__ == "__main__":
+    unittest.main()
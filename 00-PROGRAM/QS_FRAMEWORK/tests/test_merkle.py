@@ -16,6 +16,7 @@ import merkle
 
 compute_merkle_root = merkle.compute_merkle_root
 verify_merkle_proof = merkle.verify_merkle_proof
+MerkleTree = merkle.MerkleTree
 
 
 class TestMerkle(unittest.TestCase):
@@ -90,5 +91,58 @@ class TestMerkle(unittest.TestCase):
         self.assertFalse(verify_merkle_proof(leaf1, wrong_proof, root))
 
 
+
+class TestMerkleTree(unittest.TestCase):
+    """Test persistent incremental Merkle tree"""
+    
+    def test_root_matches_compute_merkle_root(self):
+        """Test that tree roots match the one-shot computation"""
+        for n in range(0, 18):
+            hashes = [f"hash_{i}" for i in range(n)]
+            tree = MerkleTree.from_leaves(hashes)
+            self.assertEqual(tree.root, compute_merkle_root(hashes))
+    
+    def test_append_matches_rebuild(self):
+        """Test that appending leaves keeps the root consistent"""
+        tree = MerkleTree()
+        hashes = []
+        for i in range(33):
+            hashes.append(f"hash_{i}")
+            root = tree.append(hashes[-1])
+            self.assertEqual(root, compute_merkle_root(hashes))
+    
+    def test_update_matches_rebuild(self):
+        """Test that updating a leaf keeps the root consistent"""
+        hashes = [f"hash_{i}" for i in range(13)]
+        tree = MerkleTree.from_leaves(hashes)
+        for i in (0, 6, 12):
+            hashes[i] = f"updated_{i}"
+            self.assertEqual(tree.update(i, hashes[i]), compute_merkle_root(hashes))
+        with self.assertRaises(IndexError):
+            tree.update(13, "out_of_range")
+    
+    def test_inclusion_proofs(self):
+        """Test that every leaf has a verifiable proof"""
+        for n in (1, 2, 3, 7, 16):
+            hashes = [f"hash_{i}" for i in range(n)]
+            tree = MerkleTree.from_leaves(hashes)
+            for i, leaf in enumerate(hashes):
+                proof = tree.get_proof(i)
+                self.assertTrue(verify_merkle_proof(leaf, proof, tree.root, index=i))
+                self.assertFalse(verify_merkle_proof("forged", proof, tree.root, index=i))
+    
+    def test_serialization_round_trip(self):
+        """Test reloading tree levels without rehashing"""
+        tree = MerkleTree.from_leaves([f"hash_{i}" for i in range(11)])
+        restored = MerkleTree.from_dict(tree.to_dict())
+        self.assertEqual(restored.levels, tree.levels)
+        self.assertEqual(restored.append("hash_11"), tree.append("hash_11"))
+        
+        data = tree.to_dict()
+        data["levels"][-1][0] = "tampered"
+        with self.assertRaises(ValueError):
+            MerkleTree.from_dict(data)
+
+
 if __name__ == "__main__":
     unittest.main()
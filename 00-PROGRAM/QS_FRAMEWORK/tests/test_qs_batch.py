@@ -0,0 +1,169 @@
+"""
+Unit tests for the QS batch evaluation engine
+"""
+
+import sys
+import os
+
+# Add src directory to path
+src_path = os.path.join(os.path.dirname(__file__), '..', 'src')
+sys.path.insert(0, src_path)
+
+import random
+import unittest
+
+# Import modules directly (not as package)
+import qs_batch
+import qs_field
+
+Candidate = qs_field.Candidate
+QSField = qs_field.QSField
+
+
+def _make_field(n, objectives=("performance", "cost", "risk"), seed=0, grid=None):
+    """Build a field with random scores; grid quantizes values to force ties."""
+    rng = random.Random(seed)
+    candidates = []
+    for i in range(n):
+        scores = {}
+        for obj in objectives:
+            value = rng.random()
+            if grid:
+                value = round(value * grid) / grid
+            scores[obj] = value
+        if i % 7 == 0:
+            scores.pop(objectives[-1])  # missing objective counts as +inf
+        scores["aggregate"] = rng.random()
+        candidates.append(Candidate(
+            id=f"x_{i}",
+            configuration={"param": i},
+            utcs_manifest={},
+            score_vector=scores,
+            uncertainty={},
+            bounds={},
+            constraints_satisfied={"C0": i % 3 != 0, "C1": i % 5 != 0},
+            provenance={},
+        ))
+    return QSField(
+        version="QS_TEST_v1",
+        candidates=candidates,
+        scores=[c.score_vector["aggregate"] for c in candidates],
+        bounds={},
+        priors={},
+        constraints={},
+    )
+
+
+def _reference_pareto(field, objectives):
+    """Original pairwise get_pareto_frontier loop."""
+    pareto_set = []
+    for candidate in field.candidates:
+        is_dominated = False
+        for other in field.candidates:
+            if candidate.id == other.id:
+                continue
+            dominates = True
+            strictly_better_in_one = False
+            for obj in objectives:
+                cand_score = candidate.score_vector.get(obj, float('inf'))
+                other_score = other.score_vector.get(obj, float('inf'))
+                if other_score > cand_score:
+                    dominates = False
+                    break
+                if other_score < cand_score:
+                    strictly_better_in_one = True
+            if dominates and strictly_better_in_one:
+                is_dominated = True
+                break
+        if not is_dominated:
+            pareto_set.append(candidate)
+    return pareto_set
+
+
+class TestWeightedSum(unittest.TestCase):
+    """Test batch criteria evaluation"""
+
+    def test_matches_per_candidate_scores(self):
+        """Batch scores are bit-identical to _evaluate_criteria"""
+        field = _make_field(300)
+        criteria = {
+            "evaluation_method": "weighted_sum",
+            "weights": {"performance": 0.5, "cost": 0.3, "risk": 0.2},
+            "penalty_weight": 1000.0,
+        }
+        expected = [field._evaluate_criteria(c, criteria) for c in field.candidates]
+        self.assertEqual(qs_batch.weighted_sum_scores(field.candidates, criteria), expected)
+
+    def test_collapse_selects_reference_argmin(self):
+        """Collapse selects the same candidate as the per-candidate path"""
+        field = _make_field(300, seed=3)
+        field.freeze()
+        criteria = {"evaluation_method": "weighted_sum", "weights": {"cost": 2.0}}
+        expected = [field._evaluate_criteria(c, criteria) for c in field.candidates]
+        idx = min(range(len(expected)), key=lambda i: expected[i])
+
+        x_star, record = field.collapse(criteria)
+        self.assertEqual(x_star.id, field.candidates[idx].id)
+        self.assertEqual(record["selection_scores"]["all_scores_K"], expected)
+
+    def test_custom_method_uses_callable(self):
+        """Custom evaluation falls back to the per-candidate callable"""
+        field = _make_field(20)
+        criteria = {
+            "evaluation_method": "custom",
+            "objective_function_callable": lambda c: -c.configuration["param"],
+        }
+        scores = qs_batch.evaluate_criteria_batch(
+            field.candidates, criteria, field._evaluate_criteria
+        )
+        self.assertEqual(qs_batch.argmin(scores), 19)
+
+    def test_unknown_method_raises(self):
+        """Unknown evaluation methods raise ValueError"""
+        field = _make_field(5)
+        field.freeze()
+        with self.assertRaises(ValueError):
+            field.collapse({"evaluation_method": "lexicographic"})
+
+
+class TestParetoFrontier(unittest.TestCase):
+    """Test sub-quadratic Pareto extraction"""
+
+    def assertSameFront(self, field, objectives):
+        expected = [c.id for c in _reference_pareto(field, objectives)]
+        actual = [c.id for c in field.get_pareto_frontier(objectives)]
+        self.assertEqual(actual, expected)
+
+    def test_two_objectives(self):
+        """2-D sweep matches the pairwise reference"""
+        for seed in range(5):
+            self.assertSameFront(_make_field(400, seed=seed), ["performance", "cost"])
+
+    def test_three_objectives(self):
+        """Sort-filter-skyline matches the pairwise reference"""
+        for seed in range(5):
+            self.assertSameFront(_make_field(400, seed=seed), ["performance", "cost", "risk"])
+
+    def test_ties_and_duplicates(self):
+        """Quantized scores with many ties match the pairwise reference"""
+        for seed in range(5):
+            field = _make_field(300, seed=seed, grid=4)
+            self.assertSameFront(field, ["performance", "cost"])
+            self.assertSameFront(field, ["performance", "cost", "risk"])
+
+    def test_single_and_no_objectives(self):
+        """Degenerate objective lists match the pairwise reference"""
+        field = _make_field(100, grid=10)
+        self.assertSameFront(field, ["cost"])
+        self.assertSameFront(field, [])
+        self.assertSameFront(field, ["unknown"])
+
+    def test_nan_falls_back_to_pairwise(self):
+        """NaN scores use pairwise comparison semantics"""
+        field = _make_field(50, seed=2)
+        field.candidates[4].score_vector["cost"] = float('nan')
+        self.assertSameFront(field, ["performance", "cost"])
+
+
+if __name__ == "__main__":
+    unittest.main()
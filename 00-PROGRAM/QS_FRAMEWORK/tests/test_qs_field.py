@@ -62,6 +62,56 @@ class TestCandidate(unittest.TestCase):
         candidate2 = Candidate.from_dict(data)
         self.assertEqual(candidate.id, candidate2.id)
         self.assertEqual(candidate.hash, candidate2.hash)
+    
+    def test_candidate_hash_pinned(self):
+        """Candidate digests must stay stable across releases"""
+        candidate = Candidate(**self.candidate_data)
+        self.assertEqual(
+            candidate.hash,
+            "0421f50e4d490140438f89e3464f76140d80474565c01026f06b2cfd922a5184",
+        )
+    
+    def test_candidate_hash_lazy(self):
+        """Nothing is hashed until the hash is read"""
+        candidate = Candidate(**self.candidate_data)
+        self.assertEqual(candidate._digests, {})
+        candidate.hash
+        self.assertEqual(set(candidate._digests), set(qs_field.HASH_SECTIONS))
+    
+    def test_candidate_hash_invalidated_on_assignment(self):
+        """Reassigning a field drops only that section's digest"""
+        candidate = Candidate(**self.candidate_data)
+        original = candidate.hash
+        candidate.score_vector = {**candidate.score_vector, "aggregate": 0.5}
+        self.assertNotIn("score_vector", candidate._digests)
+        self.assertIn("configuration", candidate._digests)
+        self.assertNotEqual(candidate.hash, original)
+        self.assertEqual(
+            candidate.hash,
+            Candidate(**{**self.candidate_data, "score_vector": candidate.score_vector}).hash,
+        )
+    
+    def test_candidate_invalidate_hash_after_in_place_change(self):
+        """In-place mutation needs an explicit invalidate_hash"""
+        candidate = Candidate(**self.candidate_data)
+        original = candidate.hash
+        candidate.configuration["param_1"] = 11.0
+        self.assertEqual(candidate.hash, original)
+        candidate.invalidate_hash("configuration")
+        self.assertNotEqual(candidate.hash, original)
+        with self.assertRaises(ValueError):
+            candidate.invalidate_hash("hash")
+    
+    def test_candidate_evolve_reuses_digests(self):
+        """evolve carries over digests of unchanged sections"""
+        candidate = Candidate(**self.candidate_data)
+        candidate.hash
+        updated = candidate.evolve(provenance={"generated_by": "update"})
+        self.assertEqual(set(updated._digests), set(qs_field.HASH_SECTIONS) - {"provenance"})
+        self.assertEqual(
+            updated.hash,
+            Candidate(**{**self.candidate_data, "provenance": {"generated_by": "update"}}).hash,
+        )
 
 
 class TestQSField(unittest.TestCase):
@@ -155,6 +205,19 @@ class TestQSField(unittest.TestCase):
         self.qs_field.candidates[0].id = original_id
         self.qs_field.candidates[0].__post_init__()
     
+    def test_inclusion_proof(self):
+        """Test Merkle inclusion proof for a candidate"""
+        self.qs_field.freeze()
+        index, proof = self.qs_field.get_inclusion_proof("x_7")
+        candidate = self.qs_field.candidates[index]
+        self.assertEqual(candidate.id, "x_7")
+        self.assertTrue(merkle.verify_merkle_proof(
+            candidate.hash, proof, self.qs_field.merkle_root, index=index
+        ))
+        
+        with self.assertRaises(ValueError):
+            self.qs_field.get_inclusion_proof("x_999")
+    
     def test_coverage_metrics(self):
         """Test coverage metrics computation"""
         metrics = self.qs_field.compute_coverage_metrics()
@@ -192,6 +255,106 @@ class TestQSField(unittest.TestCase):
         
         self.assertEqual(qs_field_2.version, self.qs_field.version)
         self.assertEqual(len(qs_field_2.candidates), len(self.qs_field.candidates))
+    
+    def test_to_dict_records_hash_scheme(self):
+        """Exports carry the hash scheme and reload under it"""
+        self.qs_field.freeze()
+        data = self.qs_field.to_dict()
+        self.assertEqual(data["hash_scheme"], qs_field.HASH_SCHEME)
+        self.assertEqual(data["candidates"][0]["hash_scheme"], qs_field.HASH_SCHEME)
+        reloaded = QSField.from_dict(data)
+        self.assertEqual(reloaded.hash_scheme, qs_field.HASH_SCHEME)
+        self.assertTrue(reloaded.validate_integrity())
+    
+    def test_unknown_hash_scheme(self):
+        data = self.qs_field.to_dict()
+        data["hash_scheme"] = "sha3-v9"
+        with self.assertRaises(ValueError):
+            QSField.from_dict(data)
+
+
+def legacy_export():
+    """Frozen field as exported by releases before the canonical hash scheme"""
+    hashes = [
+        "342e57cd5e4d7aa71cf9bb828ea214fe92068f4a98c81787656174e659e2b0a9",
+        "9e9fd202dd06cb2b6c4f58196e91ff0e11ff97b039c5630f675bb944ccc8bd43",
+        "5337d75d87a4c62053395f5394d7dd29173a3087658057fabefe9bc8545e7cbc",
+    ]
+    candidates = [
+        {
+            "id": f"x_{i}",
+            "configuration": {"span_m": 30.0 + i},
+            "utcs_manifest": {},
+            "score_vector": {"mass_kg": 1200.0 + i},
+            "uncertainty": {},
+            "bounds": {"mass_kg": [1100, 1300]},
+            "constraints_satisfied": {"C0_safety": True},
+            "provenance": {"generated_by": "v0"},
+            "hash": hashes[i],
+        }
+        for i in range(3)
+    ]
+    return {
+        "version": "QS_LEGACY_v0",
+        "candidates": candidates,
+        "scores": [0.1, 0.2, 0.3],
+        "bounds": {},
+        "priors": {},
+        "constraints": {},
+        "merkle_root": "e6f0f34d79454de7f060bba48a4c7506d0f93bc83687965a33cf76fc21a09dfe",
+        "timestamp": "2025-01-01T00:00:00Z",
+        "frozen": True,
+        "metadata": {},
+    }
+
+
+class TestLegacyHashScheme(unittest.TestCase):
+    """Test fields exported before the canonical hash scheme"""
+    
+    def test_legacy_export_validates(self):
+        data = legacy_export()
+        loaded = QSField.from_dict(legacy_export())
+        self.assertEqual(loaded.hash_scheme, qs_field.LEGACY_HASH_SCHEME)
+        self.assertEqual(
+            [qs_field.legacy_candidate_hash(c) for c in loaded.candidates],
+            [c["hash"] for c in data["candidates"]],
+        )
+        self.assertTrue(loaded.validate_integrity())
+        
+        loaded.candidates[1].score_vector = {"mass_kg": 999.0}
+        self.assertFalse(loaded.validate_integrity())
+    
+    def test_legacy_inclusion_proof(self):
+        loaded = QSField.from_dict(legacy_export())
+        index, proof = loaded.get_inclusion_proof("x_2")
+        self.assertTrue(merkle.verify_merkle_proof(
+            qs_field.legacy_candidate_hash(loaded.candidates[index]), proof, loaded.merkle_root, index=index
+        ))
+    
+    def test_upgrade_hash_scheme(self):
+        loaded = QSField.from_dict(legacy_export())
+        root = loaded.upgrade_hash_scheme()
+        self.assertEqual(loaded.hash_scheme, qs_field.HASH_SCHEME)
+        self.assertEqual(root, merkle.compute_merkle_root([c.hash for c in loaded.candidates]))
+        self.assertEqual(loaded.merkle_root, root)
+        self.assertTrue(loaded.validate_integrity())
+        self.assertTrue(QSField.from_dict(loaded.to_dict()).validate_integrity())
+    
+    def test_upgrade_rejects_tampered_field(self):
+        data = legacy_export()
+        data["candidates"][0]["id"] = "tampered"
+        loaded = QSField.from_dict(data)
+        with self.assertRaises(ValueError):
+            loaded.upgrade_hash_scheme()
+        self.assertEqual(loaded.hash_scheme, qs_field.LEGACY_HASH_SCHEME)
+    
+    def test_refreeze_uses_current_scheme(self):
+        data = legacy_export()
+        data["frozen"] = False
+        loaded = QSField.from_dict(data)
+        loaded.freeze()
+        self.assertEqual(loaded.hash_scheme, qs_field.HASH_SCHEME)
+        self.assertTrue(loaded.validate_integrity())
 
 
 if __name__ == "__main__":
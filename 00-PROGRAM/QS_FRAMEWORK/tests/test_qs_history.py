@@ -0,0 +1,208 @@
+"""
+Unit tests for the QS field history store
+"""
+
+import sys
+import os
+
+# Add src directory to path
+src_path = os.path.join(os.path.dirname(__file__), '..', 'src')
+sys.path.insert(0, src_path)
+
+import random
+import unittest
+
+# Import modules directly (not as package)
+import qs_api
+import qs_history
+
+FieldHistory = qs_history.FieldHistory
+
+
+def assert_same_field(test, loaded, original):
+    test.assertEqual(loaded.candidates, original.candidates)
+    for name in qs_history.FIELD_ATTRIBUTES:
+        test.assertEqual(getattr(loaded, name), getattr(original, name), name)
+
+
+class TestFieldHistory(unittest.TestCase):
+    """Test FieldHistory recording and reconstruction"""
+    
+    def setUp(self):
+        random.seed(3)
+        # History is driven by hand; the API's own store is left unbounded
+        self.api = qs_api.QSAPI()
+        self.field = self.api.create({"num_candidates": 15}, {"wind_tunnel": []}, {}, version="QS_HIST_v1")
+    
+    def lineage(self, history, updates):
+        """Record a field and `updates` successive evidence updates."""
+        fields, ids = [self.field], [history.record(self.field, event="create")]
+        for i in range(updates):
+            fields.append(self.api.update_evidence(fields[-1], {"description": f"run {i}"}))
+            ids.append(history.record(fields[-1]))
+        return fields, ids
+    
+    def test_reconstructs_every_version(self):
+        history = FieldHistory(snapshot_interval=4)
+        fields, ids = self.lineage(history, 10)
+        for entry_id, original in zip(ids, fields):
+            assert_same_field(self, history.get(entry_id), original)
+    
+    def test_snapshots_and_deltas(self):
+        """A snapshot every interval; deltas are much smaller"""
+        history = FieldHistory(snapshot_interval=3)
+        self.lineage(history, 6)
+        entries = history.entries()
+        self.assertEqual([e["kind"] for e in entries],
+                         ["snapshot", "delta", "delta", "snapshot", "delta", "delta", "snapshot"])
+        self.assertLess(entries[1]["bytes"], entries[0]["bytes"] / 3)
+        self.assertEqual(history.nbytes, sum(e["bytes"] for e in entries))
+    
+    def test_unchanged_field_records_empty_delta(self):
+        history = FieldHistory()
+        first = history.record(self.field)
+        second = history.record(self.field, event="freeze")
+        entries = history.entries()
+        self.assertEqual(entries[1]["kind"], "delta")
+        self.assertLess(entries[1]["bytes"], 64)
+        assert_same_field(self, history.get(second), history.get(first))
+    
+    def test_key_level_delta_is_exact(self):
+        """Removed keys and same-value type changes survive reconstruction"""
+        history = FieldHistory()
+        history.record(self.field)
+        candidate = self.field.candidates[0]
+        configuration = dict(candidate.configuration)
+        del configuration["param_3"]
+        configuration["param_1"] = 1
+        configuration["flag"] = True
+        candidate.configuration = configuration
+        entry_id = history.record(self.field)
+        loaded = history.get(entry_id).candidates[0]
+        self.assertEqual(history.entries()[-1]["kind"], "delta")
+        self.assertEqual(loaded.configuration, configuration)
+        self.assertIs(type(loaded.configuration["param_1"]), int)
+        self.assertEqual(loaded.hash, candidate.hash)
+        configuration["param_1"] = 1.0
+        candidate.configuration = dict(configuration)
+        self.assertIs(type(history.get(history.record(self.field)).candidates[0].configuration["param_1"]), float)
+    
+    def test_base_mutated_in_place_after_recording(self):
+        """Deltas are taken against the recorded base, not the live candidate"""
+        history = FieldHistory()
+        first = history.record(self.field)
+        candidate = self.field.candidates[0]
+        successor = self.api.update_evidence(self.field, {"description": "rerun"})
+        successor.candidates[0].configuration = {**candidate.configuration, "param_2": -2.0}
+        # The base now matches the new value, so a naive key diff would miss it
+        candidate.configuration["param_2"] = -2.0
+        candidate.invalidate_hash("configuration")
+        entry_id = history.record(successor)
+        self.assertEqual(history.get(entry_id).candidates[0].configuration["param_2"], -2.0)
+        self.assertNotEqual(history.get(first).candidates[0].configuration["param_2"], -2.0)
+    
+    def test_entries_are_independent_of_later_changes(self):
+        """Freezing or mutating the live field does not change recorded state"""
+        history = FieldHistory()
+        entry_id = history.record(self.field)
+        self.field.freeze()
+        self.field.candidates[0].configuration["param_1"] = -1.0
+        loaded = history.get(entry_id)
+        self.assertFalse(loaded.frozen)
+        self.assertEqual(loaded.merkle_root, "")
+        self.assertNotEqual(loaded.candidates[0].configuration["param_1"], -1.0)
+    
+    def test_max_entries_evicts_and_rebases(self):
+        history = FieldHistory(max_entries=5, snapshot_interval=4)
+        fields, ids = self.lineage(history, 9)
+        self.assertEqual(len(history), 5)
+        for entry_id in ids[:5]:
+            self.assertNotIn(entry_id, history)
+            with self.assertRaises(KeyError):
+                history.get(entry_id)
+        self.assertEqual(history.entries()[0]["kind"], "snapshot")
+        for entry_id, original in zip(ids[5:], fields[5:]):
+            assert_same_field(self, history.get(entry_id), original)
+        self.assertEqual(history.nbytes, sum(e["bytes"] for e in history.entries()))
+    
+    def test_max_bytes_bound(self):
+        """Payloads and lineage tips together stay within max_bytes"""
+        probe = FieldHistory()
+        probe.record(self.field)
+        limit = probe.tip_bytes + 6000
+        history = FieldHistory(max_bytes=limit, snapshot_interval=8)
+        fields, ids = self.lineage(history, 20)
+        self.assertLessEqual(history.nbytes + history.tip_bytes, limit)
+        self.assertGreater(len(history), 1)
+        assert_same_field(self, history.get(ids[-1]), fields[-1])
+        # A single entry larger than the bound is still kept
+        tiny = FieldHistory(max_bytes=1)
+        entry_id = tiny.record(self.field)
+        self.assertEqual(len(tiny), 1)
+        assert_same_field(self, tiny.get(entry_id), self.field)
+    
+    def test_unrelated_fields_are_snapshots(self):
+        history = FieldHistory()
+        history.record(self.field)
+        other = self.api.create({"num_candidates": 5}, {}, {}, version="QS_OTHER_v1")
+        entry_id = history.record(other, event="create")
+        self.assertEqual(history.entries()[-1]["kind"], "snapshot")
+        assert_same_field(self, history.get(entry_id), other)
+        self.assertEqual(history.find("QS_OTHER_v1"), entry_id)
+        self.assertIsNone(history.find("QS_MISSING_v1"))
+    
+    def test_other_lineage_tips_count_against_bound(self):
+        """Tips of other lineages are dropped before entries are evicted"""
+        history = FieldHistory()
+        history.record(self.field)
+        tip_bytes = history.tip_bytes
+        other = self.api.create({"num_candidates": 14}, {}, {}, version="QS_OTHER_v1")
+        history.record(other)
+        self.assertGreater(history.tip_bytes, tip_bytes)
+        
+        bounded = FieldHistory(max_bytes=history.nbytes + history.tip_bytes - 1)
+        bounded.record(self.field)
+        bounded.record(other)
+        self.assertEqual(len(bounded), 2)
+        self.assertEqual(len(bounded._tips), 1)
+        self.assertLessEqual(bounded.nbytes + bounded.tip_bytes, bounded.max_bytes)
+        # Without its tip the first lineage starts again from a snapshot
+        bounded.record(self.field)
+        self.assertEqual(bounded.entries()[-1]["kind"], "snapshot")
+    
+    def test_recording_does_not_hash_candidates(self):
+        """Recording leaves candidate hashes lazy"""
+        history = FieldHistory()
+        fields, _ = self.lineage(history, 3)
+        for field in fields:
+            for candidate in field.candidates:
+                self.assertIsNone(candidate._hash)
+    
+    def test_invalid_bounds(self):
+        with self.assertRaises(ValueError):
+            FieldHistory(max_entries=0)
+
+
+class TestQSAPIHistory(unittest.TestCase):
+    """Test QSAPI recording into its history"""
+    
+    def test_lifecycle_is_recorded(self):
+        random.seed(5)
+        api = qs_api.QSAPI(history=FieldHistory(max_entries=10))
+        field = api.create({"num_candidates": 8}, {}, {}, version="QS_API_v1")
+        field = api.update_evidence(field, {"description": "flight test"})
+        merkle_root = api.freeze(field)
+        x_star, _ = api.collapse(field, {"evaluation_method": "weighted_sum"})
+        
+        entries = api.history.entries()
+        self.assertEqual([e["event"] for e in entries], ["create", "update", "freeze", "collapse"])
+        self.assertEqual(entries[-1]["detail"]["selected_candidate"], x_star.id)
+        history = api.get_field_history()
+        self.assertEqual([f.version for f in history], ["QS_API_v1", "QS_API_v2", "QS_API_v2", "QS_API_v2"])
+        self.assertFalse(history[1].frozen)
+        self.assertEqual(history[2].merkle_root, merkle_root)
+        self.assertTrue(history[2].validate_integrity())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+"""
+Unit tests for QS field secondary indexes
+"""
+
+import sys
+import os
+
+# Add src directory to path
+src_path = os.path.join(os.path.dirname(__file__), '..', 'src')
+sys.path.insert(0, src_path)
+
+import math
+import random
+import unittest
+
+# Import modules directly (not as package)
+import qs_field
+import qs_index
+
+Candidate = qs_field.Candidate
+QSField = qs_field.QSField
+
+
+def build_field(n=300, seed=7):
+    """Field with coarse (tie-heavy) and missing attribute values."""
+    rng = random.Random(seed)
+    candidates = []
+    for i in range(n):
+        configuration = {"span_m": round(rng.uniform(28, 40), 1), "chord_m": rng.uniform(1.5, 3.0)}
+        if i % 10 == 0:
+            del configuration["chord_m"]
+        if i % 25 == 0:
+            configuration["span_m"] = "tbd"
+        candidates.append(Candidate(
+            id=f"x_{i}",
+            configuration=configuration,
+            utcs_manifest={},
+            score_vector={"mass_kg": float(rng.randrange(1150, 1450, 10))},
+            uncertainty={},
+            bounds={},
+            constraints_satisfied={"C0_safety": i % 3 != 0},
+            provenance={},
+        ))
+    return QSField(
+        version="QS_INDEX_v1",
+        candidates=candidates,
+        scores=[0.0] * n,
+        bounds={},
+        priors={},
+        constraints={},
+    )
+
+
+def value(candidate, attribute):
+    section, _, key = attribute.partition(".")
+    v = getattr(candidate, section).get(key)
+    return float(v) if isinstance(v, (int, float)) else None
+
+
+class TestParseRange(unittest.TestCase):
+    """Test range condition parsing"""
+    
+    def test_forms(self):
+        self.assertEqual(qs_index.parse_range((1, 2)), (1, True, 2, True))
+        self.assertEqual(qs_index.parse_range((None, 2)), (None, True, 2, True))
+        self.assertEqual(qs_index.parse_range({"gt": 1, "lte": 2}), (1, False, 2, True))
+        self.assertEqual(qs_index.parse_range({"lt": 5}), (None, True, 5, False))
+        self.assertEqual(qs_index.parse_range(3.5), (3.5, True, 3.5, True))
+    
+    def test_invalid(self):
+        for condition in ({"gt": 1, "gte": 2}, {"between": 1}, (1, 2, 3), "tbd"):
+            with self.assertRaises(ValueError):
+                qs_index.parse_range(condition)
+
+
+class TestFieldIndexes(unittest.TestCase):
+    """Test QSField lookups against linear scans"""
+    
+    def setUp(self):
+        self.field = build_field()
+    
+    def test_get_candidate_by_id(self):
+        self.assertIs(self.field.get_candidate_by_id("x_42"), self.field.candidates[42])
+        self.assertIsNone(self.field.get_candidate_by_id("missing"))
+    
+    def test_index_follows_candidate_changes(self):
+        """Appends rebuild the index; in-place replacement is detected on lookup"""
+        self.field.get_candidate_by_id("x_0")
+        extra = Candidate(id="x_new", configuration={}, utcs_manifest={}, score_vector={},
+                          uncertainty={}, bounds={}, constraints_satisfied={}, provenance={})
+        self.field.candidates.append(extra)
+        self.assertIs(self.field.get_candidate_by_id("x_new"), extra)
+        replacement = Candidate(id="x_renamed", configuration={}, utcs_manifest={}, score_vector={},
+                                uncertainty={}, bounds={}, constraints_satisfied={}, provenance={})
+        self.field.candidates[5] = replacement
+        self.assertIsNone(self.field.get_candidate_by_id("x_5"))
+        self.assertIs(self.field.get_candidate_by_id("x_renamed"), replacement)
+
+    def test_same_length_replacement_finds_new_id(self):
+        """A new id put in place is found without looking up the old one first"""
+        self.field.get_candidate_by_id("x_0")
+        replacement = Candidate(id="c", configuration={}, utcs_manifest={}, score_vector={},
+                                uncertainty={}, bounds={}, constraints_satisfied={}, provenance={})
+        self.field.candidates[0] = replacement
+        self.assertIs(self.field.get_candidate_by_id("c"), replacement)
+        self.assertIsNone(self.field.get_candidate_by_id("x_0"))
+        self.assertIsNone(self.field.get_candidate_by_id("missing"))
+
+    def test_query_matches_scan(self):
+        """Box queries return what a linear filter returns, in field order"""
+        queries = [
+            {"configuration.span_m": (30.0, 36.0)},
+            {"configuration.span_m": (30.0, 36.0), "score_vector.mass_kg": {"lt": 1300.0}},
+            {"configuration.span_m": {"gt": 33.3}, "configuration.chord_m": (None, 2.0)},
+            {"score_vector.mass_kg": 1200.0},
+            {"constraints_satisfied.C0_safety": True, "score_vector.mass_kg": {"gte": 1400.0}},
+            {"configuration.span_m": (50.0, 60.0)},
+            {"configuration.missing": (0, 1)},
+        ]
+        for ranges in queries:
+            expected = [
+                c for c in self.field.candidates
+                if all(qs_index._in_range(value(c, a), qs_index.parse_range(r)) for a, r in ranges.items())
+            ]
+            self.assertEqual(self.field.query_candidates(ranges), expected, ranges)
+        self.assertEqual(self.field.query_candidates({}), self.field.candidates)
+    
+    def test_strict_bounds(self):
+        """gt/lt exclude values equal to the bound"""
+        matched = self.field.query_candidates({"score_vector.mass_kg": {"gt": 1200.0, "lt": 1220.0}})
+        self.assertTrue(matched)
+        self.assertTrue(all(c.score_vector["mass_kg"] == 1210.0 for c in matched))
+    
+    def test_nearest_matches_brute_force(self):
+        """k-NN returns the brute-force neighbours, ties broken by position"""
+        attributes = ("configuration.span_m", "configuration.chord_m")
+        usable = [(i, c) for i, c in enumerate(self.field.candidates)
+                  if all(value(c, a) is not None for a in attributes)]
+        for normalize in (False, True):
+            scales = []
+            for a in attributes:
+                column = [value(c, a) for _, c in usable]
+                scales.append((max(column) - min(column)) if normalize else 1.0)
+            for point in ({attributes[0]: 33.0, attributes[1]: 2.2},
+                          {attributes[0]: 45.0, attributes[1]: 0.0}):
+                for k in (1, 7, len(usable) + 5):
+                    expected = sorted(
+                        (math.dist([value(c, a) / s for a, s in zip(attributes, scales)],
+                                   [point[a] / s for a, s in zip(attributes, scales)]), i)
+                        for i, c in usable
+                    )[:k]
+                    result = self.field.nearest_candidates(point, k=k, normalize=normalize)
+                    self.assertEqual([c.id for c, _ in result],
+                                     [self.field.candidates[i].id for _, i in expected])
+                    for (_, distance), (expected_distance, _) in zip(result, expected):
+                        self.assertAlmostEqual(distance, expected_distance)
+    
+    def test_nearest_single_attribute(self):
+        result = self.field.nearest_candidates({"score_vector.mass_kg": 1305.0}, k=2, normalize=False)
+        self.assertEqual(len(result), 2)
+        self.assertTrue(all(abs(c.score_vector["mass_kg"] - 1305.0) == 5.0 for c, _ in result))
+        with self.assertRaises(ValueError):
+            self.field.nearest_candidates({})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+"""
+Unit tests for the columnar QS field format
+"""
+
+import sys
+import os
+
+# Add src directory to path
+src_path = os.path.join(os.path.dirname(__file__), '..', 'src')
+sys.path.insert(0, src_path)
+
+import tempfile
+import unittest
+
+# Import modules directly (not as package)
+import merkle
+import qs_api
+import qs_field
+import qs_store
+
+Candidate = qs_field.Candidate
+QSField = qs_field.QSField
+
+
+def build_field(n=25):
+    """Field with every column kind, absent keys and mixed-type keys."""
+    candidates = []
+    for i in range(n):
+        configuration = {"span_m": 30.0 + i, "ribs": i, "material": f"Al-{i % 3}"}
+        if i % 4 == 0:
+            configuration["winglet"] = {"cant_deg": 15.0, "tags": ["a", "b"]}
+        candidates.append(Candidate(
+            id=f"x_{i}",
+            configuration=configuration,
+            utcs_manifest={"context": "test", "revision": i % 2 if i % 5 else "draft"},
+            score_vector={"performance": 0.5 + i * 0.01, "aggregate": 1.0 - i * 0.02},
+            uncertainty={"sigma_performance": 0.05} if i % 2 else {},
+            bounds={"weight_kg": (1200.0 + i, 1350.0 + i), "load": (1, 3)},
+            constraints_satisfied={"C0_safety": i % 3 != 0},
+            provenance={"generated_by": "test", "evidence_refs": [f"wt_{i}"], "note": None},
+        ))
+    return QSField(
+        version="QS_STORE_v1",
+        candidates=candidates,
+        scores=[c.score_vector["aggregate"] for c in candidates],
+        bounds={"weight_kg": [(1200.0, 1374.0)]},
+        priors={"C_0": {"max_weight_kg": 1400}},
+        constraints={"C_0": {"max_weight_kg": 1400}},
+        metadata={"problem": "wing sizing"},
+    )
+
+
+class TestColumnarStore(unittest.TestCase):
+    """Test write_field / QSFieldReader"""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "field.qsf")
+        self.field = build_field()
+        self.field.freeze()
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def assertFieldEqual(self, loaded, original):
+        self.assertEqual(loaded.candidates, original.candidates)
+        self.assertEqual([c.hash for c in loaded.candidates], [c.hash for c in original.candidates])
+        for attr in ("version", "scores", "bounds", "priors", "constraints",
+                     "merkle_root", "timestamp", "frozen", "metadata", "hash_scheme"):
+            self.assertEqual(getattr(loaded, attr), getattr(original, attr), attr)
+    
+    def test_round_trip(self):
+        """A written field loads back equal, with the same Merkle root"""
+        for compression in ("zlib", None):
+            qs_store.write_field(self.field, self.path, chunk_rows=7, compression=compression)
+            loaded = qs_store.read_field(self.path)
+            self.assertFieldEqual(loaded, self.field)
+            self.assertTrue(loaded.validate_integrity())
+    
+    def test_legacy_hash_scheme_round_trip(self):
+        """Fields verified under the legacy hash scheme keep it"""
+        self.field.hash_scheme = qs_field.LEGACY_HASH_SCHEME
+        self.field.merkle_root = merkle.compute_merkle_root(
+            [qs_field.legacy_candidate_hash(c) for c in self.field.candidates]
+        )
+        qs_store.write_field(self.field, self.path)
+        loaded = qs_store.read_field(self.path)
+        self.assertFieldEqual(loaded, self.field)
+        self.assertTrue(loaded.validate_integrity())
+    
+    def test_unfrozen_round_trip(self):
+        """Unfrozen fields round-trip without a hash column"""
+        field = build_field(5)
+        qs_store.write_field(field, self.path)
+        with qs_store.QSFieldReader(self.path) as reader:
+            self.assertNotIn("hash", reader.columns)
+            self.assertEqual(reader.merkle_root, "")
+            self.assertFieldEqual(reader.read_field(), field)
+    
+    def test_header(self):
+        """The header carries the row count and Merkle root"""
+        qs_store.write_field(self.field, self.path, chunk_rows=7)
+        with qs_store.QSFieldReader(self.path) as reader:
+            self.assertEqual(reader.rows, 25)
+            self.assertEqual(reader.chunk_rows, 7)
+            self.assertEqual(reader.merkle_root, self.field.merkle_root)
+            self.assertEqual(reader.version, "QS_STORE_v1")
+    
+    def test_column_kinds(self):
+        """Keys get typed columns; mixed or nested values fall back to json"""
+        qs_store.write_field(self.field, self.path)
+        with qs_store.QSFieldReader(self.path) as reader:
+            kinds = {name: reader.column_kind(name) for name in reader.columns}
+        self.assertEqual(kinds["configuration.span_m"], "f8")
+        self.assertEqual(kinds["configuration.ribs"], "i8")
+        self.assertEqual(kinds["configuration.material"], "str")
+        self.assertEqual(kinds["configuration.winglet"], "json")
+        self.assertEqual(kinds["utcs_manifest.revision"], "json")
+        self.assertEqual(kinds["bounds.weight_kg"], "f8x2")
+        self.assertEqual(kinds["bounds.load"], "i8x2")
+        self.assertEqual(kinds["constraints_satisfied.C0_safety"], "b1")
+        self.assertEqual(kinds["hash"], "h32")
+    
+    def test_partial_columns_and_rows(self):
+        """Selected columns and row ranges spanning chunks"""
+        qs_store.write_field(self.field, self.path, chunk_rows=7)
+        with qs_store.QSFieldReader(self.path) as reader:
+            columns = reader.read_columns(["id", "score_vector.performance", "uncertainty.sigma_performance"], 5, 16)
+            self.assertEqual(columns["id"], [f"x_{i}" for i in range(5, 16)])
+            self.assertEqual(
+                columns["score_vector.performance"],
+                [c.score_vector["performance"] for c in self.field.candidates[5:16]],
+            )
+            self.assertEqual(
+                columns["uncertainty.sigma_performance"],
+                [0.05 if i % 2 else None for i in range(5, 16)],
+            )
+            self.assertEqual(reader.read_candidates(5, 16), self.field.candidates[5:16])
+            self.assertEqual(reader.read_column("hash", 24), [self.field.candidates[24].hash])
+            self.assertEqual(reader.read_candidates(30, 40), [])
+            with self.assertRaises(KeyError):
+                reader.read_column("score_vector.missing")
+    
+    def test_partial_field(self):
+        """A row-range field keeps the stored root, so integrity fails"""
+        qs_store.write_field(self.field, self.path, chunk_rows=7)
+        partial = qs_store.read_field(self.path, 3, 10)
+        self.assertEqual(partial.candidates, self.field.candidates[3:10])
+        self.assertEqual(partial.scores, self.field.scores[3:10])
+        self.assertFalse(partial.validate_integrity())
+    
+    def test_empty_field(self):
+        """A field without candidates round-trips"""
+        field = QSField(version="QS_EMPTY_v1", candidates=[], scores=[], bounds={}, priors={}, constraints={})
+        qs_store.write_field(field, self.path)
+        self.assertFieldEqual(qs_store.read_field(self.path), field)
+    
+    def test_rejects_other_files(self):
+        """Files without the magic are rejected"""
+        with open(self.path, "wb") as f:
+            f.write(b"{}" * 64)
+        with self.assertRaises(ValueError):
+            qs_store.QSFieldReader(self.path)
+    
+    def test_api_export_import(self):
+        """QSAPI exports binary on request and detects it on import"""
+        api = qs_api.QSAPI()
+        api.export_field(self.field, self.path, format="binary")
+        self.assertFieldEqual(api.import_field(self.path), self.field)
+        json_path = os.path.join(self.tmpdir.name, "field.json")
+        api.export_field(self.field, json_path)
+        self.assertEqual(api.import_field(json_path).merkle_root, self.field.merkle_root)
+        with self.assertRaises(ValueError):
+            api.export_field(self.field, json_path, format="xml")
+
+
+if __name__ == "__main__":
+    unittest.main()
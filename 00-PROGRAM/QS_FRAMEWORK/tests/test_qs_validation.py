@@ -0,0 +1,171 @@
+"""
+Unit tests for the QS batch validation engine
+"""
+
+import sys
+import os
+
+# Add src directory to path
+src_path = os.path.join(os.path.dirname(__file__), '..', 'src')
+sys.path.insert(0, src_path)
+
+import random
+import unittest
+
+# Import modules directly (not as package)
+import qs_api
+import qs_batch
+import qs_field
+import qs_validation
+
+Candidate = qs_field.Candidate
+QSField = qs_field.QSField
+
+
+def _make_field(n, version, seed=0):
+    """Build a field with predictions, bounds and mixed constraint results."""
+    rng = random.Random(seed)
+    candidates = []
+    for i in range(n):
+        weight = rng.uniform(900, 1500)
+        cost = rng.uniform(3e5, 6e5)
+        candidates.append(Candidate(
+            id=f"x_{i}",
+            configuration={"param": i},
+            utcs_manifest={},
+            score_vector={"weight_kg": weight, "cost_usd": cost, "zero": 0.0},
+            uncertainty={},
+            bounds={"weight_kg": (weight * 0.95, weight * 1.05)},
+            constraints_satisfied={"C0": i % 3 != 0, "C1": i % 5 != 0},
+            provenance={},
+        ))
+    return QSField(
+        version=version,
+        candidates=candidates,
+        scores=[0.0] * n,
+        bounds={},
+        priors={},
+        constraints={},
+    )
+
+
+def _reference_coverage(field):
+    """Original three-pass compute_coverage_metrics."""
+    candidates = field.candidates
+    feasible = sum(1 for c in candidates if all(c.constraints_satisfied.values()))
+    total = sum(len(c.constraints_satisfied) for c in candidates)
+    satisfied = sum(sum(c.constraints_satisfied.values()) for c in candidates)
+    return {
+        "total_candidates": len(candidates),
+        "feasible_candidates": feasible,
+        "coverage_ratio": feasible / len(candidates),
+        "constraint_satisfaction_rate": satisfied / total if total > 0 else 0.0,
+    }
+
+
+class TestBatchValidation(unittest.TestCase):
+    """Test validate_fields against per-call validate"""
+
+    def setUp(self):
+        self.api = qs_api.QSAPI()
+        self.fields = [_make_field(40, f"QS_NIGHTLY_{i}", seed=i) for i in range(6)]
+        rng = random.Random(99)
+        self.measurements = []
+        for field in self.fields:
+            sets = []
+            for c in rng.sample(field.candidates, 5):
+                sets.append((c.id, {
+                    "weight_kg": c.score_vector["weight_kg"] * rng.uniform(0.9, 1.1),
+                    "cost_usd": c.score_vector["cost_usd"] * rng.uniform(0.8, 1.2),
+                    "zero": 1.0,
+                    "unpredicted": 3.0,
+                }))
+            self.measurements.append(sets)
+
+    def _strip(self, report):
+        report = dict(report)
+        report.pop("timestamp")
+        return report
+
+    def test_reports_match_validate(self):
+        """Batch reports equal validate() reports, field by field"""
+        report = qs_validation.validate_fields(self.fields, self.measurements)
+        self.assertEqual(len(report["fields"]), len(self.fields))
+        for field, sets, result in zip(self.fields, self.measurements, report["fields"]):
+            self.assertEqual(result["qs_version"], field.version)
+            expected = [
+                self._strip(self.api.validate(field, field.get_candidate_by_id(cid), actual))
+                for cid, actual in sets
+            ]
+            self.assertEqual([self._strip(r) for r in result["validations"]], expected)
+            self.assertEqual(result["coverage"], _reference_coverage(field))
+
+    def test_workers_match_inline(self):
+        """Worker processes produce the same report as the inline path"""
+        inline = qs_validation.validate_fields(self.fields, self.measurements, workers=1)
+        parallel = qs_validation.validate_fields(self.fields, self.measurements, workers=3)
+        self.assertEqual(inline["fields"], [
+            {**r, "validations": [{**v, "timestamp": inline["timestamp"]} for v in r["validations"]]}
+            for r in parallel["fields"]
+        ])
+        self.assertEqual(inline["summary"], parallel["summary"])
+
+    def test_summary(self):
+        """Summary aggregates every validation and field"""
+        report = qs_validation.validate_fields(self.fields, self.measurements)
+        summary = report["summary"]
+        rmse = sorted(v["metrics"]["rmse_pct"] for r in report["fields"] for v in r["validations"])
+        self.assertEqual(summary["fields"], 6)
+        self.assertEqual(summary["validations"], 30)
+        self.assertEqual(summary["rmse_pct"]["max"], rmse[-1])
+        self.assertAlmostEqual(summary["rmse_pct"]["mean"], sum(rmse) / len(rmse))
+        self.assertEqual(summary["metrics"]["weight_kg"]["count"], 30)
+        self.assertNotIn("unpredicted", summary["metrics"])
+        self.assertEqual(sum(summary["recommendations"].values()), 30)
+        self.assertEqual(summary["coverage"]["total_candidates"], 240)
+
+    def test_mapping_measurements_and_coverage_only(self):
+        """Mappings, None entries and coverage=False are accepted"""
+        c = self.fields[0].candidates[3]
+        report = qs_validation.validate_fields(
+            self.fields[:2], [{c.id: {"weight_kg": 1000.0}}, None], coverage=False,
+        )
+        self.assertEqual(report["fields"][0]["validations"][0]["candidate_id"], c.id)
+        self.assertEqual(report["fields"][1]["validations"], [])
+        self.assertNotIn("coverage", report["fields"][0])
+        self.assertNotIn("coverage", report["summary"])
+
+    def test_errors(self):
+        """Unknown candidates, length mismatches and bad workers raise ValueError"""
+        with self.assertRaises(ValueError):
+            qs_validation.validate_fields(self.fields[:1], [{"x_999": {"weight_kg": 1.0}}])
+        with self.assertRaises(ValueError):
+            qs_validation.validate_fields(self.fields[:1], [{"x_999": {"weight_kg": 1.0}}], workers=2)
+        with self.assertRaises(ValueError):
+            qs_validation.validate_fields(self.fields, self.measurements[:2])
+        with self.assertRaises(ValueError):
+            qs_validation.validate_fields(self.fields, self.measurements, workers=0)
+
+    def test_api_validate_batch(self):
+        """QSAPI.validate_batch delegates to the engine"""
+        report = self.api.validate_batch(self.fields, self.measurements, workers=2)
+        self.assertEqual(report["summary"]["validations"], 30)
+
+
+class TestBatchCoverage(unittest.TestCase):
+    """Test coverage kernels"""
+
+    def test_coverage_matches_reference(self):
+        fields = [_make_field(n, f"QS_{n}", seed=n) for n in (1, 7, 30)]
+        fields[1].candidates[2].constraints_satisfied = {}
+        expected = [_reference_coverage(f) for f in fields]
+        self.assertEqual([f.compute_coverage_metrics() for f in fields], expected)
+        self.assertEqual(qs_validation.coverage_batch(fields), expected)
+        self.assertEqual(qs_validation.coverage_batch(fields, workers=2), expected)
+
+    def test_empty_field(self):
+        self.assertEqual(qs_batch.coverage_metrics([])["coverage_ratio"], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+"""
+Embedding service throughput and tail latency against offered load (CPU).
+
+Requests arrive as a Poisson process at each offered rate; most carry 1-8
+short texts and a small fraction are bulk requests (e.g. a document
+ingest of 256 chunks). Two paths are compared:
+
+    inline   the previous behaviour: encode() called directly inside the
+             async method, one request at a time, results via .tolist()
+    batched  EmbeddingService micro-batching on the worker pool
+
+Reported per rate: achieved texts/s, p50/p99 latency of the small
+requests, and mean batch size. The default encoder is a synthetic
+MiniLM-sized torch model (hashed token bag + two dense layers, 384-d) so
+the benchmark runs without model downloads; pass
+--model sentence-transformers/all-MiniLM-L6-v2 to use the real one.
+
+Usage:
+    python bench_batching.py --rates 100 200 400 800 --seconds 5
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import zlib
+from pathlib import Path
+
+import torch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from service import EmbeddingService
+
+SYNTHETIC = "synthetic-minilm"
+WORDS = ("landing gear actuator hydraulic pressure inspection fatigue crack "
+         "fuselage frame torque sensor telemetry fuel cell hydrogen tank").split()
+
+
+class SyntheticEncoder:
+    """CPU-bound stand-in with MiniLM-like shapes (torch releases the GIL)."""
+
+    def __init__(self, dim: int = 384, vocab: int = 30522, hidden: int = 1536):
+        torch.manual_seed(0)
+        self.vocab = vocab
+        self.bag = torch.nn.EmbeddingBag(vocab, dim, mode="mean")
+        self.ff = torch.nn.Sequential(
+            torch.nn.Linear(dim, hidden), torch.nn.GELU(), torch.nn.Linear(hidden, dim)
+        )
+
+    def encode(self, texts, normalize_embeddings=True, **kwargs):
+        ids, offsets = [], []
+        for text in texts:
+            offsets.append(len(ids))
+            ids.extend(zlib.crc32(w.encode()) % self.vocab for w in text.split())
+        with torch.no_grad():
+            x = self.bag(torch.tensor(ids), torch.tensor(offsets))
+            # A few layers of per-token-like work so cost scales with batch size
+            for _ in range(6):
+                x = x + self.ff(x)
+            if normalize_embeddings:
+                x = torch.nn.functional.normalize(x, dim=1)
+        return x.numpy()
+
+
+def make_text(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 48)))
+
+
+def make_workload(rate: float, seconds: float, bulk_share: float, bulk_size: int, seed: int = 0):
+    """[(arrival_s, texts, is_bulk)] for a Poisson process."""
+    rng = random.Random(seed)
+    t, workload = 0.0, []
+    while t < seconds:
+        t += rng.expovariate(rate)
+        bulk = rng.random() < bulk_share
+        n = bulk_size if bulk else rng.randint(1, 8)
+        workload.append((t, [make_text(rng) for _ in range(n)], bulk))
+    return workload
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run_inline(model, workload):
+    """Previous implementation: blocking encode inside the coroutine."""
+    async def generate(texts):
+        return model.encode(texts, normalize_embeddings=True, show_progress_bar=False).tolist()
+    return await drive(generate, workload)
+
+
+async def run_batched(service, workload):
+    async def generate(texts):
+        return (await service.generate_embeddings(texts))["embeddings"]
+    return await drive(generate, workload)
+
+
+async def drive(generate, workload):
+    """Issue requests at their arrival times; returns (small latencies, texts, elapsed)."""
+    latencies = []
+    start = time.perf_counter()
+
+    async def one(arrival, texts, bulk):
+        # Latency counts from the scheduled arrival, so time spent waiting
+        # on a blocked event loop is included
+        due = start + arrival
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await generate(texts)
+        if not bulk:
+            latencies.append(time.perf_counter() - due)
+
+    await asyncio.gather(*[one(*item) for item in workload])
+    elapsed = time.perf_counter() - start
+    return latencies, sum(len(texts) for _, texts, _ in workload), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding micro-batching benchmark")
+    parser.add_argument("--rates", type=float, nargs="+", default=[100, 200, 400, 800])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--bulk-share", type=float, default=0.01)
+    parser.add_argument("--bulk-size", type=int, default=256)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--model", default=SYNTHETIC)
+    parser.add_argument("--modes", nargs="+", default=["inline", "batched"])
+    args = parser.parse_args()
+
+    torch.set_num_threads(max(1, torch.get_num_threads()))
+    if args.model == SYNTHETIC:
+        model = SyntheticEncoder()
+    else:
+        model = EmbeddingService().load_model(args.model)
+
+    print(f"model: {args.model}, max_batch_size {args.max_batch_size}, "
+          f"max_wait {args.max_wait_ms} ms, workers {args.workers}")
+    print(f"{'rate':>6} {'mode':>8} {'texts/s':>9} {'p50_ms':>9} {'p99_ms':>9} {'batch':>6}")
+    for rate in args.rates:
+        workload = make_workload(rate, args.seconds, args.bulk_share, args.bulk_size)
+        for mode in args.modes:
+            if mode == "inline":
+                latencies, texts, elapsed = asyncio.run(run_inline(model, workload))
+                batch = float("nan")
+            else:
+                service = EmbeddingService(
+                    default_model=args.model,
+                    max_batch_size=args.max_batch_size,
+                    max_wait_ms=args.max_wait_ms,
+                    workers=args.workers,
+                )
+                service.models[args.model] = model
+
+                async def run():
+                    try:
+                        return await run_batched(service, workload)
+                    finally:
+                        await service.aclose()
+
+                latencies, texts, elapsed = asyncio.run(run())
+                batch = service.stats["batched_texts"] / max(1, service.stats["batches"])
+            print(f"{rate:>6.0f} {mode:>8} {texts / elapsed:>9.0f} "
+                  f"{percentile(latencies, 50) * 1e3:>9.1f} {percentile(latencies, 99) * 1e3:>9.1f} "
+                  f"{batch:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,160 @@
 """
 Embedding generation service.
+
+Concurrent ``generate_embeddings`` calls are coalesced into micro-batches:
+each (model, normalize) pair has a batcher that collects queued texts until
+``max_batch_size`` is reached or ``max_wait_ms`` has passed since the first
+one arrived, then encodes the batch on a dedicated worker pool so the event
+loop keeps serving other requests. Large requests are split across batches
+and share each batch with other pending requests, so a single big call
+cannot hold up small ones. Vectors are returned as float32 NumPy arrays.
 """
 
-from typing import List, Dict, Any, Optional
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
 
 
+class _PendingRequest:
+    """Texts from one call, filled in as their batches complete."""
+    
+    __slots__ = ("texts", "future", "next", "done", "out")
+    
+    def __init__(self, texts: List[str], future: asyncio.Future):
+        self.texts = texts
+        self.future = future
+        self.next = 0
+        self.done = 0
+        self.out: Optional[np.ndarray] = None
+    
+    @property
+    def remaining(self) -> int:
+        return len(self.texts) - self.next
+
+
+class _MicroBatcher:
+    """Coalesces queued requests for one (model, normalize) pair."""
+    
+    def __init__(self, service: "EmbeddingService", model_name: str, normalize: bool):
+        self.service = service
+        self.model_name = model_name
+        self.normalize = normalize
+        self.loop = asyncio.get_running_loop()
+        self.pending: deque = deque()
+        self.pending_texts = 0
+        self.arrival = asyncio.Event()
+        self.slots = asyncio.Semaphore(service.workers)
+        self.inflight: set = set()
+        self.task = self.loop.create_task(self._run())
+    
+    def submit(self, texts: List[str]) -> asyncio.Future:
+        future = self.loop.create_future()
+        self.pending.append(_PendingRequest(texts, future))
+        self.pending_texts += len(texts)
+        self.arrival.set()
+        return future
+    
+    async def _run(self):
+        max_batch = self.service.max_batch_size
+        max_wait = self.service.max_wait_s
+        while True:
+            while not self.pending:
+                self.arrival.clear()
+                await self.arrival.wait()
+            
+            # Wait for a full batch or until the oldest text has waited max_wait
+            deadline = self.loop.time() + max_wait
+            while self.pending_texts < max_batch:
+                timeout = deadline - self.loop.time()
+                if timeout <= 0:
+                    break
+                self.arrival.clear()
+                try:
+                    await asyncio.wait_for(self.arrival.wait(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            
+            # While every worker is busy, arrivals keep growing the next batch
+            await self.slots.acquire()
+            batch = self._take_batch(max_batch)
+            if not batch:
+                self.slots.release()
+                continue
+            task = self.loop.create_task(self._encode(batch))
+            self.inflight.add(task)
+            task.add_done_callback(self.inflight.discard)
+    
+    def _take_batch(self, max_batch: int) -> List[Tuple[_PendingRequest, int, int]]:
+        """
+        Slices (request, start, count) for one batch.
+        
+        Pending requests take turns, each contributing an equal share per
+        round, so small requests are not queued behind a large one.
+        """
+        batch = []
+        size = 0
+        while self.pending and size < max_batch:
+            share = max(1, (max_batch - size) // len(self.pending))
+            for _ in range(len(self.pending)):
+                if size >= max_batch:
+                    break
+                request = self.pending.popleft()
+                if request.future.done():
+                    # Cancelled or failed: drop its remaining texts
+                    self.pending_texts -= request.remaining
+                    continue
+                count = min(share, request.remaining, max_batch - size)
+                batch.append((request, request.next, count))
+                request.next += count
+                size += count
+                self.pending_texts -= count
+                if request.remaining:
+                    self.pending.append(request)
+        return batch
+    
+    async def _encode(self, batch: List[Tuple[_PendingRequest, int, int]]):
+        texts = [t for request, start, count in batch for t in request.texts[start:start + count]]
+        try:
+            vectors = await self.loop.run_in_executor(
+                self.service.executor, self.service.encode, self.model_name, texts, self.normalize
+            )
+        except Exception as e:
+            for request, _, _ in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            return
+        finally:
+            self.slots.release()
+        
+        self.service.stats["batches"] += 1
+        self.service.stats["batched_texts"] += len(texts)
+        self.service.stats["max_batch"] = max(self.service.stats["max_batch"], len(texts))
+        
+        offset = 0
+        for request, start, count in batch:
+            if request.future.done():
+                offset += count
+                continue
+            if request.out is None:
+                request.out = np.empty((len(request.texts), vectors.shape[1]), dtype=np.float32)
+            request.out[start:start + count] = vectors[offset:offset + count]
+            offset += count
+            request.done += count
+            if request.done == len(request.texts):
+                request.future.set_result(request.out)
+    
+    async def aclose(self):
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        if self.inflight:
+            await asyncio.gather(*self.inflight, return_exceptions=True)
+
+
 class EmbeddingService:
     """
     Service for generating text embeddings.
@@ -13,9 +162,28 @@ class EmbeddingService:
     Supports multiple embedding models and providers.
     """
     
-    def __init__(self, default_model: str = "sentence-transformers/all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        default_model: str = "sentence-transformers/all-MiniLM-L6-v2",
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        workers: int = 1
+    ):
+        """
+        Args:
+            default_model: Model used when a call does not name one
+            max_batch_size: Most texts encoded in one model call
+            max_wait_ms: Longest a queued text waits for its batch to fill
+            workers: Encoder threads (batches encoded concurrently)
+        """
         self.default_model = default_model
         self.models = {}
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1000
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="embed")
+        self._batchers: Dict[Tuple[str, bool], _MicroBatcher] = {}
+        self.stats = {"requests": 0, "texts": 0, "batches": 0, "batched_texts": 0, "max_batch": 0}
     
     def load_model(self, model_name: str):
         """Load an embedding model."""
@@ -32,6 +200,31 @@ class EmbeddingService:
         # For API-based models, return a placeholder
         return None
     
+    def is_available(self, model_name: str) -> bool:
+        """Whether the model is loaded or can be loaded locally."""
+        return model_name in self.models or model_name.startswith("sentence-transformers/")
+    
+    def encode(self, model_name: str, texts: List[str], normalize: bool = True) -> np.ndarray:
+        """Encode texts in one model call (blocking; runs on the worker pool)."""
+        embedding_model = self.load_model(model_name)
+        if embedding_model is None:
+            raise ValueError(f"Model {model_name} not available")
+        embeddings = embedding_model.encode(
+            texts,
+            batch_size=len(texts),
+            normalize_embeddings=normalize,
+            show_progress_bar=False,
+            convert_to_numpy=True
+        )
+        return np.asarray(embeddings, dtype=np.float32)
+    
+    def _batcher(self, model_name: str, normalize: bool) -> _MicroBatcher:
+        key = (model_name, normalize)
+        batcher = self._batchers.get(key)
+        if batcher is None or batcher.loop is not asyncio.get_running_loop():
+            batcher = self._batchers[key] = _MicroBatcher(self, model_name, normalize)
+        return batcher
+    
     async def generate_embeddings(
         self,
         texts: List[str],
@@ -48,35 +241,38 @@ class EmbeddingService:
         
         Returns:
             {
-                "embeddings": List[List[float]],
+                "embeddings": np.ndarray of shape (len(texts), dimensions), float32,
                 "model": str,
                 "dimensions": int
             }
         """
         model_name = model or self.default_model
         
-        # Load model
-        embedding_model = self.load_model(model_name)
-        
-        if embedding_model is None:
+        if not self.is_available(model_name):
             raise ValueError(f"Model {model_name} not available")
         
-        # Generate embeddings
-        embeddings = embedding_model.encode(
-            texts,
-            normalize_embeddings=normalize,
-            show_progress_bar=False
-        )
+        self.stats["requests"] += 1
+        self.stats["texts"] += len(texts)
         
-        # Convert to list
-        embeddings_list = embeddings.tolist()
+        if not texts:
+            embeddings = np.empty((0, 0), dtype=np.float32)
+        else:
+            embeddings = await self._batcher(model_name, normalize).submit(list(texts))
         
         return {
-            "embeddings": embeddings_list,
+            "embeddings": embeddings,
             "model": model_name,
-            "dimensions": len(embeddings_list[0]) if embeddings_list else 0
+            "dimensions": embeddings.shape[1] if len(embeddings) else 0
         }
     
+    async def aclose(self):
+        """Stop the batchers and the worker pool."""
+        batchers = list(self._batchers.values())
+        self._batchers.clear()
+        for batcher in batchers:
+            await batcher.aclose()
+        self.executor.shutdown(wait=True)
+    
     async def compute_similarity(
         self,
         embedding1: List[float],
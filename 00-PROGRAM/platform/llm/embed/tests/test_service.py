@@ -0,0 +1,138 @@
+"""
+Tests for the micro-batched EmbeddingService.
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from service import EmbeddingService
+
+MODEL = "fake-model"
+
+
+class FakeModel:
+    """Deterministic encoder that records each call."""
+
+    def __init__(self, dim: int = 4, delay_s: float = 0.0, fail_on: str = None):
+        self.dim = dim
+        self.delay_s = delay_s
+        self.fail_on = fail_on
+        self.calls = []
+
+    def encode(self, texts, normalize_embeddings=True, **kwargs):
+        self.calls.append((list(texts), threading.current_thread().name))
+        if self.fail_on in texts:
+            raise RuntimeError("encoder failure")
+        if self.delay_s:
+            time.sleep(self.delay_s)
+        out = np.array([[len(t), sum(map(ord, t)) % 97, 1.0, 2.0][:self.dim] for t in texts], dtype=np.float64)
+        if normalize_embeddings:
+            out /= np.linalg.norm(out, axis=1, keepdims=True)
+        return out
+
+
+def make_service(model: FakeModel, **kwargs) -> EmbeddingService:
+    service = EmbeddingService(default_model=MODEL, **kwargs)
+    service.models[MODEL] = model
+    return service
+
+
+class TestMicroBatching:
+    """Test coalescing, ordering and output format."""
+
+    @pytest.mark.asyncio
+    async def test_returns_float32_array_in_input_order(self):
+        model = FakeModel()
+        service = make_service(model)
+        texts = ["a", "bb", "ccc"]
+        result = await service.generate_embeddings(texts)
+        await service.aclose()
+
+        embeddings = result["embeddings"]
+        assert isinstance(embeddings, np.ndarray)
+        assert embeddings.dtype == np.float32
+        assert embeddings.shape == (3, 4)
+        assert result["dimensions"] == 4
+        expected = model.encode(texts)
+        np.testing.assert_allclose(embeddings, expected, rtol=1e-6)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_batches(self):
+        model = FakeModel()
+        service = make_service(model, max_batch_size=32, max_wait_ms=20)
+        results = await asyncio.gather(*[
+            service.generate_embeddings([f"text {i}", f"other {i}"]) for i in range(16)
+        ])
+        await service.aclose()
+
+        assert len(model.calls) == 1
+        assert len(model.calls[0][0]) == 32
+        assert model.calls[0][1].startswith("embed")
+        for i, result in enumerate(results):
+            np.testing.assert_allclose(
+                result["embeddings"], model.encode([f"text {i}", f"other {i}"]), rtol=1e-6
+            )
+
+    @pytest.mark.asyncio
+    async def test_large_request_is_split_and_interleaved(self):
+        model = FakeModel(delay_s=0.01)
+        service = make_service(model, max_batch_size=8, max_wait_ms=1)
+        big = [f"doc {i}" for i in range(40)]
+
+        big_task = asyncio.create_task(service.generate_embeddings(big))
+        await asyncio.sleep(0.005)
+        small = await service.generate_embeddings(["query"])
+        small_done_after = len(model.calls)
+        big_result = await big_task
+        await service.aclose()
+
+        assert all(len(texts) <= 8 for texts, _ in model.calls)
+        assert small_done_after < len(model.calls)  # did not wait for the whole big request
+        np.testing.assert_allclose(big_result["embeddings"], model.encode(big), rtol=1e-6)
+        np.testing.assert_allclose(small["embeddings"], model.encode(["query"]), rtol=1e-6)
+
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_responsive(self):
+        model = FakeModel(delay_s=0.2)
+        service = make_service(model)
+        task = asyncio.create_task(service.generate_embeddings(["slow"]))
+
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        assert time.perf_counter() - start < 0.1
+        await task
+        await service.aclose()
+
+    @pytest.mark.asyncio
+    async def test_encoder_error_reaches_callers(self):
+        model = FakeModel(fail_on="boom")
+        service = make_service(model, max_wait_ms=20)
+        bad, good = await asyncio.gather(
+            service.generate_embeddings(["boom", "x"]),
+            service.generate_embeddings(["y"]),
+            return_exceptions=True,
+        )
+        assert isinstance(bad, RuntimeError)
+        assert isinstance(good, RuntimeError)  # shared the failing batch
+
+        ok = await service.generate_embeddings(["z"])
+        assert ok["embeddings"].shape == (1, 4)
+        await service.aclose()
+
+    @pytest.mark.asyncio
+    async def test_unknown_model_and_empty_input(self):
+        service = make_service(FakeModel())
+        with pytest.raises(ValueError, match="not available"):
+            await service.generate_embeddings(["a"], model="text-embedding-ada-002")
+        empty = await service.generate_embeddings([])
+        assert empty["embeddings"].shape[0] == 0
+        assert empty["dimensions"] == 0
+        await service.aclose()
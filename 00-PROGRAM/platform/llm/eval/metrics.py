@@ -2,10 +2,87 @@
 Evaluation metrics for LLM outputs.
 """
 
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Set, Union
+import math
 import re
 
 
+class LatencySketch:
+    """
+    Streaming latency percentiles in bounded memory.
+
+    Samples are counted in logarithmic buckets (as in DDSketch), so every
+    reported percentile is within relative_accuracy of the exact value and
+    memory grows with the dynamic range of the data, not the sample count.
+    Sketches from separate workers or runs can be merged.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        """Record one sample."""
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def merge(self, other: "LatencySketch"):
+        """Add the samples of another sketch with the same accuracy."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, p: float) -> float:
+        """Value at rank int(count * p), like calculate_latency_stats."""
+        if self.count == 0:
+            return 0.0
+        rank = min(int(self.count * p), self.count - 1)
+        if rank < self.zero_count:
+            return float(max(self.min, 0.0))
+        seen = self.zero_count
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                value = 2 * self._gamma ** index / (self._gamma + 1)
+                return float(min(max(value, self.min), self.max))
+        return float(self.max)
+
+    def stats(self) -> Dict[str, float]:
+        """Same keys as calculate_latency_stats."""
+        if self.count == 0:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0, "min": 0.0, "max": 0.0}
+        return {
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "mean": self.total / self.count,
+            "min": float(self.min),
+            "max": float(self.max)
+        }
+
+
 class EvaluationMetrics:
     """
     Metrics for evaluating LLM performance.
@@ -108,12 +185,26 @@ class EvaluationMetrics:
         }
     
     @staticmethod
-    def calculate_latency_stats(latencies_ms: List[int]) -> Dict[str, float]:
+    def recall_at_k(retrieved_ids: List[str], relevant_ids: List[str], k: int) -> float:
+        """
+        Recall@k for retrieval.
+        
+        Fraction of relevant ids that appear in the first k retrieved ids.
+        """
+        relevant = set(relevant_ids)
+        if not relevant:
+            return 0.0
+        
+        return len(relevant & set(retrieved_ids[:k])) / len(relevant)
+    
+    @staticmethod
+    def calculate_latency_stats(latencies_ms: Union[List[int], LatencySketch]) -> Dict[str, float]:
         """
         Calculate latency statistics.
         
         Args:
-            latencies_ms: List of latency measurements in milliseconds
+            latencies_ms: List of latency measurements in milliseconds, or a
+                LatencySketch for runs too large to keep every sample
         
         Returns:
             {
@@ -125,6 +216,9 @@ class EvaluationMetrics:
                 "max": float
             }
         """
+        if isinstance(latencies_ms, LatencySketch):
+            return latencies_ms.stats()
+        
         if not latencies_ms:
             return {
                 "p50": 0.0,
@@ -0,0 +1,533 @@
+"""
+Offline evaluation runner.
+
+Runs a golden set through the LLM gateway (or a provider called directly,
+such as the local StubProvider) with bounded concurrency, scores every
+answer with EvaluationMetrics and produces an EvalReport of quality,
+latency, cost and token usage. Reports are written as sorted, rounded JSON
+so that two runs diff cleanly, and compare_reports() flags regressions
+against a stored baseline.
+
+Usage:
+    python runner.py --golden-dir golden/ --set maintenance --stub --output report.json
+    python runner.py --golden-dir golden/ --set maintenance --gateway http://localhost:8000 \\
+        --model gpt-4 --tenant t1 --project p1 --token $TOKEN --concurrency 16 \\
+        --output report.json --baseline baseline.json
+"""
+
+from typing import List, Dict, Any, Optional, Iterable, Callable
+from dataclasses import dataclass, field, asdict
+from abc import ABC, abstractmethod
+from pathlib import Path
+import asyncio
+import json
+import math
+import time
+import uuid
+
+try:
+    from .metrics import EvaluationMetrics, LatencySketch
+    from .golden_sets import GoldenExample, GoldenSetManager
+except ImportError:
+    from metrics import EvaluationMetrics, LatencySketch
+    from golden_sets import GoldenExample, GoldenSetManager
+
+
+QUALITY_METRICS = ("exact_match", "f1", "groundedness", "grounded_rate")
+
+# Allowed change before a metric counts as a regression: quality metrics and
+# error rate are absolute, latency and cost are relative to the baseline
+DEFAULT_TOLERANCES = {
+    "exact_match": 0.01,
+    "f1": 0.01,
+    "groundedness": 0.01,
+    "grounded_rate": 0.01,
+    "error_rate": 0.01,
+    "latency_p50": 0.20,
+    "latency_p95": 0.20,
+    "latency_p99": 0.20,
+    "cost_total": 0.10,
+}
+# Latency changes smaller than this are noise whatever the relative change
+LATENCY_FLOOR_MS = 5.0
+
+
+def build_messages(example: GoldenExample, system_prompt: Optional[str] = None) -> List[Dict[str, str]]:
+    """Chat messages for a golden example, with its context when present."""
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    content = example.query
+    if example.context:
+        content = f"Context:\n{example.context}\n\nQuestion: {example.query}"
+    messages.append({"role": "user", "content": content})
+    return messages
+
+
+class EvalTarget(ABC):
+    """A system under evaluation."""
+
+    name: str = "target"
+
+    @abstractmethod
+    async def generate(self, example: GoldenExample) -> Dict[str, Any]:
+        """
+        Answer one golden example.
+
+        Returns:
+            {
+                "content": str,
+                "prompt_tokens": int,
+                "completion_tokens": int,
+                "cost_usd": Optional[float]
+            }
+        """
+        pass
+
+    async def aclose(self):
+        """Release resources held by the target."""
+        pass
+
+
+class GatewayTarget(EvalTarget):
+    """Evaluate through the gateway's chat endpoint."""
+
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        tenant_id: str,
+        project_id: str,
+        token: Optional[str] = None,
+        api_prefix: str = "/llm",
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        use_cache: bool = False,
+        timeout_s: float = 60.0,
+        client=None
+    ):
+        import httpx
+
+        self.name = f"gateway:{model}"
+        self.url = f"{api_prefix}/chat"
+        self.model = model
+        self.tenant_id = tenant_id
+        self.project_id = project_id
+        self.system_prompt = system_prompt
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        # Cached answers would hide latency and cost changes
+        self.use_cache = use_cache
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(base_url=base_url, headers=headers, timeout=timeout_s)
+
+    async def generate(self, example: GoldenExample) -> Dict[str, Any]:
+        response = await self.client.post(self.url, json={
+            "messages": build_messages(example, self.system_prompt),
+            "model": self.model,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "cache": self.use_cache,
+            "tenant_id": self.tenant_id,
+            "project_id": self.project_id
+        })
+        response.raise_for_status()
+        data = response.json()
+        return {
+            "content": data["content"],
+            "prompt_tokens": data["prompt_tokens"],
+            "completion_tokens": data["completion_tokens"],
+            "cost_usd": float(data["cost_usd"]) if data.get("cost_usd") is not None else None
+        }
+
+    async def aclose(self):
+        if self._owns_client:
+            await self.client.aclose()
+
+
+class ProviderTarget(EvalTarget):
+    """Evaluate a gateway LLMProvider (or any object with its chat()) directly."""
+
+    def __init__(
+        self,
+        provider,
+        model: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        cost_per_1k_tokens: Optional[float] = None
+    ):
+        self.name = f"{provider.__class__.__name__}:{model}"
+        self.provider = provider
+        self.model = model
+        self.system_prompt = system_prompt
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.cost_per_1k_tokens = cost_per_1k_tokens
+
+    async def generate(self, example: GoldenExample) -> Dict[str, Any]:
+        result = await self.provider.chat(
+            messages=build_messages(example, self.system_prompt),
+            model=self.model,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens
+        )
+        cost = None
+        if self.cost_per_1k_tokens is not None:
+            cost = result["total_tokens"] / 1000 * self.cost_per_1k_tokens
+        return {
+            "content": result["content"],
+            "prompt_tokens": result["prompt_tokens"],
+            "completion_tokens": result["completion_tokens"],
+            "cost_usd": cost
+        }
+
+
+class StubProvider:
+    """
+    Local stand-in for an LLM provider, for smoke runs without upstream calls.
+
+    By default answers with the first sentence of the context (or echoes the
+    question), after latency_s; token counts are whitespace word counts.
+    """
+
+    def __init__(self, answer: Optional[Callable[[str], str]] = None, latency_s: float = 0.0):
+        self.answer = answer or self._first_sentence
+        self.latency_s = latency_s
+
+    @staticmethod
+    def _first_sentence(prompt: str) -> str:
+        if prompt.startswith("Context:\n"):
+            context = prompt[len("Context:\n"):].split("\n\nQuestion: ")[0]
+            return context.split(". ")[0].strip()
+        return prompt
+
+    async def chat(self, messages: List[Dict[str, str]], model: str, temperature: float = 0.7,
+                   max_tokens: Optional[int] = None, **kwargs) -> Dict[str, Any]:
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        prompt = messages[-1]["content"]
+        content = self.answer(prompt)
+        prompt_tokens = sum(len(m["content"].split()) for m in messages)
+        completion_tokens = len(content.split())
+        return {
+            "content": content,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+
+
+@dataclass
+class EvalReport:
+    """Aggregate results of one evaluation run."""
+    run_id: str
+    golden_set: str
+    target: str
+    examples: int = 0
+    errors: int = 0
+    duration_s: float = 0.0
+    quality: Dict[str, float] = field(default_factory=dict)
+    latency_ms: Dict[str, float] = field(default_factory=dict)
+    cost_usd: Dict[str, float] = field(default_factory=dict)
+    tokens: Dict[str, int] = field(default_factory=dict)
+    per_example: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.examples if self.examples else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return _rounded(asdict(self))
+
+    def save(self, path: str):
+        """Write the report as stable, diffable JSON."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    @classmethod
+    def load(cls, path: str) -> "EvalReport":
+        with open(path, 'r') as f:
+            return cls(**json.load(f))
+
+
+def _rounded(value, digits: int = 6):
+    """Round floats so reruns with identical results serialize identically."""
+    if isinstance(value, float):
+        return round(value, digits) if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _rounded(item, digits) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_rounded(item, digits) for item in value]
+    return value
+
+
+class _Aggregate:
+    """Running totals, so memory does not grow with per-sample lists."""
+
+    def __init__(self):
+        self.quality = {name: 0.0 for name in QUALITY_METRICS}
+        self.scored = 0
+        self.errors = 0
+        self.latency = LatencySketch()
+        self.cost_total = 0.0
+        self.cost_min = math.inf
+        self.cost_max = 0.0
+        self.costed = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+
+class EvalRunner:
+    """
+    Runs golden sets against an EvalTarget.
+
+    At most `concurrency` examples are in flight; each worker scores its
+    answer as soon as it arrives, so scoring overlaps with outstanding
+    requests. Examples are pulled lazily, so golden sets of any size run in
+    memory proportional to concurrency plus the per-example scores.
+    """
+
+    def __init__(
+        self,
+        target: EvalTarget,
+        concurrency: int = 8,
+        timeout_s: float = 60.0,
+        groundedness_threshold: float = 0.5
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.target = target
+        self.concurrency = concurrency
+        self.timeout_s = timeout_s
+        self.groundedness_threshold = groundedness_threshold
+
+    async def run(
+        self,
+        examples: Iterable[GoldenExample],
+        golden_set: str = "",
+        run_id: Optional[str] = None
+    ) -> EvalReport:
+        """Evaluate examples and return the run report."""
+        report = EvalReport(run_id=run_id or str(uuid.uuid4()), golden_set=golden_set, target=self.target.name)
+        totals = _Aggregate()
+        pending = iter(examples)
+        start = time.perf_counter()
+
+        async def worker():
+            # next() on a shared iterator is safe: workers only yield at awaits
+            for example in pending:
+                await self._evaluate(example, report, totals)
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        report.duration_s = time.perf_counter() - start
+        self._finish(report, totals)
+        return report
+
+    async def run_golden_set(self, manager: GoldenSetManager, set_name: str, run_id: Optional[str] = None) -> EvalReport:
+        """Evaluate a golden set held by a GoldenSetManager."""
+        return await self.run(manager.get_golden_set(set_name), golden_set=set_name, run_id=run_id)
+
+    async def _evaluate(self, example: GoldenExample, report: EvalReport, totals: _Aggregate):
+        report.examples += 1
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(self.target.generate(example), timeout=self.timeout_s)
+        except Exception as e:
+            totals.errors += 1
+            error = "timeout" if isinstance(e, asyncio.TimeoutError) else f"{e.__class__.__name__}: {e}"
+            report.per_example[example.id] = {"error": error}
+            return
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        scores = self.score(example, result["content"])
+        for name in QUALITY_METRICS:
+            totals.quality[name] += scores[name]
+        totals.scored += 1
+        totals.latency.add(latency_ms)
+        totals.prompt_tokens += result.get("prompt_tokens") or 0
+        totals.completion_tokens += result.get("completion_tokens") or 0
+        cost = result.get("cost_usd")
+        if cost is not None:
+            totals.costed += 1
+            totals.cost_total += cost
+            totals.cost_min = min(totals.cost_min, cost)
+            totals.cost_max = max(totals.cost_max, cost)
+        report.per_example[example.id] = dict(scores, latency_ms=latency_ms, cost_usd=cost)
+
+    def score(self, example: GoldenExample, prediction: str) -> Dict[str, float]:
+        """Quality scores of one answer."""
+        scores = {
+            "exact_match": EvaluationMetrics.exact_match(prediction, example.reference_answer),
+            "f1": EvaluationMetrics.f1_score(prediction, example.reference_answer),
+            "groundedness": 0.0,
+            "grounded_rate": 0.0,
+        }
+        if example.context:
+            grounding = EvaluationMetrics.groundedness_score(
+                prediction, example.context, threshold=self.groundedness_threshold
+            )
+            scores["groundedness"] = grounding["score"]
+            scores["grounded_rate"] = 1.0 if grounding["is_grounded"] else 0.0
+        return scores
+
+    @staticmethod
+    def _finish(report: EvalReport, totals: _Aggregate):
+        report.errors = totals.errors
+        scored = max(totals.scored, 1)
+        report.quality = {name: total / scored for name, total in totals.quality.items()}
+        report.latency_ms = EvaluationMetrics.calculate_latency_stats(totals.latency)
+        report.cost_usd = {
+            "total": totals.cost_total,
+            "mean": totals.cost_total / totals.costed if totals.costed else 0.0,
+            "min": totals.cost_min if totals.costed else 0.0,
+            "max": totals.cost_max
+        }
+        report.tokens = {"prompt": totals.prompt_tokens, "completion": totals.completion_tokens}
+        report.per_example = dict(sorted(report.per_example.items()))
+
+
+def _report_metrics(report: EvalReport) -> Dict[str, float]:
+    metrics = {name: report.quality.get(name, 0.0) for name in QUALITY_METRICS}
+    metrics["error_rate"] = report.error_rate
+    for key in ("p50", "p95", "p99"):
+        metrics[f"latency_{key}"] = report.latency_ms.get(key, 0.0)
+    metrics["cost_total"] = report.cost_usd.get("total", 0.0)
+    return metrics
+
+
+def compare_reports(
+    current: EvalReport,
+    baseline: EvalReport,
+    tolerances: Optional[Dict[str, float]] = None,
+    example_f1_drop: float = 0.2
+) -> Dict[str, Any]:
+    """
+    Diff a run against a baseline.
+
+    Quality metrics regress when they fall by more than their tolerance;
+    error rate, latency and cost regress when they rise by more than theirs.
+
+    Returns:
+        {
+            "passed": bool,
+            "metrics": {name: {"baseline", "current", "delta", "regressed"}},
+            "regressions": List[str],
+            "examples": {"regressed": List[str], "fixed": List[str],
+                         "new_errors": List[str], "missing": List[str]}
+        }
+    """
+    tolerances = {**DEFAULT_TOLERANCES, **(tolerances or {})}
+    now, then = _report_metrics(current), _report_metrics(baseline)
+
+    metrics, regressions = {}, []
+    for name, value in now.items():
+        base = then[name]
+        delta = value - base
+        if name in QUALITY_METRICS:
+            regressed = delta < -tolerances[name]
+        elif name == "error_rate":
+            regressed = delta > tolerances[name]
+        else:
+            floor = LATENCY_FLOOR_MS if name.startswith("latency") else 0.0
+            regressed = base > 0 and delta > max(tolerances[name] * base, floor)
+        metrics[name] = {"baseline": base, "current": value, "delta": delta, "regressed": regressed}
+        if regressed:
+            regressions.append(name)
+
+    examples = {"regressed": [], "fixed": [], "new_errors": [], "missing": []}
+    for example_id, base in baseline.per_example.items():
+        result = current.per_example.get(example_id)
+        if result is None:
+            examples["missing"].append(example_id)
+        elif "error" in result and "error" not in base:
+            examples["new_errors"].append(example_id)
+        elif "error" not in result and "error" not in base:
+            change = result["f1"] - base["f1"]
+            if change <= -example_f1_drop:
+                examples["regressed"].append(example_id)
+            elif change >= example_f1_drop:
+                examples["fixed"].append(example_id)
+
+    return {
+        "passed": not regressions,
+        "metrics": _rounded(metrics),
+        "regressions": regressions,
+        "examples": examples
+    }
+
+
+def format_comparison(comparison: Dict[str, Any]) -> str:
+    """Human-readable table of a compare_reports() result."""
+    lines = [f"{'metric':<14} {'baseline':>12} {'current':>12} {'delta':>12}"]
+    for name, row in comparison["metrics"].items():
+        flag = "  REGRESSED" if row["regressed"] else ""
+        lines.append(f"{name:<14} {row['baseline']:>12.4f} {row['current']:>12.4f} {row['delta']:>+12.4f}{flag}")
+    for kind, ids in comparison["examples"].items():
+        if ids:
+            shown = ", ".join(ids[:10]) + (" ..." if len(ids) > 10 else "")
+            lines.append(f"{kind} examples ({len(ids)}): {shown}")
+    lines.append("PASSED" if comparison["passed"] else f"FAILED: {', '.join(comparison['regressions'])}")
+    return "\n".join(lines)
+
+
+async def _main(args) -> int:
+    manager = GoldenSetManager(storage_path=args.golden_dir)
+    manager.load_golden_set(args.set)
+    if args.gateway:
+        target = GatewayTarget(args.gateway, args.model, args.tenant, args.project, token=args.token,
+                               timeout_s=args.timeout)
+    else:
+        target = ProviderTarget(StubProvider(latency_s=args.stub_latency_ms / 1000), args.model)
+    runner = EvalRunner(target, concurrency=args.concurrency, timeout_s=args.timeout)
+    try:
+        report = await runner.run_golden_set(manager, args.set, run_id=args.run_id)
+    finally:
+        await target.aclose()
+
+    print(f"{report.golden_set}: {report.examples} examples, {report.errors} errors, {report.duration_s:.1f} s")
+    print("quality   " + "  ".join(f"{k}={v:.3f}" for k, v in report.quality.items()))
+    print("latency   " + "  ".join(f"{k}={v:.1f}" for k, v in report.latency_ms.items()))
+    print(f"cost      total=${report.cost_usd['total']:.4f}  tokens={report.tokens}")
+    if args.output:
+        report.save(args.output)
+    if args.baseline:
+        comparison = compare_reports(report, EvalReport.load(args.baseline))
+        print(format_comparison(comparison))
+        return 0 if comparison["passed"] else 1
+    return 0
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Run a golden set and report quality, latency and cost")
+    parser.add_argument("--golden-dir", required=True)
+    parser.add_argument("--set", required=True)
+    parser.add_argument("--gateway", default=None, help="gateway base URL; omit to use the local stub")
+    parser.add_argument("--stub", action="store_true", help="use the local stub provider (default without --gateway)")
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0)
+    parser.add_argument("--model", default="stub")
+    parser.add_argument("--tenant", default=None, help="tenant_id sent to the gateway (required with --gateway)")
+    parser.add_argument("--project", default=None, help="project_id sent to the gateway (required with --gateway)")
+    parser.add_argument("--token", default=None)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--run-id", default=None)
+    parser.add_argument("--output", default=None, help="write the report JSON here")
+    parser.add_argument("--baseline", default=None, help="baseline report JSON to diff against")
+    args = parser.parse_args(argv)
+    if args.gateway and args.stub:
+        parser.error("--gateway and --stub are mutually exclusive")
+    if args.gateway and not (args.tenant and args.project):
+        parser.error("--gateway requires --tenant and --project")
+    sys.exit(asyncio.run(_main(args)))
+
+
+if __name__ == "__main__":
+    main()
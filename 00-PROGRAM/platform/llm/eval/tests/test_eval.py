@@ -9,7 +9,7 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from metrics import EvaluationMetrics
+from metrics import EvaluationMetrics, LatencySketch
 from golden_sets import GoldenSetManager, GoldenExample
 
 
@@ -72,6 +72,14 @@ class TestEvaluationMetrics:
         # Should have some overlap but not be fully grounded
         assert result["score"] > 0.0
     
+    def test_recall_at_k(self):
+        """Test recall@k over retrieved ids."""
+        retrieved = ["c3", "c1", "c7", "c2"]
+        
+        assert EvaluationMetrics.recall_at_k(retrieved, ["c1", "c2"], k=2) == 0.5
+        assert EvaluationMetrics.recall_at_k(retrieved, ["c1", "c2"], k=4) == 1.0
+        assert EvaluationMetrics.recall_at_k(retrieved, [], k=4) == 0.0
+    
     def test_latency_stats(self):
         """Test latency statistics calculation."""
         latencies = [100, 150, 200, 250, 300, 350, 400]
@@ -92,6 +100,27 @@ class TestEvaluationMetrics:
         assert stats["max"] == 0.0
         assert stats["mean"] == 0.0
     
+    def test_latency_sketch_matches_exact_stats(self):
+        """Test streaming percentiles stay within the sketch's relative accuracy."""
+        import random
+        rng = random.Random(0)
+        latencies = [rng.lognormvariate(4, 1) for _ in range(20000)] + [0.0] * 10
+        
+        sketch = LatencySketch(relative_accuracy=0.01)
+        other = LatencySketch(relative_accuracy=0.01)
+        for i, value in enumerate(latencies):
+            (sketch if i % 2 else other).add(value)
+        sketch.merge(other)
+        
+        exact = EvaluationMetrics.calculate_latency_stats(latencies)
+        approx = EvaluationMetrics.calculate_latency_stats(sketch)
+        for key in ("p50", "p95", "p99"):
+            assert approx[key] == pytest.approx(exact[key], rel=0.01)
+        assert approx["min"] == exact["min"] and approx["max"] == exact["max"]
+        assert approx["mean"] == pytest.approx(exact["mean"])
+        assert len(sketch.buckets) < 1000
+        assert LatencySketch().stats()["p99"] == 0.0
+    
     def test_cost_stats(self):
         """Test cost statistics calculation."""
         costs = ["0.001", "0.002", "0.003", "0.004"]
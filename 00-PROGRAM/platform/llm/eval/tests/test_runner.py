@@ -0,0 +1,137 @@
+"""
+Tests for the offline evaluation runner.
+"""
+
+import json
+import pytest
+import httpx
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from golden_sets import GoldenSetManager, GoldenExample
+from runner import (
+    EvalRunner, EvalReport, ProviderTarget, GatewayTarget, StubProvider, compare_reports, format_comparison, main
+)
+
+
+def golden_examples(n=20):
+    return [
+        GoldenExample(
+            id=f"ex{i:03d}",
+            query=f"What torque is used for bolt {i}?",
+            reference_answer=f"Torque bolt {i} to {20 + i} Nm",
+            context=f"Torque bolt {i} to {20 + i} Nm. Inspect the bracket for cracks."
+        )
+        for i in range(n)
+    ]
+
+
+class CountingProvider(StubProvider):
+    """Stub that records the peak number of concurrent calls."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.in_flight = 0
+        self.peak = 0
+
+    async def chat(self, messages, model, **kwargs):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            if "bolt 13?" in messages[-1]["content"]:
+                raise RuntimeError("upstream failed")
+            return await super().chat(messages, model, **kwargs)
+        finally:
+            self.in_flight -= 1
+
+
+class TestEvalRunner:
+    """Test running, scoring and reporting."""
+
+    @pytest.mark.asyncio
+    async def test_run_scores_with_bounded_concurrency(self):
+        provider = CountingProvider(latency_s=0.01)
+        runner = EvalRunner(ProviderTarget(provider, "stub", cost_per_1k_tokens=0.5), concurrency=4)
+        report = await runner.run(golden_examples(), golden_set="torque")
+
+        assert provider.peak == 4
+        assert report.examples == 20 and report.errors == 1
+        assert report.per_example["ex013"]["error"].startswith("RuntimeError")
+        assert report.quality["exact_match"] == 1.0
+        assert report.quality["grounded_rate"] == 1.0
+        assert report.latency_ms["p50"] >= 10
+        assert report.cost_usd["total"] == pytest.approx(
+            sum(r["cost_usd"] for r in report.per_example.values() if "error" not in r)
+        )
+        assert report.tokens["completion"] == 19 * 6
+
+    @pytest.mark.asyncio
+    async def test_timeout_is_an_error(self):
+        runner = EvalRunner(ProviderTarget(StubProvider(latency_s=0.5), "stub"), timeout_s=0.05)
+        report = await runner.run(golden_examples(2))
+        assert report.errors == 2 and report.error_rate == 1.0
+        assert {r["error"] for r in report.per_example.values()} == {"timeout"}
+
+    @pytest.mark.asyncio
+    async def test_report_roundtrip_and_baseline_diff(self, tmp_path):
+        manager = GoldenSetManager(storage_path=str(tmp_path / "golden"))
+        manager.create_golden_set("torque", golden_examples())
+        manager.save_golden_set("torque")
+        manager.load_golden_set("torque")
+
+        baseline = await EvalRunner(ProviderTarget(StubProvider(), "stub")).run_golden_set(
+            manager, "torque", run_id="base"
+        )
+        baseline.save(str(tmp_path / "baseline.json"))
+        loaded = EvalReport.load(str(tmp_path / "baseline.json"))
+        assert loaded.quality == baseline.quality
+        assert json.loads((tmp_path / "baseline.json").read_text())["per_example"]["ex000"]["f1"] == 1.0
+
+        unchanged = compare_reports(loaded, loaded)
+        assert unchanged["passed"] and not unchanged["regressions"]
+
+        # Answers that drop the torque value regress quality and per-example F1
+        worse = StubProvider(answer=lambda prompt: "Torque the bolt")
+        current = await EvalRunner(ProviderTarget(worse, "stub")).run_golden_set(manager, "torque")
+        comparison = compare_reports(current, loaded)
+        assert not comparison["passed"]
+        assert {"exact_match", "f1"} <= set(comparison["regressions"])
+        assert len(comparison["examples"]["regressed"]) == 20
+        assert "REGRESSED" in format_comparison(comparison)
+
+    @pytest.mark.asyncio
+    async def test_gateway_target(self):
+        seen = []
+
+        def handler(request: httpx.Request):
+            seen.append(json.loads(request.content))
+            return httpx.Response(200, json={
+                "id": "r1", "model": "gpt-4", "content": "Torque bolt 0 to 20 Nm",
+                "prompt_tokens": 30, "completion_tokens": 6, "total_tokens": 36,
+                "latency_ms": 12, "cost_usd": "0.001080"
+            })
+
+        client = httpx.AsyncClient(base_url="http://gateway", transport=httpx.MockTransport(handler))
+        target = GatewayTarget("http://gateway", "gpt-4", "t1", "p1", client=client)
+        report = await EvalRunner(target).run(golden_examples(1))
+        await client.aclose()
+
+        assert seen[0]["cache"] is False and seen[0]["tenant_id"] == "t1"
+        assert "Context:" in seen[0]["messages"][-1]["content"]
+        assert report.quality["exact_match"] == 1.0
+        assert report.cost_usd["total"] == pytest.approx(0.00108)
+
+    def test_invalid_concurrency(self):
+        with pytest.raises(ValueError):
+            EvalRunner(ProviderTarget(StubProvider(), "stub"), concurrency=0)
+
+    @pytest.mark.parametrize("extra", [[], ["--tenant", "t1"], ["--project", "p1"]])
+    def test_gateway_cli_requires_tenant_and_project(self, tmp_path, extra, capsys):
+        argv = ["--golden-dir", str(tmp_path), "--set", "s", "--gateway", "http://gw"] + extra
+        with pytest.raises(SystemExit) as exit_info:
+            main(argv)
+        assert exit_info.value.code == 2
+        assert "--gateway requires --tenant and --project" in capsys.readouterr().err
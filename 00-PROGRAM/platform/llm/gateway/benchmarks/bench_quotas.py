@@ -0,0 +1,130 @@
+"""
+Quota engine overhead benchmark.
+
+1. Tight loop: per-check cost of QuotaEnforcer.check across many tenants.
+2. Paced load: an event loop offers requests at a fixed rate (default
+   5000 req/s) from a mix of tenants, one of which is a batch job sending
+   half of all traffic, with backend sync running in the background. Reports
+   the achieved rate, per-check latency (p50/p99/max), and how many
+   requests were admitted for the heavy tenant versus the others (a third
+   of tenants have a model allow-list, so some of their traffic is
+   rejected with 403 regardless of rate).
+
+Usage:
+    python bench_quotas.py --rate 5000 --seconds 5 --tenants 1000
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_transport import percentile
+from quotas import InMemoryQuotaBackend, QuotaEnforcer, QuotaExceeded, TenantPolicy
+
+MODELS = ["gpt-4", "gpt-3.5-turbo", "claude-3-sonnet"]
+
+
+def make_enforcer(tenants: int, backend=None) -> QuotaEnforcer:
+    default = TenantPolicy(max_requests_per_day=100000, max_tokens_per_request=4096,
+                           requests_per_minute=600, burst=50)
+    enforcer = QuotaEnforcer(default, backend=backend)
+    enforcer.set_policies({
+        f"tenant-{i}": TenantPolicy(
+            max_requests_per_day=100000,
+            max_tokens_per_request=2048,
+            allowed_models=frozenset({"gpt-4", "claude-3-*"}) if i % 3 == 0 else None,
+            requests_per_minute=600,
+            burst=50,
+        )
+        for i in range(tenants)
+    })
+    return enforcer
+
+
+def bench_tight(tenants: int, checks: int):
+    """(µs per check, rejected) over a round-robin of tenants."""
+    enforcer = make_enforcer(tenants)
+    ids = [f"tenant-{i}" for i in range(tenants)]
+    rejected = 0
+    start = time.perf_counter()
+    for k in range(checks):
+        try:
+            enforcer.check(ids[k % tenants], MODELS[k % 3], 512)
+        except QuotaExceeded:
+            rejected += 1
+    return (time.perf_counter() - start) / checks * 1e6, rejected
+
+
+async def bench_paced(tenants: int, rate: float, seconds: float, heavy_share: float):
+    enforcer = make_enforcer(tenants, backend=InMemoryQuotaBackend())
+    await enforcer.start(sync_interval_s=0.5)
+    ids = [f"tenant-{i}" for i in range(tenants)]
+    rng = random.Random(0)
+    latencies = []
+    admitted = {"heavy": 0, "other": 0}
+    offered = {"heavy": 0, "other": 0}
+
+    total = int(rate * seconds)
+    tick = 0.001
+    per_tick = rate * tick
+    sent, due = 0, 0.0
+    start = time.perf_counter()
+    while sent < total:
+        due += per_tick
+        while sent < min(total, int(due)):
+            heavy = rng.random() < heavy_share
+            tenant = ids[0] if heavy else ids[rng.randrange(1, tenants)]
+            kind = "heavy" if heavy else "other"
+            offered[kind] += 1
+            t0 = time.perf_counter_ns()
+            try:
+                enforcer.check(tenant, MODELS[sent % 3], 512)
+                admitted[kind] += 1
+            except QuotaExceeded:
+                pass
+            latencies.append(time.perf_counter_ns() - t0)
+            sent += 1
+        # Sleep until the next tick so the loop runs at the offered rate
+        delay = start + (due / rate) - time.perf_counter()
+        await asyncio.sleep(max(0.0, delay))
+    elapsed = time.perf_counter() - start
+    await enforcer.stop()
+    return sent / elapsed, latencies, offered, admitted, enforcer.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quota engine overhead benchmark")
+    parser.add_argument("--tenants", type=int, default=1000)
+    parser.add_argument("--checks", type=int, default=200000)
+    parser.add_argument("--rate", type=float, default=5000.0)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--heavy-share", type=float, default=0.5,
+                        help="fraction of traffic from one batch-job tenant")
+    args = parser.parse_args()
+
+    us, _ = bench_tight(args.tenants, args.checks)
+    print(f"tight loop: {us:.2f} µs/check ({1e6 / us:,.0f} checks/s, {args.tenants} tenants)")
+
+    achieved, latencies, offered, admitted, stats = asyncio.run(
+        bench_paced(args.tenants, args.rate, args.seconds, args.heavy_share)
+    )
+    lat_us = [ns / 1000 for ns in latencies]
+    print(f"paced: offered {args.rate:.0f} req/s, achieved {achieved:.0f} req/s, "
+          f"backend syncs {stats['syncs']}")
+    print(f"  check latency: p50 {percentile(lat_us, 50):.2f} µs, p99 {percentile(lat_us, 99):.2f} µs, "
+          f"max {max(lat_us):.1f} µs")
+    for kind in ("heavy", "other"):
+        print(f"  {kind:<5} tenant traffic: offered {offered[kind]:>7}, admitted {admitted[kind]:>7}")
+    ok = percentile(lat_us, 99) < 100 and achieved >= 0.95 * args.rate
+    print("✓ under 100 µs per request at the offered rate" if ok else "✗ overhead budget exceeded")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
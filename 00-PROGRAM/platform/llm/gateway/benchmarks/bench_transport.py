@@ -0,0 +1,119 @@
+"""
+Provider transport latency benchmark.
+
+Starts the mock upstream on a local port and measures chat latency
+(p50/p99) and throughput with the connection pool on and off, plus
+time-to-first-token for streaming.
+
+Usage:
+    python bench_transport.py --requests 2000 --concurrency 32 --latency-ms 5
+"""
+
+import argparse
+import asyncio
+import socket
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+import uvicorn
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "tests"))
+
+from providers import OpenAIProvider
+from transport import ProviderTransport, TransportConfig
+from mock_upstream import create_mock_upstream
+
+MESSAGES = [{"role": "user", "content": "Summarise ATA 32 landing gear checks."}]
+
+
+def start_upstream(latency_s: float, token_delay_s: float) -> str:
+    """Run the mock upstream in a background thread and return its base URL."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    app = create_mock_upstream(latency_s=latency_s, token_delay_s=token_delay_s)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{port}"
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run_chat(provider, requests: int, concurrency: int):
+    latencies = []
+    queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(None)
+
+    async def worker():
+        while not queue.empty():
+            queue.get_nowait()
+            start = time.perf_counter()
+            await provider.chat(MESSAGES, model="gpt-4")
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return latencies, time.perf_counter() - start
+
+
+async def run_stream(provider, requests: int):
+    ttft, total = [], []
+    for _ in range(requests):
+        start = time.perf_counter()
+        first = None
+        async for chunk in provider.chat_stream(MESSAGES, model="gpt-4"):
+            if first is None and "delta" in chunk:
+                first = time.perf_counter() - start
+        ttft.append(first)
+        total.append(time.perf_counter() - start)
+    return ttft, total
+
+
+async def main_async(args):
+    base_url = start_upstream(args.latency_ms / 1000, args.token_delay_ms / 1000)
+
+    print(f"{'mode':<10} {'req/s':>8} {'p50_ms':>8} {'p99_ms':>8}")
+    for pooled in (False, True):
+        transport = ProviderTransport(TransportConfig(
+            pooled=pooled,
+            max_concurrency=args.concurrency,
+            max_keepalive_connections=args.concurrency,
+        ))
+        provider = OpenAIProvider(api_key="bench", base_url=base_url, transport=transport)
+        await run_chat(provider, min(100, args.requests), args.concurrency)  # warm-up
+        latencies, elapsed = await run_chat(provider, args.requests, args.concurrency)
+        label = "pool-on" if pooled else "pool-off"
+        print(f"{label:<10} {args.requests / elapsed:>8.0f} "
+              f"{percentile(latencies, 50) * 1e3:>8.2f} {percentile(latencies, 99) * 1e3:>8.2f}")
+        await transport.aclose()
+
+    provider = OpenAIProvider(api_key="bench", base_url=base_url)
+    ttft, total = await run_stream(provider, args.stream_requests)
+    print(f"\nstreaming: ttft p50 {statistics.median(ttft) * 1e3:.2f} ms, "
+          f"full completion p50 {statistics.median(total) * 1e3:.2f} ms")
+    await provider.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Provider transport latency benchmark")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--token-delay-ms", type=float, default=10.0)
+    parser.add_argument("--stream-requests", type=int, default=20)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
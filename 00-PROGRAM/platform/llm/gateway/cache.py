@@ -0,0 +1,398 @@
+"""
+Response cache for LLM Gateway.
+
+Chat completions are cached under a digest of the normalized request
+(model, messages, sampling parameters, tools); embeddings are cached per
+input text, so a batch with a few new texts only sends those upstream.
+Near-duplicate chat prompts can also be matched by embedding similarity
+when an embedder is configured.
+
+Every entry lives under its tenant/project namespace
+(``TenantIsolation.get_namespace``): lookups never cross namespaces, and
+the semantic index is partitioned the same way.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import structlog
+
+try:
+    from .security import TenantIsolation
+except ImportError:
+    from security import TenantIsolation
+
+
+logger = structlog.get_logger(__name__)
+
+Embedder = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+
+
+def normalize_text(text: str) -> str:
+    """
+    Trim leading and trailing whitespace.
+
+    Internal whitespace is kept: prompts that differ in indentation or
+    code layout are different prompts.
+    """
+    return text.strip()
+
+
+def _digest(payload: Any) -> str:
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def chat_params_key(model: str, params: Dict[str, Any]) -> str:
+    """Digest of everything except the messages (the semantic partition key)."""
+    normalized = {
+        k: round(v, 4) if isinstance(v, float) else v
+        for k, v in params.items() if v is not None
+    }
+    return _digest({"model": model, "params": normalized})
+
+
+def chat_key(model: str, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+    """Exact-match key for a chat request."""
+    normalized = [
+        {"role": m["role"].strip().lower(), "content": normalize_text(m["content"])}
+        for m in messages
+    ]
+    return _digest({"p": chat_params_key(model, params), "messages": normalized})
+
+
+def embedding_key(model: str, text: str) -> str:
+    """Exact-match key for one embedding input (text is used verbatim)."""
+    return _digest({"model": model, "text": text})
+
+
+def prompt_text(messages: List[Dict[str, str]]) -> str:
+    """Text embedded for semantic lookup."""
+    return "\n".join(f"{m['role']}: {normalize_text(m['content'])}" for m in messages)
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    expires_at: float
+    latency_ms: float = 0.0
+    cost_usd: float = 0.0
+
+
+@dataclass
+class CacheStats:
+    """Counters for one namespace (or all of them)."""
+
+    lookups: int = 0
+    exact_hits: int = 0
+    semantic_hits: int = 0
+    latency_saved_ms: float = 0.0
+    cost_saved_usd: float = 0.0
+    by_kind: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    def record(self, kind: str, hit: Optional[str], entry: Optional[CacheEntry] = None):
+        self.lookups += 1
+        counts = self.by_kind.setdefault(kind, {"lookups": 0, "hits": 0})
+        counts["lookups"] += 1
+        if hit is None:
+            return
+        counts["hits"] += 1
+        if hit == "semantic":
+            self.semantic_hits += 1
+        else:
+            self.exact_hits += 1
+        if entry is not None:
+            self.latency_saved_ms += entry.latency_ms
+            self.cost_saved_usd += entry.cost_usd
+
+    def as_dict(self) -> Dict[str, Any]:
+        hits = self.exact_hits + self.semantic_hits
+        return {
+            "lookups": self.lookups,
+            "hits": hits,
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.lookups - hits,
+            "hit_rate": hits / self.lookups if self.lookups else 0.0,
+            "latency_saved_ms": round(self.latency_saved_ms, 3),
+            "cost_saved_usd": f"{self.cost_saved_usd:.6f}",
+            "by_kind": {
+                kind: {**counts, "hit_rate": counts["hits"] / counts["lookups"] if counts["lookups"] else 0.0}
+                for kind, counts in self.by_kind.items()
+            },
+        }
+
+
+class SemanticIndex:
+    """
+    Unit-normalized prompt vectors for one (namespace, model, params) partition.
+
+    Rows are appended to a growing matrix; removed rows are tombstoned and
+    the matrix is compacted once half of it is dead.
+    """
+
+    def __init__(self, dim: int, capacity: int = 64):
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.keys: List[Optional[str]] = []
+        self.rows: Dict[str, int] = {}
+        self.dead = 0
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def add(self, key: str, vector: np.ndarray):
+        if key in self.rows:
+            self.vectors[self.rows[key]] = vector
+            return
+        n = len(self.keys)
+        if n == len(self.vectors):
+            grown = np.zeros((2 * n, self.vectors.shape[1]), dtype=np.float32)
+            grown[:n] = self.vectors
+            self.vectors = grown
+        self.vectors[n] = vector
+        self.keys.append(key)
+        self.rows[key] = n
+
+    def remove(self, key: str):
+        row = self.rows.pop(key, None)
+        if row is None:
+            return
+        self.keys[row] = None
+        self.vectors[row] = 0.0
+        self.dead += 1
+        if self.dead * 2 > len(self.keys):
+            self._compact()
+
+    def _compact(self):
+        live = [(k, r) for r, k in enumerate(self.keys) if k is not None]
+        vectors = np.zeros((max(64, 2 * len(live)), self.vectors.shape[1]), dtype=np.float32)
+        for i, (_, row) in enumerate(live):
+            vectors[i] = self.vectors[row]
+        self.vectors = vectors
+        self.keys = [k for k, _ in live]
+        self.rows = {k: i for i, k in enumerate(self.keys)}
+        self.dead = 0
+
+    def search(self, vector: np.ndarray) -> Tuple[Optional[str], float]:
+        """Best (key, cosine similarity); tombstoned rows score 0."""
+        n = len(self.keys)
+        if n == 0 or not self.rows:
+            return None, 0.0
+        scores = self.vectors[:n] @ vector
+        row = int(np.argmax(scores))
+        return self.keys[row], float(scores[row])
+
+
+class ResponseCache:
+    """
+    TTL + LRU cache of chat completions and embeddings, per tenant namespace.
+
+    ``max_entries`` bounds the total number of entries across namespaces;
+    the least recently used entry is evicted first. Expired entries are
+    dropped when they are next looked up or reach the LRU end.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        chat_ttl_s: float = 3600.0,
+        embedding_ttl_s: float = 86400.0,
+        embedder: Optional[Embedder] = None,
+        semantic_threshold: float = 0.95,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_entries = max_entries
+        self.chat_ttl_s = chat_ttl_s
+        self.embedding_ttl_s = embedding_ttl_s
+        self.embedder = embedder
+        self.semantic_threshold = semantic_threshold
+        self.clock = clock
+        self._entries: "OrderedDict[Tuple[str, str, str], CacheEntry]" = OrderedDict()
+        self._semantic: Dict[Tuple[str, str], SemanticIndex] = {}
+        self._semantic_partition: Dict[Tuple[str, str, str], Tuple[str, str]] = {}
+        self.stats: Dict[str, CacheStats] = {}
+        self.total = CacheStats()
+
+    @staticmethod
+    def namespace(tenant_id: str, project_id: str) -> str:
+        return TenantIsolation.get_namespace(tenant_id, project_id)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -- storage ---------------------------------------------------------
+
+    def _get(self, namespace: str, kind: str, key: str) -> Optional[CacheEntry]:
+        full_key = (namespace, kind, key)
+        entry = self._entries.get(full_key)
+        if entry is None:
+            return None
+        if entry.expires_at <= self.clock():
+            self._drop(full_key)
+            return None
+        self._entries.move_to_end(full_key)
+        return entry
+
+    def _set(self, namespace: str, kind: str, key: str, entry: CacheEntry):
+        full_key = (namespace, kind, key)
+        self._entries[full_key] = entry
+        self._entries.move_to_end(full_key)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, full_key: Tuple[str, str, str]):
+        self._entries.pop(full_key, None)
+        partition = self._semantic_partition.pop(full_key, None)
+        if partition is not None:
+            index = self._semantic.get(partition)
+            if index is not None:
+                index.remove(full_key[2])
+                if not index:
+                    del self._semantic[partition]
+
+    def _record(self, namespace: str, kind: str, hit: Optional[str], entry: Optional[CacheEntry] = None):
+        self.stats.setdefault(namespace, CacheStats()).record(kind, hit, entry)
+        self.total.record(kind, hit, entry)
+
+    def invalidate(self, tenant_id: str, project_id: Optional[str] = None) -> int:
+        """Drop every entry of a tenant (or one of its projects)."""
+        if project_id:
+            namespace = self.namespace(tenant_id, project_id)
+            doomed = [k for k in self._entries if k[0] == namespace]
+        else:
+            prefix = f"{tenant_id}/"
+            doomed = [k for k in self._entries if k[0].startswith(prefix)]
+        for full_key in doomed:
+            self._drop(full_key)
+        return len(doomed)
+
+    # -- chat ------------------------------------------------------------
+
+    async def _embed_prompt(self, messages: List[Dict[str, str]]) -> Optional[np.ndarray]:
+        try:
+            vector = np.asarray((await self.embedder([prompt_text(messages)]))[0], dtype=np.float32)
+        except Exception as e:
+            logger.warning("cache_embedding_failed", error=str(e))
+            return None
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else None
+
+    async def get_chat(
+        self,
+        namespace: str,
+        model: str,
+        messages: List[Dict[str, str]],
+        params: Dict[str, Any],
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str], Dict[str, Any]]:
+        """
+        Look up a chat completion.
+
+        Returns:
+            (cached result or None, "exact" / "semantic" / None, lookup
+            state to pass back to ``put_chat`` on a miss)
+        """
+        key = chat_key(model, messages, params)
+        lookup = {"key": key, "vector": None}
+        entry = self._get(namespace, "chat", key)
+        if entry is not None:
+            self._record(namespace, "chat", "exact", entry)
+            return entry.value, "exact", lookup
+
+        if self.embedder is not None:
+            partition = (namespace, chat_params_key(model, params))
+            vector = await self._embed_prompt(messages)
+            lookup["vector"] = vector
+            index = self._semantic.get(partition)
+            if vector is not None and index is not None:
+                match, score = index.search(vector)
+                if match is not None and score >= self.semantic_threshold:
+                    entry = self._get(namespace, "chat", match)
+                    if entry is not None:
+                        self._record(namespace, "chat", "semantic", entry)
+                        return entry.value, "semantic", lookup
+
+        self._record(namespace, "chat", None)
+        return None, None, lookup
+
+    def put_chat(
+        self,
+        namespace: str,
+        model: str,
+        params: Dict[str, Any],
+        lookup: Dict[str, Any],
+        result: Dict[str, Any],
+        latency_ms: float,
+        cost_usd: float,
+        ttl_s: Optional[float] = None,
+    ):
+        """Store a completion under the key computed by ``get_chat``."""
+        key = lookup["key"]
+        ttl = self.chat_ttl_s if ttl_s is None else ttl_s
+        self._set(namespace, "chat", key, CacheEntry(result, self.clock() + ttl, latency_ms, cost_usd))
+        vector = lookup.get("vector")
+        if vector is not None:
+            partition = (namespace, chat_params_key(model, params))
+            index = self._semantic.get(partition)
+            if index is None:
+                index = self._semantic[partition] = SemanticIndex(len(vector))
+            index.add(key, vector)
+            self._semantic_partition[(namespace, "chat", key)] = partition
+
+    # -- embeddings ------------------------------------------------------
+
+    def get_embeddings(
+        self, namespace: str, model: str, texts: List[str]
+    ) -> Tuple[List[Optional[List[float]]], List[int]]:
+        """
+        Look up each input text.
+
+        Returns:
+            (per-text vector or None, indexes of the texts that missed)
+        """
+        found: List[Optional[List[float]]] = []
+        missing = []
+        for i, text in enumerate(texts):
+            entry = self._get(namespace, "embedding", embedding_key(model, text))
+            self._record(namespace, "embedding", "exact" if entry else None, entry)
+            found.append(entry.value if entry else None)
+            if entry is None:
+                missing.append(i)
+        return found, missing
+
+    def put_embeddings(
+        self,
+        namespace: str,
+        model: str,
+        texts: List[str],
+        embeddings: List[List[float]],
+        latency_ms: float,
+        cost_usd: float,
+        ttl_s: Optional[float] = None,
+    ):
+        """Store vectors for texts fetched together; latency and cost are split evenly."""
+        if not texts:
+            return
+        ttl = self.embedding_ttl_s if ttl_s is None else ttl_s
+        expires_at = self.clock() + ttl
+        share = 1.0 / len(texts)
+        for text, vector in zip(texts, embeddings):
+            self._set(namespace, "embedding", embedding_key(model, text),
+                      CacheEntry(vector, expires_at, latency_ms * share, cost_usd * share))
+
+    # -- reporting -------------------------------------------------------
+
+    def stats_for(self, namespace: Optional[str] = None) -> Dict[str, Any]:
+        """Stats for one namespace, or for the whole cache when namespace is None."""
+        if namespace is None:
+            stats = self.total.as_dict()
+            stats["entries"] = len(self._entries)
+        else:
+            stats = self.stats.get(namespace, CacheStats()).as_dict()
+            stats["entries"] = sum(1 for k in self._entries if k[0] == namespace)
+        return stats
@@ -26,6 +26,13 @@ class Settings(BaseSettings):
         alias="IDEALE_DB_URL"
     )
     
+    db_write_mode: str = "batched"  # batched, async, sync
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_write_batch_size: int = 200
+    db_flush_interval_ms: int = 50
+    db_write_queue_size: int = 10000
+    
     # Security
     jwt_secret_key: str = Field(default="change-me-in-production", alias="JWT_SIGNING_KEY")
     jwt_algorithm: str = "HS256"
@@ -42,10 +49,37 @@ class Settings(BaseSettings):
     anthropic_api_key: Optional[str] = Field(default=None, alias="ANTHROPIC_API_KEY")
     azure_openai_endpoint: Optional[str] = Field(default=None, alias="AZURE_OPENAI_ENDPOINT")
     azure_openai_api_key: Optional[str] = Field(default=None, alias="AZURE_OPENAI_API_KEY")
+    openai_base_url: str = Field(default="https://api.openai.com/v1", alias="OPENAI_BASE_URL")
+    anthropic_base_url: str = Field(default="https://api.anthropic.com/v1", alias="ANTHROPIC_BASE_URL")
+    
+    # Provider transport
+    provider_pool_enabled: bool = True
+    provider_max_connections: int = 100
+    provider_max_keepalive_connections: int = 20
+    provider_max_concurrency: int = 32
+    provider_max_retries: int = 3
+    provider_timeout_seconds: float = 60.0
     
     # Rate limiting
     rate_limit_enabled: bool = True
     rate_limit_requests_per_minute: int = 60
+    rate_limit_burst: Optional[int] = None  # defaults to requests per minute
+    
+    # Tenant quotas (defaults for tenants without a TenantConfig row)
+    quota_default_requests_per_day: int = 1000
+    quota_default_max_tokens_per_request: int = 4096
+    quota_backend_url: Optional[str] = None  # memory:// or redis://host:6379/0
+    quota_sync_interval_ms: int = 500
+    quota_policy_refresh_seconds: int = 60
+    
+    # Response cache
+    response_cache_enabled: bool = True
+    response_cache_max_entries: int = 10000
+    response_cache_ttl_seconds: int = 3600
+    response_cache_embedding_ttl_seconds: int = 86400
+    response_cache_semantic_enabled: bool = False
+    response_cache_semantic_threshold: float = 0.95
+    response_cache_embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
     
     # Audit
     audit_log_enabled: bool = True
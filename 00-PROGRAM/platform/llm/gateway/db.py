@@ -0,0 +1,335 @@
+"""
+Database access for LLM Gateway.
+
+Request and audit rows are written off the request path: handlers hand ORM
+records to a ``BatchedWriter``, which inserts them in groups from a
+background task over an async SQLAlchemy engine. The per-request ``async``
+and legacy ``sync`` write modes are kept for benchmarking.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import structlog
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+try:
+    from .models import Base, AuditEvent
+except ImportError:
+    from models import Base, AuditEvent
+
+
+logger = structlog.get_logger(__name__)
+
+WRITE_MODES = ("batched", "async", "sync")
+
+# Default async driver per dialect when the URL does not name one
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+SYNC_ONLY_DRIVERS = {"asyncpg", "aiosqlite"}
+
+
+def to_async_url(url: str) -> str:
+    """Select the async driver for a database URL (explicit drivers are kept)."""
+    scheme, sep, rest = url.partition("://")
+    if "+" in scheme:
+        return url
+    return ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+
+def to_sync_url(url: str) -> str:
+    """Drop an async-only driver from a database URL."""
+    scheme, sep, rest = url.partition("://")
+    dialect, _, driver = scheme.partition("+")
+    if driver in SYNC_ONLY_DRIVERS:
+        return dialect + sep + rest
+    return url
+
+
+class BatchedWriter:
+    """
+    Background writer that inserts queued ORM records in groups.
+
+    A batch is written as soon as ``batch_size`` records are queued, or
+    ``flush_interval_s`` after its first record arrived. The queue is
+    bounded, so ``submit`` applies backpressure when the database falls
+    behind instead of growing without limit. Failed batches are retried
+    with exponential backoff; after ``max_retries`` the rows are inserted one
+    at a time, so only the rows that fail on their own are dropped (and
+    logged).
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        batch_size: int = 200,
+        flush_interval_s: float = 0.05,
+        max_queue: int = 10000,
+        max_retries: int = 3,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.max_queue = max_queue
+        self.max_retries = max_retries
+        self.stats = {"rows": 0, "batches": 0, "retries": 0, "dropped": 0}
+        self._queue: Optional[asyncio.Queue] = None
+        self._batch_ready: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._flushes = 0
+
+    async def start(self):
+        """Start the background flush task on the running event loop."""
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._batch_ready = asyncio.Event()
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+
+    async def submit(self, record):
+        """Queue an ORM record for insertion (waits while the queue is full)."""
+        if self._task is None:
+            raise RuntimeError("BatchedWriter is not started")
+        await self._queue.put(record)
+        if self._queue.qsize() >= self.batch_size:
+            self._batch_ready.set()
+
+    async def flush(self):
+        """Wait until every queued record has been written (or dropped)."""
+        if self._task is None:
+            return
+        self._flushes += 1
+        try:
+            self._batch_ready.set()
+            await self._queue.join()
+        finally:
+            self._flushes -= 1
+
+    async def stop(self):
+        """Write everything still queued and stop the background task."""
+        if self._task is None:
+            return
+        self._closing = True
+        await self.flush()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def _drain(self, batch: list):
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                return
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            self._drain(batch)
+            if len(batch) < self.batch_size and not (self._closing or self._flushes):
+                self._batch_ready.clear()
+                try:
+                    await asyncio.wait_for(self._batch_ready.wait(), self.flush_interval_s)
+                except asyncio.TimeoutError:
+                    pass
+                self._drain(batch)
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _commit(self, rows: list):
+        async with self.session_factory() as session:
+            session.add_all(rows)
+            await session.commit()
+
+    async def _write(self, batch: list):
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self._commit(batch)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    logger.error("db_batch_write_failed", rows=len(batch), error=str(e))
+                    if len(batch) == 1:
+                        self.stats["dropped"] += 1
+                    else:
+                        await self._write_rows(batch)
+                    return
+                self.stats["retries"] += 1
+                await asyncio.sleep(0.05 * 2 ** attempt)
+            else:
+                self.stats["rows"] += len(batch)
+                self.stats["batches"] += 1
+                return
+
+    async def _write_rows(self, batch: list):
+        """Insert a failed batch row by row, dropping only the rows that fail."""
+        for row in batch:
+            try:
+                await self._commit([row])
+            except Exception as e:
+                self.stats["dropped"] += 1
+                logger.error(
+                    "db_row_write_failed",
+                    table=getattr(row, "__tablename__", type(row).__name__),
+                    row_id=getattr(row, "id", None),
+                    error=str(e),
+                )
+            else:
+                self.stats["rows"] += 1
+
+
+class GatewayDatabase:
+    """
+    Engine, sessions and write path for the gateway database.
+
+    Write modes:
+        batched: records are queued and inserted in groups by a BatchedWriter
+        async: each record is committed on its own async session
+        sync: each record is committed on a blocking session (legacy path,
+              kept for benchmarking; it stalls the event loop)
+
+    Engines are created in ``start`` so that importing the application does
+    not require a database driver.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        mode: str = "batched",
+        pool_size: int = 10,
+        max_overflow: int = 20,
+        batch_size: int = 200,
+        flush_interval_ms: int = 50,
+        max_queue: int = 10000,
+    ):
+        if mode not in WRITE_MODES:
+            raise ValueError(f"Unknown database write mode: {mode}")
+        self.url = url
+        self.mode = mode
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.batch_size = batch_size
+        self.flush_interval_ms = flush_interval_ms
+        self.max_queue = max_queue
+        self.engine = None
+        self.sync_engine = None
+        self.session_factory = None
+        self.sync_session_factory = None
+        self.writer: Optional[BatchedWriter] = None
+
+    @classmethod
+    def from_settings(cls, config) -> "GatewayDatabase":
+        """Build from gateway Settings (``database_url`` and ``db_*`` fields)."""
+        return cls(
+            url=config.database_url,
+            mode=config.db_write_mode,
+            pool_size=config.db_pool_size,
+            max_overflow=config.db_max_overflow,
+            batch_size=config.db_write_batch_size,
+            flush_interval_ms=config.db_flush_interval_ms,
+            max_queue=config.db_write_queue_size,
+        )
+
+    def _engine_kwargs(self, url: str) -> Dict[str, Any]:
+        if url.startswith("sqlite"):
+            return {}
+        return {"pool_size": self.pool_size, "max_overflow": self.max_overflow, "pool_pre_ping": True}
+
+    async def start(self):
+        """Create engines and tables, and start the batched writer."""
+        if self.mode == "sync":
+            url = to_sync_url(self.url)
+            self.sync_engine = create_engine(url, **self._engine_kwargs(url))
+            self.sync_session_factory = sessionmaker(
+                autocommit=False, autoflush=False, bind=self.sync_engine
+            )
+            Base.metadata.create_all(bind=self.sync_engine)
+            return
+
+        url = to_async_url(self.url)
+        self.engine = create_async_engine(url, **self._engine_kwargs(url))
+        self.session_factory = async_sessionmaker(self.engine, expire_on_commit=False)
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        if self.mode == "batched":
+            self.writer = BatchedWriter(
+                self.session_factory,
+                batch_size=self.batch_size,
+                flush_interval_s=self.flush_interval_ms / 1000,
+                max_queue=self.max_queue,
+            )
+            await self.writer.start()
+
+    async def stop(self):
+        """Flush pending writes and dispose of the engines."""
+        if self.writer is not None:
+            await self.writer.stop()
+            self.writer = None
+        if self.engine is not None:
+            await self.engine.dispose()
+            self.engine = None
+        if self.sync_engine is not None:
+            self.sync_engine.dispose()
+            self.sync_engine = None
+
+    def session(self) -> AsyncSession:
+        """Open an async session (``async with database.session() as s``)."""
+        if self.session_factory is None:
+            raise RuntimeError("Async sessions are not available (database not started or sync mode)")
+        return self.session_factory()
+
+    async def record(self, row):
+        """
+        Persist an ORM row according to the write mode.
+
+        Raises:
+            RuntimeError: If called before ``start`` or after ``stop``
+        """
+        started = self.writer if self.mode == "batched" else self.engine or self.sync_engine
+        if started is None:
+            raise RuntimeError("GatewayDatabase not started")
+        if self.mode == "batched":
+            await self.writer.submit(row)
+        elif self.mode == "async":
+            async with self.session_factory() as session:
+                session.add(row)
+                await session.commit()
+        else:
+            db = self.sync_session_factory()
+            try:
+                db.add(row)
+                db.commit()
+            finally:
+                db.close()
+
+    async def record_audit(self, entry: dict):
+        """Persist an AuditLogger entry as an AuditEvent row."""
+        await self.record(AuditEvent(
+            id=str(uuid.uuid4()),
+            request_id=entry["request_id"],
+            tenant_id=entry["tenant_id"],
+            project_id=entry["project_id"],
+            user_id=entry["user_id"],
+            action=entry["action"],
+            details=entry["details"],
+            created_at=datetime.fromisoformat(entry["timestamp"]),
+        ))
+
+    async def flush(self):
+        """Wait for queued writes to reach the database (batched mode)."""
+        if self.writer is not None:
+            await self.writer.flush()
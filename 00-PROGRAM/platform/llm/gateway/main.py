@@ -3,30 +3,38 @@ Main API application for LLM Gateway.
 """
 
 import uuid
+import math
 import time
+import json
+from datetime import datetime
 from typing import Optional
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Depends, HTTPException, Header, status
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from fastapi.responses import StreamingResponse
 
+from .cache import ResponseCache
 from .config import settings
-from .models import Base, ChatRequest as ChatRequestModel, EmbeddingRequest as EmbeddingRequestModel
+from .db import GatewayDatabase
+from .models import ChatRequest as ChatRequestModel, EmbeddingRequest as EmbeddingRequestModel
 from .schemas import (
     ChatRequest, ChatResponse,
     EmbedRequest, EmbedResponse,
+    CacheStatsResponse,
     KnowledgeSyncRequest, KnowledgeSyncResponse,
     ContextCreateRequest, ContextResponse
 )
 from .providers import ProviderFactory
+from .quotas import (
+    QuotaEnforcer, QuotaExceeded, TenantPolicy,
+    create_quota_backend, load_tenant_policies
+)
 from .security import SecurityManager, TenantIsolation, AuditLogger, KMSManager
 
 
-# Database setup
-engine = create_engine(settings.database_url)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Database setup (engines are created at startup)
+database = GatewayDatabase.from_settings(settings)
 
 
 # Initialize security components
@@ -35,6 +43,14 @@ security_manager = SecurityManager(
     algorithm=settings.jwt_algorithm
 )
 audit_logger = AuditLogger(enabled=settings.audit_log_enabled)
+quota_enforcer = QuotaEnforcer(
+    default_policy=TenantPolicy(
+        max_requests_per_day=settings.quota_default_requests_per_day,
+        max_tokens_per_request=settings.quota_default_max_tokens_per_request,
+        requests_per_minute=settings.rate_limit_requests_per_minute,
+        burst=settings.rate_limit_burst
+    )
+)
 kms_manager = KMSManager(
     provider=settings.kms_provider,
     aws_kms_key_id=settings.aws_kms_key_id,
@@ -43,13 +59,47 @@ kms_manager = KMSManager(
 )
 
 
+def _create_cache_embedder():
+    """Prompt embedder for semantic cache lookups (None when disabled)."""
+    if not settings.response_cache_semantic_enabled:
+        return None
+    from ..embed.service import EmbeddingService
+    service = EmbeddingService(default_model=settings.response_cache_embedding_model)
+    
+    async def embed(texts):
+        return (await service.generate_embeddings(texts))["embeddings"]
+    
+    return embed
+
+
+response_cache = ResponseCache(
+    max_entries=settings.response_cache_max_entries,
+    chat_ttl_s=settings.response_cache_ttl_seconds,
+    embedding_ttl_s=settings.response_cache_embedding_ttl_seconds,
+    embedder=_create_cache_embedder(),
+    semantic_threshold=settings.response_cache_semantic_threshold
+)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifecycle management."""
     # Startup
-    Base.metadata.create_all(bind=engine)
+    await database.start()
+    audit_logger.sink = database.record_audit
+    if settings.rate_limit_enabled:
+        quota_enforcer.backend = create_quota_backend(settings.quota_backend_url)
+        await quota_enforcer.start(
+            sync_interval_s=settings.quota_sync_interval_ms / 1000,
+            policy_loader=_load_tenant_policies if database.session_factory else None,
+            policy_refresh_s=settings.quota_policy_refresh_seconds
+        )
     yield
     # Shutdown
+    if settings.rate_limit_enabled:
+        await quota_enforcer.stop()
+    await ProviderFactory.close_all()
+    await database.stop()
 
 
 app = FastAPI(
@@ -69,14 +119,25 @@ app.add_middleware(
 )
 
 
-# Dependency injection
-def get_db():
-    """Get database session."""
-    db = SessionLocal()
+async def _load_tenant_policies():
+    return await load_tenant_policies(
+        database.session_factory,
+        requests_per_minute=settings.rate_limit_requests_per_minute,
+        burst=settings.rate_limit_burst
+    )
+
+
+def enforce_quota(tenant_id: str, model: str, max_tokens: Optional[int] = None):
+    """Apply tenant quotas; the request is sent upstream unchanged."""
+    if not settings.rate_limit_enabled:
+        return
     try:
-        yield db
-    finally:
-        db.close()
+        quota_enforcer.check(tenant_id, model, max_tokens)
+    except QuotaExceeded as e:
+        headers = None
+        if e.retry_after is not None:
+            headers = {"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+        raise HTTPException(status_code=e.status_code, detail=e.detail, headers=headers)
 
 
 def get_current_user(authorization: Optional[str] = Header(None)):
@@ -123,7 +184,6 @@ async def health_check():
 @app.post(f"{settings.api_prefix}/chat", response_model=ChatResponse)
 async def chat(
     request: ChatRequest,
-    db: Session = Depends(get_db),
     user: dict = Depends(get_current_user)
 ):
     """
@@ -143,6 +203,9 @@ async def chat(
             detail="Access denied to requested tenant/project"
         )
     
+    # Enforce tenant quotas before any provider call
+    enforce_quota(request.tenant_id, request.model, request.max_tokens)
+    
     request_id = str(uuid.uuid4())
     start_time = time.time()
     
@@ -153,18 +216,42 @@ async def chat(
         # Convert messages
         messages = [{"role": msg.role, "content": msg.content} for msg in request.messages]
         
-        # Execute chat completion
-        result = await provider.chat(
-            messages=messages,
-            model=request.model,
-            temperature=request.temperature,
-            max_tokens=request.max_tokens
-        )
+        # Serve repeats from the response cache
+        params = {
+            "temperature": request.temperature,
+            "max_tokens": request.max_tokens,
+            "top_p": request.top_p,
+            "tools": request.tools
+        }
+        namespace = ResponseCache.namespace(request.tenant_id, request.project_id)
+        use_cache = settings.response_cache_enabled and request.cache
+        cache_hit = None
+        if use_cache:
+            result, cache_hit, lookup = await response_cache.get_chat(
+                namespace, request.model, messages, params
+            )
+        
+        if cache_hit is None:
+            # Execute chat completion
+            result = await provider.chat(
+                messages=messages,
+                model=request.model,
+                temperature=request.temperature,
+                max_tokens=request.max_tokens
+            )
         
         latency_ms = int((time.time() - start_time) * 1000)
         
-        # Calculate cost (simplified)
-        cost_usd = _calculate_cost(request.model, result["total_tokens"])
+        # Calculate cost (simplified); cache hits cost nothing upstream
+        if cache_hit:
+            cost_usd = _calculate_cost(request.model, 0)
+        else:
+            cost_usd = _calculate_cost(request.model, result["total_tokens"])
+            if use_cache:
+                response_cache.put_chat(
+                    namespace, request.model, params, lookup, result,
+                    latency_ms=latency_ms, cost_usd=float(cost_usd)
+                )
         
         # Audit log
         await audit_logger.log_request(
@@ -175,7 +262,8 @@ async def chat(
             action="chat",
             details={
                 "model": request.model,
-                "tokens": result["total_tokens"]
+                "tokens": result["total_tokens"],
+                "cache": cache_hit
             }
         )
         
@@ -196,8 +284,7 @@ async def chat(
             cost_usd=cost_usd,
             guardrails_passed=True
         )
-        db.add(chat_record)
-        db.commit()
+        await database.record(chat_record)
         
         return ChatResponse(
             id=request_id,
@@ -208,7 +295,8 @@ async def chat(
             total_tokens=result["total_tokens"],
             latency_ms=latency_ms,
             cost_usd=cost_usd,
-            guardrails_passed=True
+            guardrails_passed=True,
+            cached=cache_hit
         )
     
     except Exception as e:
@@ -218,10 +306,117 @@ async def chat(
         )
 
 
+@app.post(f"{settings.api_prefix}/chat/stream")
+async def chat_stream(
+    request: ChatRequest,
+    user: dict = Depends(get_current_user)
+):
+    """
+    Streaming chat completion endpoint.
+    
+    Returns server-sent events: one ``{"id", "delta"}`` event per content
+    fragment, then a final ``{"id", "done": true, ...usage}`` event. The
+    request is audited and stored once the stream completes.
+    """
+    # Validate tenant access
+    if not TenantIsolation.validate_tenant_access(
+        token_tenant_id=user.get("tenant_id"),
+        request_tenant_id=request.tenant_id,
+        token_project_id=user.get("project_id"),
+        request_project_id=request.project_id
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to requested tenant/project"
+        )
+    
+    # Enforce tenant quotas before any provider call
+    enforce_quota(request.tenant_id, request.model, request.max_tokens)
+    
+    try:
+        provider = ProviderFactory.get_provider_for_model(request.model, settings)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Chat completion failed: {str(e)}"
+        )
+    
+    request_id = str(uuid.uuid4())
+    messages = [{"role": msg.role, "content": msg.content} for msg in request.messages]
+    
+    async def event_stream():
+        start_time = time.time()
+        content_parts = []
+        usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        
+        try:
+            async for chunk in provider.chat_stream(
+                messages=messages,
+                model=request.model,
+                temperature=request.temperature,
+                max_tokens=request.max_tokens
+            ):
+                if "delta" in chunk:
+                    content_parts.append(chunk["delta"])
+                    yield _sse_event({"id": request_id, "delta": chunk["delta"]})
+                elif "usage" in chunk:
+                    usage = chunk["usage"]
+        except Exception as e:
+            yield _sse_event(
+                {"id": request_id, "error": f"Chat completion failed: {str(e)}"},
+                event="error"
+            )
+            return
+        
+        latency_ms = int((time.time() - start_time) * 1000)
+        cost_usd = _calculate_cost(request.model, usage["total_tokens"])
+        
+        yield _sse_event({
+            "id": request_id,
+            "done": True,
+            "model": request.model,
+            **usage,
+            "latency_ms": latency_ms,
+            "cost_usd": cost_usd,
+        })
+        
+        # Audit log
+        await audit_logger.log_request(
+            request_id=request_id,
+            tenant_id=request.tenant_id,
+            project_id=request.project_id,
+            user_id=user.get("user_id", "unknown"),
+            action="chat_stream",
+            details={
+                "model": request.model,
+                "tokens": usage["total_tokens"]
+            }
+        )
+        
+        # Store in database
+        await database.record(ChatRequestModel(
+            id=request_id,
+            tenant_id=request.tenant_id,
+            project_id=request.project_id,
+            user_id=user.get("user_id", "unknown"),
+            model=request.model,
+            provider=provider.__class__.__name__,
+            prompt=messages[-1]["content"],
+            response="".join(content_parts),
+            prompt_tokens=usage["prompt_tokens"],
+            completion_tokens=usage["completion_tokens"],
+            total_tokens=usage["total_tokens"],
+            latency_ms=latency_ms,
+            cost_usd=cost_usd,
+            guardrails_passed=True
+        ))
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @app.post(f"{settings.api_prefix}/embed", response_model=EmbedResponse)
 async def embed(
     request: EmbedRequest,
-    db: Session = Depends(get_db),
     user: dict = Depends(get_current_user)
 ):
     """
@@ -239,6 +434,9 @@ async def embed(
             detail="Access denied to requested tenant/project"
         )
     
+    # Enforce tenant quotas before any provider call
+    enforce_quota(request.tenant_id, request.model)
+    
     request_id = str(uuid.uuid4())
     start_time = time.time()
     
@@ -249,11 +447,30 @@ async def embed(
         # Convert input to list
         texts = [request.input] if isinstance(request.input, str) else request.input
         
-        # Generate embeddings
-        result = await provider.embed(texts=texts, model=request.model)
+        # Look up each input in the response cache; only misses go upstream
+        namespace = ResponseCache.namespace(request.tenant_id, request.project_id)
+        use_cache = settings.response_cache_enabled and request.cache
+        if use_cache:
+            embeddings, missing = response_cache.get_embeddings(namespace, request.model, texts)
+        else:
+            embeddings, missing = [None] * len(texts), list(range(len(texts)))
+        
+        tokens = 0
+        if missing:
+            # Generate embeddings
+            missing_texts = [texts[i] for i in missing]
+            result = await provider.embed(texts=missing_texts, model=request.model)
+            tokens = result["tokens"]
+            for i, vector in zip(missing, result["embeddings"]):
+                embeddings[i] = vector
         
         latency_ms = int((time.time() - start_time) * 1000)
-        cost_usd = _calculate_embedding_cost(request.model, result["tokens"])
+        cost_usd = _calculate_embedding_cost(request.model, tokens)
+        if use_cache and missing:
+            response_cache.put_embeddings(
+                namespace, request.model, missing_texts, result["embeddings"],
+                latency_ms=latency_ms, cost_usd=float(cost_usd)
+            )
         
         # Audit log
         await audit_logger.log_request(
@@ -264,7 +481,8 @@ async def embed(
             action="embed",
             details={
                 "model": request.model,
-                "tokens": result["tokens"]
+                "tokens": tokens,
+                "cached_inputs": len(texts) - len(missing)
             }
         )
         
@@ -277,21 +495,21 @@ async def embed(
             model=request.model,
             provider=provider.__class__.__name__,
             text=texts[0] if len(texts) == 1 else f"{len(texts)} texts",
-            embedding_dimensions=len(result["embeddings"][0]) if result["embeddings"] else 0,
-            tokens=result["tokens"],
+            embedding_dimensions=len(embeddings[0]) if embeddings else 0,
+            tokens=tokens,
             latency_ms=latency_ms,
             cost_usd=cost_usd
         )
-        db.add(embed_record)
-        db.commit()
+        await database.record(embed_record)
         
         return EmbedResponse(
             id=request_id,
             model=request.model,
-            embeddings=result["embeddings"],
-            tokens=result["tokens"],
+            embeddings=embeddings,
+            tokens=tokens,
             latency_ms=latency_ms,
-            cost_usd=cost_usd
+            cost_usd=cost_usd,
+            cached_inputs=len(texts) - len(missing)
         )
     
     except Exception as e:
@@ -301,6 +519,34 @@ async def embed(
         )
 
 
+@app.get(f"{settings.api_prefix}/cache/stats", response_model=CacheStatsResponse)
+async def cache_stats(
+    tenant_id: str,
+    project_id: str,
+    user: dict = Depends(get_current_user)
+):
+    """
+    Response cache statistics for a tenant/project.
+    
+    Reports hit rate, and the provider latency and cost that cache hits
+    avoided (measured when each entry was stored).
+    """
+    # Validate tenant access
+    if not TenantIsolation.validate_tenant_access(
+        token_tenant_id=user.get("tenant_id"),
+        request_tenant_id=tenant_id,
+        token_project_id=user.get("project_id"),
+        request_project_id=project_id
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to requested tenant/project"
+        )
+    
+    stats = response_cache.stats_for(ResponseCache.namespace(tenant_id, project_id))
+    return CacheStatsResponse(tenant_id=tenant_id, project_id=project_id, **stats)
+
+
 @app.post("/knowledge/sync", response_model=KnowledgeSyncResponse)
 async def sync_knowledge(
     request: KnowledgeSyncRequest,
@@ -370,6 +616,12 @@ async def create_context(
     )
 
 
+def _sse_event(data: dict, event: Optional[str] = None) -> str:
+    """Format a server-sent event."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
 def _calculate_cost(model: str, tokens: int) -> str:
     """Calculate approximate cost in USD."""
     # Simplified cost calculation
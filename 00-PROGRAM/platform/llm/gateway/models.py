@@ -81,6 +81,28 @@ class EmbeddingRequest(Base):
     )
 
 
+class AuditEvent(Base):
+    """Append-only audit trail written by AuditLogger."""
+    
+    __tablename__ = "audit_events"
+    
+    id = Column(String(36), primary_key=True)
+    request_id = Column(String(36), nullable=False, index=True)
+    tenant_id = Column(String(100), nullable=False, index=True)
+    project_id = Column(String(100), nullable=False, index=True)
+    user_id = Column(String(100), nullable=False, index=True)
+    
+    action = Column(String(50), nullable=False)
+    details = Column(JSON, nullable=True)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    __table_args__ = (
+        Index("idx_tenant_project_audit", "tenant_id", "project_id"),
+        Index("idx_created_at_audit", "created_at"),
+    )
+
+
 class TenantConfig(Base):
     """Tenant-specific configuration."""
     
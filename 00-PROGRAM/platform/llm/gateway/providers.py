@@ -3,10 +3,15 @@ LLM Provider abstraction layer.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 import time
 import uuid
 
+try:
+    from .transport import ProviderTransport, TransportConfig, iter_sse_data
+except ImportError:
+    from transport import ProviderTransport, TransportConfig, iter_sse_data
+
 
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
@@ -33,6 +38,35 @@ class LLMProvider(ABC):
         """
         pass
     
+    async def chat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute a chat completion, yielding output as it is generated.
+        
+        Yields:
+            {"delta": str} for each content fragment, then a final
+            {"usage": {"prompt_tokens": int, "completion_tokens": int, "total_tokens": int}}
+        
+        Providers without native streaming yield the full completion once.
+        """
+        result = await self.chat(messages, model, temperature, max_tokens, **kwargs)
+        yield {"delta": result["content"]}
+        yield {"usage": {
+            "prompt_tokens": result["prompt_tokens"],
+            "completion_tokens": result["completion_tokens"],
+            "total_tokens": result["total_tokens"],
+        }}
+    
+    async def aclose(self):
+        """Release provider resources."""
+        pass
+    
     @abstractmethod
     async def embed(
         self,
@@ -54,9 +88,21 @@ class LLMProvider(ABC):
 class OpenAIProvider(LLMProvider):
     """OpenAI provider implementation."""
     
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.openai.com/v1",
+        transport: Optional[ProviderTransport] = None,
+    ):
         self.api_key = api_key
-        self.base_url = "https://api.openai.com/v1"
+        self.base_url = base_url
+        self.transport = transport or ProviderTransport()
+    
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
     
     async def chat(
         self,
@@ -67,13 +113,6 @@ class OpenAIProvider(LLMProvider):
         **kwargs
     ) -> Dict[str, Any]:
         """Execute OpenAI chat completion."""
-        import httpx
-        
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
         payload = {
             "model": model,
             "messages": messages,
@@ -83,15 +122,11 @@ class OpenAIProvider(LLMProvider):
         if max_tokens:
             payload["max_tokens"] = max_tokens
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=60.0
-            )
-            response.raise_for_status()
-            data = response.json()
+        data = await self.transport.post_json(
+            f"{self.base_url}/chat/completions",
+            headers=self._headers(),
+            payload=payload,
+        )
         
         return {
             "content": data["choices"][0]["message"]["content"],
@@ -100,33 +135,60 @@ class OpenAIProvider(LLMProvider):
             "total_tokens": data["usage"]["total_tokens"],
         }
     
+    async def chat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream OpenAI chat completion tokens."""
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "stream": True,
+            "stream_options": {"include_usage": True},
+        }
+        
+        if max_tokens:
+            payload["max_tokens"] = max_tokens
+        
+        lines = self.transport.stream_lines(
+            f"{self.base_url}/chat/completions",
+            headers=self._headers(),
+            payload=payload,
+        )
+        async for chunk in iter_sse_data(lines):
+            for choice in chunk.get("choices") or []:
+                content = choice.get("delta", {}).get("content")
+                if content:
+                    yield {"delta": content}
+            usage = chunk.get("usage")
+            if usage:
+                yield {"usage": {
+                    "prompt_tokens": usage["prompt_tokens"],
+                    "completion_tokens": usage["completion_tokens"],
+                    "total_tokens": usage["total_tokens"],
+                }}
+    
     async def embed(
         self,
         texts: List[str],
         model: str
     ) -> Dict[str, Any]:
         """Generate OpenAI embeddings."""
-        import httpx
-        
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
         payload = {
             "model": model,
             "input": texts
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/embeddings",
-                headers=headers,
-                json=payload,
-                timeout=60.0
-            )
-            response.raise_for_status()
-            data = response.json()
+        data = await self.transport.post_json(
+            f"{self.base_url}/embeddings",
+            headers=self._headers(),
+            payload=payload,
+        )
         
         embeddings = [item["embedding"] for item in data["data"]]
         tokens = data["usage"]["total_tokens"]
@@ -135,27 +197,40 @@ class OpenAIProvider(LLMProvider):
             "embeddings": embeddings,
             "tokens": tokens
         }
+    
+    async def aclose(self):
+        """Close the provider connection pool."""
+        await self.transport.aclose()
 
 
 class AnthropicProvider(LLMProvider):
     """Anthropic Claude provider implementation."""
     
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.anthropic.com/v1",
+        transport: Optional[ProviderTransport] = None,
+    ):
         self.api_key = api_key
-        self.base_url = "https://api.anthropic.com/v1"
+        self.base_url = base_url
+        self.transport = transport or ProviderTransport()
     
-    async def chat(
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "x-api-key": self.api_key,
+            "anthropic-version": "2023-06-01",
+            "Content-Type": "application/json"
+        }
+    
+    def _payload(
         self,
         messages: List[Dict[str, str]],
         model: str,
-        temperature: float = 0.7,
-        max_tokens: Optional[int] = None,
-        **kwargs
+        temperature: float,
+        max_tokens: Optional[int],
     ) -> Dict[str, Any]:
-        """Execute Anthropic chat completion."""
-        import httpx
-        
-        # Convert messages format
+        """Convert messages format and build request payload."""
         system_message = None
         formatted_messages = []
         
@@ -165,12 +240,6 @@ class AnthropicProvider(LLMProvider):
             else:
                 formatted_messages.append(msg)
         
-        headers = {
-            "x-api-key": self.api_key,
-            "anthropic-version": "2023-06-01",
-            "Content-Type": "application/json"
-        }
-        
         payload = {
             "model": model,
             "messages": formatted_messages,
@@ -181,15 +250,22 @@ class AnthropicProvider(LLMProvider):
         if system_message:
             payload["system"] = system_message
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/messages",
-                headers=headers,
-                json=payload,
-                timeout=60.0
-            )
-            response.raise_for_status()
-            data = response.json()
+        return payload
+    
+    async def chat(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Execute Anthropic chat completion."""
+        data = await self.transport.post_json(
+            f"{self.base_url}/messages",
+            headers=self._headers(),
+            payload=self._payload(messages, model, temperature, max_tokens),
+        )
         
         return {
             "content": data["content"][0]["text"],
@@ -198,6 +274,48 @@ class AnthropicProvider(LLMProvider):
             "total_tokens": data["usage"]["input_tokens"] + data["usage"]["output_tokens"],
         }
     
+    async def chat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream Anthropic chat completion tokens."""
+        payload = self._payload(messages, model, temperature, max_tokens)
+        payload["stream"] = True
+        
+        prompt_tokens = 0
+        completion_tokens = 0
+        lines = self.transport.stream_lines(
+            f"{self.base_url}/messages",
+            headers=self._headers(),
+            payload=payload,
+        )
+        async for event in iter_sse_data(lines):
+            event_type = event.get("type")
+            if event_type == "message_start":
+                prompt_tokens = event["message"]["usage"].get("input_tokens", 0)
+            elif event_type == "content_block_delta":
+                text = event.get("delta", {}).get("text")
+                if text:
+                    yield {"delta": text}
+            elif event_type == "message_delta":
+                completion_tokens = event.get("usage", {}).get("output_tokens", completion_tokens)
+            elif event_type == "message_stop":
+                break
+        
+        yield {"usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }}
+    
+    async def aclose(self):
+        """Close the provider connection pool."""
+        await self.transport.aclose()
+    
     async def embed(
         self,
         texts: List[str],
@@ -210,6 +328,10 @@ class AnthropicProvider(LLMProvider):
 class ProviderFactory:
     """Factory for creating LLM providers."""
     
+    # Long-lived providers keyed by (provider, api_key, base_url) so that
+    # requests share one connection pool per upstream
+    _providers: Dict[Tuple[str, str, str], LLMProvider] = {}
+    
     @staticmethod
     def create_provider(provider_name: str, **kwargs) -> LLMProvider:
         """Create a provider instance."""
@@ -225,19 +347,50 @@ class ProviderFactory:
         
         return provider_class(**kwargs)
     
-    @staticmethod
-    def get_provider_for_model(model: str, config) -> LLMProvider:
-        """Determine provider based on model name."""
+    @classmethod
+    def get_provider_for_model(cls, model: str, config) -> LLMProvider:
+        """Determine provider based on model name, reusing pooled instances."""
         
         if model.startswith("gpt-") or model.startswith("text-embedding-"):
             if not config.openai_api_key:
                 raise ValueError("OpenAI API key not configured")
-            return OpenAIProvider(api_key=config.openai_api_key)
+            return cls._get_or_create(
+                OpenAIProvider,
+                config.openai_api_key,
+                getattr(config, "openai_base_url", "https://api.openai.com/v1"),
+                config,
+            )
         
         elif model.startswith("claude-"):
             if not config.anthropic_api_key:
                 raise ValueError("Anthropic API key not configured")
-            return AnthropicProvider(api_key=config.anthropic_api_key)
+            return cls._get_or_create(
+                AnthropicProvider,
+                config.anthropic_api_key,
+                getattr(config, "anthropic_base_url", "https://api.anthropic.com/v1"),
+                config,
+            )
         
         else:
             raise ValueError(f"Unknown model: {model}")
+    
+    @classmethod
+    def _get_or_create(cls, provider_class, api_key: str, base_url: str, config) -> LLMProvider:
+        key = (provider_class.__name__, api_key, base_url)
+        provider = cls._providers.get(key)
+        if provider is None:
+            provider = provider_class(
+                api_key=api_key,
+                base_url=base_url,
+                transport=ProviderTransport(TransportConfig.from_settings(config)),
+            )
+            cls._providers[key] = provider
+        return provider
+    
+    @classmethod
+    async def close_all(cls):
+        """Close all pooled providers (call on application shutdown)."""
+        providers = list(cls._providers.values())
+        cls._providers.clear()
+        for provider in providers:
+            await provider.aclose()
@@ -0,0 +1,389 @@
+"""
+Tenant quota and rate-limit enforcement for LLM Gateway.
+
+Checks run in-process before a request reaches a provider:
+
+    - allowed_models: model allow-list (entries ending in ``*`` match a prefix)
+    - max_tokens_per_request: upper bound on explicitly requested completion tokens
+    - requests per minute: token bucket per tenant (bursts up to the bucket size)
+    - max_requests_per_day: sliding-window counter per tenant
+
+A check is a few dictionary lookups and float operations, so it adds
+microseconds per request. With a shared ``QuotaBackend`` configured, the
+daily counters of every gateway instance are reconciled in the background
+(``QuotaEnforcer.sync``); request-path checks never wait on the backend.
+"""
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, FrozenSet, Optional, Tuple
+
+import structlog
+from sqlalchemy import select
+
+try:
+    from .models import TenantConfig
+except ImportError:
+    from models import TenantConfig
+
+
+logger = structlog.get_logger(__name__)
+
+DAY_SECONDS = 86400.0
+
+
+class QuotaExceeded(Exception):
+    """A request was rejected by tenant policy."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: Optional[float] = None):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class TenantPolicy:
+    """Limits applied to one tenant (None means unlimited / unrestricted)."""
+
+    max_requests_per_day: Optional[int] = 1000
+    max_tokens_per_request: Optional[int] = 4096
+    allowed_models: Optional[FrozenSet[str]] = None
+    requests_per_minute: Optional[int] = 60
+    burst: Optional[int] = None
+
+    @classmethod
+    def from_config(cls, config: TenantConfig, requests_per_minute: Optional[int] = 60,
+                    burst: Optional[int] = None) -> "TenantPolicy":
+        """Build from a TenantConfig row; the per-minute rate comes from settings."""
+        return cls(
+            max_requests_per_day=config.max_requests_per_day,
+            max_tokens_per_request=config.max_tokens_per_request,
+            allowed_models=frozenset(config.allowed_models) if config.allowed_models is not None else None,
+            requests_per_minute=requests_per_minute,
+            burst=burst,
+        )
+
+    def model_allowed(self, model: str) -> bool:
+        allowed = self.allowed_models
+        if allowed is None or model in allowed:
+            return True
+        return any(entry.endswith("*") and model.startswith(entry[:-1]) for entry in allowed)
+
+
+async def load_tenant_policies(
+    session_factory,
+    requests_per_minute: Optional[int] = 60,
+    burst: Optional[int] = None,
+) -> Dict[str, TenantPolicy]:
+    """Read every TenantConfig row into policies keyed by tenant_id."""
+    async with session_factory() as session:
+        rows = (await session.scalars(select(TenantConfig))).all()
+    return {
+        row.tenant_id: TenantPolicy.from_config(row, requests_per_minute, burst)
+        for row in rows
+    }
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate`` tokens per second."""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity: float, rate: float, now: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def available(self, now: float, cost: float = 1.0) -> float:
+        """0.0 if ``cost`` tokens are available now, else seconds until they are."""
+        self._refill(now)
+        if self.tokens >= cost:
+            return 0.0
+        return (cost - self.tokens) / self.rate if self.rate > 0 else float("inf")
+
+    def consume(self, cost: float = 1.0):
+        self.tokens -= cost
+
+
+class SlidingWindowCounter:
+    """
+    Sliding-window request counter over fixed, clock-aligned windows.
+
+    The count for the window ending now is estimated as the current
+    window's count plus the previous window's count weighted by how much
+    of it still overlaps (the usual two-bucket approximation). Windows are
+    aligned to wall-clock multiples of ``window_s`` so counters in separate
+    processes agree on window boundaries. Local increments not yet pushed
+    to a shared backend are kept in ``pending``.
+    """
+
+    __slots__ = ("window_s", "window", "current", "previous", "pending")
+
+    def __init__(self, window_s: float, now: float):
+        self.window_s = window_s
+        self.window = int(now // window_s)
+        self.current = 0
+        self.previous = 0
+        self.pending: Dict[int, int] = {}
+
+    def _roll(self, now: float):
+        window = int(now // self.window_s)
+        if window != self.window:
+            self.previous = self.current if window == self.window + 1 else 0
+            self.current = 0
+            self.window = window
+
+    def count(self, now: float) -> float:
+        self._roll(now)
+        overlap = 1.0 - (now / self.window_s - self.window)
+        return self.current + self.previous * overlap
+
+    def retry_after(self, now: float, limit: int) -> float:
+        """Seconds until the estimate drops below ``limit`` (assuming no new requests)."""
+        self._roll(now)
+        window_end = (self.window + 1) * self.window_s
+        if self.current >= limit or self.previous == 0:
+            return window_end - now
+        # previous * (1 - t/window) + current < limit
+        t = (1.0 - (limit - self.current) / self.previous) * self.window_s
+        return max(0.0, self.window * self.window_s + t - now)
+
+    def increment(self):
+        self.current += 1
+        self.pending[self.window] = self.pending.get(self.window, 0) + 1
+
+    def merge(self, window: int, total: int, since: int):
+        """Apply a shared total for ``window``; ``since`` local increments arrived meanwhile."""
+        if window == self.window:
+            self.current = max(self.current, total + since)
+        elif window == self.window - 1:
+            self.previous = max(self.previous, total + since)
+
+
+class QuotaBackend(ABC):
+    """Shared counter store that reconciles daily counts across gateway instances."""
+
+    @abstractmethod
+    async def add(self, key: str, delta: int, ttl_s: int) -> int:
+        """Add ``delta`` to ``key`` (expiring after ``ttl_s``) and return the new total."""
+
+    async def aclose(self):
+        pass
+
+
+class InMemoryQuotaBackend(QuotaBackend):
+    """Process-local backend (tests, and several enforcers in one process)."""
+
+    def __init__(self):
+        self.counters: Dict[str, int] = {}
+
+    async def add(self, key: str, delta: int, ttl_s: int) -> int:
+        total = self.counters.get(key, 0) + delta
+        self.counters[key] = total
+        return total
+
+
+class RedisQuotaBackend(QuotaBackend):
+    """Redis-backed counters (requires the ``redis`` package)."""
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise ImportError("redis is required for the shared quota backend")
+        self.client = redis.from_url(url)
+
+    async def add(self, key: str, delta: int, ttl_s: int) -> int:
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.incrby(key, delta)
+            pipe.expire(key, ttl_s)
+            total, _ = await pipe.execute()
+        return int(total)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+def create_quota_backend(url: Optional[str]) -> Optional[QuotaBackend]:
+    """Backend for a URL: None (local only), ``memory://`` or ``redis://...``."""
+    if not url:
+        return None
+    if url.startswith("memory://"):
+        return InMemoryQuotaBackend()
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisQuotaBackend(url)
+    raise ValueError(f"Unknown quota backend: {url}")
+
+
+class QuotaEnforcer:
+    """
+    Per-tenant limit checks for the request path.
+
+    ``check`` is synchronous and touches only in-process state; it is meant
+    to be called from the event loop thread. Policies are set per tenant
+    (``set_policies``); tenants without one get ``default_policy``.
+    """
+
+    def __init__(
+        self,
+        default_policy: Optional[TenantPolicy] = None,
+        backend: Optional[QuotaBackend] = None,
+        day_window_s: float = DAY_SECONDS,
+        clock: Callable[[], float] = time.time,
+        key_prefix: str = "llm-gateway:quota",
+    ):
+        self.default_policy = default_policy or TenantPolicy()
+        self.backend = backend
+        self.day_window_s = day_window_s
+        self.clock = clock
+        self.key_prefix = key_prefix
+        self.policies: Dict[str, TenantPolicy] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._days: Dict[str, SlidingWindowCounter] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"allowed": 0, "rejected": 0, "syncs": 0, "sync_errors": 0}
+
+    def set_policies(self, policies: Dict[str, TenantPolicy]):
+        """Replace tenant policies; buckets are rebuilt lazily for changed rates."""
+        self.policies = dict(policies)
+        for tenant_id in list(self._buckets):
+            policy = self.policies.get(tenant_id, self.default_policy)
+            if policy.requests_per_minute is None:
+                del self._buckets[tenant_id]
+                continue
+            bucket = self._buckets[tenant_id]
+            capacity, rate = self._bucket_shape(policy)
+            if bucket.capacity != capacity or bucket.rate != rate:
+                del self._buckets[tenant_id]
+
+    @staticmethod
+    def _bucket_shape(policy: TenantPolicy) -> Tuple[float, float]:
+        rpm = policy.requests_per_minute
+        return float(policy.burst or rpm), rpm / 60.0
+
+    def check(self, tenant_id: str, model: str, max_tokens: Optional[int] = None) -> Optional[int]:
+        """
+        Admit a request or raise QuotaExceeded.
+
+        Nothing is counted for rejected requests. The request itself is
+        never changed: only an explicit max_tokens above the tenant limit
+        is rejected.
+
+        Returns:
+            Completion tokens budgeted for the request: the requested
+            max_tokens, or the tenant limit as an estimate when unset
+            (None when neither is known).
+        """
+        policy = self.policies.get(tenant_id, self.default_policy)
+
+        if not policy.model_allowed(model):
+            self.stats["rejected"] += 1
+            raise QuotaExceeded(403, f"Model {model} is not allowed for tenant {tenant_id}")
+
+        limit = policy.max_tokens_per_request
+        if limit is not None and max_tokens is not None and max_tokens > limit:
+            self.stats["rejected"] += 1
+            raise QuotaExceeded(400, f"max_tokens {max_tokens} exceeds tenant limit of {limit}")
+        budget = max_tokens if max_tokens is not None else limit
+
+        now = self.clock()
+
+        bucket = None
+        if policy.requests_per_minute is not None:
+            bucket = self._buckets.get(tenant_id)
+            if bucket is None:
+                capacity, rate = self._bucket_shape(policy)
+                bucket = self._buckets[tenant_id] = TokenBucket(capacity, rate, now)
+            wait = bucket.available(now)
+            if wait:
+                self.stats["rejected"] += 1
+                raise QuotaExceeded(429, "Rate limit exceeded", retry_after=wait)
+
+        day = None
+        daily_limit = policy.max_requests_per_day
+        if daily_limit is not None:
+            day = self._days.get(tenant_id)
+            if day is None:
+                day = self._days[tenant_id] = SlidingWindowCounter(self.day_window_s, now)
+            if day.count(now) >= daily_limit:
+                self.stats["rejected"] += 1
+                raise QuotaExceeded(429, "Daily request quota exceeded",
+                                    retry_after=day.retry_after(now, daily_limit))
+
+        if bucket is not None:
+            bucket.consume()
+        if day is not None:
+            day.increment()
+        self.stats["allowed"] += 1
+        return budget
+
+    def _key(self, tenant_id: str, window: int) -> str:
+        return f"{self.key_prefix}:{tenant_id}:{window}"
+
+    async def sync(self):
+        """Push local daily increments to the shared backend and pull totals."""
+        if self.backend is None:
+            return
+        ttl = int(2 * self.day_window_s) + 60
+        for tenant_id, day in list(self._days.items()):
+            pending, day.pending = day.pending, {}
+            windows = dict(pending)
+            windows.setdefault(day.window, 0)
+            for window, delta in windows.items():
+                try:
+                    total = await self.backend.add(self._key(tenant_id, window), delta, ttl)
+                except Exception as e:
+                    # Keep the increments for the next attempt
+                    day.pending[window] = day.pending.get(window, 0) + delta
+                    self.stats["sync_errors"] += 1
+                    logger.warning("quota_sync_failed", tenant_id=tenant_id, error=str(e))
+                    continue
+                day.merge(window, total, day.pending.get(window, 0))
+        self.stats["syncs"] += 1
+
+    async def start(
+        self,
+        sync_interval_s: float = 0.5,
+        policy_loader: Optional[Callable[[], Awaitable[Dict[str, TenantPolicy]]]] = None,
+        policy_refresh_s: float = 60.0,
+    ):
+        """Run backend sync and policy refresh in a background task."""
+        if policy_loader is not None:
+            self.set_policies(await policy_loader())
+        self._task = asyncio.create_task(
+            self._run(sync_interval_s, policy_loader, policy_refresh_s)
+        )
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.sync()
+        if self.backend is not None:
+            await self.backend.aclose()
+
+    async def _run(self, sync_interval_s, policy_loader, policy_refresh_s):
+        last_refresh = time.monotonic()
+        while True:
+            await asyncio.sleep(sync_interval_s)
+            await self.sync()
+            if policy_loader is not None and time.monotonic() - last_refresh >= policy_refresh_s:
+                last_refresh = time.monotonic()
+                try:
+                    self.set_policies(await policy_loader())
+                except Exception as e:
+                    logger.warning("quota_policy_refresh_failed", error=str(e))
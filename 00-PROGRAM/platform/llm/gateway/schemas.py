@@ -24,6 +24,7 @@ class ChatRequest(BaseModel):
     max_tokens: Optional[int] = Field(default=None, ge=1, le=32000)
     top_p: Optional[float] = Field(default=1.0, ge=0.0, le=1.0)
     stream: bool = Field(default=False, description="Stream response")
+    cache: bool = Field(default=True, description="Serve from / store in the response cache")
     
     # Context for RAG
     context_ids: Optional[List[str]] = Field(default=None, description="Context IDs for RAG")
@@ -52,6 +53,7 @@ class ChatResponse(BaseModel):
     latency_ms: int
     cost_usd: Optional[str] = None
     guardrails_passed: bool = True
+    cached: Optional[str] = Field(default=None, description="Cache hit type: exact or semantic")
     
     # RAG
     retrieved_contexts: Optional[List[Dict[str, Any]]] = None
@@ -62,6 +64,7 @@ class EmbedRequest(BaseModel):
     
     input: str | List[str] = Field(..., description="Text to embed")
     model: str = Field(default="text-embedding-ada-002", description="Embedding model")
+    cache: bool = Field(default=True, description="Serve from / store in the response cache")
     
     tenant_id: str = Field(..., description="Tenant identifier")
     project_id: str = Field(..., description="Project identifier")
@@ -78,6 +81,24 @@ class EmbedResponse(BaseModel):
     tokens: int
     latency_ms: int
     cost_usd: Optional[str] = None
+    cached_inputs: int = Field(default=0, description="Inputs served from the response cache")
+
+
+class CacheStatsResponse(BaseModel):
+    """Response cache statistics for a tenant/project."""
+    
+    tenant_id: str
+    project_id: str
+    entries: int
+    lookups: int
+    hits: int
+    exact_hits: int
+    semantic_hits: int
+    misses: int
+    hit_rate: float
+    latency_saved_ms: float
+    cost_saved_usd: str
+    by_kind: Dict[str, Dict[str, float]]
 
 
 class KnowledgeSyncRequest(BaseModel):
@@ -2,9 +2,10 @@
 Security utilities for LLM Gateway.
 """
 
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 import uuid
 from datetime import datetime, timedelta
+import structlog
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
@@ -84,8 +85,21 @@ class TenantIsolation:
 class AuditLogger:
     """Audit logging for security events."""
     
-    def __init__(self, enabled: bool = True):
+    def __init__(
+        self,
+        enabled: bool = True,
+        sink: Optional[Callable[[dict], Awaitable[None]]] = None
+    ):
+        """
+        Args:
+            enabled: Whether to record audit events at all
+            sink: Async callable that persists each entry (e.g. the gateway's
+                batched database writer); entries go to structured logging
+                when no sink is set
+        """
         self.enabled = enabled
+        self.sink = sink
+        self._logger = structlog.get_logger("audit")
     
     async def log_request(
         self,
@@ -110,11 +124,10 @@ class AuditLogger:
             "details": details
         }
         
-        # In production, this would write to a secure, append-only log store
-        # For now, we'll just use structured logging
-        import structlog
-        logger = structlog.get_logger()
-        logger.info("audit_log", **log_entry)
+        if self.sink is not None:
+            await self.sink(log_entry)
+        else:
+            self._logger.info("audit_log", **log_entry)
     
     async def log_guardrails_violation(
         self,
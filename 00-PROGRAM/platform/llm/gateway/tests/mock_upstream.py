@@ -0,0 +1,165 @@
+"""
+Mock OpenAI/Anthropic upstream for transport tests and benchmarks.
+
+Serves OpenAI-style ``/chat/completions`` and ``/embeddings`` and
+Anthropic-style ``/messages`` endpoints, with optional latency, per-token
+delay and failure injection. Run standalone with:
+
+    python mock_upstream.py --port 8901 --latency-ms 20
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import List
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+@dataclass
+class MockState:
+    """Configurable behaviour and counters for the mock upstream."""
+
+    latency_s: float = 0.0
+    token_delay_s: float = 0.0
+    tokens: List[str] = field(default_factory=lambda: ["Hello", ",", " world", "!"])
+    fail_first: int = 0
+    fail_status: int = 429
+    requests: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+
+
+def create_mock_upstream(**kwargs) -> FastAPI:
+    """Create a mock upstream app; kwargs initialise MockState."""
+    app = FastAPI()
+    state = MockState(**kwargs)
+    app.state.mock = state
+
+    async def begin():
+        """Count the request and return an injected failure, if any."""
+        state.requests += 1
+        if state.requests <= state.fail_first:
+            return JSONResponse(
+                {"error": {"message": "injected failure"}},
+                status_code=state.fail_status,
+                headers={"retry-after": "0"},
+            )
+        state.in_flight += 1
+        state.max_in_flight = max(state.max_in_flight, state.in_flight)
+        if state.latency_s:
+            await asyncio.sleep(state.latency_s)
+        return None
+
+    def end():
+        state.in_flight -= 1
+
+    async def token_stream(render, first=None, last=None):
+        try:
+            if first:
+                yield first
+            for token in state.tokens:
+                if state.token_delay_s:
+                    await asyncio.sleep(state.token_delay_s)
+                yield render(token)
+            if last:
+                yield last
+        finally:
+            end()
+
+    def sse(data) -> str:
+        return f"data: {json.dumps(data)}\n\n"
+
+    usage = {
+        "prompt_tokens": 5,
+        "completion_tokens": len(state.tokens),
+        "total_tokens": 5 + len(state.tokens),
+    }
+
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        failure = await begin()
+        if failure is not None:
+            return failure
+
+        if body.get("stream"):
+            return StreamingResponse(
+                token_stream(
+                    lambda t: sse({"choices": [{"index": 0, "delta": {"content": t}}]}),
+                    last=sse({"choices": [], "usage": usage}) + "data: [DONE]\n\n",
+                ),
+                media_type="text/event-stream",
+            )
+
+        end()
+        return {
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(state.tokens)}}],
+            "usage": usage,
+        }
+
+    @app.post("/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        failure = await begin()
+        if failure is not None:
+            return failure
+        end()
+        texts = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        return {
+            "data": [{"index": i, "embedding": [0.1, 0.2, 0.3]} for i in range(len(texts))],
+            "usage": {"total_tokens": sum(len(t.split()) for t in texts)},
+        }
+
+    @app.post("/messages")
+    async def messages(request: Request):
+        body = await request.json()
+        failure = await begin()
+        if failure is not None:
+            return failure
+
+        if body.get("stream"):
+            def event(name, data):
+                return f"event: {name}\n" + sse({"type": name, **data})
+
+            return StreamingResponse(
+                token_stream(
+                    lambda t: event("content_block_delta", {"index": 0, "delta": {"type": "text_delta", "text": t}}),
+                    first=event("message_start", {"message": {"usage": {"input_tokens": 5, "output_tokens": 0}}}),
+                    last=(
+                        event("message_delta", {"usage": {"output_tokens": len(state.tokens)}})
+                        + event("message_stop", {})
+                    ),
+                ),
+                media_type="text/event-stream",
+            )
+
+        end()
+        return {
+            "content": [{"type": "text", "text": "".join(state.tokens)}],
+            "usage": {"input_tokens": 5, "output_tokens": len(state.tokens)},
+        }
+
+    return app
+
+
+if __name__ == "__main__":
+    import argparse
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Mock LLM upstream")
+    parser.add_argument("--port", type=int, default=8901)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--token-delay-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    uvicorn.run(
+        create_mock_upstream(
+            latency_s=args.latency_ms / 1000,
+            token_delay_s=args.token_delay_ms / 1000,
+        ),
+        host="127.0.0.1",
+        port=args.port,
+        log_level="warning",
+    )
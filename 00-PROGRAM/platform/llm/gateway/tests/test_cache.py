@@ -0,0 +1,233 @@
+"""
+Tests for the gateway response cache.
+"""
+
+import pytest
+import httpx
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from cache import ResponseCache, chat_key
+from mock_upstream import create_mock_upstream
+
+MESSAGES = [{"role": "user", "content": "What is ATA 32?"}]
+PARAMS = {"temperature": 0.0, "max_tokens": 256, "top_p": 1.0, "tools": None}
+RESULT = {"content": "Landing gear.", "prompt_tokens": 5, "completion_tokens": 3, "total_tokens": 8}
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def miss_then_store(cache, namespace, messages=MESSAGES, params=PARAMS, model="gpt-4"):
+    result, hit, lookup = await cache.get_chat(namespace, model, messages, params)
+    assert hit is None
+    cache.put_chat(namespace, model, params, lookup, RESULT, latency_ms=120, cost_usd=0.0024)
+
+
+class TestChatCache:
+    """Test exact-match chat caching."""
+
+    def test_key_trims_whitespace_and_role_case(self):
+        a = chat_key("gpt-4", [{"role": "User", "content": "  What is ATA 32?\n "}], PARAMS)
+        b = chat_key("gpt-4", MESSAGES, PARAMS)
+        assert a == b
+        assert chat_key("gpt-4", [{"role": "user", "content": "What is\n ATA 32?"}], PARAMS) != b
+        indented = [{"role": "user", "content": "def f():\n    return 1"}]
+        flat = [{"role": "user", "content": "def f():\n return 1"}]
+        assert chat_key("gpt-4", indented, PARAMS) != chat_key("gpt-4", flat, PARAMS)
+        assert chat_key("gpt-4", MESSAGES, {**PARAMS, "temperature": 0.5}) != b
+        assert chat_key("gpt-3.5-turbo", MESSAGES, PARAMS) != b
+
+    @pytest.mark.asyncio
+    async def test_exact_hit(self):
+        cache = ResponseCache()
+        await miss_then_store(cache, "t1/p1")
+        result, hit, _ = await cache.get_chat("t1/p1", "gpt-4", MESSAGES, PARAMS)
+        assert hit == "exact"
+        assert result == RESULT
+
+        stats = cache.stats_for("t1/p1")
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["latency_saved_ms"] == 120
+        assert stats["cost_saved_usd"] == "0.002400"
+
+    @pytest.mark.asyncio
+    async def test_tenant_isolation(self):
+        cache = ResponseCache()
+        await miss_then_store(cache, ResponseCache.namespace("t1", "p1"))
+        for namespace in (ResponseCache.namespace("t2", "p1"), ResponseCache.namespace("t1", "p2")):
+            _, hit, _ = await cache.get_chat(namespace, "gpt-4", MESSAGES, PARAMS)
+            assert hit is None
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = ResponseCache(chat_ttl_s=60, clock=clock)
+        await miss_then_store(cache, "t1/p1")
+        clock.now += 59
+        assert (await cache.get_chat("t1/p1", "gpt-4", MESSAGES, PARAMS))[1] == "exact"
+        clock.now += 2
+        assert (await cache.get_chat("t1/p1", "gpt-4", MESSAGES, PARAMS))[1] is None
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=2)
+        for text in ("a", "b"):
+            await miss_then_store(cache, "t1/p1", [{"role": "user", "content": text}])
+        await cache.get_chat("t1/p1", "gpt-4", [{"role": "user", "content": "a"}], PARAMS)
+        await miss_then_store(cache, "t1/p1", [{"role": "user", "content": "c"}])
+        assert (await cache.get_chat("t1/p1", "gpt-4", [{"role": "user", "content": "a"}], PARAMS))[1]
+        assert (await cache.get_chat("t1/p1", "gpt-4", [{"role": "user", "content": "b"}], PARAMS))[1] is None
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tenant(self):
+        cache = ResponseCache()
+        await miss_then_store(cache, "t1/p1")
+        await miss_then_store(cache, "t1/p2")
+        await miss_then_store(cache, "t2/p1")
+        assert cache.invalidate("t1") == 2
+        assert len(cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_project_is_exact(self):
+        cache = ResponseCache()
+        for namespace in ("t1/p", "t1/p2", "t1/prod", "t10/p"):
+            await miss_then_store(cache, namespace)
+        assert cache.invalidate("t1", "p") == 1
+        assert len(cache) == 3
+        assert cache.invalidate("t1") == 2
+        assert len(cache) == 1
+
+
+class TestSemanticCache:
+    """Test near-duplicate lookup through an embedder."""
+
+    @staticmethod
+    def embedder():
+        calls = []
+
+        async def embed(texts):
+            calls.append(texts)
+            # Bag-of-letters vectors: paraphrases with the same letters match
+            vectors = []
+            for text in texts:
+                body = text.split(": ", 1)[-1].lower()
+                vectors.append([body.count(c) for c in "abcdefghijklmnopqrstuvwxyz0123456789"])
+            return vectors
+
+        return embed, calls
+
+    @pytest.mark.asyncio
+    async def test_semantic_hit_for_near_duplicate(self):
+        embed, calls = self.embedder()
+        cache = ResponseCache(embedder=embed, semantic_threshold=0.95)
+        await miss_then_store(cache, "t1/p1")
+
+        paraphrase = [{"role": "user", "content": "what is ata 32"}]
+        result, hit, _ = await cache.get_chat("t1/p1", "gpt-4", paraphrase, PARAMS)
+        assert hit == "semantic"
+        assert result == RESULT
+
+        unrelated = [{"role": "user", "content": "Describe hydrogen fuel cell cooling"}]
+        assert (await cache.get_chat("t1/p1", "gpt-4", unrelated, PARAMS))[1] is None
+        assert cache.stats_for("t1/p1")["semantic_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_semantic_respects_namespace_and_params(self):
+        embed, _ = self.embedder()
+        cache = ResponseCache(embedder=embed, semantic_threshold=0.95)
+        await miss_then_store(cache, "t1/p1")
+        paraphrase = [{"role": "user", "content": "what is ata 32"}]
+        assert (await cache.get_chat("t2/p1", "gpt-4", paraphrase, PARAMS))[1] is None
+        hot = {**PARAMS, "temperature": 1.0}
+        assert (await cache.get_chat("t1/p1", "gpt-4", paraphrase, hot))[1] is None
+
+    @pytest.mark.asyncio
+    async def test_embedder_failure_falls_back_to_exact(self):
+        async def broken(texts):
+            raise RuntimeError("model not available")
+
+        cache = ResponseCache(embedder=broken)
+        await miss_then_store(cache, "t1/p1")
+        assert (await cache.get_chat("t1/p1", "gpt-4", MESSAGES, PARAMS))[1] == "exact"
+
+
+class TestEmbeddingCache:
+    """Test per-input embedding caching."""
+
+    def test_partial_hits(self):
+        cache = ResponseCache()
+        cache.put_embeddings("t1/p1", "text-embedding-3-small", ["a", "b"], [[1.0], [2.0]],
+                             latency_ms=40, cost_usd=0.0002)
+        found, missing = cache.get_embeddings("t1/p1", "text-embedding-3-small", ["b", "c", "a"])
+        assert found == [[2.0], None, [1.0]]
+        assert missing == [1]
+        stats = cache.stats_for("t1/p1")
+        assert stats["by_kind"]["embedding"]["hits"] == 2
+        assert stats["latency_saved_ms"] == 40
+
+        found, missing = cache.get_embeddings("t2/p1", "text-embedding-3-small", ["a"])
+        assert missing == [0]
+
+
+class TestGatewayCache:
+    """Test the cache through the gateway app against the mock upstream."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_chat_and_embed_skip_upstream(self, tmp_path):
+        sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+        from llm.gateway import main
+        from llm.gateway.db import GatewayDatabase
+        from llm.gateway.providers import OpenAIProvider
+        from llm.gateway.transport import ProviderTransport, TransportConfig
+
+        upstream = create_mock_upstream()
+        main.settings.openai_api_key = "k"
+        main.settings.openai_base_url = "http://upstream"
+        main.ProviderFactory._providers[("OpenAIProvider", "k", "http://upstream")] = OpenAIProvider(
+            api_key="k",
+            base_url="http://upstream",
+            transport=ProviderTransport(TransportConfig(), transport=httpx.ASGITransport(app=upstream)),
+        )
+        main.database = GatewayDatabase(f"sqlite:///{tmp_path / 'gateway.db'}")
+        token = main.security_manager.create_access_token({"user_id": "u", "tenant_id": "t1", "project_id": "p1"})
+        headers = {"Authorization": f"Bearer {token}"}
+        chat = {"tenant_id": "t1", "project_id": "p1", "model": "gpt-4", "temperature": 0.0,
+                "messages": [{"role": "user", "content": "Summarise ATA 32"}]}
+        embed = {"tenant_id": "t1", "project_id": "p1", "model": "text-embedding-3-small",
+                 "input": ["alpha", "beta"]}
+
+        async with main.lifespan(main.app):
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app),
+                                         base_url="http://gateway") as client:
+                first = (await client.post("/llm/chat", json=chat, headers=headers)).json()
+                second = (await client.post("/llm/chat", json=chat, headers=headers)).json()
+                assert first["cached"] is None and second["cached"] == "exact"
+                assert second["content"] == first["content"]
+                assert upstream.state.mock.requests == 1
+
+                await client.post("/llm/embed", json=embed, headers=headers)
+                response = (await client.post("/llm/embed", json={**embed, "input": ["beta", "gamma"]},
+                                              headers=headers)).json()
+                assert response["cached_inputs"] == 1
+                assert upstream.state.mock.requests == 3
+
+                stats = (await client.get("/llm/cache/stats", params={"tenant_id": "t1", "project_id": "p1"},
+                                          headers=headers)).json()
+                assert stats["by_kind"]["chat"] == {"lookups": 2, "hits": 1, "hit_rate": 0.5}
+                assert stats["by_kind"]["embedding"]["hits"] == 1
+
+                denied = await client.get("/llm/cache/stats", params={"tenant_id": "t2", "project_id": "p1"},
+                                          headers=headers)
+                assert denied.status_code == 403
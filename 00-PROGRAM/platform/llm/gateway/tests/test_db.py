@@ -0,0 +1,251 @@
+"""
+Tests for the gateway database layer and batched writer (SQLite via aiosqlite).
+"""
+
+import asyncio
+import uuid
+import pytest
+import sys
+from pathlib import Path
+
+from sqlalchemy import func, select
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db import BatchedWriter, GatewayDatabase, to_async_url, to_sync_url
+from models import AuditEvent, ChatRequest, EmbeddingRequest
+from security import AuditLogger
+
+
+def chat_row(tenant_id: str = "t1") -> ChatRequest:
+    return ChatRequest(
+        id=str(uuid.uuid4()),
+        tenant_id=tenant_id,
+        project_id="p1",
+        user_id="u1",
+        model="gpt-4",
+        provider="OpenAIProvider",
+        prompt="hello",
+        response="world",
+        total_tokens=3,
+    )
+
+
+def embed_row() -> EmbeddingRequest:
+    return EmbeddingRequest(
+        id=str(uuid.uuid4()),
+        tenant_id="t1",
+        project_id="p1",
+        user_id="u1",
+        model="text-embedding-3-small",
+        provider="OpenAIProvider",
+        text="hello",
+        tokens=1,
+    )
+
+
+async def count(database: GatewayDatabase, model) -> int:
+    async with database.session() as session:
+        return await session.scalar(select(func.count()).select_from(model))
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'gateway.db'}"
+
+
+class TestDatabaseUrls:
+    """Test driver selection for database URLs."""
+
+    def test_async_url_selects_driver(self):
+        assert to_async_url("postgresql://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+        assert to_async_url("sqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+
+    def test_async_url_keeps_explicit_driver(self):
+        assert to_async_url("postgresql+psycopg://h/db") == "postgresql+psycopg://h/db"
+
+    def test_sync_url_drops_async_driver(self):
+        assert to_sync_url("postgresql+asyncpg://h/db") == "postgresql://h/db"
+        assert to_sync_url("sqlite:///x.db") == "sqlite:///x.db"
+
+    def test_unknown_write_mode(self):
+        with pytest.raises(ValueError, match="Unknown database write mode"):
+            GatewayDatabase("sqlite:///x.db", mode="eventual")
+
+
+class TestBatchedWriter:
+    """Test grouping, flushing and failure handling."""
+
+    @pytest.mark.asyncio
+    async def test_rows_are_written_in_batches(self, db_url):
+        """Test that concurrent submissions share commits and all rows land."""
+        database = GatewayDatabase(db_url, batch_size=50, flush_interval_ms=20)
+        await database.start()
+        try:
+            await asyncio.gather(*[database.record(chat_row()) for _ in range(180)])
+            await asyncio.gather(*[database.record(embed_row()) for _ in range(20)])
+            await database.flush()
+
+            assert await count(database, ChatRequest) == 180
+            assert await count(database, EmbeddingRequest) == 20
+            stats = database.writer.stats
+            assert stats["rows"] == 200
+            assert stats["batches"] <= 10
+        finally:
+            await database.stop()
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_flushes_after_interval(self, db_url):
+        """Test that a lone record is written without waiting for a full batch."""
+        database = GatewayDatabase(db_url, batch_size=1000, flush_interval_ms=10)
+        await database.start()
+        try:
+            await database.record(chat_row())
+            for _ in range(100):
+                if database.writer.stats["rows"]:
+                    break
+                await asyncio.sleep(0.01)
+            assert await count(database, ChatRequest) == 1
+        finally:
+            await database.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_pending_rows(self, db_url):
+        """Test that shutdown writes everything still queued."""
+        database = GatewayDatabase(db_url, batch_size=1000, flush_interval_ms=60000)
+        await database.start()
+        for _ in range(25):
+            await database.record(chat_row())
+        await database.stop()
+
+        reopened = GatewayDatabase(db_url, mode="async")
+        await reopened.start()
+        try:
+            assert await count(reopened, ChatRequest) == 25
+        finally:
+            await reopened.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried_then_dropped(self):
+        """Test that a failing database does not stall the writer."""
+        class FailingSession:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            def add_all(self, rows):
+                pass
+
+            async def commit(self):
+                raise RuntimeError("database unavailable")
+
+        writer = BatchedWriter(FailingSession, batch_size=10, flush_interval_s=0.0, max_retries=1)
+        await writer.start()
+        await writer.submit(object())
+        await writer.stop()
+        assert writer.stats == {"rows": 0, "batches": 0, "retries": 1, "dropped": 1}
+
+    @pytest.mark.asyncio
+    async def test_failing_row_does_not_drop_its_batch(self, db_url):
+        """Test that only the bad row of a failed batch is dropped."""
+        database = GatewayDatabase(db_url, batch_size=10, flush_interval_ms=60000)
+        await database.start()
+        try:
+            database.writer.max_retries = 1
+            existing = chat_row()
+            await database.record(existing)
+            await database.flush()
+
+            duplicate = chat_row()
+            duplicate.id = existing.id
+            for row in (chat_row(), duplicate, chat_row(), embed_row()):
+                await database.record(row)
+            await database.flush()
+
+            assert await count(database, ChatRequest) == 3
+            assert await count(database, EmbeddingRequest) == 1
+            stats = database.writer.stats
+            assert stats["rows"] == 4 and stats["dropped"] == 1 and stats["retries"] == 1
+        finally:
+            await database.stop()
+
+    @pytest.mark.asyncio
+    async def test_submit_requires_start(self):
+        writer = BatchedWriter(None)
+        with pytest.raises(RuntimeError, match="not started"):
+            await writer.submit(object())
+
+
+class TestWriteModes:
+    """Test the per-request write paths kept for benchmarking."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("mode", ["async", "sync"])
+    async def test_per_request_modes_commit_immediately(self, db_url, mode):
+        database = GatewayDatabase(db_url, mode=mode)
+        await database.start()
+        await database.record(chat_row())
+        await database.stop()
+
+        reopened = GatewayDatabase(db_url, mode="async")
+        await reopened.start()
+        try:
+            assert await count(reopened, ChatRequest) == 1
+        finally:
+            await reopened.stop()
+
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("mode", ["batched", "async", "sync"])
+    async def test_record_requires_start(self, db_url, mode):
+        """Test that records outside start/stop fail with a clear error."""
+        database = GatewayDatabase(db_url, mode=mode)
+        with pytest.raises(RuntimeError, match="GatewayDatabase not started"):
+            await database.record(chat_row())
+        await database.start()
+        await database.stop()
+        with pytest.raises(RuntimeError, match="GatewayDatabase not started"):
+            await database.record(chat_row())
+
+
+class TestAuditPersistence:
+    """Test AuditLogger routed through the database writer."""
+
+    @pytest.mark.asyncio
+    async def test_audit_events_are_persisted(self, db_url):
+        database = GatewayDatabase(db_url, batch_size=10, flush_interval_ms=5)
+        await database.start()
+        try:
+            audit = AuditLogger(sink=database.record_audit)
+            for i in range(12):
+                await audit.log_request(
+                    request_id=str(uuid.uuid4()),
+                    tenant_id="t1",
+                    project_id="p1",
+                    user_id="u1",
+                    action="chat",
+                    details={"model": "gpt-4", "tokens": i},
+                )
+            await database.flush()
+
+            async with database.session() as session:
+                events = (await session.scalars(select(AuditEvent))).all()
+            assert len(events) == 12
+            assert sorted(e.details["tokens"] for e in events) == list(range(12))
+            assert all(e.action == "chat" for e in events)
+        finally:
+            await database.stop()
+
+    @pytest.mark.asyncio
+    async def test_disabled_audit_logger_skips_sink(self):
+        received = []
+
+        async def sink(entry):
+            received.append(entry)
+
+        audit = AuditLogger(enabled=False, sink=sink)
+        await audit.log_request("r", "t", "p", "u", "chat", {})
+        assert received == []
@@ -0,0 +1,217 @@
+"""
+Tests for tenant quota and rate-limit enforcement.
+"""
+
+import pytest
+import sys
+import uuid
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db import GatewayDatabase
+from models import TenantConfig
+from quotas import (
+    InMemoryQuotaBackend, QuotaEnforcer, QuotaExceeded, SlidingWindowCounter,
+    TenantPolicy, TokenBucket, create_quota_backend, load_tenant_policies
+)
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def unlimited(**kwargs) -> TenantPolicy:
+    fields = dict(max_requests_per_day=None, max_tokens_per_request=None,
+                  allowed_models=None, requests_per_minute=None)
+    fields.update(kwargs)
+    return TenantPolicy(**fields)
+
+
+class TestPrimitives:
+    """Test token bucket and sliding window counters."""
+
+    def test_token_bucket_burst_then_refill(self):
+        bucket = TokenBucket(capacity=3, rate=1.0, now=0.0)
+        for _ in range(3):
+            assert bucket.available(0.0) == 0.0
+            bucket.consume()
+        assert bucket.available(0.0) == pytest.approx(1.0)
+        assert bucket.available(0.5) == pytest.approx(0.5)
+        assert bucket.available(1.0) == 0.0
+
+    def test_sliding_window_weights_previous_window(self):
+        counter = SlidingWindowCounter(window_s=100.0, now=0.0)
+        for _ in range(10):
+            counter.increment()
+        assert counter.count(50.0) == 10
+        # A quarter into the next window, 75% of the previous window still counts
+        assert counter.count(125.0) == pytest.approx(7.5)
+        assert counter.count(350.0) == 0
+
+    def test_sliding_window_retry_after(self):
+        counter = SlidingWindowCounter(window_s=100.0, now=0.0)
+        for _ in range(10):
+            counter.increment()
+        assert counter.retry_after(40.0, limit=10) == pytest.approx(60.0)
+        # In the next window, 10 * (1 - t/100) < 5 once t > 50
+        assert counter.retry_after(110.0, limit=5) == pytest.approx(40.0)
+
+
+class TestQuotaEnforcer:
+    """Test per-tenant policy checks."""
+
+    def test_allowed_models_with_prefix(self):
+        enforcer = QuotaEnforcer(unlimited(allowed_models=frozenset({"gpt-4", "claude-3-*"})))
+        enforcer.check("t1", "gpt-4")
+        enforcer.check("t1", "claude-3-sonnet")
+        with pytest.raises(QuotaExceeded) as exc:
+            enforcer.check("t1", "gpt-3.5-turbo")
+        assert exc.value.status_code == 403
+
+    def test_max_tokens_limit_and_estimate(self):
+        """Test that only explicit max_tokens are limited; unset ones are budgeted at the limit."""
+        enforcer = QuotaEnforcer(unlimited(max_tokens_per_request=1000))
+        assert enforcer.check("t1", "gpt-4", 500) == 500
+        assert enforcer.check("t1", "gpt-4") == 1000
+        assert QuotaEnforcer(unlimited()).check("t1", "gpt-4") is None
+        with pytest.raises(QuotaExceeded) as exc:
+            enforcer.check("t1", "gpt-4", 2000)
+        assert exc.value.status_code == 400
+
+    def test_rate_limit_is_per_tenant(self):
+        clock = FakeClock()
+        enforcer = QuotaEnforcer(unlimited(requests_per_minute=60, burst=2), clock=clock)
+        enforcer.check("t1", "gpt-4")
+        enforcer.check("t1", "gpt-4")
+        with pytest.raises(QuotaExceeded) as exc:
+            enforcer.check("t1", "gpt-4")
+        assert exc.value.status_code == 429
+        assert exc.value.retry_after == pytest.approx(1.0)
+
+        enforcer.check("t2", "gpt-4")  # other tenants are unaffected
+        clock.now += 1.0
+        enforcer.check("t1", "gpt-4")
+
+    def test_daily_quota(self):
+        clock = FakeClock(now=0.0)
+        enforcer = QuotaEnforcer(unlimited(max_requests_per_day=3), clock=clock)
+        for _ in range(3):
+            enforcer.check("t1", "gpt-4")
+        with pytest.raises(QuotaExceeded, match="Daily request quota"):
+            enforcer.check("t1", "gpt-4")
+        clock.now += 2 * 86400
+        enforcer.check("t1", "gpt-4")
+
+    def test_rejections_do_not_consume(self):
+        """Test that a request rejected by the daily quota keeps its rate token."""
+        enforcer = QuotaEnforcer(
+            unlimited(max_requests_per_day=1, requests_per_minute=60, burst=5),
+            clock=FakeClock(),
+        )
+        enforcer.check("t1", "gpt-4")
+        for _ in range(3):
+            with pytest.raises(QuotaExceeded):
+                enforcer.check("t1", "gpt-4")
+        assert enforcer._buckets["t1"].tokens == pytest.approx(4.0)
+        assert enforcer.stats == {"allowed": 1, "rejected": 3, "syncs": 0, "sync_errors": 0}
+
+    def test_tenant_policy_overrides_default(self):
+        enforcer = QuotaEnforcer(unlimited())
+        enforcer.set_policies({"t1": unlimited(allowed_models=frozenset())})
+        enforcer.check("t2", "gpt-4")
+        with pytest.raises(QuotaExceeded):
+            enforcer.check("t1", "gpt-4")
+
+    def test_set_policies_with_unlimited_rate(self):
+        """Test that switching a tenant to an unlimited rate drops its bucket."""
+        enforcer = QuotaEnforcer(unlimited(requests_per_minute=60, burst=1), clock=FakeClock())
+        enforcer.check("t1", "gpt-4")
+        enforcer.set_policies({"t1": unlimited()})
+        assert "t1" not in enforcer._buckets
+        for _ in range(5):
+            enforcer.check("t1", "gpt-4")
+
+        enforcer = QuotaEnforcer(unlimited(), clock=FakeClock())
+        enforcer.check("t1", "gpt-4")
+        enforcer.set_policies({"t1": unlimited(max_requests_per_day=10)})
+        assert enforcer.check("t1", "gpt-4") is None
+
+    def test_unknown_backend_url(self):
+        assert create_quota_backend(None) is None
+        assert isinstance(create_quota_backend("memory://"), InMemoryQuotaBackend)
+        with pytest.raises(ValueError, match="Unknown quota backend"):
+            create_quota_backend("ftp://x")
+
+
+class TestSharedBackend:
+    """Test daily counters reconciled across gateway instances."""
+
+    @pytest.mark.asyncio
+    async def test_instances_share_daily_quota(self):
+        clock = FakeClock()
+        backend = InMemoryQuotaBackend()
+        policy = unlimited(max_requests_per_day=10)
+        a = QuotaEnforcer(policy, backend=backend, clock=clock)
+        b = QuotaEnforcer(policy, backend=backend, clock=clock)
+
+        for _ in range(6):
+            a.check("t1", "gpt-4")
+        for _ in range(3):
+            b.check("t1", "gpt-4")
+        await a.sync()
+        await b.sync()
+        await a.sync()
+
+        a.check("t1", "gpt-4")  # 10th request overall
+        with pytest.raises(QuotaExceeded):
+            a.check("t1", "gpt-4")
+        await a.sync()
+        await b.sync()
+        with pytest.raises(QuotaExceeded):
+            b.check("t1", "gpt-4")
+        assert backend.counters == {f"llm-gateway:quota:t1:{int(clock.now // 86400)}": 10}
+
+    @pytest.mark.asyncio
+    async def test_failed_sync_keeps_pending(self):
+        class DownBackend(InMemoryQuotaBackend):
+            async def add(self, key, delta, ttl_s):
+                raise ConnectionError("backend down")
+
+        enforcer = QuotaEnforcer(unlimited(max_requests_per_day=10), backend=DownBackend(),
+                                 clock=FakeClock())
+        enforcer.check("t1", "gpt-4")
+        await enforcer.sync()
+        assert sum(enforcer._days["t1"].pending.values()) == 1
+        assert enforcer.stats["sync_errors"] == 1
+
+
+class TestPolicyLoading:
+    """Test policies built from TenantConfig rows."""
+
+    @pytest.mark.asyncio
+    async def test_load_tenant_policies(self, tmp_path):
+        database = GatewayDatabase(f"sqlite:///{tmp_path / 'gateway.db'}", mode="async")
+        await database.start()
+        try:
+            await database.record(TenantConfig(
+                id=str(uuid.uuid4()),
+                tenant_id="t1",
+                max_requests_per_day=50,
+                max_tokens_per_request=256,
+                allowed_models=["gpt-4"],
+            ))
+            policies = await load_tenant_policies(database.session_factory, requests_per_minute=30)
+        finally:
+            await database.stop()
+
+        policy = policies["t1"]
+        assert policy.max_requests_per_day == 50
+        assert policy.max_tokens_per_request == 256
+        assert policy.allowed_models == frozenset({"gpt-4"})
+        assert policy.requests_per_minute == 30
@@ -0,0 +1,151 @@
+"""
+Tests for the pooled provider transport against a mock upstream.
+"""
+
+import asyncio
+import pytest
+import httpx
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from transport import ProviderTransport, TransportConfig
+from providers import OpenAIProvider, AnthropicProvider, ProviderFactory
+from mock_upstream import create_mock_upstream
+
+BASE_URL = "http://upstream"
+
+
+def make_transport(app, **config):
+    config.setdefault("backoff_base", 0.0)
+    return ProviderTransport(TransportConfig(**config), transport=httpx.ASGITransport(app=app))
+
+
+class TestProviderTransport:
+    """Test pooling, retries and concurrency limits."""
+
+    @pytest.mark.asyncio
+    async def test_pooled_client_is_reused(self):
+        """Test that pooled transport keeps one client across calls."""
+        app = create_mock_upstream()
+        transport = make_transport(app)
+        provider = OpenAIProvider(api_key="k", base_url=BASE_URL, transport=transport)
+
+        await provider.chat([{"role": "user", "content": "hi"}], model="gpt-4")
+        client = transport._client
+        await provider.chat([{"role": "user", "content": "hi"}], model="gpt-4")
+        assert client is not None
+        assert transport._client is client
+
+        await transport.aclose()
+        assert transport._client is None
+
+    @pytest.mark.asyncio
+    async def test_unpooled_transport_opens_client_per_call(self):
+        """Test that disabling the pool keeps no shared client."""
+        app = create_mock_upstream()
+        transport = make_transport(app, pooled=False)
+        provider = OpenAIProvider(api_key="k", base_url=BASE_URL, transport=transport)
+
+        result = await provider.chat([{"role": "user", "content": "hi"}], model="gpt-4")
+        assert result["content"] == "Hello, world!"
+        assert transport._client is None
+
+    @pytest.mark.asyncio
+    async def test_retries_rate_limit_then_succeeds(self):
+        """Test retry with backoff on 429."""
+        app = create_mock_upstream(fail_first=2, fail_status=429)
+        provider = OpenAIProvider(api_key="k", base_url=BASE_URL, transport=make_transport(app))
+
+        result = await provider.chat([{"role": "user", "content": "hi"}], model="gpt-4")
+        assert result["total_tokens"] == 9
+        assert app.state.mock.requests == 3
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        """Test that persistent 5xx errors surface after max_retries."""
+        app = create_mock_upstream(fail_first=10, fail_status=503)
+        transport = make_transport(app, max_retries=2)
+        provider = OpenAIProvider(api_key="k", base_url=BASE_URL, transport=transport)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await provider.chat([{"role": "user", "content": "hi"}], model="gpt-4")
+        assert app.state.mock.requests == 3
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self):
+        """Test that 4xx errors other than 429 fail immediately."""
+        app = create_mock_upstream(fail_first=10, fail_status=400)
+        provider = OpenAIProvider(api_key="k", base_url=BASE_URL, transport=make_transport(app))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await provider.chat([{"role": "user", "content": "hi"}], model="gpt-4")
+        assert app.state.mock.requests == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """Test that in-flight upstream calls never exceed max_concurrency."""
+        app = create_mock_upstream(latency_s=0.02)
+        provider = OpenAIProvider(
+            api_key="k", base_url=BASE_URL, transport=make_transport(app, max_concurrency=2)
+        )
+
+        await asyncio.gather(*[
+            provider.chat([{"role": "user", "content": "hi"}], model="gpt-4")
+            for _ in range(8)
+        ])
+        assert app.state.mock.requests == 8
+        assert app.state.mock.max_in_flight == 2
+
+
+class TestStreaming:
+    """Test token streaming through providers."""
+
+    @pytest.mark.asyncio
+    async def test_openai_stream(self):
+        """Test OpenAI SSE stream yields deltas then usage."""
+        app = create_mock_upstream()
+        provider = OpenAIProvider(api_key="k", base_url=BASE_URL, transport=make_transport(app))
+
+        chunks = [c async for c in provider.chat_stream([{"role": "user", "content": "hi"}], model="gpt-4")]
+        assert "".join(c["delta"] for c in chunks if "delta" in c) == "Hello, world!"
+        assert chunks[-1]["usage"]["total_tokens"] == 9
+
+    @pytest.mark.asyncio
+    async def test_anthropic_stream(self):
+        """Test Anthropic SSE stream yields deltas then usage."""
+        app = create_mock_upstream(fail_first=1, fail_status=503)
+        provider = AnthropicProvider(api_key="k", base_url=BASE_URL, transport=make_transport(app))
+
+        messages = [
+            {"role": "system", "content": "be brief"},
+            {"role": "user", "content": "hi"},
+        ]
+        chunks = [c async for c in provider.chat_stream(messages, model="claude-3-opus")]
+        assert "".join(c["delta"] for c in chunks if "delta" in c) == "Hello, world!"
+        assert chunks[-1]["usage"] == {"prompt_tokens": 5, "completion_tokens": 4, "total_tokens": 9}
+        assert app.state.mock.requests == 2
+
+
+class TestProviderFactoryPooling:
+    """Test that the factory reuses providers."""
+
+    @pytest.mark.asyncio
+    async def test_provider_reused_per_model_family(self):
+        """Test that repeated lookups share one provider and transport."""
+        config = SimpleNamespace(openai_api_key="k1", anthropic_api_key="k2")
+        first = ProviderFactory.get_provider_for_model("gpt-4", config)
+        second = ProviderFactory.get_provider_for_model("gpt-3.5-turbo", config)
+        claude = ProviderFactory.get_provider_for_model("claude-3-opus", config)
+
+        assert first is second
+        assert first.transport is second.transport
+        assert claude is not first
+
+        await ProviderFactory.close_all()
+        assert ProviderFactory.get_provider_for_model("gpt-4", config) is not first
+        await ProviderFactory.close_all()
@@ -0,0 +1,214 @@
+"""
+Shared HTTP transport for LLM providers.
+
+Keeps one long-lived connection pool per provider, bounds concurrent
+upstream calls, and retries rate-limited or failed requests with
+jittered exponential backoff.
+"""
+
+import asyncio
+import json
+import random
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+
+# Upstream responses worth retrying: rate limits and transient server errors
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass
+class TransportConfig:
+    """Connection pool, concurrency and retry settings."""
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    max_concurrency: int = 32
+    max_retries: int = 3
+    backoff_base: float = 0.25
+    backoff_max: float = 8.0
+    timeout: float = 60.0
+    pooled: bool = True
+
+    @classmethod
+    def from_settings(cls, config) -> "TransportConfig":
+        """Build transport config from gateway settings."""
+        defaults = cls()
+        return cls(
+            max_connections=getattr(config, "provider_max_connections", defaults.max_connections),
+            max_keepalive_connections=getattr(
+                config, "provider_max_keepalive_connections", defaults.max_keepalive_connections
+            ),
+            max_concurrency=getattr(config, "provider_max_concurrency", defaults.max_concurrency),
+            max_retries=getattr(config, "provider_max_retries", defaults.max_retries),
+            timeout=getattr(config, "provider_timeout_seconds", defaults.timeout),
+            pooled=getattr(config, "provider_pool_enabled", defaults.pooled),
+        )
+
+
+class ProviderTransport:
+    """
+    Pooled, bounded, retrying HTTP transport.
+
+    With pooling disabled a fresh client is opened per request, which is
+    the behaviour providers had before the shared transport and is kept
+    for benchmarking.
+    """
+
+    def __init__(
+        self,
+        config: Optional[TransportConfig] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Initialize transport.
+
+        Args:
+            config: Pool, concurrency and retry settings
+            transport: Optional httpx transport (e.g. ASGITransport for a mock upstream)
+        """
+        self.config = config or TransportConfig()
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore = asyncio.Semaphore(self.config.max_concurrency)
+        self._rng = random.Random()
+
+    def _new_client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=self.config.max_connections,
+            max_keepalive_connections=self.config.max_keepalive_connections,
+            keepalive_expiry=self.config.keepalive_expiry,
+        )
+        return httpx.AsyncClient(
+            limits=limits,
+            timeout=self.config.timeout,
+            transport=self._transport,
+        )
+
+    @asynccontextmanager
+    async def _client_context(self):
+        """Yield the shared client, or a one-off client when pooling is off."""
+        if self.config.pooled:
+            if self._client is None or self._client.is_closed:
+                self._client = self._new_client()
+            yield self._client
+        else:
+            async with self._new_client() as client:
+                yield client
+
+    def _backoff_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After when present."""
+        cap = min(self.config.backoff_max, self.config.backoff_base * (2 ** attempt))
+        delay = self._rng.uniform(0, cap)
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+            if retry_after:
+                try:
+                    delay = max(delay, min(float(retry_after), self.config.backoff_max))
+                except ValueError:
+                    pass
+        return delay
+
+    def _should_retry(self, attempt: int, response: Optional[httpx.Response]) -> bool:
+        if attempt >= self.config.max_retries:
+            return False
+        return response is None or response.status_code in RETRYABLE_STATUS_CODES
+
+    async def post_json(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        POST a JSON payload and return the decoded JSON response.
+
+        Raises:
+            httpx.HTTPStatusError: If the upstream returns an error after retries
+            httpx.TransportError: If the upstream is unreachable after retries
+        """
+        attempt = 0
+        while True:
+            response = None
+            async with self._semaphore:
+                async with self._client_context() as client:
+                    try:
+                        response = await client.post(url, headers=headers, json=payload)
+                    except httpx.TransportError:
+                        if not self._should_retry(attempt, None):
+                            raise
+                    else:
+                        if not self._should_retry(attempt, response):
+                            response.raise_for_status()
+                            return response.json()
+
+            # Back off outside the semaphore so waiting retries don't hold a slot
+            await asyncio.sleep(self._backoff_delay(attempt, response))
+            attempt += 1
+
+    async def stream_lines(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+    ) -> AsyncIterator[str]:
+        """
+        POST a JSON payload and yield response lines as they arrive.
+
+        Retries only happen before the first line is yielded, so callers
+        never see duplicated output.
+
+        Raises:
+            httpx.HTTPStatusError: If the upstream returns an error after retries
+            httpx.TransportError: If the upstream is unreachable after retries
+        """
+        attempt = 0
+        while True:
+            response = None
+            started = False
+            async with self._semaphore:
+                async with self._client_context() as client:
+                    try:
+                        async with client.stream(
+                            "POST", url, headers=headers, json=payload
+                        ) as response:
+                            if not self._should_retry(attempt, response):
+                                response.raise_for_status()
+                                async for line in response.aiter_lines():
+                                    started = True
+                                    yield line
+                                return
+                    except httpx.TransportError:
+                        if started or not self._should_retry(attempt, None):
+                            raise
+                        response = None
+
+            await asyncio.sleep(self._backoff_delay(attempt, response))
+            attempt += 1
+
+    async def aclose(self):
+        """Close the shared connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+async def iter_sse_data(lines: AsyncIterator[str]) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Decode JSON payloads from server-sent event lines.
+
+    Stops at the OpenAI-style ``[DONE]`` sentinel; ``event:`` lines and
+    keep-alive comments are skipped.
+    """
+    async for line in lines:
+        if not line.startswith("data:"):
+            continue
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            break
+        if data:
+            yield json.loads(data)
@@ -0,0 +1,133 @@
+"""
+Guardrails throughput on long RAG-style interactions.
+
+The input is a question followed by retrieved maintenance-manual context
+(procedural prose with torque values, part numbers, ATA references and the
+odd email address); the output is a generated answer of a tenth the size.
+Two paths run validate_full_interaction over the same texts:
+
+    legacy   the previous per-check regex searches, one call per rule
+    scanner  GuardrailsEngine with the compiled anchor scanner
+
+Reported per context size: MB/s over input plus output, p50 per
+interaction, and whether both paths agree on every check outcome.
+
+Usage:
+    python bench_scanner.py --sizes 16 256 1024 --repeats 20
+"""
+
+import argparse
+import asyncio
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine import GuardrailsEngine
+
+WORDS = ("actuator bolt bracket seal hydraulic line pressure torque inspect remove install cracks "
+         "corrosion wear clearance gauge fitting valve manifold sensor harness the a of to and with").split()
+
+
+def context_text(rng: random.Random, size_kb: int) -> str:
+    """Retrieved context of about size_kb kilobytes."""
+    parts, produced = [], 0
+    while produced < size_kb * 1024:
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20))).capitalize()
+        roll = rng.random()
+        if roll < 0.3:
+            sentence += f" to {rng.randint(10, 90)} Nm (ref. ATA {rng.randint(21, 36)}-{rng.randint(10, 99)}-00)"
+        elif roll < 0.4:
+            sentence += f", part number {rng.randint(100, 999)}-{rng.randint(1000, 9999)}-{rng.randint(1, 9)}"
+        elif roll < 0.41:
+            sentence += " and report findings to mro.ops@hyf-a.aero"
+        parts.append(sentence + ". ")
+        produced += len(parts[-1])
+    return "".join(parts)
+
+
+class LegacyEngine:
+    """The previous GuardrailsEngine checks, kept for comparison."""
+
+    def checks(self, text, output):
+        pii = []
+        for pattern, pii_type in [
+            (r'\b\d{3}-\d{2}-\d{4}\b', "SSN"),
+            (r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', "Email"),
+            (r'\b\d{16}\b', "Credit Card"),
+            (r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', "Phone Number"),
+        ]:
+            if re.search(pattern, text):
+                pii.append(pii_type)
+        outcomes = [bool(pii)]
+        if output:
+            outcomes.append(any(re.search(p, text, re.IGNORECASE) for p in
+                                [r'<script[^>]*>.*?</script>', r'javascript:', r'onerror\s*=']))
+        else:
+            outcomes.append(any(re.search(p, text, re.IGNORECASE) for p in [
+                r'ignore\s+(previous|all)\s+instructions', r'disregard\s+(previous|all)\s+instructions',
+                r'forget\s+(previous|all)\s+instructions', r'system:\s*you\s+are', r'[<\[]system[>\]]']))
+            text_lower = text.lower()
+            outcomes.append(any(kw in text_lower for kw in
+                                ["itar", "export control", "classified", "confidential proprietary", "cui"]))
+        return outcomes
+
+    def validate_full_interaction(self, input_text, output_text):
+        return self.checks(input_text, False) + self.checks(output_text, True)
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def run(args):
+    rng = random.Random(0)
+    engine = GuardrailsEngine()
+    legacy = LegacyEngine()
+    print(f"{'context_KB':>10} {'mode':>8} {'MB/s':>8} {'p50_ms':>8} {'agree':>6}")
+    for size in args.sizes:
+        interactions = []
+        for _ in range(args.repeats):
+            question = "What torque is specified for the landing gear actuator bolts?\n\n"
+            interactions.append((question + context_text(rng, size), context_text(rng, max(1, size // 10))))
+        megabytes = sum(len(i) + len(o) for i, o in interactions) / (1024 * 1024)
+
+        legacy_outcomes, latencies = [], []
+        start = time.perf_counter()
+        for input_text, output_text in interactions:
+            t0 = time.perf_counter()
+            legacy_outcomes.append(legacy.validate_full_interaction(input_text, output_text))
+            latencies.append((time.perf_counter() - t0) * 1000)
+        elapsed = time.perf_counter() - start
+        print(f"{size:>10} {'legacy':>8} {megabytes / elapsed:>8.1f} {percentile(latencies, 0.5):>8.2f} {'-':>6}")
+
+        outcomes, latencies = [], []
+        start = time.perf_counter()
+        for input_text, output_text in interactions:
+            t0 = time.perf_counter()
+            result = await engine.validate_full_interaction(input_text, output_text, {})
+            latencies.append((time.perf_counter() - t0) * 1000)
+            outcomes.append([not c.passed for c in result["input_checks"] + result["output_checks"]])
+        elapsed = time.perf_counter() - start
+        # Legacy order is input (pii, injection, prohibited), output (pii, safety)
+        agree = all(
+            [new[0], new[1], new[2], new[4], new[3]] == old for new, old in zip(outcomes, legacy_outcomes)
+        )
+        print(f"{size:>10} {'scanner':>8} {megabytes / elapsed:>8.1f} {percentile(latencies, 0.5):>8.2f} "
+              f"{str(agree):>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Guardrails scanner benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 256, 1024],
+                        help="retrieved context sizes in KB")
+    parser.add_argument("--repeats", type=int, default=20)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
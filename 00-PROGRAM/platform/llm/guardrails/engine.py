@@ -3,9 +3,14 @@ Guardrails validation engine.
 """
 
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import re
 
+try:
+    from .scanner import GuardrailScanner, Finding
+except ImportError:
+    from scanner import GuardrailScanner, Finding
+
 
 @dataclass
 class GuardrailCheck:
@@ -14,6 +19,22 @@ class GuardrailCheck:
     passed: bool
     severity: str  # info, warning, error
     message: Optional[str] = None
+    findings: List[Finding] = field(default_factory=list)
+
+
+# Severity and message of a failed check
+_FAILURES = {
+    "pii_detection": ("error", "Detected PII: {labels}"),
+    "prompt_injection": ("error", "Potential prompt injection detected"),
+    "prohibited_content": ("warning", "Potentially sensitive content detected: {labels}"),
+    "output_safety": ("error", "Unsafe content detected in output"),
+}
+
+_SCRIPT_BLOCK_RE = re.compile(r'<script[^>]*>.*?</script>', re.IGNORECASE | re.DOTALL)
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+# Rules are compiled once and shared by all engines using the defaults
+_DEFAULT_SCANNER = GuardrailScanner()
 
 
 class GuardrailsEngine:
@@ -29,151 +50,95 @@ class GuardrailsEngine:
             "prompt_injection",
             "output_validation"
         ])
+        rules = self.config.get("rules")
+        self.scanner = GuardrailScanner(rules) if rules is not None else _DEFAULT_SCANNER
     
     async def validate_input(self, text: str, context: Dict[str, Any]) -> List[GuardrailCheck]:
         """Validate user input before sending to LLM."""
+        enabled = [c for c in ("pii_detection", "prompt_injection", "prohibited_content") if c in self.checks_enabled]
+        # One pass over the text for all enabled checks
+        findings = self.scan(text, enabled)
         checks = []
-        
+
         # PII detection
-        if "pii_detection" in self.checks_enabled:
-            checks.append(self._check_pii(text))
-        
+        if "pii_detection" in enabled:
+            checks.append(self._build_check("pii_detection", findings, "pii_detection_input"))
+
         # Prompt injection detection
-        if "prompt_injection" in self.checks_enabled:
-            checks.append(self._check_prompt_injection(text))
-        
+        if "prompt_injection" in enabled:
+            checks.append(self._build_check("prompt_injection", findings))
+
         # Prohibited content
-        if "prohibited_content" in self.checks_enabled:
-            checks.append(self._check_prohibited_content(text))
-        
+        if "prohibited_content" in enabled:
+            checks.append(self._build_check("prohibited_content", findings))
+
         return checks
-    
+
     async def validate_output(self, text: str, context: Dict[str, Any]) -> List[GuardrailCheck]:
         """Validate LLM output before returning to user."""
+        enabled = []
+        if "output_validation" in self.checks_enabled:
+            enabled.append("output_safety")
+        if "pii_detection" in self.checks_enabled:
+            enabled.append("pii_detection")
+        findings = self.scan(text, enabled)
         checks = []
-        
+
         # Output validation
-        if "output_validation" in self.checks_enabled:
-            checks.append(self._check_output_safety(text))
-        
+        if "output_safety" in enabled:
+            checks.append(self._build_check("output_safety", findings))
+
         # PII in output
-        if "pii_detection" in self.checks_enabled:
-            checks.append(self._check_pii(text, context="output"))
-        
+        if "pii_detection" in enabled:
+            checks.append(self._build_check("pii_detection", findings, "pii_detection_output"))
+
         return checks
-    
+
+    def scan(self, text: str, checks: Optional[List[str]] = None) -> List[Finding]:
+        """Return all rule findings in text, with spans."""
+        return self.scanner.scan(text, checks)
+
+    def _build_check(self, check: str, findings: List[Finding], check_name: Optional[str] = None) -> GuardrailCheck:
+        """Turn the findings of one check into a GuardrailCheck."""
+        matched = [f for f in findings if f.check == check]
+        check_name = check_name or check
+        if not matched:
+            return GuardrailCheck(check_name=check_name, passed=True, severity="info")
+
+        # Labels in rule-table order, as the individual checks reported them
+        found = {f.label for f in matched}
+        labels = list(dict.fromkeys(r.label for r in self.scanner.rules if r.check == check and r.label in found))
+        severity, message = _FAILURES[check]
+        return GuardrailCheck(
+            check_name=check_name,
+            passed=False,
+            severity=severity,
+            message=message.format(labels=", ".join(labels)),
+            findings=matched
+        )
+
     def _check_pii(self, text: str, context: str = "input") -> GuardrailCheck:
         """Check for Personally Identifiable Information."""
         # Simplified PII patterns (in production, use Presidio or similar)
-        pii_patterns = [
-            (r'\b\d{3}-\d{2}-\d{4}\b', "SSN"),  # US SSN
-            (r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', "Email"),
-            (r'\b\d{16}\b', "Credit Card"),
-            (r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', "Phone Number"),
-        ]
-        
-        found_pii = []
-        for pattern, pii_type in pii_patterns:
-            if re.search(pattern, text):
-                found_pii.append(pii_type)
-        
-        if found_pii:
-            return GuardrailCheck(
-                check_name=f"pii_detection_{context}",
-                passed=False,
-                severity="error",
-                message=f"Detected PII: {', '.join(found_pii)}"
-            )
-        
-        return GuardrailCheck(
-            check_name=f"pii_detection_{context}",
-            passed=True,
-            severity="info"
-        )
-    
+        return self._build_check("pii_detection", self.scan(text, ["pii_detection"]), f"pii_detection_{context}")
+
     def _check_prompt_injection(self, text: str) -> GuardrailCheck:
         """Check for prompt injection attempts."""
-        # Common prompt injection patterns
-        injection_patterns = [
-            r'ignore\s+(previous|all)\s+instructions',
-            r'disregard\s+(previous|all)\s+instructions',
-            r'forget\s+(previous|all)\s+instructions',
-            r'system:\s*you\s+are',
-            r'[<\[]system[>\]]',
-        ]
-        
-        for pattern in injection_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return GuardrailCheck(
-                    check_name="prompt_injection",
-                    passed=False,
-                    severity="error",
-                    message="Potential prompt injection detected"
-                )
-        
-        return GuardrailCheck(
-            check_name="prompt_injection",
-            passed=True,
-            severity="info"
-        )
-    
+        return self._build_check("prompt_injection", self.scan(text, ["prompt_injection"]))
+
     def _check_prohibited_content(self, text: str) -> GuardrailCheck:
         """Check for prohibited or sensitive content."""
-        # Aerospace-specific prohibited topics
-        prohibited_keywords = [
-            "itar",
-            "export control",
-            "classified",
-            "confidential proprietary",
-            "cui",  # Controlled Unclassified Information
-        ]
-        
-        text_lower = text.lower()
-        found_prohibited = [kw for kw in prohibited_keywords if kw in text_lower]
-        
-        if found_prohibited:
-            return GuardrailCheck(
-                check_name="prohibited_content",
-                passed=False,
-                severity="warning",
-                message=f"Potentially sensitive content detected: {', '.join(found_prohibited)}"
-            )
-        
-        return GuardrailCheck(
-            check_name="prohibited_content",
-            passed=True,
-            severity="info"
-        )
-    
+        return self._build_check("prohibited_content", self.scan(text, ["prohibited_content"]))
+
     def _check_output_safety(self, text: str) -> GuardrailCheck:
         """Validate output is safe and appropriate."""
-        # Check for common harmful patterns
-        harmful_patterns = [
-            r'<script[^>]*>.*?</script>',  # XSS
-            r'javascript:',
-            r'onerror\s*=',
-        ]
-        
-        for pattern in harmful_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return GuardrailCheck(
-                    check_name="output_safety",
-                    passed=False,
-                    severity="error",
-                    message="Unsafe content detected in output"
-                )
-        
-        return GuardrailCheck(
-            check_name="output_safety",
-            passed=True,
-            severity="info"
-        )
-    
+        return self._build_check("output_safety", self.scan(text, ["output_safety"]))
+
     def sanitize_output(self, text: str) -> str:
         """Sanitize output by removing potentially harmful content."""
         # Remove HTML/script tags
-        text = re.sub(r'<script[^>]*>.*?</script>', '', text, flags=re.IGNORECASE | re.DOTALL)
-        text = re.sub(r'<[^>]+>', '', text)
+        text = _SCRIPT_BLOCK_RE.sub('', text)
+        text = _HTML_TAG_RE.sub('', text)
         
         return text
     
@@ -0,0 +1,226 @@
+"""
+Precompiled anchor scanner for guardrail rules.
+
+Every rule match starts at an anchor that is cheap to find in C: a literal
+(case-insensitive, looked up in the lowercased text), a run of three or more
+digits, or the '@' of an email address. The scanner makes one str.find pass
+over the lowercased text per distinct literal anchor (shared by the rules
+that use it), one pass for digit runs and one for '@', and runs each rule's
+precompiled pattern anchored at the positions found. The cost therefore
+grows with the number of distinct anchors, but each pass is a C substring
+search rather than a regex search per rule. A single alternation regex
+over all anchors was measured at less than half this throughput: the
+regex engine tries the alternatives at every position, so it too grows
+with the number of anchors.
+
+The rule table reproduces the checks previously hard-coded in
+GuardrailsEngine; findings are reported per match with spans.
+"""
+
+from typing import List, Dict, Optional, Iterable, Tuple, Set
+from bisect import bisect_right
+from dataclasses import dataclass
+from itertools import accumulate
+import re
+
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    A guardrail rule.
+
+    trigger selects how candidates are found:
+        literal    the match starts with one of anchors (lowercase)
+        substring  the anchor itself is the finding (case-insensitive)
+        digits     the match starts at a run of three or more digits
+        email      the match contains an '@'
+    """
+    check: str
+    label: str
+    pattern: str
+    flags: int = 0
+    trigger: str = "literal"
+    anchors: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class Finding:
+    """A rule match in the scanned text."""
+    check: str
+    label: str
+    start: int
+    end: int
+    text: str
+
+
+DEFAULT_RULES: Tuple[Rule, ...] = (
+    # PII (labels reported in this order)
+    Rule("pii_detection", "SSN", r'\b\d{3}-\d{2}-\d{4}\b', trigger="digits"),
+    Rule("pii_detection", "Email", r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', trigger="email"),
+    Rule("pii_detection", "Credit Card", r'\b\d{16}\b', trigger="digits"),
+    Rule("pii_detection", "Phone Number", r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', trigger="digits"),
+    # Prompt injection
+    Rule("prompt_injection", "ignore_instructions", r'ignore\s+(?:previous|all)\s+instructions',
+         re.IGNORECASE, anchors=("ignore",)),
+    Rule("prompt_injection", "disregard_instructions", r'disregard\s+(?:previous|all)\s+instructions',
+         re.IGNORECASE, anchors=("disregard",)),
+    Rule("prompt_injection", "forget_instructions", r'forget\s+(?:previous|all)\s+instructions',
+         re.IGNORECASE, anchors=("forget",)),
+    Rule("prompt_injection", "system_role", r'system:\s*you\s+are', re.IGNORECASE, anchors=("system:",)),
+    Rule("prompt_injection", "system_tag", r'[<\[]system[>\]]', re.IGNORECASE, anchors=("<system", "[system")),
+    # Aerospace-specific prohibited topics (substring match, reported in this order)
+    Rule("prohibited_content", "itar", "itar", trigger="substring", anchors=("itar",)),
+    Rule("prohibited_content", "export control", "export control", trigger="substring", anchors=("export control",)),
+    Rule("prohibited_content", "classified", "classified", trigger="substring", anchors=("classified",)),
+    Rule("prohibited_content", "confidential proprietary", "confidential proprietary", trigger="substring",
+         anchors=("confidential proprietary",)),
+    Rule("prohibited_content", "cui", "cui", trigger="substring", anchors=("cui",)),  # Controlled Unclassified Information
+    # Output safety
+    Rule("output_safety", "script_tag", r'<script[^>]*>.*?</script>', re.IGNORECASE, anchors=("<script",)),
+    Rule("output_safety", "javascript_url", r'javascript:', re.IGNORECASE, anchors=("javascript:",)),
+    Rule("output_safety", "onerror_handler", r'onerror\s*=', re.IGNORECASE, anchors=("onerror",)),
+)
+
+_DIGIT_RUN_RE = re.compile(r'\d{3,}')
+_EMAIL_LOCAL_TAIL_RE = re.compile(r'[A-Za-z0-9._%+-]+\Z')
+_EMAIL_START_RE = re.compile(r'\b[A-Za-z0-9._%+-]')
+
+# Characters that re.IGNORECASE matches to an ASCII letter although
+# str.lower() does not map them to it; texts containing them take the
+# exact per-rule path.
+_CASE_EXCEPTIONS = ("İ", "ı", "ſ")
+
+
+class GuardrailScanner:
+    """
+    Compiled scan plan over a rule table.
+
+    Compile once and reuse; scan() is safe to call concurrently.
+    """
+
+    def __init__(self, rules: Iterable[Rule] = DEFAULT_RULES):
+        self.rules: Tuple[Rule, ...] = tuple(rules)
+        self.checks: Set[str] = {rule.check for rule in self.rules}
+        self._compiled = [
+            None if rule.trigger == "substring" else re.compile(rule.pattern, rule.flags)
+            for rule in self.rules
+        ]
+        self._anchors: Dict[str, List[int]] = {}
+        self._digit_rules: List[int] = []
+        self._email_rules: List[int] = []
+        for index, rule in enumerate(self.rules):
+            if rule.trigger in ("literal", "substring"):
+                if not rule.anchors:
+                    raise ValueError(f"Rule {rule.label} needs at least one anchor")
+                for anchor in rule.anchors:
+                    self._anchors.setdefault(anchor.lower(), []).append(index)
+            elif rule.trigger == "digits":
+                self._digit_rules.append(index)
+            elif rule.trigger == "email":
+                self._email_rules.append(index)
+            else:
+                raise ValueError(f"Unknown trigger: {rule.trigger}")
+
+    def scan(self, text: str, checks: Optional[Iterable[str]] = None) -> List[Finding]:
+        """
+        Find all rule matches in text.
+
+        Args:
+            text: Text to scan
+            checks: Restrict to these check names (default: all)
+
+        Returns:
+            Findings ordered by position
+        """
+        wanted = self.checks if checks is None else set(checks)
+        active = [check in wanted for check in (rule.check for rule in self.rules)]
+        lowered = text.lower()
+        if len(lowered) != len(text) or any(c in text for c in _CASE_EXCEPTIONS):
+            return self._scan_exact(text, lowered, active)
+
+        findings: List[Finding] = []
+        for anchor, indexes in self._anchors.items():
+            indexes = [i for i in indexes if active[i]]
+            if not indexes:
+                continue
+            position = lowered.find(anchor)
+            while position != -1:
+                for index in indexes:
+                    self._verify(index, text, position, len(anchor), findings)
+                position = lowered.find(anchor, position + 1)
+
+        digit_rules = [i for i in self._digit_rules if active[i]]
+        if digit_rules:
+            for run in _DIGIT_RUN_RE.finditer(text):
+                for index in digit_rules:
+                    self._verify(index, text, run.start(), 0, findings)
+
+        email_rules = [i for i in self._email_rules if active[i]]
+        if email_rules:
+            at = text.find("@")
+            while at != -1:
+                start = self._email_start(text, at)
+                if start is not None:
+                    for index in email_rules:
+                        self._verify(index, text, start, 0, findings)
+                at = text.find("@", at + 1)
+
+        findings.sort(key=lambda f: (f.start, f.end))
+        return findings
+
+    def _verify(self, index: int, text: str, position: int, length: int, findings: List[Finding]):
+        rule = self.rules[index]
+        if rule.trigger == "substring":
+            findings.append(Finding(rule.check, rule.label, position, position + length,
+                                    text[position:position + length]))
+            return
+        match = self._compiled[index].match(text, position)
+        if match:
+            findings.append(Finding(rule.check, rule.label, match.start(), match.end(), match.group()))
+
+    @staticmethod
+    def _email_start(text: str, at: int) -> Optional[int]:
+        """
+        Leftmost position an email match ending its local part at '@' can start.
+
+        The local-part characters exclude '@', so every match containing this
+        '@' starts in the run of local-part characters before it, at the first
+        word boundary.
+        """
+        window = 64
+        while True:
+            low = max(0, at - window)
+            tail = _EMAIL_LOCAL_TAIL_RE.search(text, low, at)
+            if tail is None:
+                return None
+            if tail.start() > low or low == 0:
+                break
+            window *= 4
+        start = _EMAIL_START_RE.search(text, tail.start(), at)
+        return start.start() if start else None
+
+    def _scan_exact(self, text: str, lowered: str, active: List[bool]) -> List[Finding]:
+        """Per-rule scan for texts where lowercasing does not preserve offsets."""
+        findings: List[Finding] = []
+        offsets = None
+        if len(lowered) != len(text):
+            # Start of each original character in the lowercased text
+            offsets = [0] + list(accumulate(len(c.lower()) for c in text))
+        for index, rule in enumerate(self.rules):
+            if not active[index]:
+                continue
+            if rule.trigger == "substring":
+                for anchor in rule.anchors:
+                    position = lowered.find(anchor)
+                    while position != -1:
+                        start, end = position, position + len(anchor)
+                        if offsets is not None:
+                            start = bisect_right(offsets, start) - 1
+                            end = bisect_right(offsets, end - 1)
+                        findings.append(Finding(rule.check, rule.label, start, end, text[start:end]))
+                        position = lowered.find(anchor, position + 1)
+            else:
+                for match in self._compiled[index].finditer(text):
+                    findings.append(Finding(rule.check, rule.label, match.start(), match.end(), match.group()))
+        findings.sort(key=lambda f: (f.start, f.end))
+        return findings
@@ -0,0 +1,229 @@
+"""
+Recall@k and per-stage latency of vector, lexical and hybrid retrieval.
+
+A synthetic S1000D-style corpus (one data module per task, each with a DMC,
+ATA heading, part numbers and descriptive prose) is chunked with
+DocumentProcessor and indexed through RAGRetriever.index_chunks. A golden
+set of three query kinds is written and then loaded through
+GoldenSetManager:
+
+    dmc    the data module code, e.g. "DMC-HYF-A-32-11-03-00A-520A-A"
+    part   "Where is part number 4F1203-7 installed?"
+    text   a descriptive sentence with a few words dropped
+    para   the same sentence with most words replaced by synonyms, which
+           the embedder maps together and BM25 cannot
+
+The embedder is a deterministic stand-in (hashed word features with digit
+runs broken into three-character word pieces, as subword tokenizers do)
+served through EmbeddingService; pass --reranker to add a cross-encoder
+when sentence-transformers is installed.
+
+Usage:
+    python bench_hybrid.py --modules 1500 --queries 300
+"""
+
+import argparse
+import asyncio
+import random
+import re
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "embed"))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "eval"))
+
+from document_processor import DocumentProcessor
+from retriever import RAGRetriever, CrossEncoderReranker
+from service import EmbeddingService
+from golden_sets import GoldenSetManager, GoldenExample
+from metrics import EvaluationMetrics
+
+SYSTEMS = [("32", "landing gear"), ("29", "hydraulic power"), ("28", "fuel"), ("24", "electrical power"),
+           ("21", "air conditioning"), ("27", "flight controls")]
+WORDS = ("actuator bolt bracket seal line pressure torque inspect remove install cracks corrosion wear "
+         "clearance gauge fitting valve manifold sensor harness hose clamp bearing bushing spring").split()
+# Long-tail vocabulary so descriptive sentences are distinguishable
+_SYLLABLES = "ka ro mi tel van sor ful dex pra lin gor tha vel mun sib".split()
+_VOCAB_RNG = random.Random(42)
+WORDS += sorted({"".join(_VOCAB_RNG.choice(_SYLLABLES) for _ in range(3)) for _ in range(3000)})
+# Synonyms share an embedding feature but not a surface form
+SYNONYMS = {word: word[::-1] + "e" for word in WORDS}
+_CANONICAL = {synonym: word for word, synonym in SYNONYMS.items()}
+KS = (1, 5, 10)
+KINDS = ("dmc", "part", "text", "para")
+
+
+class HashedWordEncoder:
+    """Deterministic dense stand-in for a sentence embedding model."""
+
+    def __init__(self, dim: int = 256):
+        rng = np.random.default_rng(0)
+        self.dim = dim
+        self.projection = rng.standard_normal((4096, dim)).astype(np.float32)
+
+    def _pieces(self, text):
+        for word in re.findall(r"[a-z]+|\d+", text.lower()):
+            if word.isdigit():
+                yield from (word[i:i + 3] for i in range(0, len(word), 3))
+            elif len(word) > 2:
+                yield _CANONICAL.get(word, word)
+
+    def encode(self, texts, normalize_embeddings=True, **kwargs):
+        counts = np.zeros((len(texts), 4096), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for piece in self._pieces(text):
+                counts[row, zlib.crc32(piece.encode()) % 4096] += 1.0
+        out = np.log1p(counts) @ self.projection
+        if normalize_embeddings:
+            out /= np.maximum(np.linalg.norm(out, axis=1, keepdims=True), 1e-9)
+        return out
+
+
+class MemoryVectorStore:
+    """Brute-force cosine search over a float32 matrix."""
+
+    def __init__(self):
+        self.ids, self.texts, self.metadata, self.blocks = [], [], [], []
+        self._matrix = None
+
+    async def insert(self, collection_name, vectors, texts, metadata, ids=None):
+        self.blocks.append(np.asarray(vectors, dtype=np.float32))
+        self.ids.extend(ids)
+        self.texts.extend(texts)
+        self.metadata.extend(metadata)
+        self._matrix = None
+
+    async def search(self, collection_name, query_vector, top_k=10, score_threshold=None):
+        if self._matrix is None:
+            self._matrix = np.vstack(self.blocks)
+        scores = self._matrix @ np.asarray(query_vector, dtype=np.float32)
+        top = np.argpartition(-scores, min(top_k, len(scores) - 1))[:top_k]
+        top = top[np.argsort(-scores[top])]
+        return [{"id": self.ids[i], "text": self.texts[i], "metadata": self.metadata[i], "score": float(scores[i])}
+                for i in top if score_threshold is None or scores[i] >= score_threshold]
+
+
+def data_module(rng: random.Random, n: int):
+    """(text, dmc, part numbers, descriptive sentences) for module n."""
+    code, system = SYSTEMS[n % len(SYSTEMS)]
+    sub = f"{rng.randint(10, 99)}-{rng.randint(0, 99):02d}"
+    dmc = f"DMC-HYF-A-{code}-{sub}-00A-{rng.choice([520, 720, 300])}A-A"
+    parts = [f"{rng.randint(1, 9)}{rng.choice('ABCDEF')}{rng.randint(1000, 9999)}-{rng.randint(1, 9)}"
+             for _ in range(3)]
+    sentences = [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 16))).capitalize() + f" on the {system}."
+        for _ in range(rng.randint(4, 10))
+    ]
+    lines = [f"{dmc}\n\n{code}.{n} {system.title()} task {n}\n"]
+    lines.append(" ".join(sentences[:len(sentences) // 2]) + "\n\n")
+    for step, part in enumerate(parts, 1):
+        lines.append(f"Step {step}. Install part number {part} on the {rng.choice(WORDS)} "
+                     f"and torque to {rng.randint(10, 90)} Nm.\n")
+    lines.append("\n" + " ".join(sentences[len(sentences) // 2:]) + "\n")
+    return "".join(lines), dmc, parts, sentences
+
+
+def build_golden_set(rng, modules, chunks_by_module, count):
+    examples = []
+    for i in range(count):
+        n = rng.randrange(len(modules))
+        _, dmc, parts, sentences = modules[n]
+        chunks = chunks_by_module[n]
+        kind = KINDS[i % len(KINDS)]
+        if kind == "dmc":
+            query, needle = dmc, dmc
+        elif kind == "part":
+            needle = rng.choice(parts)
+            query = f"Where is part number {needle} installed?"
+        elif kind == "text":
+            needle = rng.choice(sentences)
+            words = needle.rstrip(".").split()
+            query = " ".join(w for w in words if rng.random() > 0.3)
+        else:
+            needle = rng.choice(sentences)
+            words = needle.rstrip(".").lower().split()
+            query = " ".join(SYNONYMS.get(w, w) if rng.random() < 0.7 else w for w in words)
+        relevant = [c.chunk_id for c in chunks if needle.split(" on the ")[0] in c.text]
+        examples.append(GoldenExample(id=f"q{i}", query=query, reference_answer=needle,
+                                      metadata={"kind": kind, "relevant_ids": relevant}))
+    return examples
+
+
+async def run(args):
+    rng = random.Random(0)
+    processor = DocumentProcessor(chunk_size=128, chunk_overlap=16)
+    modules = [data_module(rng, n) for n in range(args.modules)]
+    chunks_by_module = [processor.process_text(text, f"dm-{n}") for n, (text, *_) in enumerate(modules)]
+
+    service = EmbeddingService(default_model="hashed-words", max_batch_size=64)
+    service.models["hashed-words"] = HashedWordEncoder()
+    reranker = CrossEncoderReranker(args.reranker) if args.reranker else None
+    retriever = RAGRetriever(MemoryVectorStore(), service, reranker=reranker,
+                             rerank_budget_ms=args.rerank_budget_ms)
+
+    start = time.perf_counter()
+    all_chunks = [chunk for chunks in chunks_by_module for chunk in chunks]
+    await retriever.index_chunks("manuals", all_chunks, batch_size=256)
+    print(f"indexed {len(all_chunks)} chunks from {args.modules} modules in {time.perf_counter() - start:.1f} s")
+
+    with tempfile.TemporaryDirectory() as storage:
+        manager = GoldenSetManager(storage_path=storage)
+        manager.create_golden_set("retrieval", build_golden_set(rng, modules, chunks_by_module, args.queries))
+        manager.save_golden_set("retrieval")
+        manager = GoldenSetManager(storage_path=storage)
+        manager.load_golden_set("retrieval")
+        golden = manager.get_golden_set("retrieval")
+
+    modes = ["vector", "lexical", "hybrid", "hybrid-rrf"] + (["hybrid+rerank"] if reranker else [])
+    print(f"{'mode':>14} {'kind':>5} " + " ".join(f"{'R@' + str(k):>6}" for k in KS))
+    stage_latency = {}
+    for label in modes:
+        mode = label.split("+")[0].split("-")[0]
+        retriever.fusion = "rrf" if label == "hybrid-rrf" else "score"
+        recalls = {kind: {k: [] for k in KS} for kind in KINDS + ("all",)}
+        retriever.clear_query_cache()
+        for passes in range(2):
+            for example in golden:
+                timings = {}
+                results = await retriever.retrieve(example.query, "manuals", top_k=max(KS), score_threshold=None,
+                                                   mode=mode, rerank=label.endswith("rerank"), timings=timings)
+                if passes == 0:
+                    ids = [r.chunk_id for r in results]
+                    for k in KS:
+                        recall = EvaluationMetrics.recall_at_k(ids, example.metadata["relevant_ids"], k)
+                        recalls[example.metadata["kind"]][k].append(recall)
+                        recalls["all"][k].append(recall)
+                for stage, ms in timings.items():
+                    key = f"{stage}{' (cached)' if passes and stage == 'embed_ms' else ''}"
+                    stage_latency.setdefault(label, {}).setdefault(key, []).append(ms)
+        for kind, by_k in recalls.items():
+            print(f"{label:>14} {kind:>5} " + " ".join(f"{np.mean(by_k[k]):>6.3f}" for k in KS))
+
+    print("\nper-stage latency (ms), both passes; the second pass hits the query-embedding cache")
+    print(f"{'mode':>14} {'stage':>18} {'p50':>8} {'p95':>8}")
+    for label, stages in stage_latency.items():
+        for stage, values in stages.items():
+            stats = EvaluationMetrics.calculate_latency_stats(values)
+            print(f"{label:>14} {stage:>18} {stats['p50']:>8.3f} {stats['p95']:>8.3f}")
+    print(f"\nquery cache: {retriever.cache_stats}")
+    await service.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hybrid retrieval benchmark")
+    parser.add_argument("--modules", type=int, default=1500)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--reranker", default=None,
+                        help="cross-encoder model name, e.g. cross-encoder/ms-marco-MiniLM-L-6-v2")
+    parser.add_argument("--rerank-budget-ms", type=float, default=150.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
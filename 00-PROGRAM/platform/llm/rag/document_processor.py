@@ -2,37 +2,143 @@
 Document processing and chunking for RAG.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Callable, NamedTuple, Union
+import bisect
 import re
 from dataclasses import dataclass
 
 
 @dataclass
 class DocumentChunk:
-    """A chunk of a document."""
+    """
+    A chunk of a document.
+
+    start_index/end_index are offsets into the source text as given (before
+    whitespace cleanup), so source[start_index:end_index] is the raw span the
+    chunk was built from. Consecutive chunks overlap by up to chunk_overlap
+    tokens.
+    """
     text: str
     metadata: Dict[str, Any]
     chunk_id: str
     document_id: str
     start_index: int
     end_index: int
+    token_count: int = 0
+
+
+# Approximation of the cl100k_base pre-tokenizer, used when tiktoken is not
+# installed. Common English words are single tokens, so the match count is
+# close to the real count for prose; letter and symbol runs are capped in
+# length so long identifiers are not counted as one token.
+_PRETOKEN_RE = re.compile(
+    r"'(?:[sdmt]|ll|ve|re)|(?:[^\r\n\w]|_)?[^\W\d_]{1,10}|\d{1,3}| ?(?:[^\s\w]|_){1,3}[\r\n]*|\s*[\r\n]+|\s+(?!\S)|\s+",
+    re.IGNORECASE,
+)
+
+
+class TokenCounter:
+    """
+    Token counter compatible with the OpenAI tokenizers.
+
+    Uses tiktoken when installed and falls back to a pre-tokenizer
+    approximation otherwise.
+    """
+
+    def __init__(self, model: str = "gpt-3.5-turbo"):
+        self.model = model
+        self._encoding = None
+        try:
+            import tiktoken
+
+            try:
+                self._encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                self._encoding = tiktoken.get_encoding("cl100k_base")
+        except ImportError:
+            pass
+
+    @property
+    def exact(self) -> bool:
+        """Whether counts come from the real tokenizer."""
+        return self._encoding is not None
+
+    def __call__(self, text: str) -> int:
+        if self._encoding is not None:
+            return len(self._encoding.encode_ordinary(text))
+        return len(_PRETOKEN_RE.findall(text))
+
+
+# Boundary strengths, weakest first
+_WORD, _SENTENCE, _PARAGRAPH, _HEADING = range(4)
+
+# Split points sit before the separating whitespace, which keeps per-unit
+# token counts additive for BPE tokenizers that attach a leading space to
+# the following word.
+_BOUNDARY_RE = re.compile(
+    r"(?P<heading>\n(?:[ \t]*\n)*(?=[ \t]*(?:#{1,6}[ \t]|\d+(?:\.\d+)*[ \t]+[A-Z])))"
+    r"|(?P<paragraph>\n[ \t]*\n)"
+    r"|(?P<sentence>(?<=[.!?])(?=\s)|(?<=[.!?][\"')\]])(?=\s))"
+)
+_STRENGTH = {"heading": _HEADING, "paragraph": _PARAGRAPH, "sentence": _SENTENCE}
+_WORD_RE = re.compile(r"\s*\S+")
+_LEADING_WS_RE = re.compile(r"\s*")
+
+# Text without any boundary is held back at most this many characters per
+# token of chunk_size before being cut (at whitespace when there is any), so
+# the carry rescanned with each piece stays bounded.
+_CARRY_CHARS_PER_TOKEN = 16
+# Characters kept before a hard cut: the longest sentence-boundary lookbehind
+_LOOKBEHIND = 2
+
+
+class _Unit(NamedTuple):
+    """Smallest span the chunker packs: a heading, sentence or word run."""
+    text: str
+    start: int
+    tokens: int
+    kind: int
 
 
 class DocumentProcessor:
     """
     Process documents for RAG indexing.
+
+    Chunks are packed from sentence units up to chunk_size tokens. A heading
+    always starts a new chunk, and an overflowing chunk is closed at its last
+    paragraph break when that keeps at least half the budget. Sentences longer
+    than the budget are split at whitespace. The input may be a string or an
+    iterable of string pieces (pages, file reads); offsets are tracked while
+    splitting, so the source is never searched or concatenated.
     """
-    
+
     def __init__(
         self,
         chunk_size: int = 512,
         chunk_overlap: int = 50,
-        separator: str = "\n\n"
+        separator: str = "\n\n",
+        model: str = "gpt-3.5-turbo",
+        token_counter: Optional[Callable[[str], int]] = None
     ):
+        """
+        Initialize processor.
+
+        Args:
+            chunk_size: Maximum tokens per chunk
+            chunk_overlap: Tokens of trailing sentences repeated at the start
+                of the next chunk within a section
+            separator: Separator inserted between streamed pages
+            model: Model whose tokenizer defines the token budget
+            token_counter: Optional callable overriding the tokenizer
+        """
+        if chunk_overlap * 2 >= chunk_size:
+            raise ValueError("chunk_overlap must be less than half of chunk_size")
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.separator = separator
-    
+        self.model = model
+        self.count_tokens = token_counter or TokenCounter(model)
+
     def process_text(
         self,
         text: str,
@@ -41,114 +147,242 @@ class DocumentProcessor:
     ) -> List[DocumentChunk]:
         """
         Process raw text into chunks.
-        
+
         Args:
             text: Raw text content
             document_id: Unique document identifier
             metadata: Optional metadata to attach to chunks
-        
+
         Returns:
             List of DocumentChunk objects
         """
-        # Clean text
-        text = self._clean_text(text)
-        
-        # Split into chunks
-        chunks = self._split_text(text)
-        
-        # Create chunk objects
-        document_chunks = []
-        for i, chunk_text in enumerate(chunks):
-            chunk = DocumentChunk(
-                text=chunk_text,
-                metadata=metadata or {},
-                chunk_id=f"{document_id}_chunk_{i}",
+        return list(self.iter_chunks(text, document_id, metadata))
+
+    def iter_chunks(
+        self,
+        source: Union[str, Iterable[str]],
+        document_id: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Iterator[DocumentChunk]:
+        """
+        Lazily chunk a string or a stream of string pieces.
+
+        Offsets are relative to the concatenation of the pieces. Chunks under
+        a heading carry it as metadata["heading"].
+
+        Args:
+            source: Text, or an iterable of text pieces
+            document_id: Unique document identifier
+            metadata: Optional metadata to attach to chunks
+
+        Yields:
+            DocumentChunk objects in document order
+        """
+        pieces = [source] if isinstance(source, str) else source
+        metadata = metadata or {}
+        heading = None
+
+        index = 0
+
+        for units in self._pack(self._iter_units(pieces)):
+            raw = "".join(unit.text for unit in units)
+            if not raw.strip():
+                continue
+            if units[0].kind == _HEADING:
+                title = units[0].text.lstrip().split("\n", 1)[0]
+                heading = self._clean_text(title.lstrip("#"))
+            lead = _LEADING_WS_RE.match(raw).end()
+            start = units[0].start + lead
+            end = units[0].start + len(raw.rstrip())
+            chunk_metadata = metadata if heading is None else {**metadata, "heading": heading}
+            yield DocumentChunk(
+                text=self._clean_text(raw),
+                metadata=chunk_metadata,
+                chunk_id=f"{document_id}_chunk_{index}",
                 document_id=document_id,
-                start_index=text.find(chunk_text),
-                end_index=text.find(chunk_text) + len(chunk_text)
+                start_index=start,
+                end_index=end,
+                token_count=sum(unit.tokens for unit in units)
             )
-            document_chunks.append(chunk)
-        
-        return document_chunks
-    
+            index += 1
+
     def process_pdf(self, file_path: str, document_id: str) -> List[DocumentChunk]:
-        """Process a PDF file."""
+        """Process a PDF file, streaming pages into the chunker."""
         try:
             from pypdf import PdfReader
-            
-            reader = PdfReader(file_path)
-            text = ""
-            
-            for page in reader.pages:
-                text += page.extract_text() + "\n\n"
-            
-            metadata = {
-                "source_type": "pdf",
-                "page_count": len(reader.pages),
-                "file_path": file_path
-            }
-            
-            return self.process_text(text, document_id, metadata)
-        
         except ImportError:
             raise ImportError("pypdf is required for PDF processing")
-    
+
+        reader = PdfReader(file_path)
+        page_starts: List[int] = []
+
+        def pages() -> Iterator[str]:
+            offset = 0
+            for page in reader.pages:
+                page_starts.append(offset)
+                text = (page.extract_text() or "") + self.separator
+                offset += len(text)
+                yield text
+
+        metadata = {
+            "source_type": "pdf",
+            "page_count": len(reader.pages),
+            "file_path": file_path
+        }
+
+        chunks = []
+        for chunk in self.iter_chunks(pages(), document_id, metadata):
+            # Pages up to the chunk's end have been read by the time it is yielded
+            chunk.metadata = {**chunk.metadata, "page": bisect.bisect_right(page_starts, chunk.start_index)}
+            chunks.append(chunk)
+        return chunks
+
     def process_markdown(self, text: str, document_id: str) -> List[DocumentChunk]:
         """Process markdown text."""
         # Extract headers for metadata
         headers = re.findall(r'^#+\s+(.+)$', text, re.MULTILINE)
-        
+
         metadata = {
             "source_type": "markdown",
             "headers": headers
         }
-        
+
         return self.process_text(text, document_id, metadata)
-    
+
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text."""
         # Remove excessive whitespace
         text = re.sub(r'\s+', ' ', text)
-        
+
         # Remove control characters
         text = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', text)
-        
+
         return text.strip()
-    
-    def _split_text(self, text: str) -> List[str]:
+
+    def _iter_units(self, pieces: Iterable[str]) -> Iterator[_Unit]:
         """
-        Split text into chunks with overlap.
-        
-        Uses a simple character-based splitting with overlap.
+        Split a stream of pieces into units at heading, paragraph and
+        sentence boundaries.
+
+        Only the text after the last boundary is carried into the next piece,
+        and it is cut once longer than chunk_size * _CARRY_CHARS_PER_TOKEN
+        characters, so each character is scanned a bounded number of times.
         """
-        chunks = []
-        start = 0
-        text_length = len(text)
-        
-        while start < text_length:
-            end = start + self.chunk_size
-            
-            # Try to break at sentence boundary
-            if end < text_length:
-                # Look for sentence ending
-                sentence_end = text.rfind('.', start, end)
-                if sentence_end > start:
-                    end = sentence_end + 1
-            
-            chunk = text[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
-            
-            # Move start position with overlap
-            start = end - self.chunk_overlap
-        
-        return chunks
-    
-    def estimate_tokens(self, text: str, model: str = "gpt-3.5-turbo") -> int:
+        carry = ""
+        offset = 0  # source offset of carry[0]
+        kind = _PARAGRAPH
+        max_carry = self.chunk_size * _CARRY_CHARS_PER_TOKEN
+
+        for piece in pieces:
+            buffer = carry + piece
+            last = 0
+            for match in _BOUNDARY_RE.finditer(buffer):
+                position = match.start()
+                if position == last:
+                    # Boundary re-found at the carry start, or stacked boundaries
+                    kind = max(kind, _STRENGTH[match.lastgroup])
+                    continue
+                yield from self._make_units(buffer[last:position], offset + last, kind)
+                kind = _STRENGTH[match.lastgroup]
+                last = position
+
+            if len(buffer) - last > max_carry:
+                cut = max(buffer.rfind(" ", last), buffer.rfind("\n", last))
+                if cut <= last:
+                    # No whitespace (minified or encoded text): cut hard
+                    cut = len(buffer) - _LOOKBEHIND
+                yield from self._make_units(buffer[last:cut], offset + last, kind)
+                kind = _WORD
+                last = cut
+            carry = buffer[last:]
+            offset += last
+
+        if carry.strip():
+            yield from self._make_units(carry, offset, kind)
+
+    def _make_units(self, text: str, start: int, kind: int) -> Iterator[_Unit]:
+        """Yield the span as one unit, splitting it when over budget."""
+        tokens = self.count_tokens(text)
+        if tokens <= self.chunk_size:
+            yield _Unit(text, start, tokens, kind)
+            return
+
+        # Over-long sentence: group words up to half the budget
+        budget = self.chunk_size // 2
+        group_start, group_tokens = 0, 0
+        for match in _WORD_RE.finditer(text):
+            word_tokens = self.count_tokens(match.group())
+            if group_tokens and group_tokens + word_tokens > budget:
+                yield _Unit(text[group_start:match.start()], start + group_start, group_tokens, kind)
+                kind = _WORD
+                group_start, group_tokens = match.start(), 0
+            if word_tokens > budget:
+                # A single run with no whitespace: slice it
+                for cut in range(match.start(), match.end(), budget):
+                    piece = text[cut:min(cut + budget, match.end())]
+                    yield _Unit(piece, start + cut, self.count_tokens(piece), kind)
+                    kind = _WORD
+                group_start = match.end()
+                continue
+            group_tokens += word_tokens
+        if group_start < len(text):
+            yield _Unit(text[group_start:], start + group_start, self.count_tokens(text[group_start:]), kind)
+
+    def _pack(self, units: Iterable[_Unit]) -> Iterator[List[_Unit]]:
+        """Greedily pack units into chunks of at most chunk_size tokens."""
+        current: List[_Unit] = []
+        tokens = 0
+        carried = 0  # leading units repeated from the previous chunk
+
+        for unit in units:
+            if unit.kind == _HEADING:
+                # New section: no overlap carried across the heading
+                if len(current) > carried:
+                    yield current
+                current, tokens, carried = [], 0, 0
+
+            while current and tokens + unit.tokens > self.chunk_size:
+                if len(current) == carried:
+                    current, tokens, carried = [], 0, 0
+                    break
+                split = self._split_index(current, carried, tokens)
+                yield current[:split]
+                overlap = self._overlap(current, carried, split)
+                current = overlap + current[split:]
+                carried = len(overlap)
+                tokens = sum(u.tokens for u in current)
+
+            current.append(unit)
+            tokens += unit.tokens
+
+        if len(current) > carried:
+            yield current
+
+    def _split_index(self, units: List[_Unit], carried: int, tokens: int) -> int:
+        """Index to close the chunk at: the last paragraph break past half the budget."""
+        prefix = tokens
+        for i in range(len(units) - 1, carried, -1):
+            prefix -= units[i].tokens
+            if prefix < self.chunk_size // 2:
+                break
+            if units[i].kind >= _PARAGRAPH:
+                return i
+        return len(units)
+
+    def _overlap(self, units: List[_Unit], carried: int, split: int) -> List[_Unit]:
+        """Trailing sentences of units[:split] that fit in chunk_overlap."""
+        start, tokens = split, 0
+        while start - 1 > carried and tokens + units[start - 1].tokens <= self.chunk_overlap:
+            start -= 1
+            tokens += units[start].tokens
+        return units[start:split]
+
+    def estimate_tokens(self, text: str, model: Optional[str] = None) -> int:
         """
-        Estimate token count for text.
-        
-        This is a simple approximation. For accurate counts, use tiktoken.
+        Count tokens for text.
+
+        Uses the processor's tokenizer, or one for the given model.
         """
-        # Rough approximation: 1 token ≈ 4 characters
-        return len(text) // 4
+        if model is None or model == self.model:
+            return self.count_tokens(text)
+        return TokenCounter(model)(text)
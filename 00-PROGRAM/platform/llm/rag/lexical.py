@@ -0,0 +1,243 @@
+"""
+In-memory BM25 inverted index for lexical retrieval.
+
+Identifiers such as part numbers, ATA codes (32-11-00) and DMC strings are
+kept as single terms. Compound identifiers are also indexed under their
+two- and three-part windows, so a query for "32-11" or "32-11-00" matches
+the DMC-HYF-A-32-11-00-00A-520A-A module that contains it.
+"""
+
+from typing import List, Dict, Any, Optional, Tuple
+import re
+from collections import Counter
+
+import numpy as np
+
+
+_TERM_RE = re.compile(r"[a-z0-9]+(?:[-./_][a-z0-9]+)*")
+_PART_RE = re.compile(r"[a-z0-9]+")
+# Tombstoned slots are compacted away once they exceed this fraction of the
+# live documents, so replacing documents does not grow the postings
+_COMPACT_RATIO = 0.5
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it of on or that the this to was were what which with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased terms plus sub-identifiers of compound identifiers."""
+    terms = []
+    for term in _TERM_RE.findall(text.lower()):
+        if term in _STOPWORDS:
+            continue
+        terms.append(term)
+        if len(term) > 3 and not term.isalnum():
+            parts = [m.span() for m in _PART_RE.finditer(term)]
+            for width in (2, 3):
+                if width < len(parts):
+                    terms.extend(term[parts[i][0]:parts[i + width - 1][1]]
+                                 for i in range(len(parts) - width + 1))
+    return terms
+
+
+def has_identifier(text: str) -> bool:
+    """Whether text contains a code-like term (letters or separators mixed with digits)."""
+    return any(
+        len(term) > 3 and any(c.isdigit() for c in term) and not term.isdigit()
+        for term in _TERM_RE.findall(text.lower())
+    )
+
+
+class _Collection:
+    """Postings and document store for one collection."""
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.texts: List[str] = []
+        self.metadata: List[Dict[str, Any]] = []
+        self.lengths: List[int] = []
+        self.alive: List[bool] = []
+        self.positions: Dict[str, int] = {}
+        self.postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        self.live_count = 0
+        self.total_length = 0
+        # Numpy views rebuilt lazily after writes
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._lengths: Optional[np.ndarray] = None
+        self._alive: Optional[np.ndarray] = None
+
+    def invalidate(self):
+        self._arrays.clear()
+        self._lengths = None
+        self._alive = None
+
+    def arrays(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        cached = self._arrays.get(term)
+        if cached is None:
+            posting = self.postings.get(term)
+            if posting is None:
+                return None
+            cached = (np.asarray(posting[0], dtype=np.int64), np.asarray(posting[1], dtype=np.float32))
+            self._arrays[term] = cached
+        return cached
+
+    def compact(self):
+        """Drop tombstoned slots and renumber live documents in order."""
+        keep = [i for i, alive in enumerate(self.alive) if alive]
+        remap = {old: new for new, old in enumerate(keep)}
+        postings = {}
+        for term, (docs, freqs) in self.postings.items():
+            kept = [(remap[d], tf) for d, tf in zip(docs, freqs) if d in remap]
+            if kept:
+                postings[term] = ([d for d, _ in kept], [tf for _, tf in kept])
+        self.postings = postings
+        self.ids = [self.ids[i] for i in keep]
+        self.texts = [self.texts[i] for i in keep]
+        self.metadata = [self.metadata[i] for i in keep]
+        self.lengths = [self.lengths[i] for i in keep]
+        self.alive = [True] * len(keep)
+        self.positions = {doc_id: i for i, doc_id in enumerate(self.ids)}
+        self.invalidate()
+
+    def doc_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(document lengths, live mask)."""
+        if self._lengths is None:
+            self._lengths = np.asarray(self.lengths, dtype=np.float32)
+            self._alive = np.asarray(self.alive, dtype=bool)
+        return self._lengths, self._alive
+
+
+class LexicalIndex:
+    """
+    BM25 index over document chunks, one namespace per collection.
+
+    Mirrors the VectorStoreAdapter insert/delete/search shapes so the two can
+    be populated side by side. Re-inserting an id replaces the document.
+    Removed documents are tombstoned and compacted away in bulk once they
+    pass half of the live documents, which keeps removal amortized O(1).
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.collections: Dict[str, _Collection] = {}
+
+    def insert(
+        self,
+        collection_name: str,
+        texts: List[str],
+        metadata: List[Dict[str, Any]],
+        ids: List[str]
+    ):
+        """Index documents."""
+        collection = self.collections.setdefault(collection_name, _Collection())
+        for doc_id, text, meta in zip(ids, texts, metadata):
+            if doc_id in collection.positions:
+                self._remove(collection, collection.positions[doc_id])
+            position = len(collection.ids)
+            counts = Counter(tokenize(text))
+            for term, tf in counts.items():
+                docs, freqs = collection.postings.setdefault(term, ([], []))
+                docs.append(position)
+                freqs.append(tf)
+            length = sum(counts.values())
+            collection.ids.append(doc_id)
+            collection.texts.append(text)
+            collection.metadata.append(meta)
+            collection.lengths.append(length)
+            collection.alive.append(True)
+            collection.positions[doc_id] = position
+            collection.live_count += 1
+            collection.total_length += length
+        self._after_write(collection)
+
+    def delete(self, collection_name: str, ids: List[str]):
+        """Remove documents by ID."""
+        collection = self.collections.get(collection_name)
+        if collection is None:
+            return
+        for doc_id in ids:
+            position = collection.positions.get(doc_id)
+            if position is not None:
+                self._remove(collection, position)
+        self._after_write(collection)
+
+    def delete_collection(self, collection_name: str):
+        self.collections.pop(collection_name, None)
+
+    def search(
+        self,
+        collection_name: str,
+        query: str,
+        top_k: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank documents by BM25.
+
+        Returns:
+            List of dicts with keys: id, score, text, metadata
+        """
+        collection = self.collections.get(collection_name)
+        if collection is None or collection.live_count == 0:
+            return []
+
+        lengths, alive = collection.doc_arrays()
+        avg_length = collection.total_length / collection.live_count or 1.0
+        scores = np.zeros(len(collection.ids), dtype=np.float32)
+        matched = False
+        for term in set(tokenize(query)):
+            arrays = collection.arrays(term)
+            if arrays is None:
+                continue
+            docs, tf = arrays
+            live = alive[docs]
+            df = int(live.sum())
+            if df == 0:
+                continue
+            matched = True
+            idf = np.log(1.0 + (collection.live_count - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1.0 - self.b + self.b * lengths[docs] / avg_length)
+            scores[docs] += np.where(live, idf * tf * (self.k1 + 1.0) / (tf + norm), 0.0)
+
+        if not matched:
+            return []
+        k = min(top_k, int(np.count_nonzero(scores)))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            {
+                "id": collection.ids[i],
+                "text": collection.texts[i],
+                "metadata": collection.metadata[i],
+                "score": float(scores[i])
+            }
+            for i in top
+        ]
+
+    def get_stats(self, collection_name: str) -> Dict[str, Any]:
+        collection = self.collections.get(collection_name)
+        return {
+            "collection_name": collection_name,
+            "document_count": collection.live_count if collection else 0,
+            "term_count": len(collection.postings) if collection else 0
+        }
+
+    @staticmethod
+    def _after_write(collection: _Collection):
+        if len(collection.ids) - collection.live_count > collection.live_count * _COMPACT_RATIO:
+            collection.compact()
+        else:
+            collection.invalidate()
+
+    @staticmethod
+    def _remove(collection: _Collection, position: int):
+        if not collection.alive[position]:
+            return
+        # Postings keep the slot; the tombstone excludes it from scoring
+        collection.alive[position] = False
+        del collection.positions[collection.ids[position]]
+        collection.live_count -= 1
+        collection.total_length -= collection.lengths[position]
+        collection.texts[position] = ""
@@ -1,9 +1,27 @@
 """
 RAG retrieval service.
+
+Retrieval modes:
+    vector   dense search through the VectorStoreAdapter
+    lexical  BM25 over the local LexicalIndex
+    hybrid   both, fused by weighted reciprocal rank or min-max normalised
+             score, optionally reranked by a cross-encoder within a
+             latency budget
 """
 
 from typing import List, Dict, Any, Optional
+from collections import OrderedDict
 from dataclasses import dataclass
+import asyncio
+import time
+
+try:
+    from .lexical import LexicalIndex, has_identifier
+except ImportError:
+    from lexical import LexicalIndex, has_identifier
+
+RETRIEVAL_MODES = ("vector", "lexical", "hybrid")
+FUSION_METHODS = ("rrf", "score")
 
 
 @dataclass
@@ -14,6 +32,28 @@ class RetrievalResult:
     text: str
     score: float
     metadata: Dict[str, Any]
+    scores: Optional[Dict[str, float]] = None
+
+
+class Reranker:
+    """Scores (query, passage) pairs; higher is more relevant."""
+
+    def score(self, query: str, texts: List[str]) -> List[float]:
+        raise NotImplementedError
+
+
+class CrossEncoderReranker(Reranker):
+    """CPU cross-encoder reranker backed by sentence-transformers."""
+
+    def __init__(self, model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2", max_length: int = 512):
+        try:
+            from sentence_transformers import CrossEncoder
+        except ImportError:
+            raise ImportError("sentence-transformers is required for cross-encoder reranking")
+        self.model = CrossEncoder(model_name, max_length=max_length, device="cpu")
+
+    def score(self, query: str, texts: List[str]) -> List[float]:
+        return [float(s) for s in self.model.predict([(query, text) for text in texts])]
 
 
 class RAGRetriever:
@@ -23,23 +63,107 @@ class RAGRetriever:
     Retrieves relevant document chunks based on query.
     """
     
-    def __init__(self, vector_store, embedding_service):
+    def __init__(
+        self,
+        vector_store,
+        embedding_service,
+        lexical_index: Optional[LexicalIndex] = None,
+        reranker: Optional[Reranker] = None,
+        mode: str = "vector",
+        candidate_multiplier: int = 4,
+        fusion: str = "score",
+        rrf_k: int = 60,
+        vector_weight: float = 1.0,
+        lexical_weight: float = 1.0,
+        identifier_boost: float = 2.0,
+        rerank_candidates: int = 20,
+        rerank_batch_size: int = 8,
+        rerank_budget_ms: float = 150.0,
+        query_cache_size: int = 1024
+    ):
         """
         Initialize retriever.
         
         Args:
             vector_store: Vector database adapter
             embedding_service: Embedding generation service
+            lexical_index: BM25 index for lexical and hybrid modes
+            reranker: Optional reranker applied to fused hybrid results
+            mode: Default retrieval mode (vector, lexical or hybrid)
+            candidate_multiplier: Candidates fetched per source as a multiple of top_k
+            fusion: "score" sums min-max normalised scores, which keeps a
+                decisive BM25 match on an identifier on top; "rrf" uses
+                reciprocal ranks only
+            rrf_k: Reciprocal rank fusion constant
+            vector_weight: Fusion weight of the vector ranking
+            lexical_weight: Fusion weight of the lexical ranking
+            identifier_boost: Multiplier on lexical_weight for queries that
+                contain part numbers, ATA codes or DMC strings
+            rerank_candidates: Fused candidates offered to the reranker
+            rerank_batch_size: Pairs scored per reranker call
+            rerank_budget_ms: Time allowed for reranking; candidates not
+                scored in time keep their fused order
+            query_cache_size: Query embeddings kept in the LRU cache
         """
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {mode}")
+        if fusion not in FUSION_METHODS:
+            raise ValueError(f"Unknown fusion method: {fusion}")
         self.vector_store = vector_store
         self.embedding_service = embedding_service
+        self.lexical_index = lexical_index if lexical_index is not None else LexicalIndex()
+        self.reranker = reranker
+        self.mode = mode
+        self.candidate_multiplier = candidate_multiplier
+        self.fusion = fusion
+        self.rrf_k = rrf_k
+        self.vector_weight = vector_weight
+        self.lexical_weight = lexical_weight
+        self.identifier_boost = identifier_boost
+        self.rerank_candidates = rerank_candidates
+        self.rerank_batch_size = rerank_batch_size
+        self.rerank_budget_ms = rerank_budget_ms
+        self.query_cache_size = query_cache_size
+        self._query_cache: "OrderedDict[str, Any]" = OrderedDict()
+        self.cache_stats = {"hits": 0, "misses": 0}
+    
+    async def index_chunks(self, context_id: str, chunks: List[Any], batch_size: int = 64) -> int:
+        """
+        Embed chunks and add them to the vector store and the lexical index.
+        
+        Args:
+            context_id: Context/collection to index into
+            chunks: DocumentChunk objects
+            batch_size: Chunks embedded and inserted per call
+        
+        Returns:
+            Number of chunks indexed
+        """
+        for i in range(0, len(chunks), batch_size):
+            batch = chunks[i:i + batch_size]
+            texts = [chunk.text for chunk in batch]
+            ids = [chunk.chunk_id for chunk in batch]
+            metadata = [{**chunk.metadata, "document_id": chunk.document_id} for chunk in batch]
+            result = await self.embedding_service.generate_embeddings(texts=texts, normalize=True)
+            await self.vector_store.insert(
+                collection_name=context_id,
+                vectors=result["embeddings"],
+                texts=texts,
+                metadata=metadata,
+                ids=ids
+            )
+            self.lexical_index.insert(context_id, texts, metadata, ids)
+        return len(chunks)
     
     async def retrieve(
         self,
         query: str,
         context_id: str,
         top_k: int = 5,
-        score_threshold: float = 0.7
+        score_threshold: float = 0.7,
+        mode: Optional[str] = None,
+        rerank: Optional[bool] = None,
+        timings: Optional[Dict[str, float]] = None
     ) -> List[RetrievalResult]:
         """
         Retrieve relevant document chunks.
@@ -48,40 +172,161 @@ class RAGRetriever:
             query: Search query
             context_id: Context/collection to search in
             top_k: Number of results to return
-            score_threshold: Minimum similarity score
+            score_threshold: Minimum vector similarity score (lexical hits
+                are not thresholded)
+            mode: Retrieval mode; defaults to the retriever's mode
+            rerank: Apply the reranker in hybrid mode (default: when one is set)
+            timings: Optional dict filled with per-stage latencies in ms
         
         Returns:
             List of RetrievalResult objects
         """
-        # Generate query embedding
+        mode = mode or self.mode
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {mode}")
+        timings = timings if timings is not None else {}
+        started = time.perf_counter()
+        pool = top_k if mode == "vector" else top_k * self.candidate_multiplier
+        
+        vector_hits: List[Dict[str, Any]] = []
+        if mode != "lexical":
+            t0 = time.perf_counter()
+            query_embedding = await self._embed_query(query)
+            t1 = time.perf_counter()
+            vector_hits = await self.vector_store.search(
+                collection_name=context_id,
+                query_vector=query_embedding,
+                top_k=pool,
+                score_threshold=score_threshold
+            )
+            timings["embed_ms"] = (t1 - t0) * 1000
+            timings["vector_ms"] = (time.perf_counter() - t1) * 1000
+        
+        lexical_hits: List[Dict[str, Any]] = []
+        if mode != "vector":
+            t0 = time.perf_counter()
+            lexical_hits = self.lexical_index.search(context_id, query, top_k=pool)
+            timings["lexical_ms"] = (time.perf_counter() - t0) * 1000
+        
+        if mode == "vector":
+            results = [self._to_result(hit, hit["score"], {"vector": hit["score"]}) for hit in vector_hits]
+        elif mode == "lexical":
+            results = [self._to_result(hit, hit["score"], {"lexical": hit["score"]}) for hit in lexical_hits]
+        else:
+            t0 = time.perf_counter()
+            lexical_weight = self.lexical_weight
+            if has_identifier(query):
+                lexical_weight *= self.identifier_boost
+            results = self._fuse(vector_hits, lexical_hits, lexical_weight)
+            timings["fusion_ms"] = (time.perf_counter() - t0) * 1000
+            if rerank is None:
+                rerank = self.reranker is not None
+            if rerank and self.reranker is not None and results:
+                t0 = time.perf_counter()
+                results = await self._rerank(query, results)
+                timings["rerank_ms"] = (time.perf_counter() - t0) * 1000
+        
+        timings["total_ms"] = (time.perf_counter() - started) * 1000
+        return results[:top_k]
+    
+    def clear_query_cache(self):
+        """Drop cached query embeddings, e.g. after switching embedding models."""
+        self._query_cache.clear()
+    
+    async def _embed_query(self, query: str):
+        """Embed a query through the LRU cache."""
+        key = " ".join(query.split())
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            self._query_cache.move_to_end(key)
+            self.cache_stats["hits"] += 1
+            return cached
+        
+        self.cache_stats["misses"] += 1
         query_result = await self.embedding_service.generate_embeddings(
-            texts=[query],
+            texts=[key],
             normalize=True
         )
-        query_embedding = query_result["embeddings"][0]
+        embedding = query_result["embeddings"][0]
+        if self.query_cache_size > 0:
+            self._query_cache[key] = embedding
+            if len(self._query_cache) > self.query_cache_size:
+                self._query_cache.popitem(last=False)
+        return embedding
+    
+    def _fuse(
+        self,
+        vector_hits: List[Dict[str, Any]],
+        lexical_hits: List[Dict[str, Any]],
+        lexical_weight: float
+    ) -> List[RetrievalResult]:
+        """Weighted fusion of the two rankings."""
+        fused: Dict[str, RetrievalResult] = {}
+        for source, hits, weight in (
+            ("vector", vector_hits, self.vector_weight),
+            ("lexical", lexical_hits, lexical_weight)
+        ):
+            if not hits:
+                continue
+            high = max(hit["score"] for hit in hits)
+            low = min(hit["score"] for hit in hits)
+            for rank, hit in enumerate(hits, 1):
+                if self.fusion == "rrf":
+                    contribution = weight / (self.rrf_k + rank)
+                else:
+                    contribution = weight * ((hit["score"] - low) / (high - low) if high > low else 1.0)
+                result = fused.get(hit["id"])
+                if result is None:
+                    result = fused[hit["id"]] = self._to_result(hit, 0.0, {})
+                result.score += contribution
+                result.scores[source] = hit["score"]
+        return sorted(fused.values(), key=lambda r: r.score, reverse=True)
+    
+    async def _rerank(self, query: str, results: List[RetrievalResult]) -> List[RetrievalResult]:
+        """
+        Rerank the head of the fused list in batches until the budget runs out.
         
-        # Search vector store
-        results = await self.vector_store.search(
-            collection_name=context_id,
-            query_vector=query_embedding,
-            top_k=top_k,
-            score_threshold=score_threshold
-        )
+        Scoring runs in the default executor so the event loop stays free.
+        """
+        loop = asyncio.get_running_loop()
+        head = results[:self.rerank_candidates]
+        deadline = time.perf_counter() + self.rerank_budget_ms / 1000
+        batch_s = 0.0
+        scored: List[RetrievalResult] = []
         
-        # Convert to RetrievalResult
-        retrieval_results = []
-        for result in results:
-            retrieval_results.append(
-                RetrievalResult(
-                    chunk_id=result["id"],
-                    document_id=result["metadata"].get("document_id", "unknown"),
-                    text=result["text"],
-                    score=result["score"],
-                    metadata=result["metadata"]
+        for i in range(0, len(head), self.rerank_batch_size):
+            remaining = deadline - time.perf_counter()
+            if remaining <= batch_s:
+                break
+            batch = head[i:i + self.rerank_batch_size]
+            t0 = time.perf_counter()
+            try:
+                scores = await asyncio.wait_for(
+                    loop.run_in_executor(None, self.reranker.score, query, [r.text for r in batch]),
+                    timeout=remaining
                 )
-            )
+            except asyncio.TimeoutError:
+                break
+            batch_s = max(batch_s, time.perf_counter() - t0)
+            for result, score in zip(batch, scores):
+                result.scores["rerank"] = float(score)
+                scored.append(result)
         
-        return retrieval_results
+        if not scored:
+            return results
+        scored.sort(key=lambda r: r.scores["rerank"], reverse=True)
+        return scored + results[len(scored):]
+    
+    @staticmethod
+    def _to_result(hit: Dict[str, Any], score: float, scores: Dict[str, float]) -> RetrievalResult:
+        return RetrievalResult(
+            chunk_id=hit["id"],
+            document_id=hit["metadata"].get("document_id", "unknown"),
+            text=hit["text"],
+            score=score,
+            metadata=hit["metadata"],
+            scores=scores
+        )
     
     def format_context(self, results: List[RetrievalResult]) -> str:
         """
@@ -110,7 +355,8 @@ class RAGRetriever:
         query: str,
         context_id: str,
         top_k: int = 5,
-        score_threshold: float = 0.7
+        score_threshold: float = 0.7,
+        mode: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Retrieve and format context in one call.
@@ -126,7 +372,8 @@ class RAGRetriever:
             query=query,
             context_id=context_id,
             top_k=top_k,
-            score_threshold=score_threshold
+            score_threshold=score_threshold,
+            mode=mode
         )
         
         formatted_context = self.format_context(results)
@@ -0,0 +1,141 @@
+"""
+Tests for the streaming document chunker.
+"""
+
+import random
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from document_processor import DocumentProcessor, TokenCounter
+
+
+def make_manual(sections: int = 12, seed: int = 0) -> str:
+    """Maintenance-manual-like text with headings, steps and odd whitespace."""
+    rng = random.Random(seed)
+    words = "remove the bolt torque actuator hydraulic line inspect seal for cracks and wear".split()
+    parts = ["Front matter for the  landing gear manual.\n\n"]
+    for s in range(sections):
+        parts.append(f"{32 - s % 3}.{s} Main Gear Task {s}\n")
+        for _ in range(rng.randint(1, 6)):
+            sentences = [" ".join(rng.choice(words) for _ in range(rng.randint(4, 30))).capitalize() + rng.choice(".!?")
+                         for _ in range(rng.randint(1, 12))]
+            parts.append(" ".join(sentences) + rng.choice(["\n\n", "\n \n", "\n\n\n"]))
+        if s % 4 == 0:
+            parts.append("Part number " + "X" * rng.randint(50, 900) + " applies.\n\n")
+        if s % 5 == 0:
+            parts.append("## Warning\tHydraulic\x0bpressure (3000 psi) [see 1.2].\n\n")
+    return "".join(parts) + "  \n"
+
+
+def reconstruct(source: str, chunks) -> str:
+    """Stitch the source back together from chunk spans, dropping overlaps."""
+    out, position = [], 0
+    for chunk in chunks:
+        gap = source[position:chunk.start_index]
+        assert not gap.strip(), "text between chunks was dropped"
+        span = source[chunk.start_index:chunk.end_index]
+        out.append(gap + span[max(0, position - chunk.start_index):])
+        position = max(position, chunk.end_index)
+    return "".join(out)
+
+
+def split_randomly(text: str, seed: int):
+    rng = random.Random(seed)
+    position = 0
+    while position < len(text):
+        step = rng.randint(1, 400)
+        yield text[position:position + step]
+        position += step
+
+
+class TestDocumentProcessor:
+    """Test chunk boundaries, offsets and token budgets."""
+
+    @pytest.mark.parametrize("chunk_size,overlap", [(64, 10), (128, 0), (512, 50)])
+    def test_offsets_reconstruct_source(self, chunk_size, overlap):
+        source = make_manual()
+        processor = DocumentProcessor(chunk_size=chunk_size, chunk_overlap=overlap)
+        chunks = processor.process_text(source, "dm-32")
+
+        assert chunks[0].start_index == 0
+        assert chunks[-1].end_index == len(source.rstrip())
+        for chunk in chunks:
+            assert processor._clean_text(source[chunk.start_index:chunk.end_index]) == chunk.text
+        for prev, nxt in zip(chunks, chunks[1:]):
+            # Chunks overlap or are separated only by whitespace
+            assert nxt.start_index > prev.start_index
+            assert nxt.start_index <= prev.end_index or not source[prev.end_index:nxt.start_index].strip()
+        assert reconstruct(source, chunks) == source.rstrip()
+
+    def test_streamed_pieces_match_whole_text(self):
+        source = make_manual(seed=3)
+        processor = DocumentProcessor(chunk_size=96, chunk_overlap=16)
+        whole = processor.process_text(source, "dm")
+        streamed = list(processor.iter_chunks(split_randomly(source, seed=7), "dm"))
+
+        assert [(c.start_index, c.end_index, c.text) for c in streamed] == \
+               [(c.start_index, c.end_index, c.text) for c in whole]
+        assert reconstruct(source, streamed) == source.rstrip()
+
+    def test_token_budget_and_counts(self):
+        source = make_manual(seed=1)
+        processor = DocumentProcessor(chunk_size=80, chunk_overlap=12)
+        for chunk in processor.process_text(source, "dm"):
+            raw = source[chunk.start_index:chunk.end_index]
+            assert chunk.token_count <= 80
+            # Per-unit counts sum to the count of the whole span
+            assert abs(chunk.token_count - processor.count_tokens(raw)) <= 1
+
+    def test_headings_start_chunks(self):
+        source = make_manual(seed=2)
+        processor = DocumentProcessor(chunk_size=256, chunk_overlap=20)
+        chunks = processor.process_text(source, "dm")
+        headed = [c for c in chunks if c.text[:1].isdigit() and " Main Gear Task " in c.text[:24]]
+        assert len(headed) == 12
+        for chunk in headed:
+            assert chunk.text.startswith(chunk.metadata["heading"])
+        assert chunks[-1].metadata["heading"].startswith(("30.11", "Warning"))
+
+    def test_overlap_repeats_trailing_sentences(self):
+        text = " ".join(f"Sentence number {i} is here." for i in range(200))
+        processor = DocumentProcessor(chunk_size=64, chunk_overlap=20)
+        chunks = processor.process_text(text, "doc")
+        assert len(chunks) > 3
+        for prev, nxt in zip(chunks, chunks[1:]):
+            assert nxt.start_index < prev.end_index
+            assert text[nxt.start_index:prev.end_index].endswith(".")
+
+    def test_whitespace_free_stream_is_cut(self):
+        """A stream without boundaries is chunked with a bounded carry"""
+        rng = random.Random(5)
+        alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+        source = "".join(rng.choice(alphabet) for _ in range(200_000))
+        processor = DocumentProcessor(chunk_size=64, chunk_overlap=8)
+        read = []
+
+        def pieces():
+            for position in range(0, len(source), 7):
+                read.append(position)
+                yield source[position:position + 7]
+
+        chunks = processor.iter_chunks(pieces(), "b64")
+        first = next(chunks)
+        # The first chunk arrives long before the stream is consumed
+        assert read[-1] <= 64 * 16 + 7
+        chunks = [first] + list(chunks)
+        for chunk in chunks:
+            assert chunk.token_count <= 64
+            assert source[chunk.start_index:chunk.end_index] == chunk.text
+        assert reconstruct(source, chunks) == source
+
+    def test_counter_and_validation(self):
+        assert TokenCounter()("Hello world, this is a test.") == 8
+        processor = DocumentProcessor(token_counter=lambda text: len(text.split()))
+        assert processor.estimate_tokens("one two three") == 3
+        with pytest.raises(ValueError):
+            DocumentProcessor(chunk_size=64, chunk_overlap=32)
+        assert DocumentProcessor().process_text("   \n\n ", "empty") == []
@@ -0,0 +1,193 @@
+"""
+Tests for lexical, vector and hybrid retrieval.
+"""
+
+import time
+import zlib
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from document_processor import DocumentChunk
+from lexical import LexicalIndex, tokenize
+from retriever import RAGRetriever, Reranker
+
+DOCS = {
+    "c1": "Remove the main landing gear actuator. Part number MS21042-3 secures the bracket.",
+    "c2": "Inspect the nose landing gear actuator for hydraulic leaks and corrosion.",
+    "c3": "DMC-HYF-A-32-11-00-00A-520A-A describes removal of the main gear strut.",
+    "c4": "Refuel the aircraft through the pressure refuelling coupling in ATA 28-21-00.",
+    "c5": "Hydrogen tank venting procedure after a cabin pressure warning.",
+}
+
+
+class WordEmbedder:
+    """Dense stand-in that only sees alphabetic words, like a model that
+    tokenizes part numbers into meaningless pieces."""
+
+    def __init__(self, dim: int = 64):
+        self.dim = dim
+        self.calls = 0
+
+    async def generate_embeddings(self, texts, normalize=True):
+        self.calls += 1
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                word = "".join(c for c in word if c.isalpha())
+                if len(word) > 2:
+                    out[row, zlib.crc32(word.encode()) % self.dim] += 1.0
+        out /= np.maximum(np.linalg.norm(out, axis=1, keepdims=True), 1e-9)
+        return {"embeddings": out, "model": "words", "dimensions": self.dim}
+
+
+class MemoryVectorStore:
+    """Brute-force cosine VectorStoreAdapter."""
+
+    def __init__(self):
+        self.rows = {}
+
+    async def insert(self, collection_name, vectors, texts, metadata, ids=None):
+        for vec_id, vector, text, meta in zip(ids, vectors, texts, metadata):
+            self.rows.setdefault(collection_name, {})[vec_id] = (np.asarray(vector), text, meta)
+
+    async def search(self, collection_name, query_vector, top_k=10, score_threshold=None):
+        hits = []
+        for vec_id, (vector, text, meta) in self.rows.get(collection_name, {}).items():
+            score = float(np.dot(vector, query_vector))
+            if score_threshold is None or score >= score_threshold:
+                hits.append({"id": vec_id, "text": text, "metadata": meta, "score": score})
+        return sorted(hits, key=lambda h: h["score"], reverse=True)[:top_k]
+
+
+class SlowReranker(Reranker):
+    """Prefers passages mentioning 'strut'; each call takes delay_s."""
+
+    def __init__(self, delay_s: float = 0.0):
+        self.delay_s = delay_s
+        self.calls = 0
+
+    def score(self, query, texts):
+        self.calls += 1
+        time.sleep(self.delay_s)
+        return [1.0 if "strut" in text else 0.0 for text in texts]
+
+
+async def make_retriever(**kwargs) -> RAGRetriever:
+    retriever = RAGRetriever(MemoryVectorStore(), WordEmbedder(), **kwargs)
+    chunks = [DocumentChunk(text=text, metadata={}, chunk_id=cid, document_id=f"dm-{cid}",
+                            start_index=0, end_index=len(text)) for cid, text in DOCS.items()]
+    await retriever.index_chunks("manuals", chunks)
+    return retriever
+
+
+class TestLexicalIndex:
+    """Test BM25 scoring and identifier handling."""
+
+    def test_identifier_terms(self):
+        terms = tokenize("See ATA 32-11-00 and part MS21042-3.")
+        assert "32-11-00" in terms and "32-11" in terms and "11-00" in terms
+        assert "32-11-00" in tokenize("DMC-HYF-A-32-11-00-00A-520A-A")
+        assert "ms21042-3" in terms
+        assert "the" not in tokenize("the gear")
+
+    def test_search_replace_and_delete(self):
+        index = LexicalIndex()
+        index.insert("c", list(DOCS.values()), [{} for _ in DOCS], list(DOCS))
+        assert index.search("c", "32-11", top_k=3)[0]["id"] == "c3"
+        assert index.search("c", "ms21042-3")[0]["id"] == "c1"
+
+        index.insert("c", ["Part number MS21042-3 replaced."], [{}], ["c4"])
+        assert {hit["id"] for hit in index.search("c", "ms21042-3")} == {"c1", "c4"}
+        index.delete("c", ["c1"])
+        assert [hit["id"] for hit in index.search("c", "ms21042-3")] == ["c4"]
+        assert index.search("c", "unrelated words") == []
+        assert index.get_stats("c")["document_count"] == 4
+
+    def test_replacing_documents_compacts_postings(self):
+        index = LexicalIndex()
+        for round_ in range(50):
+            texts = [f"Torque bolt {i} revision r{round_} to spec." for i in range(10)]
+            index.insert("c", texts, [{} for _ in texts], [f"d{i}" for i in range(10)])
+        collection = index.collections["c"]
+        assert len(collection.ids) <= 15
+        assert len(collection.postings["torque"][0]) <= 15
+        assert "r0" not in collection.postings
+        assert [hit["id"] for hit in index.search("c", "bolt 3 r49", top_k=1)] == ["d3"]
+        assert index.search("c", "r48") == []
+
+        index.delete("c", [f"d{i}" for i in range(10)])
+        assert collection.ids == [] and collection.postings == {}
+        assert index.get_stats("c") == {"collection_name": "c", "document_count": 0, "term_count": 0}
+
+
+class TestHybridRetrieval:
+    """Test fusion, reranking and the query embedding cache."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("fusion", ["score", "rrf"])
+    async def test_hybrid_finds_codes_missed_by_vectors(self, fusion):
+        retriever = await make_retriever(fusion=fusion)
+        query = "MS21042-3"
+        assert await retriever.retrieve(query, "manuals", top_k=2) == []
+        hybrid = await retriever.retrieve(query, "manuals", top_k=2, mode="hybrid")
+        assert hybrid[0].chunk_id == "c1"
+        assert hybrid[0].document_id == "dm-c1"
+        assert "lexical" in hybrid[0].scores
+
+    @pytest.mark.asyncio
+    async def test_fusion_rewards_agreement(self):
+        retriever = await make_retriever(mode="hybrid")
+        timings = {}
+        results = await retriever.retrieve("main landing gear actuator", "manuals", top_k=3,
+                                           score_threshold=None, timings=timings)
+        assert results[0].chunk_id == "c1"
+        assert set(results[0].scores) == {"vector", "lexical"}
+        assert {"embed_ms", "vector_ms", "lexical_ms", "fusion_ms", "total_ms"} <= set(timings)
+
+    @pytest.mark.asyncio
+    async def test_query_embedding_cache(self):
+        retriever = await make_retriever()
+        calls = retriever.embedding_service.calls
+        await retriever.retrieve("landing gear", "manuals")
+        await retriever.retrieve("  landing   gear ", "manuals")
+        assert retriever.embedding_service.calls == calls + 1
+        assert retriever.cache_stats == {"hits": 1, "misses": 1}
+
+    @pytest.mark.asyncio
+    async def test_rerank_reorders_head(self):
+        retriever = await make_retriever(mode="hybrid", reranker=SlowReranker())
+        results = await retriever.retrieve("main landing gear", "manuals", top_k=3, score_threshold=None)
+        assert results[0].chunk_id == "c3"
+        assert results[0].scores["rerank"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_rerank_respects_budget(self):
+        reranker = SlowReranker(delay_s=0.05)
+        retriever = await make_retriever(mode="hybrid", reranker=reranker, rerank_batch_size=1,
+                                         rerank_budget_ms=80)
+        timings = {}
+        results = await retriever.retrieve("landing gear actuator", "manuals", top_k=5,
+                                           score_threshold=None, timings=timings)
+        assert timings["rerank_ms"] < 150
+        assert 1 <= reranker.calls < 5
+        assert len(results) == 5
+        assert sum("rerank" in r.scores for r in results) == reranker.calls
+
+        unranked = await retriever.retrieve("landing gear actuator", "manuals", top_k=5,
+                                            score_threshold=None, rerank=False)
+        assert all("rerank" not in r.scores for r in unranked)
+
+    @pytest.mark.asyncio
+    async def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            RAGRetriever(MemoryVectorStore(), WordEmbedder(), mode="sparse")
+        with pytest.raises(ValueError):
+            RAGRetriever(MemoryVectorStore(), WordEmbedder(), fusion="max")
+        retriever = await make_retriever()
+        with pytest.raises(ValueError):
+            await retriever.retrieve("x", "manuals", mode="sparse")
@@ -3,7 +3,8 @@ Abstract base class for vector store adapters.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
+import asyncio
 
 
 class VectorStoreAdapter(ABC):
@@ -52,6 +53,24 @@ class VectorStoreAdapter(ABC):
         """
         pass
     
+    async def search_batch(
+        self,
+        collection_name: str,
+        query_vectors: Sequence[List[float]],
+        top_k: int = 10,
+        score_threshold: Optional[float] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search several query vectors.
+        
+        Adapters whose backend supports batched queries override this to
+        send a single request.
+        """
+        return list(await asyncio.gather(*(
+            self.search(collection_name, vector, top_k=top_k, score_threshold=score_threshold)
+            for vector in query_vectors
+        )))
+    
     @abstractmethod
     async def delete(self, collection_name: str, ids: List[str]):
         """Delete vectors by ID."""
@@ -0,0 +1,179 @@
+"""
+Qdrant ingest and search throughput benchmark.
+
+Compares the previous adapter behaviour (sync client called from async
+methods, whole list in one upsert, one request per query) with
+QdrantAdapter (async client, chunked concurrent upserts, batched search).
+Alongside each phase a 1 ms ticker measures the longest event loop stall,
+which is what other requests on the same loop would wait.
+
+Against a server the async client overlaps network round trips; in
+--memory mode everything runs in-process, so the numbers mostly show
+request overhead and the cost of blocking the loop; local mode also
+ignores payload indexes, so filtered search there is a full scan.
+
+Usage:
+    docker run -d -p 6333:6333 qdrant/qdrant
+    python bench_qdrant.py --url http://localhost:6333 --rows 100000 --dim 384 \\
+        --batch-sizes 128 512 2048 --concurrency 4 --queries 1000
+    python bench_qdrant.py --memory --rows 20000 --dim 128
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from vector.qdrant_adapter import QdrantAdapter, _point_id
+
+COLLECTION = "bench_qdrant"
+
+
+def generate_rows(n: int, dim: int, seed: int = 0):
+    """Yield synthetic S1000D-style chunks lazily."""
+    rng = random.Random(seed)
+    for i in range(n):
+        yield (
+            f"DMC-BWB-A-32-10-{i:08d}",
+            [rng.uniform(-1, 1) for _ in range(dim)],
+            f"Landing gear inspection step {i}: check torque link and retraction actuator.",
+            {"ata": f"32-{i % 40:02d}", "chunk": i, "source": "AMM"},
+        )
+
+
+class LoopMonitor:
+    """Longest gap between 1 ms ticks while active."""
+
+    def __init__(self):
+        self.max_stall_ms = 0.0
+        self._task = None
+
+    async def _tick(self):
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            self.max_stall_ms = max(self.max_stall_ms, (now - last) * 1000 - 1)
+            last = now
+
+    async def __aenter__(self):
+        self._task = asyncio.ensure_future(self._tick())
+        # Let the ticker start before the measured phase, and tick once after
+        await asyncio.sleep(0.002)
+        return self
+
+    async def __aexit__(self, *exc):
+        await asyncio.sleep(0.002)
+        self._task.cancel()
+
+
+class LegacyQdrant:
+    """The previous QdrantAdapter: sync client inside async methods."""
+
+    def __init__(self, client: QdrantClient):
+        self.client = client
+
+    async def insert(self, rows):
+        points = [PointStruct(id=_point_id(i), vector=v, payload={"text": t, **m}) for i, v, t, m in rows]
+        self.client.upsert(collection_name=COLLECTION, points=points)
+
+    async def search(self, query_vector, top_k):
+        return self.client.query_points(collection_name=COLLECTION, query=query_vector, limit=top_k).points
+
+
+async def run(args):
+    if args.memory:
+        sync_client, adapter_kwargs = QdrantClient(location=":memory:"), {"location": ":memory:"}
+    else:
+        sync_client, adapter_kwargs = QdrantClient(url=args.url), {"url": args.url}
+    rng = random.Random(1)
+    queries = [[rng.uniform(-1, 1) for _ in range(args.dim)] for _ in range(args.queries)]
+
+    print(f"{'mode':>22} {'batch':>6} {'rows/s':>9} {'max_stall_ms':>12}")
+    if args.legacy:
+        if sync_client.collection_exists(COLLECTION):
+            sync_client.delete_collection(COLLECTION)
+        sync_client.create_collection(COLLECTION, vectors_config=VectorParams(size=args.dim, distance=Distance.COSINE))
+        legacy = LegacyQdrant(sync_client)
+        rows = list(generate_rows(args.rows, args.dim))
+        async with LoopMonitor() as monitor:
+            start = time.perf_counter()
+            try:
+                await legacy.insert(rows)
+                rate = f"{args.rows / (time.perf_counter() - start):>9.0f}"
+            except Exception as e:
+                rate = f"{'failed':>9}"
+                print(f"legacy upsert failed: {e.__class__.__name__}: {str(e)[:80]}")
+        print(f"{'legacy single upsert':>22} {args.rows:>6} {rate} {monitor.max_stall_ms:>12.1f}")
+
+        async with LoopMonitor() as monitor:
+            start = time.perf_counter()
+            for query in queries:
+                await legacy.search(query, args.top_k)
+            qps = args.queries / (time.perf_counter() - start)
+        print(f"{'legacy search':>22} {'':>6} {qps:>9.0f} {monitor.max_stall_ms:>12.1f}  (queries/s)")
+
+    adapter = None
+    for batch_size in args.batch_sizes:
+        adapter = QdrantAdapter(upsert_batch_size=batch_size, max_concurrent_upserts=args.concurrency,
+                                indexed_fields={"ata": "keyword"}, **adapter_kwargs)
+        if await adapter.client.collection_exists(COLLECTION):
+            await adapter.delete_collection(COLLECTION)
+        await adapter.create_collection(COLLECTION, args.dim)
+        async with LoopMonitor() as monitor:
+            start = time.perf_counter()
+            written = await adapter.insert_stream(COLLECTION, generate_rows(args.rows, args.dim))
+            elapsed = time.perf_counter() - start
+        print(f"{'async chunked':>22} {batch_size:>6} {written / elapsed:>9.0f} {monitor.max_stall_ms:>12.1f}")
+
+    async with LoopMonitor() as monitor:
+        start = time.perf_counter()
+        for query in queries:
+            await adapter.search(COLLECTION, query, top_k=args.top_k)
+        qps = args.queries / (time.perf_counter() - start)
+    print(f"{'async search':>22} {'':>6} {qps:>9.0f} {monitor.max_stall_ms:>12.1f}  (queries/s)")
+
+    async with LoopMonitor() as monitor:
+        start = time.perf_counter()
+        for offset in range(0, len(queries), args.query_batch):
+            await adapter.search_batch(COLLECTION, queries[offset:offset + args.query_batch], top_k=args.top_k)
+        qps = args.queries / (time.perf_counter() - start)
+    print(f"{'async search_batch':>22} {args.query_batch:>6} {qps:>9.0f} {monitor.max_stall_ms:>12.1f}  (queries/s)")
+
+    async with LoopMonitor() as monitor:
+        start = time.perf_counter()
+        for query in queries:
+            await adapter.search(COLLECTION, query, top_k=args.top_k, filters={"ata": "32-07"})
+        qps = args.queries / (time.perf_counter() - start)
+    print(f"{'async filtered search':>22} {'':>6} {qps:>9.0f} {monitor.max_stall_ms:>12.1f}  (queries/s)")
+
+    await adapter.delete_collection(COLLECTION)
+    await adapter.aclose()
+    sync_client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Qdrant adapter benchmark")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="Qdrant server URL")
+    target.add_argument("--memory", action="store_true", help="use the in-process local mode")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[128, 512, 2048])
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--query-batch", type=int, default=32)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--no-legacy", dest="legacy", action="store_false")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
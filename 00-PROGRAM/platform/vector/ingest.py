@@ -0,0 +1,100 @@
+"""
+Bulk ingest helpers shared by vector store adapters.
+
+Batches row streams without materializing them and records resumable
+progress checkpoints.
+"""
+
+import json
+import os
+from dataclasses import dataclass, asdict
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+# (id, vector, text, metadata)
+IngestRow = Tuple[str, Sequence[float], str, Dict[str, Any]]
+
+
+def iter_batches(rows: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+    """Yield lists of at most batch_size rows from any iterable."""
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1")
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def dedupe_last_wins(batch: List[IngestRow]) -> List[IngestRow]:
+    """
+    Drop earlier rows that share an id with a later row in the batch.
+
+    Set-based upserts cannot touch the same key twice in one statement;
+    this keeps the row-by-row "last write wins" behaviour.
+    """
+    latest = {}
+    for row in batch:
+        latest[row[0]] = row
+    if len(latest) == len(batch):
+        return batch
+    return list(latest.values())
+
+
+@dataclass
+class IngestCheckpoint:
+    """
+    Resumable ingest progress stored as a small JSON file.
+
+    rows_committed counts input rows (in stream order) whose batch has
+    been committed. Upserts are idempotent, so a crash between a commit
+    and the checkpoint write only replays one batch.
+    """
+
+    path: str
+    collection_name: str
+    rows_committed: int = 0
+
+    @classmethod
+    def load(cls, path: str, collection_name: str) -> "IngestCheckpoint":
+        """
+        Load a checkpoint, or start a new one if the file does not exist.
+
+        Raises:
+            ValueError: If the checkpoint belongs to a different collection
+        """
+        if not os.path.exists(path):
+            return cls(path=path, collection_name=collection_name)
+
+        with open(path, "r") as f:
+            data = json.load(f)
+
+        if data.get("collection_name") != collection_name:
+            raise ValueError(
+                f"Checkpoint {path} is for collection {data.get('collection_name')}, "
+                f"not {collection_name}"
+            )
+        return cls(path=path, collection_name=collection_name,
+                   rows_committed=int(data.get("rows_committed", 0)))
+
+    def advance(self, rows: int):
+        """Record rows as committed and persist atomically."""
+        self.rows_committed += rows
+        tmp_path = f"{self.path}.tmp"
+        data = asdict(self)
+        del data["path"]
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """Remove the checkpoint file after a completed ingest."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def open_checkpoint(path: Optional[str], collection_name: str) -> Optional[IngestCheckpoint]:
+    """Load a checkpoint if a path is given."""
+    return IngestCheckpoint.load(path, collection_name) if path else None
@@ -2,7 +2,11 @@
 PostgreSQL with pgvector adapter.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Sequence, Tuple
+from itertools import islice
+import io
+import json
+import time
 import uuid
 from sqlalchemy import create_engine, Column, String, Text, Integer, JSON
 from sqlalchemy.ext.declarative import declarative_base
@@ -10,11 +14,75 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.sql import text
 
 from .base import VectorStoreAdapter
+from .ingest import IngestRow, iter_batches, dedupe_last_wins, open_checkpoint
 
 
 Base = declarative_base()
 
 
+def _vector_literal(vec: Sequence[float]) -> str:
+    """Format a vector as a pgvector text literal."""
+    if hasattr(vec, "tolist"):
+        vec = vec.tolist()
+    return "[" + ",".join(map(str, vec)) + "]"
+
+
+def _copy_escape(value: str) -> str:
+    """Escape a value for PostgreSQL COPY text format."""
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _copy_line(row: IngestRow) -> str:
+    """Render one (id, vector, text, metadata) row as a COPY text line."""
+    vec_id, vec, txt, meta = row
+    meta_str = _copy_escape(json.dumps(meta)) if meta is not None else "\\N"
+    return f"{_copy_escape(str(vec_id))}\t{_copy_escape(txt)}\t{_vector_literal(vec)}\t{meta_str}\n"
+
+
+def _build_where(
+    filters: Optional[Dict[str, Any]],
+    score_threshold: Optional[float]
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    SQL WHERE clause and bind parameters for a filtered vector search.
+
+    Filters use the same shape as QdrantAdapter: {field: value} is a JSONB
+    containment test (served by the GIN metadata index), a list matches any
+    of its values, and a dict with gt/gte/lt/lte compares numerically. The
+    score threshold becomes a distance bound so it is applied during the
+    index scan rather than after LIMIT.
+    """
+    clauses, params = [], {}
+    for n, (key, value) in enumerate((filters or {}).items()):
+        if isinstance(value, dict):
+            ops = {"gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+            unknown = set(value) - set(ops)
+            if unknown:
+                raise ValueError(f"Unknown range operator(s) for {key}: {sorted(unknown)}")
+            params[f"f{n}_key"] = key
+            for op, bound in value.items():
+                clauses.append(f"(metadata->>:f{n}_key)::numeric {ops[op]} :f{n}_{op}")
+                params[f"f{n}_{op}"] = bound
+        elif isinstance(value, (list, tuple, set)):
+            options = []
+            for m, option in enumerate(value):
+                options.append(f"metadata @> CAST(:f{n}_{m} AS jsonb)")
+                params[f"f{n}_{m}"] = json.dumps({key: option})
+            clauses.append("(" + " OR ".join(options) + ")" if options else "FALSE")
+        else:
+            clauses.append(f"metadata @> CAST(:f{n} AS jsonb)")
+            params[f"f{n}"] = json.dumps({key: value})
+    if score_threshold is not None:
+        clauses.append("(embedding <=> CAST(:query_vector AS vector)) <= :max_distance")
+        params["max_distance"] = 1.0 - score_threshold
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
 class PgVectorAdapter(VectorStoreAdapter):
     """
     Adapter for PostgreSQL with pgvector extension.
@@ -22,20 +90,42 @@ class PgVectorAdapter(VectorStoreAdapter):
     Requires pgvector extension to be installed in the database.
     """
     
-    def __init__(self, connection_url: str):
+    def __init__(
+        self,
+        connection_url: str,
+        *,
+        hnsw_m: int = 16,
+        hnsw_ef_construction: int = 200,
+        ef_search: Optional[int] = None
+    ):
         """
         Initialize pgvector adapter.
         
         Args:
             connection_url: PostgreSQL connection URL
+            hnsw_m: Default HNSW graph degree for new collections
+            hnsw_ef_construction: Default HNSW build candidate list size
+            ef_search: Default HNSW query candidate list size (None keeps
+                the server setting, 40 unless configured)
         """
         self.engine = create_engine(connection_url)
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.ef_search = ef_search
         
         # Ensure pgvector extension is enabled
         with self.engine.connect() as conn:
             conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
             conn.commit()
+            version = conn.execute(
+                text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+            ).scalar()
+        
+        # Iterative index scans (pgvector 0.8+) keep filtered queries from
+        # coming back short when the filter rejects most of ef_search
+        self.pgvector_version = tuple(int(p) for p in (version or "0").split(".") if p.isdigit())
+        self.iterative_scan = self.pgvector_version >= (0, 8)
     
     async def create_collection(
         self,
@@ -43,9 +133,16 @@ class PgVectorAdapter(VectorStoreAdapter):
         dimension: int,
         metadata: Optional[Dict[str, Any]] = None
     ):
-        """Create a new table for vector storage."""
+        """
+        Create a new table for vector storage.
+        
+        metadata may carry "hnsw_m" and "hnsw_ef_construction" to override
+        the adapter's index build parameters for this collection.
+        """
         # Sanitize collection name
         safe_name = collection_name.replace("-", "_").replace(".", "_")
+        m = int((metadata or {}).get("hnsw_m", self.hnsw_m))
+        ef_construction = int((metadata or {}).get("hnsw_ef_construction", self.hnsw_ef_construction))
         
         with self.engine.connect() as conn:
             # Create table
@@ -64,7 +161,14 @@ class PgVectorAdapter(VectorStoreAdapter):
                 CREATE INDEX IF NOT EXISTS {safe_name}_embedding_idx 
                 ON {safe_name} 
                 USING hnsw (embedding vector_cosine_ops)
-                WITH (m = 16, ef_construction = 200)
+                WITH (m = {m}, ef_construction = {ef_construction})
+            """))
+            
+            # Create index for metadata filtering
+            conn.execute(text(f"""
+                CREATE INDEX IF NOT EXISTS {safe_name}_metadata_idx
+                ON {safe_name}
+                USING gin (metadata jsonb_path_ops)
             """))
             
             conn.commit()
@@ -83,92 +187,240 @@ class PgVectorAdapter(VectorStoreAdapter):
         vectors: List[List[float]],
         texts: List[str],
         metadata: List[Dict[str, Any]],
-        ids: Optional[List[str]] = None
-    ):
-        """Insert vectors into collection."""
-        safe_name = collection_name.replace("-", "_").replace(".", "_")
+        ids: Optional[List[str]] = None,
+        *,
+        batch_size: int = 5000,
+        checkpoint_path: Optional[str] = None
+    ) -> int:
+        """
+        Insert vectors into collection.
         
+        Rows are bulk loaded in batches; see insert_stream.
+        
+        Returns:
+            Number of rows written by this call
+        """
         if ids is None:
             ids = [str(uuid.uuid4()) for _ in vectors]
         
-        with self.engine.connect() as conn:
-            for i, (vec, txt, meta, vec_id) in enumerate(zip(vectors, texts, metadata, ids)):
-                # Convert vector to string format for pgvector
-                vec_str = "[" + ",".join(str(x) for x in vec) + "]"
+        return await self.insert_stream(
+            collection_name,
+            zip(ids, vectors, texts, metadata),
+            batch_size=batch_size,
+            checkpoint_path=checkpoint_path
+        )
+    
+    async def insert_stream(
+        self,
+        collection_name: str,
+        rows: Iterable[IngestRow],
+        *,
+        batch_size: int = 5000,
+        checkpoint_path: Optional[str] = None
+    ) -> int:
+        """
+        Bulk upsert a stream of (id, vector, text, metadata) rows.
+        
+        Each batch is COPY'd into a session-local staging table and merged
+        with a single INSERT ... ON CONFLICT, then committed. Metadata is
+        stored as real JSONB so it can be filtered. Rows are consumed
+        lazily, so arbitrarily large corpora stream in constant memory.
+        
+        Args:
+            collection_name: Target collection
+            rows: Iterable of (id, vector, text, metadata) tuples
+            batch_size: Rows per COPY/commit
+            checkpoint_path: Optional JSON checkpoint file. Committed rows
+                are recorded after each batch; re-running with the same
+                rows and path skips them. The file is removed on success.
+        
+        Returns:
+            Number of rows written by this call (ids repeated within a
+            batch count once)
+        """
+        safe_name = collection_name.replace("-", "_").replace(".", "_")
+        stage_name = f"{safe_name}_stage"
+        
+        checkpoint = open_checkpoint(checkpoint_path, collection_name)
+        if checkpoint and checkpoint.rows_committed:
+            rows = islice(rows, checkpoint.rows_committed, None)
+        
+        written = 0
+        conn = self.engine.raw_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                CREATE TEMP TABLE IF NOT EXISTS {stage_name} (
+                    id VARCHAR(100),
+                    text TEXT,
+                    embedding TEXT,
+                    metadata TEXT
+                ) ON COMMIT DELETE ROWS
+            """)
+            conn.commit()
+            
+            for batch in iter_batches(rows, batch_size):
+                deduped = dedupe_last_wins(batch)
+                buffer = io.StringIO()
+                buffer.writelines(_copy_line(row) for row in deduped)
+                buffer.seek(0)
                 
-                conn.execute(
-                    text(f"""
-                        INSERT INTO {safe_name} (id, text, embedding, metadata)
-                        VALUES (:id, :text, :embedding::vector, :metadata::jsonb)
-                        ON CONFLICT (id) DO UPDATE
-                        SET text = EXCLUDED.text,
-                            embedding = EXCLUDED.embedding,
-                            metadata = EXCLUDED.metadata
-                    """),
-                    {
-                        "id": vec_id,
-                        "text": txt,
-                        "embedding": vec_str,
-                        "metadata": str(meta)
-                    }
+                cursor.copy_expert(
+                    f"COPY {stage_name} (id, text, embedding, metadata) FROM STDIN",
+                    buffer
                 )
+                cursor.execute(f"""
+                    INSERT INTO {safe_name} (id, text, embedding, metadata)
+                    SELECT id, text, embedding::vector, metadata::jsonb
+                    FROM {stage_name}
+                    ON CONFLICT (id) DO UPDATE
+                    SET text = EXCLUDED.text,
+                        embedding = EXCLUDED.embedding,
+                        metadata = EXCLUDED.metadata
+                """)
+                conn.commit()
+                
+                written += len(deduped)
+                if checkpoint:
+                    checkpoint.advance(len(batch))
             
-            conn.commit()
+            if checkpoint:
+                checkpoint.clear()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        
+        return written
     
     async def search(
         self,
         collection_name: str,
         query_vector: List[float],
         top_k: int = 10,
-        score_threshold: Optional[float] = None
+        score_threshold: Optional[float] = None,
+        *,
+        filters: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None,
+        exact: bool = False
     ) -> List[Dict[str, Any]]:
-        """Search for similar vectors using cosine similarity."""
+        """
+        Search for similar vectors using cosine similarity.
+        
+        Metadata filters and the score threshold run inside the query, so
+        top_k rows that pass them are returned when they exist.
+        
+        Args:
+            filters: Optional metadata filters, e.g. {"ata": "32-11"},
+                {"source": ["AMM", "CMM"]} or {"chunk": {"gte": 10}}
+            ef_search: HNSW candidate list size for this query; higher
+                trades latency for recall (raised to top_k if smaller)
+            exact: Skip the index and scan every row (ground truth)
+        """
         safe_name = collection_name.replace("-", "_").replace(".", "_")
-        vec_str = "[" + ",".join(str(x) for x in query_vector) + "]"
+        where, params = _build_where(filters, score_threshold)
+        params.update({"query_vector": _vector_literal(query_vector), "top_k": top_k})
         
         query = f"""
             SELECT 
                 id,
                 text,
                 metadata,
-                1 - (embedding <=> :query_vector::vector) as score
-            FROM {safe_name}
-            ORDER BY embedding <=> :query_vector::vector
+                1 - (embedding <=> CAST(:query_vector AS vector)) as score
+            FROM {safe_name}{where}
+            ORDER BY embedding <=> CAST(:query_vector AS vector)
             LIMIT :top_k
         """
         
-        with self.engine.connect() as conn:
-            result = conn.execute(
-                text(query),
-                {"query_vector": vec_str, "top_k": top_k}
-            )
+        # SET LOCAL only lasts for this transaction
+        with self.engine.begin() as conn:
+            for setting in self._search_settings(top_k, ef_search, exact, bool(where)):
+                conn.execute(text(setting))
+            result = conn.execute(text(query), params)
             
-            results = []
-            for row in result:
-                score = float(row[3])
-                
-                # Apply score threshold if specified
-                if score_threshold and score < score_threshold:
-                    continue
-                
-                results.append({
+            return [
+                {
                     "id": row[0],
                     "text": row[1],
                     "metadata": row[2] if row[2] else {},
-                    "score": score
-                })
-            
-            return results
+                    "score": float(row[3])
+                }
+                for row in result
+            ]
+    
+    def _search_settings(self, top_k: int, ef_search: Optional[int], exact: bool, filtered: bool) -> List[str]:
+        if exact:
+            return ["SET LOCAL enable_indexscan = off"]
+        settings = []
+        ef_search = ef_search if ef_search is not None else self.ef_search
+        if ef_search is not None:
+            settings.append(f"SET LOCAL hnsw.ef_search = {max(int(ef_search), top_k)}")
+        if filtered and self.iterative_scan:
+            settings.append("SET LOCAL hnsw.iterative_scan = strict_order")
+        return settings
     
-    async def delete(self, collection_name: str, ids: List[str]):
-        """Delete vectors by ID."""
+    async def measure_recall(
+        self,
+        collection_name: str,
+        query_vectors: Sequence[List[float]],
+        top_k: int = 10,
+        ef_search_values: Sequence[int] = (16, 40, 100, 200, 400),
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Recall@top_k and latency of HNSW search against exact search.
+        
+        Returns:
+            One dict per ef_search value (plus "exact"): ef_search, recall,
+            mean_results, p50_ms, p95_ms
+        """
+        truth, exact_ms = [], []
+        for vector in query_vectors:
+            start = time.perf_counter()
+            hits = await self.search(collection_name, vector, top_k, filters=filters, exact=True)
+            exact_ms.append((time.perf_counter() - start) * 1000)
+            truth.append({hit["id"] for hit in hits})
+        
+        def summary(ef, recalls, counts, latencies):
+            latencies = sorted(latencies)
+            return {
+                "ef_search": ef,
+                "recall": sum(recalls) / len(recalls) if recalls else 0.0,
+                "mean_results": sum(counts) / len(counts) if counts else 0.0,
+                "p50_ms": latencies[len(latencies) // 2] if latencies else 0.0,
+                "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else 0.0
+            }
+        
+        rows = []
+        for ef in ef_search_values:
+            recalls, counts, latencies = [], [], []
+            for vector, expected in zip(query_vectors, truth):
+                start = time.perf_counter()
+                hits = await self.search(collection_name, vector, top_k, filters=filters, ef_search=ef)
+                latencies.append((time.perf_counter() - start) * 1000)
+                counts.append(len(hits))
+                if expected:
+                    recalls.append(len(expected & {hit["id"] for hit in hits}) / len(expected))
+            rows.append(summary(ef, recalls, counts, latencies))
+        rows.append(summary("exact", [1.0] * len(truth), [len(t) for t in truth], exact_ms))
+        return rows
+    
+    async def delete(
+        self,
+        collection_name: str,
+        ids: List[str],
+        *,
+        batch_size: int = 10000
+    ):
+        """Delete vectors by ID with one set-based statement per batch."""
         safe_name = collection_name.replace("-", "_").replace(".", "_")
         
         with self.engine.connect() as conn:
-            for vec_id in ids:
+            for batch in iter_batches(ids, batch_size):
                 conn.execute(
-                    text(f"DELETE FROM {safe_name} WHERE id = :id"),
-                    {"id": vec_id}
+                    text(f"DELETE FROM {safe_name} WHERE id = ANY(:ids)"),
+                    {"ids": batch}
                 )
             conn.commit()
     
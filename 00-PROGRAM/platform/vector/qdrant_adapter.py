@@ -2,122 +2,383 @@
 Qdrant vector database adapter.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Sequence
+from itertools import islice
+import asyncio
 import uuid
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import (
+    Batch, Distance, FieldCondition, Filter, MatchAny, MatchValue, PayloadSchemaType,
+    PointIdsList, QueryRequest, Range, VectorParams
+)
 
 from .base import VectorStoreAdapter
+from .ingest import IngestRow, iter_batches, dedupe_last_wins, open_checkpoint
+
+
+# Payload key holding the caller's id when it is not a valid Qdrant point id
+_ID_KEY = "_id"
+
+_SCHEMA_TYPES = {
+    "keyword": PayloadSchemaType.KEYWORD,
+    "integer": PayloadSchemaType.INTEGER,
+    "float": PayloadSchemaType.FLOAT,
+    "bool": PayloadSchemaType.BOOL,
+    "text": PayloadSchemaType.TEXT,
+    "datetime": PayloadSchemaType.DATETIME,
+}
+
+
+def _point_id(vec_id) -> Any:
+    """
+    Qdrant point id for a caller id.
+
+    Qdrant accepts unsigned integers and UUIDs only; other ids (chunk ids,
+    DMC strings) map to a deterministic UUIDv5 so re-inserts still upsert.
+    """
+    if isinstance(vec_id, int) and vec_id >= 0:
+        return vec_id
+    try:
+        return str(uuid.UUID(str(vec_id)))
+    except ValueError:
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, str(vec_id)))
+
+
+def _build_filter(filters: Optional[Dict[str, Any]]) -> Optional[Filter]:
+    """
+    Translate {field: value} metadata filters into a Qdrant filter.
+
+    A list matches any of its values; a dict with gt/gte/lt/lte is a range.
+    """
+    if not filters:
+        return None
+    conditions = []
+    for key, value in filters.items():
+        if isinstance(value, dict):
+            conditions.append(FieldCondition(key=key, range=Range(**value)))
+        elif isinstance(value, (list, tuple, set)):
+            conditions.append(FieldCondition(key=key, match=MatchAny(any=list(value))))
+        else:
+            conditions.append(FieldCondition(key=key, match=MatchValue(value=value)))
+    return Filter(must=conditions)
+
+
+def _to_result(point) -> Dict[str, Any]:
+    payload = dict(point.payload or {})
+    text = payload.pop("text", "")
+    vec_id = payload.pop(_ID_KEY, None)
+    return {
+        "id": vec_id if vec_id is not None else str(point.id),
+        "text": text,
+        "metadata": payload,
+        "score": point.score
+    }
 
 
 class QdrantAdapter(VectorStoreAdapter):
     """
     Adapter for Qdrant vector database.
+
+    Uses the native async client, so no call blocks the event loop. Inserts
+    are split into batches upserted concurrently, and multi-query search
+    goes out as one batched request.
     """
-    
-    def __init__(self, host: str = "localhost", port: int = 6333):
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6333,
+        *,
+        url: Optional[str] = None,
+        location: Optional[str] = None,
+        api_key: Optional[str] = None,
+        prefer_grpc: bool = False,
+        timeout: int = 60,
+        upsert_batch_size: int = 256,
+        max_concurrent_upserts: int = 4,
+        indexed_fields: Optional[Dict[str, str]] = None,
+        client: Optional[AsyncQdrantClient] = None
+    ):
         """
         Initialize Qdrant adapter.
-        
+
         Args:
             host: Qdrant server host
             port: Qdrant server port
+            url: Full server URL (overrides host/port)
+            location: ":memory:" for an in-process store (tests, benchmarks)
+            api_key: Qdrant Cloud API key
+            prefer_grpc: Use gRPC instead of REST
+            timeout: Request timeout in seconds
+            upsert_batch_size: Points per upsert request
+            max_concurrent_upserts: Upsert requests in flight per insert
+            indexed_fields: Metadata fields to index on every new
+                collection, mapped to a schema type (keyword, integer,
+                float, bool, text, datetime)
+            client: Preconfigured AsyncQdrantClient
         """
-        self.client = QdrantClient(host=host, port=port)
-    
+        if upsert_batch_size < 1 or max_concurrent_upserts < 1:
+            raise ValueError("upsert_batch_size and max_concurrent_upserts must be >= 1")
+        if client is not None:
+            self.client = client
+        elif location is not None:
+            self.client = AsyncQdrantClient(location=location)
+        else:
+            self.client = AsyncQdrantClient(
+                url=url,
+                host=None if url else host,
+                port=port,
+                api_key=api_key,
+                prefer_grpc=prefer_grpc,
+                timeout=timeout
+            )
+        self.upsert_batch_size = upsert_batch_size
+        self.max_concurrent_upserts = max_concurrent_upserts
+        self.indexed_fields = dict(indexed_fields or {})
+
     async def create_collection(
         self,
         collection_name: str,
         dimension: int,
         metadata: Optional[Dict[str, Any]] = None
     ):
-        """Create a new Qdrant collection."""
-        self.client.create_collection(
+        """
+        Create a new Qdrant collection.
+
+        metadata may carry "indexed_fields" ({field: schema type}) to index
+        in addition to the adapter defaults.
+        """
+        await self.client.create_collection(
             collection_name=collection_name,
             vectors_config=VectorParams(
                 size=dimension,
                 distance=Distance.COSINE
             )
         )
-    
+        fields = {**self.indexed_fields, **((metadata or {}).get("indexed_fields") or {})}
+        await asyncio.gather(*(
+            self.create_payload_index(collection_name, field_name, schema)
+            for field_name, schema in fields.items()
+        ))
+
+    async def create_payload_index(self, collection_name: str, field_name: str, schema: str = "keyword"):
+        """Index a metadata field so filtered search does not scan payloads."""
+        if schema not in _SCHEMA_TYPES:
+            raise ValueError(f"Unknown payload schema: {schema}")
+        await self.client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field_name,
+            field_schema=_SCHEMA_TYPES[schema],
+            wait=True
+        )
+
     async def delete_collection(self, collection_name: str):
         """Delete a Qdrant collection."""
-        self.client.delete_collection(collection_name=collection_name)
-    
+        await self.client.delete_collection(collection_name=collection_name)
+
     async def insert(
         self,
         collection_name: str,
         vectors: List[List[float]],
         texts: List[str],
         metadata: List[Dict[str, Any]],
-        ids: Optional[List[str]] = None
-    ):
-        """Insert vectors into Qdrant collection."""
+        ids: Optional[List[str]] = None,
+        *,
+        checkpoint_path: Optional[str] = None
+    ) -> int:
+        """
+        Insert vectors into Qdrant collection.
+
+        Points are upserted in batches; see insert_stream.
+
+        Returns:
+            Number of points written by this call
+        """
         if ids is None:
             ids = [str(uuid.uuid4()) for _ in vectors]
-        
-        points = []
-        for vec_id, vector, text, meta in zip(ids, vectors, texts, metadata):
-            payload = {
-                "text": text,
-                **meta
-            }
-            
-            points.append(
-                PointStruct(
-                    id=vec_id,
-                    vector=vector,
-                    payload=payload
-                )
-            )
-        
-        self.client.upsert(
+
+        return await self.insert_stream(
+            collection_name,
+            zip(ids, vectors, texts, metadata),
+            checkpoint_path=checkpoint_path
+        )
+
+    async def insert_stream(
+        self,
+        collection_name: str,
+        rows: Iterable[IngestRow],
+        *,
+        checkpoint_path: Optional[str] = None
+    ) -> int:
+        """
+        Upsert a stream of (id, vector, text, metadata) rows.
+
+        Rows are cut into batches of upsert_batch_size and up to
+        max_concurrent_upserts batches are in flight at once. Rows are
+        consumed lazily, so memory stays bounded by the batches in flight.
+        Within a batch the last row for an id wins; an id repeated in
+        different concurrent batches may resolve to either row, so use
+        max_concurrent_upserts=1 when the stream relies on ordering.
+
+        Args:
+            collection_name: Target collection
+            rows: Iterable of (id, vector, text, metadata) tuples
+            checkpoint_path: Optional JSON checkpoint file. The contiguous
+                prefix of acknowledged rows is recorded as batches finish;
+                re-running with the same rows and path skips it. The file
+                is removed on success.
+
+        Returns:
+            Number of points written by this call
+        """
+        checkpoint = open_checkpoint(checkpoint_path, collection_name)
+        if checkpoint and checkpoint.rows_committed:
+            rows = islice(rows, checkpoint.rows_committed, None)
+
+        written = 0
+        # Batches finish out of order; the checkpoint only advances over
+        # the contiguous prefix of finished batches
+        finished: Dict[int, int] = {}
+        next_to_record = 0
+        in_flight = set()
+
+        async def upsert(number: int, batch: List[IngestRow]):
+            await self._upsert_batch(collection_name, dedupe_last_wins(batch))
+            return number, len(batch)
+
+        def record(task):
+            nonlocal written, next_to_record
+            number, count = task.result()
+            written += count
+            finished[number] = count
+            while next_to_record in finished:
+                if checkpoint:
+                    checkpoint.advance(finished[next_to_record])
+                del finished[next_to_record]
+                next_to_record += 1
+
+        try:
+            for number, batch in enumerate(iter_batches(rows, self.upsert_batch_size)):
+                if len(in_flight) >= self.max_concurrent_upserts:
+                    done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        record(task)
+                in_flight.add(asyncio.ensure_future(upsert(number, batch)))
+            if in_flight:
+                done, _ = await asyncio.wait(in_flight)
+                in_flight = set()
+                for task in done:
+                    record(task)
+        except BaseException:
+            for task in in_flight:
+                task.cancel()
+            raise
+
+        if checkpoint:
+            checkpoint.clear()
+        return written
+
+    async def _upsert_batch(self, collection_name: str, batch: List[IngestRow]):
+        point_ids, vectors, payloads = [], [], []
+        for vec_id, vector, text, meta in batch:
+            point_id = _point_id(vec_id)
+            payload = {"text": text, **(meta or {})}
+            if str(point_id) != str(vec_id):
+                payload[_ID_KEY] = vec_id
+            point_ids.append(point_id)
+            vectors.append(self._vector(vector))
+            payloads.append(payload)
+
+        await self.client.upsert(
             collection_name=collection_name,
-            points=points
+            points=Batch(ids=point_ids, vectors=vectors, payloads=payloads),
+            wait=True
         )
-    
+
     async def search(
         self,
         collection_name: str,
         query_vector: List[float],
         top_k: int = 10,
-        score_threshold: Optional[float] = None
+        score_threshold: Optional[float] = None,
+        filters: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
-        """Search for similar vectors in Qdrant."""
-        search_result = self.client.search(
+        """
+        Search for similar vectors in Qdrant.
+
+        Args:
+            filters: Optional metadata filters, e.g. {"ata": "32-11"},
+                {"source": ["AMM", "CMM"]} or {"chunk": {"gte": 10}}
+        """
+        response = await self.client.query_points(
             collection_name=collection_name,
-            query_vector=query_vector,
+            query=self._vector(query_vector),
+            query_filter=_build_filter(filters),
             limit=top_k,
-            score_threshold=score_threshold
+            score_threshold=score_threshold,
+            with_payload=True
         )
-        
-        results = []
-        for hit in search_result:
-            payload = hit.payload
-            text = payload.pop("text", "")
-            
-            results.append({
-                "id": str(hit.id),
-                "text": text,
-                "metadata": payload,
-                "score": hit.score
-            })
-        
-        return results
-    
-    async def delete(self, collection_name: str, ids: List[str]):
-        """Delete vectors by ID from Qdrant."""
-        self.client.delete(
+
+        return [_to_result(point) for point in response.points]
+
+    async def search_batch(
+        self,
+        collection_name: str,
+        query_vectors: Sequence[List[float]],
+        top_k: int = 10,
+        score_threshold: Optional[float] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Search several query vectors in one request."""
+        if len(query_vectors) == 0:
+            return []
+        query_filter = _build_filter(filters)
+        responses = await self.client.query_batch_points(
             collection_name=collection_name,
-            points_selector=ids
+            requests=[
+                QueryRequest(
+                    query=self._vector(vector),
+                    filter=query_filter,
+                    limit=top_k,
+                    score_threshold=score_threshold,
+                    with_payload=True
+                )
+                for vector in query_vectors
+            ]
         )
-    
+
+        return [[_to_result(point) for point in response.points] for response in responses]
+
+    async def delete(
+        self,
+        collection_name: str,
+        ids: List[str],
+        *,
+        batch_size: int = 10000
+    ):
+        """Delete vectors by ID from Qdrant."""
+        for batch in iter_batches(ids, batch_size):
+            await self.client.delete(
+                collection_name=collection_name,
+                points_selector=PointIdsList(points=[_point_id(vec_id) for vec_id in batch]),
+                wait=True
+            )
+
     async def get_stats(self, collection_name: str) -> Dict[str, Any]:
         """Get Qdrant collection statistics."""
-        info = self.client.get_collection(collection_name=collection_name)
-        
+        info = await self.client.get_collection(collection_name=collection_name)
+
         return {
             "collection_name": collection_name,
             "vector_count": info.points_count,
-            "dimension": info.config.params.vectors.size
+            "dimension": info.config.params.vectors.size,
+            "indexed_fields": sorted(info.payload_schema or {})
         }
+
+    async def aclose(self):
+        """Close the underlying client."""
+        await self.client.close()
+
+    @staticmethod
+    def _vector(vector) -> List[float]:
+        return vector.tolist() if hasattr(vector, "tolist") else list(vector)
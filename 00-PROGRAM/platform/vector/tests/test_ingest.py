@@ -0,0 +1,66 @@
+"""
+Tests for vector bulk ingest helpers.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ingest import IngestCheckpoint, iter_batches, dedupe_last_wins, open_checkpoint
+
+
+class TestBatching:
+    """Test batching helpers."""
+
+    def test_iter_batches_streams_generator(self):
+        """Test batching a generator without materializing it."""
+        batches = list(iter_batches((i for i in range(7)), 3))
+        assert batches == [[0, 1, 2], [3, 4, 5], [6]]
+
+    def test_iter_batches_rejects_zero(self):
+        """Test invalid batch size."""
+        with pytest.raises(ValueError):
+            list(iter_batches([1], 0))
+
+    def test_dedupe_last_wins(self):
+        """Test duplicate ids keep the last row."""
+        batch = [("a", [1.0], "first", {}), ("b", [2.0], "b", {}), ("a", [3.0], "second", {})]
+        result = dedupe_last_wins(batch)
+        assert [row[0] for row in result] == ["a", "b"]
+        assert result[0][2] == "second"
+
+
+class TestIngestCheckpoint:
+    """Test resumable checkpoints."""
+
+    def test_new_checkpoint_starts_at_zero(self, tmp_path):
+        """Test loading a missing checkpoint file."""
+        checkpoint = IngestCheckpoint.load(str(tmp_path / "ckpt.json"), "docs")
+        assert checkpoint.rows_committed == 0
+
+    def test_advance_persists_and_resumes(self, tmp_path):
+        """Test that progress survives a reload."""
+        path = str(tmp_path / "ckpt.json")
+        checkpoint = IngestCheckpoint.load(path, "docs")
+        checkpoint.advance(500)
+        checkpoint.advance(250)
+
+        resumed = IngestCheckpoint.load(path, "docs")
+        assert resumed.rows_committed == 750
+
+        resumed.clear()
+        assert IngestCheckpoint.load(path, "docs").rows_committed == 0
+
+    def test_collection_mismatch_raises(self, tmp_path):
+        """Test a checkpoint cannot resume a different collection."""
+        path = str(tmp_path / "ckpt.json")
+        IngestCheckpoint.load(path, "docs").advance(10)
+        with pytest.raises(ValueError):
+            IngestCheckpoint.load(path, "other")
+
+    def test_open_checkpoint_optional(self):
+        """Test that no path means no checkpoint."""
+        assert open_checkpoint(None, "docs") is None
@@ -0,0 +1,132 @@
+"""
+Tests for pgvector bulk COPY ingest (mocked DB-API connection).
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add platform directory to path (the adapters use package-relative imports)
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from vector.pgvector_adapter import PgVectorAdapter, _copy_line
+
+
+class FakeCursor:
+    def __init__(self):
+        self.statements = []
+        self.copies = []
+
+    def execute(self, sql):
+        self.statements.append(" ".join(sql.split()))
+
+    def copy_expert(self, sql, buffer):
+        self.copies.append((sql, buffer.read()))
+
+
+class FakeConnection:
+    def __init__(self):
+        self.cursor_obj = FakeCursor()
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = False
+
+    def cursor(self):
+        return self.cursor_obj
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class FakeEngine:
+    def __init__(self):
+        self.conn = FakeConnection()
+
+    def raw_connection(self):
+        return self.conn
+
+
+def make_adapter():
+    # Skip __init__: it connects to PostgreSQL
+    adapter = PgVectorAdapter.__new__(PgVectorAdapter)
+    adapter.engine = FakeEngine()
+    return adapter
+
+
+class TestCopyLine:
+    """Test COPY text-format rendering."""
+
+    def test_escapes_special_characters(self):
+        line = _copy_line(("id\t1", [0.5, 1.0], "a\tb\nc\\d\re", {"k": "x\ty"}))
+        fields = line[:-1].split("\t")
+        assert line.endswith("\n") and line.count("\n") == 1
+        assert fields == ["id\\t1", "a\\tb\\nc\\\\d\\re", "[0.5,1.0]", '{"k": "x\\\\ty"}']
+
+    def test_null_metadata_and_literal_backslash_n(self):
+        line = _copy_line(("a", [1.0], "\\N", None))
+        assert line == "a\t\\\\N\t[1.0]\t\\N\n"
+
+
+class TestInsertStream:
+    """Test staging COPY and merge statements."""
+
+    @pytest.mark.asyncio
+    async def test_copy_then_merge_per_batch(self):
+        adapter = make_adapter()
+        rows = [
+            ("a", [1.0], "first", {}),
+            ("b", [2.0], "b", None),
+            ("a", [3.0], "second", {"v": 2}),
+            ("c", [4.0], "c", {}),
+        ]
+        written = await adapter.insert_stream("docs-v1", iter(rows), batch_size=3)
+
+        # Within the first batch "a" is deduplicated, last row wins
+        assert written == 3
+        conn = adapter.engine.conn
+        cursor = conn.cursor_obj
+        assert [sql for sql, _ in cursor.copies] == [
+            "COPY docs_v1_stage (id, text, embedding, metadata) FROM STDIN"
+        ] * 2
+        first = cursor.copies[0][1].splitlines()
+        assert first == ["a\tsecond\t[3.0]\t{\"v\": 2}", "b\tb\t[2.0]\t\\N"]
+
+        merges = [sql for sql in cursor.statements if sql.startswith("INSERT INTO")]
+        assert len(merges) == 2
+        assert merges[0] == (
+            "INSERT INTO docs_v1 (id, text, embedding, metadata) "
+            "SELECT id, text, embedding::vector, metadata::jsonb FROM docs_v1_stage "
+            "ON CONFLICT (id) DO UPDATE SET text = EXCLUDED.text, "
+            "embedding = EXCLUDED.embedding, metadata = EXCLUDED.metadata"
+        )
+        assert "ON COMMIT DELETE ROWS" in cursor.statements[0]
+        # Staging table creation plus one commit per batch
+        assert conn.commits == 3 and conn.closed
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_counts_input_rows(self, tmp_path):
+        adapter = make_adapter()
+        path = tmp_path / "ckpt.json"
+        rows = [("a", [1.0], "x", {}), ("a", [2.0], "y", {}), ("b", [3.0], "z", {})]
+
+        class Fail(Exception):
+            pass
+
+        def failing_rows():
+            yield from rows[:2]
+            raise Fail()
+
+        with pytest.raises(Fail):
+            await adapter.insert_stream("docs", failing_rows(), batch_size=2, checkpoint_path=str(path))
+        assert json.loads(path.read_text())["rows_committed"] == 2
+
+        adapter = make_adapter()
+        assert await adapter.insert_stream("docs", iter(rows), batch_size=2, checkpoint_path=str(path)) == 1
+        assert not path.exists()
@@ -0,0 +1,47 @@
+"""
+Tests for pgvector filtered search SQL.
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+from sqlalchemy import text
+
+# Add platform directory to path (the adapters use package-relative imports)
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from vector.pgvector_adapter import _build_where
+
+
+class TestBuildWhere:
+    """Test that filters and thresholds are pushed into SQL."""
+
+    def test_no_filters(self):
+        assert _build_where(None, None) == ("", {})
+
+    def test_equality_list_and_range(self):
+        where, params = _build_where({"ata": "32-11", "source": ["AMM", "CMM"], "chunk": {"gte": 10, "lt": 20}}, None)
+        assert where.startswith(" WHERE ")
+        assert "metadata @> CAST(:f0 AS jsonb)" in where
+        assert json.loads(params["f0"]) == {"ata": "32-11"}
+        assert "(metadata @> CAST(:f1_0 AS jsonb) OR metadata @> CAST(:f1_1 AS jsonb))" in where
+        assert json.loads(params["f1_1"]) == {"source": "CMM"}
+        assert "(metadata->>:f2_key)::numeric >= :f2_gte" in where
+        assert params["f2_key"] == "chunk" and params["f2_lt"] == 20
+        # Every placeholder is a real bind parameter
+        assert set(text(where)._bindparams) == set(params)
+
+    def test_score_threshold_is_distance_bound(self):
+        where, params = _build_where({}, 0.75)
+        assert "(embedding <=> CAST(:query_vector AS vector)) <= :max_distance" in where
+        assert params["max_distance"] == pytest.approx(0.25)
+        # A zero threshold is still applied
+        assert _build_where({}, 0.0)[1]["max_distance"] == 1.0
+
+    def test_rejects_unknown_range_operator(self):
+        with pytest.raises(ValueError):
+            _build_where({"chunk": {"between": [1, 2]}}, None)
+
+    def test_empty_choice_matches_nothing(self):
+        assert _build_where({"source": []}, None)[0] == " WHERE FALSE"
@@ -0,0 +1,84 @@
+"""
+Tests for the Qdrant adapter against Qdrant's in-memory mode.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+pytest.importorskip("qdrant_client")
+
+# Add platform directory to path (the adapters use package-relative imports)
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from vector.qdrant_adapter import QdrantAdapter, _point_id
+
+
+def rows(n, dim=8):
+    for i in range(n):
+        vector = [0.0] * dim
+        vector[i % dim] = 1.0
+        vector[(i + 1) % dim] = 0.1 * (i % 5)
+        yield f"DMC-HYF-A-32-{i:04d}", vector, f"step {i}", {"ata": f"32-{i % 3}", "chunk": i}
+
+
+async def make_adapter(**kwargs):
+    adapter = QdrantAdapter(location=":memory:", upsert_batch_size=7, indexed_fields={"ata": "keyword"}, **kwargs)
+    await adapter.create_collection("manuals", 8, metadata={"indexed_fields": {"chunk": "integer"}})
+    return adapter
+
+
+@pytest.mark.filterwarnings("ignore:Payload indexes have no effect")
+class TestQdrantAdapter:
+    """Test batched upserts, filtered and batched search."""
+
+    def test_point_ids(self):
+        assert _point_id(42) == 42
+        uid = "0b9f7a4e-5a5e-4f6b-9b1c-2f1d0c7e8a11"
+        assert _point_id(uid) == uid
+        assert _point_id("DMC-1") == _point_id("DMC-1") != _point_id("DMC-2")
+
+    @pytest.mark.asyncio
+    async def test_chunked_insert_and_stats(self, tmp_path):
+        adapter = await make_adapter(max_concurrent_upserts=3)
+        checkpoint = tmp_path / "ckpt.json"
+        written = await adapter.insert_stream("manuals", rows(50), checkpoint_path=str(checkpoint))
+        assert written == 50
+        assert not checkpoint.exists()
+
+        stats = await adapter.get_stats("manuals")
+        assert stats["vector_count"] == 50
+        # Local mode accepts but does not keep payload indexes
+        assert isinstance(stats["indexed_fields"], list)
+
+        # Re-inserting the same ids upserts in place
+        ids, vectors, texts, metadata = zip(*rows(10))
+        await adapter.insert("manuals", list(vectors), ["updated"] * 10, list(metadata), ids=list(ids))
+        assert (await adapter.get_stats("manuals"))["vector_count"] == 50
+        await adapter.aclose()
+
+    @pytest.mark.asyncio
+    async def test_search_filters_and_batch(self):
+        adapter = await make_adapter()
+        await adapter.insert_stream("manuals", rows(40))
+        query = [1.0] + [0.0] * 7
+
+        hits = await adapter.search("manuals", query, top_k=3)
+        assert hits[0]["id"] == "DMC-HYF-A-32-0000"
+        assert hits[0]["text"] == "step 0"
+        assert hits[0]["metadata"] == {"ata": "32-0", "chunk": 0}
+
+        filtered = await adapter.search("manuals", query, top_k=5, filters={"ata": "32-1"})
+        assert filtered and all(h["metadata"]["ata"] == "32-1" for h in filtered)
+        ranged = await adapter.search("manuals", query, top_k=50, filters={"chunk": {"gte": 30}, "ata": ["32-0", "32-2"]})
+        assert ranged and all(h["metadata"]["chunk"] >= 30 for h in ranged)
+
+        queries = [[0.0] * i + [1.0] + [0.0] * (7 - i) for i in range(8)]
+        batched = await adapter.search_batch("manuals", queries, top_k=4)
+        single = [await adapter.search("manuals", q, top_k=4) for q in queries]
+        assert [[h["id"] for h in r] for r in batched] == [[h["id"] for h in r] for r in single]
+
+        await adapter.delete("manuals", ["DMC-HYF-A-32-0000"])
+        hits = await adapter.search("manuals", query, top_k=1)
+        assert hits[0]["id"] != "DMC-HYF-A-32-0000"
+        await adapter.aclose()
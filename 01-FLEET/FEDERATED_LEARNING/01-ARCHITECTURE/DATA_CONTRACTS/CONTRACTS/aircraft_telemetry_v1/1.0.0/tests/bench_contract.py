@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for aircraft_telemetry_v1 contract validation
+
+Replicates examples/telemetry_sample.jsonl into a synthetic fleet stream
+(platforms x time steps, timestamps shifted per replica) and reports
+messages per second for the row engine (validate_message per dict), the
+columnar engine (TelemetryFrame + validate_frame) and validate_frame
+alone on a prebuilt frame (input already columnar).
+
+Usage:
+    python bench_contract.py --messages 100000 1000000
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from contract_test import ContractValidator, TelemetryFrame
+
+
+def generate_messages(n: int):
+    """n messages built from the example file, spread over 50 platforms."""
+    example_file = Path(__file__).parent.parent / "examples" / "telemetry_sample.jsonl"
+    with open(example_file, "r") as f:
+        base = [json.loads(line) for line in f]
+    span = max(m["timestamp"] for m in base) - min(m["timestamp"] for m in base) + 1000
+    platforms = [hashlib.sha256(f"tail-{k}".encode()).hexdigest() for k in range(50)]
+
+    messages = []
+    for i in range(n):
+        replica, k = divmod(i, len(base))
+        m = dict(base[k])
+        m["platform_id"] = platforms[replica % len(platforms)]
+        m["timestamp"] = base[k]["timestamp"] + (replica // len(platforms)) * span
+        messages.append(m)
+    return messages
+
+
+def bench(messages, engine: str, now_ms: float):
+    validator = ContractValidator()
+    t0 = time.perf_counter()
+    report = validator.validate_batch(messages, engine=engine, now_ms=now_ms)
+    return len(messages) / (time.perf_counter() - t0), report
+
+
+def bench_frame(messages, now_ms: float):
+    """Throughput of validate_frame alone, on a frame built beforehand."""
+    frame = TelemetryFrame.from_records(messages)
+    validator = ContractValidator()
+    t0 = time.perf_counter()
+    validator.validate_frame(frame, now_ms=now_ms)
+    return len(messages) / (time.perf_counter() - t0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Contract validation throughput")
+    parser.add_argument("--messages", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--row-max", type=int, default=100000,
+                        help="Largest batch to run through the row engine")
+    args = parser.parse_args()
+
+    print(f"{'messages':>10} {'engine':>9} {'msgs/s':>12} {'valid':>8} {'flagged':>8} {'warnings':>9}")
+    for n in args.messages:
+        messages = generate_messages(n)
+        now_ms = max(m["timestamp"] for m in messages)
+        engines = ["row", "columnar"] if n <= args.row_max else ["columnar"]
+        for engine in engines:
+            rate, report = bench(messages, engine, now_ms)
+            stats = report["stats"]
+            print(f"{n:>10} {engine:>9} {rate:>12.0f} {stats['valid_messages']:>8} "
+                  f"{stats['flagged_messages']:>8} {len(report['warnings']):>9}")
+        print(f"{n:>10} {'frame':>9} {bench_frame(messages, now_ms):>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
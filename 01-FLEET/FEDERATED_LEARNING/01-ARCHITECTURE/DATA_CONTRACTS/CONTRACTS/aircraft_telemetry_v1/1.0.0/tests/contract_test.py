@@ -10,32 +10,240 @@ This test validates that data conforms to the aircraft_telemetry_v1 contract:
 - Timestamp validation
 
 Run on edge devices (FL clients) before data is used for training.
+
+Batches are validated column-wise (`ContractValidator.validate_frame`):
+messages are converted once into a TelemetryFrame of NumPy columns and
+every check runs as an array operation. Rate-of-change and consistency
+constraints need history across messages, so they are only applied on
+this path; `validate_message` remains the single-message reference.
 """
 
+import ast
 import json
 import os
+import re
 import sys
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timezone
 import hashlib
 
+import numpy as np
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+
+REQUIRED_FIELDS = ["timestamp", "platform_id", "signal_name", "value", "quality"]
+
+# Timestamp window (milliseconds)
+MAX_FUTURE_MS = 60000
+MAX_PAST_MS = 365 * 86400000  # allow historical data for testing
+
+# Per-message outcome codes used by the batch engine
+ACCEPT, ALERT, REJECT = 0, 1, 2
+ACTION_NAMES = ("ACCEPT", "ALERT", "REJECT")
+ACTION_CODES = {"ACCEPT": ACCEPT, "ALERT": ALERT, "REJECT": REJECT}
+
+_MISSING = object()
+_NUMERIC_TYPES = (int, float, bool)
+
+
+def _now_ms() -> float:
+    return datetime.now(timezone.utc).timestamp() * 1000  # Convert to milliseconds
+
+
+def _factorize(values: List[Any]) -> Tuple[np.ndarray, List[Any]]:
+    """Integer codes for hashable values, and the distinct values in code order."""
+    lookup: Dict[Any, int] = {}
+    for v in set(values):
+        lookup[v] = len(lookup)
+    codes = np.fromiter(map(lookup.__getitem__, values), dtype=np.int64, count=len(values))
+    return codes, list(lookup)
+
+
+class TelemetryFrame:
+    """
+    Column-oriented batch of TelemetryMessage records.
+
+    Columns follow schema.avsc. `value`, `timestamp` and `quality` are kept
+    both as the original objects (for reporting) and as float columns with
+    NaN for null/non-numeric entries; `platform_id` and `signal_name` are
+    factorized into integer codes so per-key work runs once per distinct key.
+    """
+
+    def __init__(self, columns: Dict[str, Any]):
+        """
+        Build a frame from columns.
+
+        Args:
+            columns: Field name -> sequence, equal length. Missing required
+                fields (whole columns or single `_MISSING` entries) are
+                recorded and rejected during validation.
+        """
+        lengths = {len(columns[f]) for f in REQUIRED_FIELDS if f in columns}
+        if len(lengths) > 1:
+            raise ValueError(f"Column lengths differ: {sorted(lengths)}")
+        n = lengths.pop() if lengths else 0
+        self.size = n
+
+        missing = np.zeros((len(REQUIRED_FIELDS), n), dtype=bool)
+        raw = {}
+        for k, field in enumerate(REQUIRED_FIELDS):
+            col = columns.get(field)
+            if col is None:
+                missing[k] = True
+                col = [_MISSING] * n
+            col = list(col)
+            if _MISSING in col:
+                missing[k] |= np.fromiter((v is _MISSING for v in col), dtype=bool, count=n)
+            raw[field] = col
+        self.missing = missing
+
+        self.timestamp_obj = raw["timestamp"]
+        self.value_obj = raw["value"]
+        self.quality_obj = raw["quality"]
+        self.timestamp = self._numeric(raw["timestamp"])
+        self.value = self._numeric(raw["value"])
+        self.quality = self._numeric(raw["quality"])
+
+        self.platform_code, self.platforms = _factorize(raw["platform_id"])
+        self.signal_code, self.signals = _factorize(raw["signal_name"])
+
+    @staticmethod
+    def _numeric(col: List[Any]) -> np.ndarray:
+        """Float column; NaN where the value is missing, null or not a number."""
+        try:
+            arr = np.array(col)
+        except (ValueError, OverflowError):
+            arr = None
+        if arr is not None and arr.dtype.kind in "biuf" and arr.ndim == 1:
+            return arr.astype(float)
+        return np.fromiter(
+            (v if isinstance(v, _NUMERIC_TYPES) else np.nan for v in col),
+            dtype=float, count=len(col),
+        )
+
+    @classmethod
+    def from_records(cls, messages: List[Dict[str, Any]]) -> "TelemetryFrame":
+        """Build a frame from message dicts in one pass per column."""
+        return cls({
+            field: [m.get(field, _MISSING) for m in messages]
+            for field in REQUIRED_FIELDS
+        })
+
+    def platform_id(self, i: int) -> Any:
+        return self.platforms[self.platform_code[i]]
+
+    def signal_name(self, i: int) -> Any:
+        return self.signals[self.signal_code[i]]
+
+    def signal_mask(self, names) -> np.ndarray:
+        """Boolean mask of messages whose signal is in names."""
+        wanted = np.array([s in names for s in self.signals], dtype=bool)
+        return wanted[self.signal_code] if len(wanted) else np.zeros(self.size, dtype=bool)
+
+    def __len__(self):
+        return self.size
+
+
+class ConsistencyCondition:
+    """
+    Vectorized evaluator for constraints.yaml consistency conditions.
+
+    Supports comparisons, arithmetic, and/or/not and `A implies B`.
+    Condition variables are bound to constraint signals by exact name or
+    by a signal-name token starting with the variable (e.g. `temp` ->
+    `engine_1_oil_temperature`).
+    """
+
+    _ALLOWED = (
+        ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub,
+        ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Compare, ast.Lt, ast.LtE,
+        ast.Gt, ast.GtE, ast.Eq, ast.NotEq, ast.Name, ast.Load, ast.Constant,
+    )
+
+    def __init__(self, condition: str, signals: List[str]):
+        self.condition = condition
+        expr = re.sub(r"\((.+?)\)\s+implies\s+\((.+)\)", r"(not (\1)) or (\2)", condition.strip())
+        tree = ast.parse(expr, mode="eval")
+        for node in ast.walk(tree):
+            if not isinstance(node, self._ALLOWED):
+                raise ValueError(f"Unsupported syntax in condition {condition!r}: {type(node).__name__}")
+        self.tree = tree
+        names = sorted({n.id for n in ast.walk(tree) if isinstance(n, ast.Name)})
+        self.bindings = {name: self._bind(name, signals) for name in names}
+
+    def _bind(self, name: str, signals: List[str]) -> str:
+        if name in signals:
+            return name
+        matches = [s for s in signals if any(tok.startswith(name) for tok in s.split("_"))]
+        if len(matches) != 1:
+            raise ValueError(f"Cannot bind {name!r} in {self.condition!r} to one of {signals}")
+        return matches[0]
+
+    def __call__(self, values: Dict[str, np.ndarray]) -> np.ndarray:
+        """Evaluate over arrays keyed by signal name; returns a bool array."""
+        return np.asarray(self._eval(self.tree.body, values), dtype=bool)
+
+    def _eval(self, node, values):
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Name):
+            return values[self.bindings[node.id]]
+        if isinstance(node, ast.UnaryOp):
+            operand = self._eval(node.operand, values)
+            return np.logical_not(operand) if isinstance(node.op, ast.Not) else -operand
+        if isinstance(node, ast.BoolOp):
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            result = self._eval(node.values[0], values)
+            for sub in node.values[1:]:
+                result = combine(result, self._eval(sub, values))
+            return result
+        if isinstance(node, ast.BinOp):
+            left, right = self._eval(node.left, values), self._eval(node.right, values)
+            op = type(node.op)
+            if op is ast.Add:
+                return left + right
+            if op is ast.Sub:
+                return left - right
+            if op is ast.Mult:
+                return left * right
+            return left / right
+        if isinstance(node, ast.Compare):
+            ops = {ast.Lt: np.less, ast.LtE: np.less_equal, ast.Gt: np.greater,
+                   ast.GtE: np.greater_equal, ast.Eq: np.equal, ast.NotEq: np.not_equal}
+            left = self._eval(node.left, values)
+            result = True
+            for op, comparator in zip(node.ops, node.comparators):
+                right = self._eval(comparator, values)
+                result = np.logical_and(result, ops[type(op)](left, right))
+                left = right
+            return result
+        raise ValueError(f"Unsupported node {type(node).__name__}")
+
 
 class ContractValidator:
     """Validates data against aircraft_telemetry_v1 contract."""
     
-    def __init__(self, contract_path: str = None):
+    def __init__(self, contract_path: str = None, consistency_window_ms: int = 1000):
         """
         Initialize validator with contract definitions.
         
         Args:
             contract_path: Path to contract directory (default: current directory)
+            consistency_window_ms: Maximum age of a signal's last value when
+                joined with other signals for consistency checks
         """
         if contract_path is None:
             contract_path = Path(__file__).parent.parent
         self.contract_path = Path(contract_path)
+        self.consistency_window_ms = consistency_window_ms
         
         # Load constraints from constraints.yaml
+        self.constraints_doc = self._load_constraints_doc()
         self.range_constraints = self._load_range_constraints()
         self.rate_constraints = self._load_rate_constraints()
         self.consistency_constraints = self._load_consistency_constraints()
@@ -49,10 +257,31 @@ class ContractValidator:
             "rejected_messages": 0,
             "flagged_messages": 0,
         }
+        
+        # Last accepted (timestamp, value) per (platform_id, signal_name),
+        # carried between frames for rate and consistency checks
+        self._last_sample: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        
+        self._compile_range_table()
+    
+    def _load_constraints_doc(self) -> Optional[Dict[str, Any]]:
+        """Parse constraints.yaml, or None if unavailable."""
+        constraints_file = self.contract_path / "constraints.yaml"
+        if yaml is None or not constraints_file.exists():
+            return None
+        with open(constraints_file, "r") as f:
+            return yaml.safe_load(f)
     
     def _load_range_constraints(self) -> Dict[str, Dict]:
         """Load range constraints from constraints.yaml."""
-        # Simplified constraint definitions (in production, parse YAML)
+        if self.constraints_doc and "range_constraints" in self.constraints_doc:
+            keys = ("min", "max", "action_below", "action_above")
+            return {
+                c["signal"]: {k: c[k] for k in keys if k in c}
+                for c in self.constraints_doc["range_constraints"]
+            }
+        
+        # Built-in definitions when constraints.yaml cannot be parsed
         return {
             "engine_1_egt": {"min": -50, "max": 1200, "action_above": "ALERT"},
             "engine_1_oil_temperature": {"min": -40, "max": 150, "action_below": "ALERT", "action_above": "ALERT"},
@@ -66,6 +295,16 @@ class ContractValidator:
     
     def _load_rate_constraints(self) -> Dict[str, Dict]:
         """Load rate-of-change constraints."""
+        if self.constraints_doc and "rate_of_change_constraints" in self.constraints_doc:
+            return {
+                c["signal"]: {
+                    "max_delta": c["max_delta"],
+                    "window": c.get("window", 1),
+                    "action": c.get("action_exceed", "ALERT"),
+                }
+                for c in self.constraints_doc["rate_of_change_constraints"]
+            }
+        
         return {
             "engine_1_egt": {"max_delta": 100, "window": 1},
             "h2_tank_pressure_fwd": {"max_delta": 50, "window": 1},
@@ -74,20 +313,52 @@ class ContractValidator:
     
     def _load_consistency_constraints(self) -> List[Dict]:
         """Load consistency (cross-signal) constraints."""
-        return [
-            {
+        if self.constraints_doc and "consistency_constraints" in self.constraints_doc:
+            definitions = self.constraints_doc["consistency_constraints"]
+        else:
+            definitions = [{
                 "name": "H2 pressure-temperature",
                 "signals": ["h2_tank_pressure_fwd", "h2_tank_temp_fwd"],
-                "check": lambda p, t: p < 400 * (t / 300),
+                "condition": "pressure < 400 * (temp / 300)",
+            }]
+        
+        return [
+            {
+                "name": c["name"],
+                "signals": list(c["signals"]),
+                "check": ConsistencyCondition(c["condition"], list(c["signals"])),
+                "action": c.get("action_fail", "WARNING"),
             }
+            for c in definitions
         ]
     
-    def validate_message(self, message: Dict[str, Any]) -> Tuple[bool, str]:
+    def _compile_range_table(self):
+        """Precompute per-signal range arrays for the batch engine."""
+        names = list(self.range_constraints)
+        self._range_code = {name: i for i, name in enumerate(names)}
+        
+        def column(key, default):
+            return np.array([self.range_constraints[n].get(key, default) for n in names] + [default],
+                            dtype=float)
+        
+        def actions(key):
+            return np.array(
+                [ACTION_CODES.get(self.range_constraints[n].get(key, "REJECT"), REJECT) for n in names]
+                + [ACCEPT], dtype=np.int8)
+        
+        # Extra trailing slot for signals without a range constraint
+        self._range_min = column("min", -np.inf)
+        self._range_max = column("max", np.inf)
+        self._range_action_below = actions("action_below")
+        self._range_action_above = actions("action_above")
+    
+    def validate_message(self, message: Dict[str, Any], now_ms: float = None) -> Tuple[bool, str]:
         """
         Validate a single telemetry message.
         
         Args:
             message: Telemetry message as dict
+            now_ms: Reference time for timestamp checks (default: current time)
             
         Returns:
             (is_valid, action) where action is "ACCEPT", "ALERT", or "REJECT"
@@ -95,15 +366,14 @@ class ContractValidator:
         self.stats["total_messages"] += 1
         
         # 1. Required field validation
-        required_fields = ["timestamp", "platform_id", "signal_name", "value", "quality"]
-        for field in required_fields:
+        for field in REQUIRED_FIELDS:
             if field not in message:
                 self.violations.append(f"Missing required field: {field}")
                 self.stats["rejected_messages"] += 1
                 return False, "REJECT"
         
         # 2. Timestamp validation
-        timestamp_valid, timestamp_action = self._validate_timestamp(message["timestamp"])
+        timestamp_valid, timestamp_action = self._validate_timestamp(message["timestamp"], now_ms)
         if not timestamp_valid:
             self.violations.append(f"Invalid timestamp: {message['timestamp']}")
             self.stats["rejected_messages"] += 1
@@ -140,16 +410,16 @@ class ContractValidator:
         self.stats["valid_messages"] += 1
         return True, "ACCEPT"
     
-    def _validate_timestamp(self, timestamp: int) -> Tuple[bool, str]:
+    def _validate_timestamp(self, timestamp: int, now_ms: float = None) -> Tuple[bool, str]:
         """Validate timestamp is reasonable (not too far in future or past)."""
-        now = datetime.now(timezone.utc).timestamp() * 1000  # Convert to milliseconds
+        now = _now_ms() if now_ms is None else now_ms
         
         # Not more than 60 seconds in future
-        if timestamp > now + 60000:
+        if timestamp > now + MAX_FUTURE_MS:
             return False, "REJECT"
         
         # Not more than 365 days in past (allow historical data for testing)
-        if timestamp < now - (365 * 86400000):
+        if timestamp < now - MAX_PAST_MS:
             return False, "REJECT"
         
         return True, "ACCEPT"
@@ -184,18 +454,33 @@ class ContractValidator:
         
         return True, "ACCEPT"
     
-    def validate_batch(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def validate_batch(
+        self,
+        messages: List[Dict[str, Any]],
+        engine: str = "columnar",
+        now_ms: float = None,
+    ) -> Dict[str, Any]:
         """
         Validate a batch of messages.
         
         Args:
             messages: List of telemetry messages
+            engine: "columnar" (TelemetryFrame, all constraints) or "row"
+                (validate_message per message; no rate/consistency checks)
+            now_ms: Reference time for timestamp checks (default: current time,
+                read once per batch)
             
         Returns:
             Validation report with statistics and violations
         """
-        for msg in messages:
-            self.validate_message(msg)
+        now_ms = _now_ms() if now_ms is None else now_ms
+        if engine == "columnar":
+            self.validate_frame(TelemetryFrame.from_records(messages), now_ms=now_ms)
+        elif engine == "row":
+            for msg in messages:
+                self.validate_message(msg, now_ms)
+        else:
+            raise ValueError(f"Unknown engine: {engine}")
         
         return {
             "stats": self.stats,
@@ -204,6 +489,235 @@ class ContractValidator:
             "success_rate": self.stats["valid_messages"] / max(self.stats["total_messages"], 1),
         }
     
+    def validate_frame(
+        self,
+        frame: TelemetryFrame,
+        now_ms: float = None,
+        rate_checks: bool = True,
+        consistency_checks: bool = True,
+    ) -> np.ndarray:
+        """
+        Validate a frame column-wise.
+        
+        Base checks (required fields, timestamp, pseudonymization, range,
+        quality) give the same outcomes, messages and stats as
+        validate_message. Rate-of-change and consistency checks then run
+        over the accepted messages, joined with the last samples of
+        earlier frames.
+        
+        Args:
+            frame: Telemetry frame
+            now_ms: Reference time for timestamp checks (default: current time)
+            rate_checks: Apply rate-of-change constraints
+            consistency_checks: Apply consistency constraints
+            
+        Returns:
+            Per-message action codes (ACCEPT, ALERT, REJECT)
+        """
+        n = len(frame)
+        now = _now_ms() if now_ms is None else now_ms
+        action = np.full(n, ACCEPT, dtype=np.int8)
+        undecided = np.ones(n, dtype=bool)
+        
+        # Reason code per message: 0=none, 1..5 in check order
+        reason = np.zeros(n, dtype=np.int8)
+        
+        def decide(mask, act, code):
+            mask = mask & undecided
+            action[mask] = act
+            reason[mask] = code
+            undecided[mask] = False
+        
+        # 1. Required fields (report the first missing one)
+        any_missing = frame.missing.any(axis=0)
+        first_missing = frame.missing.argmax(axis=0)
+        decide(any_missing, REJECT, 1)
+        
+        # 2. Timestamp window; non-numeric timestamps are rejected
+        ts = frame.timestamp
+        with np.errstate(invalid="ignore"):
+            bad_ts = np.isnan(ts) | (ts > now + MAX_FUTURE_MS) | (ts < now - MAX_PAST_MS)
+        decide(bad_ts, REJECT, 2)
+        
+        # 3. Pseudonymization, evaluated once per distinct platform_id
+        checked = np.zeros(len(frame.platforms), dtype=bool)
+        checked[np.unique(frame.platform_code[undecided])] = True
+        pseudo = np.array([
+            not ok or p is _MISSING or self._is_pseudonymized(p)
+            for ok, p in zip(checked, frame.platforms)
+        ], dtype=bool)
+        if len(pseudo):
+            decide(~pseudo[frame.platform_code], REJECT, 3)
+        
+        # 4. Range limits from the contract, looked up once per distinct signal
+        signal_range = np.array([self._range_code.get(s, -1) for s in frame.signals], dtype=np.int64)
+        codes = signal_range[frame.signal_code] if len(signal_range) else np.zeros(0, dtype=np.int64)
+        value = frame.value
+        with np.errstate(invalid="ignore"):
+            below = value < self._range_min[codes]
+            above = ~below & (value > self._range_max[codes])
+        range_action = np.where(below, self._range_action_below[codes],
+                                np.where(above, self._range_action_above[codes], ACCEPT))
+        decide(range_action == REJECT, REJECT, 4)
+        decide(range_action == ALERT, ALERT, 4)
+        
+        # 5. Quality indicator
+        decide(~np.isin(frame.quality, (0, 1, 2)), REJECT, 5)
+        
+        # Report in message order
+        for i in np.flatnonzero(reason):
+            code = reason[i]
+            if code == 1:
+                self.violations.append(f"Missing required field: {REQUIRED_FIELDS[first_missing[i]]}")
+            elif code == 2:
+                self.violations.append(f"Invalid timestamp: {frame.timestamp_obj[i]}")
+            elif code == 3:
+                self.violations.append(f"Platform ID not pseudonymized: {frame.platform_id(i)}")
+            elif code == 4:
+                entry = f"{frame.signal_name(i)}={frame.value_obj[i]}"
+                if action[i] == REJECT:
+                    self.violations.append(f"Range violation: {entry}")
+                else:
+                    self.warnings.append(f"Range warning: {entry}")
+            else:
+                self.violations.append(f"Invalid quality indicator: {frame.quality_obj[i]}")
+        
+        # History-based checks over accepted messages with numeric values
+        eligible = (action != REJECT) & ~np.isnan(value)
+        if rate_checks and self.rate_constraints:
+            self._check_rates(frame, eligible, action)
+        if consistency_checks and self.consistency_constraints:
+            self._check_consistency(frame, eligible)
+        self._remember_last_samples(frame, eligible)
+        
+        self.stats["total_messages"] += n
+        self.stats["rejected_messages"] += int(np.count_nonzero(action == REJECT))
+        self.stats["flagged_messages"] += int(np.count_nonzero(action == ALERT))
+        self.stats["valid_messages"] += int(np.count_nonzero(action == ACCEPT))
+        return action
+    
+    def _history_rows(self, frame: TelemetryFrame, rows: np.ndarray, signals: List[str]):
+        """
+        Rows of the given signals plus carried-over last samples, sorted by
+        (platform, timestamp, frame order).
+        
+        Returns (platform codes, signal positions in `signals`, timestamps,
+        values, frame index or -1 for carried samples), in sorted order.
+        """
+        position = {name: k for k, name in enumerate(signals)}
+        frame_pos = np.array([position.get(s, -1) for s in frame.signals], dtype=np.int64)
+        platform_of = {p: c for c, p in enumerate(frame.platforms)}
+        
+        carried = [(p, position[s], t, v) for (p, s), (t, v) in self._last_sample.items()
+                   if s in position]
+        for p, _, _, _ in carried:
+            if p not in platform_of:
+                platform_of[p] = len(platform_of)
+        carried_platform = [platform_of[p] for p, _, _, _ in carried]
+        
+        pcode = np.concatenate([frame.platform_code[rows], np.array(carried_platform, dtype=np.int64)])
+        signal = np.concatenate([frame_pos[frame.signal_code[rows]],
+                                 np.array([c[1] for c in carried], dtype=np.int64)])
+        ts = np.concatenate([frame.timestamp[rows], np.array([c[2] for c in carried], dtype=float)])
+        val = np.concatenate([frame.value[rows], np.array([c[3] for c in carried], dtype=float)])
+        index = np.concatenate([rows, np.full(len(carried), -1)])
+        # Carried samples sort before frame rows at equal timestamps
+        order_key = np.concatenate([np.arange(len(rows)), np.full(len(carried), -1)])
+        
+        order = np.lexsort((order_key, ts, pcode))
+        return pcode[order], signal[order], ts[order], val[order], index[order]
+    
+    def _check_rates(self, frame: TelemetryFrame, eligible: np.ndarray, action: np.ndarray):
+        """Flag consecutive samples whose per-second change exceeds max_delta / window."""
+        signals = list(self.rate_constraints)
+        rows = np.flatnonzero(eligible & frame.signal_mask(signals))
+        if not len(rows):
+            return
+        
+        pcode, signal, ts, val, index = self._history_rows(frame, rows, signals)
+        exceeded = np.zeros(len(ts), dtype=bool)
+        rate = np.zeros(len(ts))
+        for k, name in enumerate(signals):
+            constraint = self.rate_constraints[name]
+            sel = np.flatnonzero(signal == k)
+            if len(sel) < 2:
+                continue
+            same_platform = pcode[sel][1:] == pcode[sel][:-1]
+            dv = np.abs(np.diff(val[sel]))
+            dt_s = np.diff(ts[sel]) / 1000.0
+            with np.errstate(divide="ignore", invalid="ignore"):
+                r = np.where(dv == 0, 0.0, dv / dt_s)
+            limit = constraint["max_delta"] / constraint.get("window", 1)
+            hit = same_platform & (r > limit)
+            exceeded[sel[1:]] |= hit
+            rate[sel[1:]] = np.where(hit, r, rate[sel[1:]])
+        
+        for k in np.flatnonzero(exceeded & (index >= 0)):
+            i = index[k]
+            name = frame.signal_name(i)
+            constraint = self.rate_constraints[name]
+            self.warnings.append(
+                f"Rate-of-change warning: {name}={frame.value_obj[i]} "
+                f"({rate[k]:.1f}/s > {constraint['max_delta']}/{constraint.get('window', 1)}s)"
+            )
+            act = ACTION_CODES.get(constraint.get("action", "ALERT"), ALERT)
+            if act > action[i]:
+                action[i] = act
+    
+    def _check_consistency(self, frame: TelemetryFrame, eligible: np.ndarray):
+        """
+        Evaluate cross-signal conditions at each sample of a constraint's
+        signals, using the latest value of every other signal on the same
+        platform within consistency_window_ms.
+        """
+        for constraint in self.consistency_constraints:
+            signals = constraint["signals"]
+            rows = np.flatnonzero(eligible & frame.signal_mask(signals))
+            if not len(rows):
+                continue
+            
+            pcode, signal, ts, val, index = self._history_rows(frame, rows, signals)
+            m = len(ts)
+            pos = np.arange(m)
+            group_start = np.maximum.accumulate(
+                np.where(np.r_[True, pcode[1:] != pcode[:-1]], pos, 0)
+            )
+            
+            joined = {}
+            fresh = np.ones(m, dtype=bool)
+            for k, name in enumerate(signals):
+                last = np.maximum.accumulate(np.where(signal == k, pos, -1))
+                ok = (last >= group_start) & (ts - ts[np.maximum(last, 0)] <= self.consistency_window_ms)
+                joined[name] = np.where(ok, val[np.maximum(last, 0)], np.nan)
+                fresh &= ok
+            
+            evaluate = np.flatnonzero(fresh & (index >= 0))
+            if not len(evaluate):
+                continue
+            holds = constraint["check"]({k: v[evaluate] for k, v in joined.items()})
+            for k in evaluate[~holds]:
+                values = ", ".join(f"{name}={joined[name][k]:g}" for name in signals)
+                self.warnings.append(
+                    f"Consistency {constraint['action'].lower()}: {constraint['name']} ({values})"
+                )
+    
+    def _remember_last_samples(self, frame: TelemetryFrame, eligible: np.ndarray):
+        """Keep the latest accepted sample per (platform, signal) for history checks."""
+        tracked = set(self.rate_constraints)
+        for constraint in self.consistency_constraints:
+            tracked.update(constraint["signals"])
+        rows = np.flatnonzero(eligible & frame.signal_mask(tracked))
+        if not len(rows):
+            return
+        key_code = frame.platform_code[rows] * len(frame.signals) + frame.signal_code[rows]
+        order = np.lexsort((np.arange(len(rows)), frame.timestamp[rows], key_code))
+        last = order[np.r_[key_code[order][1:] != key_code[order][:-1], True]]
+        for i in rows[last]:
+            key = (frame.platform_id(i), frame.signal_name(i))
+            previous = self._last_sample.get(key)
+            if previous is None or frame.timestamp[i] >= previous[0]:
+                self._last_sample[key] = (frame.timestamp[i], frame.value[i])
+    
     def print_report(self):
         """Print validation report."""
         print("\n" + "="*60)
@@ -264,6 +778,126 @@ def test_contract_with_examples():
     return success
 
 
+def _load_examples() -> List[Dict[str, Any]]:
+    example_file = Path(__file__).parent.parent / "examples" / "telemetry_sample.jsonl"
+    with open(example_file, "r") as f:
+        return [json.loads(line) for line in f]
+
+
+def _message(signal, value, ts, platform="ab" * 32, quality=0):
+    return {"timestamp": ts, "platform_id": platform, "signal_name": signal,
+            "value": value, "unit": "", "quality": quality}
+
+
+def test_columnar_matches_row_engine():
+    """Columnar base checks give the same outcomes, messages and stats as validate_message."""
+    base = _load_examples()
+    now = max(m["timestamp"] for m in base)
+    messages = []
+    for i in range(400):
+        m = dict(base[i % len(base)])
+        kind = i % 11
+        if kind == 1:
+            del m[REQUIRED_FIELDS[i % len(REQUIRED_FIELDS)]]
+        elif kind == 2:
+            m["timestamp"] = now + 120000
+        elif kind == 3:
+            m["platform_id"] = "AC-H2-001"
+        elif kind == 4:
+            m["signal_name"], m["value"] = "h2_tank_temp_fwd", 10.0  # below -> REJECT
+        elif kind == 5:
+            m["signal_name"], m["value"] = "engine_1_egt", 1300.0  # above -> ALERT
+        elif kind == 6:
+            m["quality"] = 7
+        elif kind == 7:
+            m["signal_name"], m["value"], m["quality"] = "engine_1_oil_pressure", 5.0, 9
+        messages.append(m)
+    
+    row = ContractValidator()
+    for m in messages:
+        row.validate_message(m, now)
+    
+    columnar = ContractValidator()
+    actions = columnar.validate_frame(
+        TelemetryFrame.from_records(messages), now_ms=now,
+        rate_checks=False, consistency_checks=False,
+    )
+    
+    assert columnar.stats == row.stats
+    assert columnar.violations == row.violations
+    assert columnar.warnings == row.warnings
+    assert [ACTION_NAMES[a] for a in actions[:12]] == [
+        row_action for _, row_action in
+        (ContractValidator().validate_message(m, now) for m in messages[:12])
+    ]
+
+
+def test_range_limits_from_contract(tmp_path):
+    """Range limits and actions are read from constraints.yaml."""
+    contract_dir = Path(__file__).parent.parent
+    text = (contract_dir / "constraints.yaml").read_text()
+    (tmp_path / "constraints.yaml").write_text(text.replace("max: 1200", "max: 900"))
+    
+    validator = ContractValidator(tmp_path)
+    assert validator.range_constraints["engine_1_egt"]["max"] == 900
+    assert validator.range_constraints["engine_1_egt"]["action_below"] == "REJECT"
+    
+    now = 1760210300000
+    report = validator.validate_batch([_message("engine_1_egt", 1000.0, now)], now_ms=now)
+    assert report["stats"]["flagged_messages"] == 1
+    assert report["warnings"] == ["Range warning: engine_1_egt=1000.0"]
+
+
+def test_rate_of_change_constraint():
+    """EGT jumps above max_delta per second are flagged, including across frames."""
+    now = 1760210300000
+    validator = ContractValidator()
+    report = validator.validate_batch([
+        _message("engine_1_egt", 500.0, now - 3000),
+        _message("engine_1_egt", 550.0, now - 2000),   # 50/s
+        _message("engine_1_egt", 700.0, now - 1000),   # 150/s -> ALERT
+        _message("engine_1_egt", 700.0, now - 1000, platform="cd" * 32),  # other platform
+    ], now_ms=now)
+    assert report["stats"]["flagged_messages"] == 1
+    assert report["stats"]["valid_messages"] == 3
+    assert report["warnings"][0].startswith("Rate-of-change warning: engine_1_egt=700.0")
+    
+    # History carries over to the next frame
+    validator.validate_batch([_message("engine_1_egt", 400.0, now)], now_ms=now)
+    assert validator.stats["flagged_messages"] == 2
+
+
+def test_consistency_constraint():
+    """Hot oil with low pressure on the same platform raises a consistency warning."""
+    now = 1760210300000
+    validator = ContractValidator()
+    validator.validate_batch([
+        _message("engine_1_oil_temperature", 95.0, now - 500),
+        _message("engine_1_oil_pressure", 20.0, now - 400),
+        _message("engine_1_oil_pressure", 20.0, now - 300, platform="cd" * 32),
+        _message("engine_1_oil_temperature", 95.0, now + 5000, platform="cd" * 32),  # stale join
+    ], now_ms=now)
+    oil = [w for w in validator.warnings if "oil" in w.lower()]
+    assert len(oil) == 1
+    assert "engine_1_oil_pressure=20" in oil[0]
+    assert validator.stats["valid_messages"] == 4
+
+
+def test_consistency_condition_parser():
+    """Contract conditions compile to vectorized checks with signal bindings."""
+    cond = ConsistencyCondition(
+        "(altitude > 5000) implies (airspeed_true >= airspeed_indicated * 1.1)",
+        ["airspeed_true", "airspeed_indicated", "altitude_pressure"],
+    )
+    assert cond.bindings["altitude"] == "altitude_pressure"
+    result = cond({
+        "altitude_pressure": np.array([1000.0, 20000.0, 20000.0]),
+        "airspeed_true": np.array([100.0, 100.0, 300.0]),
+        "airspeed_indicated": np.array([200.0, 200.0, 200.0]),
+    })
+    assert result.tolist() == [True, False, True]
+
+
 def main():
     """Main entry point for contract testing."""
     print("Aircraft Telemetry v1 Contract Test")
@@ -0,0 +1,289 @@
+"""
+aero_db.py - Resident aerodynamic coefficient database
+
+Loads the α–Mach coefficient tables (CL, CD, Cm) and the airframe/control
+YAML parameters once, keeps them as NumPy grids, and evaluates whole arrays
+of (alpha, Mach, elevator deflection) points per call.
+
+The vectorized path uses the same index search, clamping and weight formula
+as the scalar `bilinear_interp`, so results are bit-identical to the
+per-point reference (`compute_aero_coeffs`).
+
+Usage:
+    from aero_db import AeroDatabase
+
+    db = AeroDatabase.load()
+    out = db.evaluate(alpha_deg=[0.0, 5.0], mach=[0.3, 0.5], delta_e_rad=0.0)
+    print(out['CL'])
+
+Author: Digital Twin Model Team
+Version: 1.0.0
+"""
+
+import csv
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import numpy as np
+import yaml
+
+
+PARAMS_DIR = Path(__file__).parent.parent / 'PARAMS'
+
+# Coefficient name -> table file under PARAMS/tables
+TABLE_FILES = {
+    'CL': 'CL_alpha_mach.csv',
+    'CD': 'CD_alpha_mach.csv',
+    'Cm': 'Cm_alpha_mach.csv',
+}
+
+ArrayLike = Union[float, np.ndarray, list]
+
+
+def load_csv_table(filepath):
+    """
+    Load a CSV table with alpha_deg in first column and Mach numbers as headers.
+
+    Returns:
+        alpha_vals: List of alpha values (degrees)
+        mach_vals: List of Mach values
+        data: 2D array of coefficient values [alpha_idx, mach_idx]
+    """
+    with open(filepath, 'r') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+
+        # Extract Mach values from header (skip first column which is 'alpha_deg')
+        mach_vals = [float(m) for m in header[1:]]
+
+        alpha_vals = []
+        data_rows = []
+
+        for row in reader:
+            alpha_vals.append(float(row[0]))
+            data_rows.append([float(v) for v in row[1:]])
+
+    return alpha_vals, mach_vals, np.array(data_rows)
+
+
+def bilinear_interp(x, y, x_vals, y_vals, data):
+    """
+    Perform bilinear interpolation on a 2D grid (single point reference).
+
+    Args:
+        x: Query point x-coordinate (alpha in degrees)
+        y: Query point y-coordinate (Mach number)
+        x_vals: List of x grid values (alpha values)
+        y_vals: List of y grid values (Mach values)
+        data: 2D array of data values [x_idx, y_idx]
+
+    Returns:
+        Interpolated value at (x, y)
+    """
+    # Find surrounding indices
+    x_idx = np.searchsorted(x_vals, x) - 1
+    y_idx = np.searchsorted(y_vals, y) - 1
+
+    # Clamp to valid range
+    x_idx = np.clip(x_idx, 0, len(x_vals) - 2)
+    y_idx = np.clip(y_idx, 0, len(y_vals) - 2)
+
+    # Get surrounding grid points
+    x0, x1 = x_vals[x_idx], x_vals[x_idx + 1]
+    y0, y1 = y_vals[y_idx], y_vals[y_idx + 1]
+
+    # Compute interpolation weights
+    tx = (x - x0) / (x1 - x0) if x1 != x0 else 0.0
+    ty = (y - y0) / (y1 - y0) if y1 != y0 else 0.0
+
+    # Bilinear interpolation
+    f00 = data[x_idx, y_idx]
+    f10 = data[x_idx + 1, y_idx]
+    f01 = data[x_idx, y_idx + 1]
+    f11 = data[x_idx + 1, y_idx + 1]
+
+    result = (1 - tx) * (1 - ty) * f00 + \
+             tx * (1 - ty) * f10 + \
+             (1 - tx) * ty * f01 + \
+             tx * ty * f11
+
+    return result
+
+
+def _cell_weights(q: np.ndarray, grid: np.ndarray):
+    """Lower cell index and fractional weight for each query (vectorized)."""
+    idx = np.clip(np.searchsorted(grid, q) - 1, 0, len(grid) - 2)
+    g0 = grid[idx]
+    span = grid[idx + 1] - g0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(span != 0, (q - g0) / span, 0.0)
+    return idx, t
+
+
+@dataclass
+class AeroGrid:
+    """
+    Coefficient tables sharing one α–Mach grid.
+
+    data holds all coefficients stacked on the last axis
+    [alpha_idx, mach_idx, coeff], so each query point needs one set of
+    index lookups and one gather for every coefficient.
+    """
+
+    names: tuple
+    alpha_deg: np.ndarray
+    mach: np.ndarray
+    data: np.ndarray
+
+    def interp(self, alpha_deg: np.ndarray, mach: np.ndarray) -> np.ndarray:
+        """
+        Bilinear interpolation at arrays of points.
+
+        Returns:
+            Array of shape alpha_deg.shape + (len(names),)
+        """
+        ix, tx = _cell_weights(alpha_deg, self.alpha_deg)
+        iy, ty = _cell_weights(mach, self.mach)
+        d = self.data
+        tx = tx[..., None]
+        ty = ty[..., None]
+        return (1 - tx) * (1 - ty) * d[ix, iy] + \
+            tx * (1 - ty) * d[ix + 1, iy] + \
+            (1 - tx) * ty * d[ix, iy + 1] + \
+            tx * ty * d[ix + 1, iy + 1]
+
+
+class AeroDatabase:
+    """
+    In-memory aerodynamic database for batch coefficient evaluation.
+
+    Tables that share an α–Mach grid are stacked into a single AeroGrid;
+    tables on different grids get a grid each.
+    """
+
+    def __init__(self, tables: Dict[str, tuple], coeffs: dict, control: dict):
+        """
+        Initialize database.
+
+        Args:
+            tables: Coefficient name -> (alpha_vals, mach_vals, data)
+            coeffs: Parsed coeffs_airframe.yaml
+            control: Parsed control_effectiveness.yaml
+        """
+        self.coeffs = coeffs
+        self.control = control
+        self.names = tuple(tables)
+
+        groups: Dict[tuple, list] = {}
+        for name, (alpha_vals, mach_vals, data) in tables.items():
+            groups.setdefault((tuple(alpha_vals), tuple(mach_vals)), []).append((name, data))
+
+        self.grids = [
+            AeroGrid(
+                names=tuple(name for name, _ in members),
+                alpha_deg=np.asarray(alpha_key, dtype=float),
+                mach=np.asarray(mach_key, dtype=float),
+                data=np.stack([np.asarray(data, dtype=float) for _, data in members], axis=-1),
+            )
+            for (alpha_key, mach_key), members in groups.items()
+        ]
+
+        trim = coeffs['trim']
+        delta = control['delta_effectiveness']
+        self.trim = {'CL': trim['CL0'], 'CD': trim['CD0'], 'Cm': trim['Cm0']}
+        self.delta_e = {'CL': delta['CL_delta_e'], 'Cm': delta['Cm_delta_e']}
+
+    @classmethod
+    def load(cls, params_dir: Optional[Union[str, Path]] = None) -> 'AeroDatabase':
+        """
+        Read tables and YAML parameters from a PARAMS directory.
+
+        Args:
+            params_dir: Path to PARAMS (defaults to this block's PARAMS/)
+        """
+        params_path = Path(params_dir) if params_dir else PARAMS_DIR
+        tables = {
+            name: load_csv_table(params_path / 'tables' / filename)
+            for name, filename in TABLE_FILES.items()
+        }
+        with open(params_path / 'coeffs_airframe.yaml', 'r') as f:
+            coeffs = yaml.safe_load(f)
+        with open(params_path / 'control_effectiveness.yaml', 'r') as f:
+            control = yaml.safe_load(f)
+        return cls(tables, coeffs, control)
+
+    def base_coeffs(self, alpha_deg: ArrayLike, mach: ArrayLike) -> Dict[str, np.ndarray]:
+        """Table coefficients (no trim or control terms) at broadcast points."""
+        alpha, mach = np.broadcast_arrays(
+            np.asarray(alpha_deg, dtype=float), np.asarray(mach, dtype=float)
+        )
+        out = {}
+        for grid in self.grids:
+            values = grid.interp(alpha, mach)
+            for k, name in enumerate(grid.names):
+                out[name] = values[..., k]
+        return out
+
+    def evaluate(
+        self,
+        alpha_deg: ArrayLike,
+        mach: ArrayLike,
+        delta_e_rad: ArrayLike = 0.0,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Compute aerodynamic coefficients for arrays of flight conditions.
+
+        Args:
+            alpha_deg: Angle of attack (degrees)
+            mach: Mach number
+            delta_e_rad: Elevator deflection (radians)
+
+        Inputs broadcast against each other.
+
+        Returns:
+            Dictionary with CL, CD, Cm arrays of the broadcast shape
+        """
+        alpha, mach, delta_e = np.broadcast_arrays(
+            np.asarray(alpha_deg, dtype=float),
+            np.asarray(mach, dtype=float),
+            np.asarray(delta_e_rad, dtype=float),
+        )
+        base = self.base_coeffs(alpha, mach)
+
+        # Same term order as the per-point build-up
+        CL = base['CL'] + self.trim['CL']
+        CD = base['CD'] + self.trim['CD']
+        Cm = base['Cm'] + self.trim['Cm']
+        CL = CL + self.delta_e['CL'] * delta_e
+        Cm = Cm + self.delta_e['Cm'] * delta_e
+
+        return {'CL': CL, 'CD': CD, 'Cm': Cm}
+
+
+@lru_cache(maxsize=None)
+def _cached_database(params_path: Path) -> AeroDatabase:
+    return AeroDatabase.load(params_path)
+
+
+def get_database(params_dir: Optional[Union[str, Path]] = None) -> AeroDatabase:
+    """Process-wide database for a PARAMS directory, loaded on first use."""
+    return _cached_database(Path(params_dir).resolve() if params_dir else PARAMS_DIR.resolve())
+
+
+def compute_aero_coeffs(alpha_deg, mach, delta_e_rad=0.0, params_dir=None):
+    """
+    Compute aerodynamic coefficients for a single flight condition.
+
+    Args:
+        alpha_deg: Angle of attack (degrees)
+        mach: Mach number
+        delta_e_rad: Elevator deflection (radians)
+        params_dir: Path to PARAMS directory (defaults to this block's PARAMS/)
+
+    Returns:
+        Dictionary with CL, CD, Cm values
+    """
+    result = get_database(params_dir).evaluate(alpha_deg, mach, delta_e_rad)
+    return {key: float(value) for key, value in result.items()}
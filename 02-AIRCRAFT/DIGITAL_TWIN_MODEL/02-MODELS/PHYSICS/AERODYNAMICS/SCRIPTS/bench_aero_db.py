@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+bench_aero_db.py - Aerodynamic coefficient lookup throughput
+
+Measures points per second for:
+1. Per-point build-up that re-reads the PARAMS tables on every call
+2. Per-point calls against the resident database
+3. Batched calls against the resident database
+
+Usage:
+    python bench_aero_db.py --points 1000 100000 1000000
+
+Author: Digital Twin Model Team
+Version: 1.0.0
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'MODELS'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'TESTS'))
+
+from aero_db import AeroDatabase, compute_aero_coeffs
+from test_aero_interp import reference_aero_coeffs
+
+
+def sample_points(n: int, seed: int = 0):
+    """Random (alpha, Mach, delta_e) points inside the table envelope."""
+    rng = np.random.default_rng(seed)
+    return (
+        rng.uniform(-10.0, 15.0, n),
+        rng.uniform(0.0, 0.8, n),
+        rng.uniform(-0.35, 0.35, n),
+    )
+
+
+def bench_per_point(fn, n: int) -> float:
+    alpha, mach, delta_e = sample_points(n)
+    t0 = time.perf_counter()
+    for i in range(n):
+        fn(alpha[i], mach[i], delta_e[i])
+    return n / (time.perf_counter() - t0)
+
+
+def bench_batch(db: AeroDatabase, n: int, repeats: int = 3) -> float:
+    alpha, mach, delta_e = sample_points(n)
+    best = float('inf')
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        db.evaluate(alpha, mach, delta_e)
+        best = min(best, time.perf_counter() - t0)
+    return n / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Aero database throughput')
+    parser.add_argument('--points', type=int, nargs='+', default=[1000, 100000, 1000000])
+    parser.add_argument('--per-point', type=int, default=2000,
+                        help='Points for the per-point (non-batched) measurements')
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    db = AeroDatabase.load()
+    print(f"load: {1e3 * (time.perf_counter() - t0):.2f} ms")
+
+    n = args.per_point
+    print(f"{'mode':<24} {'points':>10} {'points/s':>14}")
+    print(f"{'re-read per point':<24} {n // 10:>10} {bench_per_point(reference_aero_coeffs, n // 10):>14.0f}")
+    print(f"{'resident per point':<24} {n:>10} {bench_per_point(compute_aero_coeffs, n):>14.0f}")
+    for n in args.points:
+        print(f"{'resident batch':<24} {n:>10} {bench_batch(db, n):>14.0f}")
+
+
+if __name__ == '__main__':
+    main()
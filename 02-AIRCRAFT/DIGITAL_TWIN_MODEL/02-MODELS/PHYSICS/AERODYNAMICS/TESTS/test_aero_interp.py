@@ -7,124 +7,52 @@ for the aerodynamics block.
 Test data is provided in golden_inputs.npz and golden_outputs.npz.
 """
 
+import sys
 import numpy as np
 import yaml
-import csv
 from pathlib import Path
 
+# Add MODELS directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'MODELS'))
 
-def load_csv_table(filepath):
-    """
-    Load a CSV table with alpha_deg in first column and Mach numbers as headers.
-    
-    Returns:
-        alpha_vals: List of alpha values (degrees)
-        mach_vals: List of Mach values
-        data: 2D array of coefficient values [alpha_idx, mach_idx]
-    """
-    with open(filepath, 'r') as f:
-        reader = csv.reader(f)
-        header = next(reader)
-        
-        # Extract Mach values from header (skip first column which is 'alpha_deg')
-        mach_vals = [float(m) for m in header[1:]]
-        
-        alpha_vals = []
-        data_rows = []
-        
-        for row in reader:
-            alpha_vals.append(float(row[0]))
-            data_rows.append([float(v) for v in row[1:]])
-    
-    return alpha_vals, mach_vals, np.array(data_rows)
+from aero_db import AeroDatabase, bilinear_interp, compute_aero_coeffs, load_csv_table
 
 
-def bilinear_interp(x, y, x_vals, y_vals, data):
+def reference_aero_coeffs(alpha_deg, mach, delta_e_rad=0.0):
     """
-    Perform bilinear interpolation on a 2D grid.
-    
-    Args:
-        x: Query point x-coordinate (alpha in degrees)
-        y: Query point y-coordinate (Mach number)
-        x_vals: List of x grid values (alpha values)
-        y_vals: List of y grid values (Mach values)
-        data: 2D array of data values [x_idx, y_idx]
-    
-    Returns:
-        Interpolated value at (x, y)
-    """
-    # Find surrounding indices
-    x_idx = np.searchsorted(x_vals, x) - 1
-    y_idx = np.searchsorted(y_vals, y) - 1
-    
-    # Clamp to valid range
-    x_idx = np.clip(x_idx, 0, len(x_vals) - 2)
-    y_idx = np.clip(y_idx, 0, len(y_vals) - 2)
-    
-    # Get surrounding grid points
-    x0, x1 = x_vals[x_idx], x_vals[x_idx + 1]
-    y0, y1 = y_vals[y_idx], y_vals[y_idx + 1]
-    
-    # Compute interpolation weights
-    tx = (x - x0) / (x1 - x0) if x1 != x0 else 0.0
-    ty = (y - y0) / (y1 - y0) if y1 != y0 else 0.0
-    
-    # Bilinear interpolation
-    f00 = data[x_idx, y_idx]
-    f10 = data[x_idx + 1, y_idx]
-    f01 = data[x_idx, y_idx + 1]
-    f11 = data[x_idx + 1, y_idx + 1]
-    
-    result = (1 - tx) * (1 - ty) * f00 + \
-             tx * (1 - ty) * f10 + \
-             (1 - tx) * ty * f01 + \
-             tx * ty * f11
-    
-    return result
-
+    Per-point coefficient build-up that re-reads PARAMS on every call.
 
-def compute_aero_coeffs(alpha_deg, mach, delta_e_rad=0.0, params_dir='../PARAMS'):
-    """
-    Compute aerodynamic coefficients for given flight condition.
-    
-    Args:
-        alpha_deg: Angle of attack (degrees)
-        mach: Mach number
-        delta_e_rad: Elevator deflection (radians)
-        params_dir: Path to PARAMS directory
-    
-    Returns:
-        Dictionary with CL, CD, Cm values
+    Kept as the reference for the resident database.
     """
     params_path = Path(__file__).parent.parent / 'PARAMS'
-    
+
     # Load tables
     alpha_cl, mach_cl, cl_table = load_csv_table(params_path / 'tables' / 'CL_alpha_mach.csv')
     alpha_cd, mach_cd, cd_table = load_csv_table(params_path / 'tables' / 'CD_alpha_mach.csv')
     alpha_cm, mach_cm, cm_table = load_csv_table(params_path / 'tables' / 'Cm_alpha_mach.csv')
-    
+
     # Base coefficients from tables
     CL_base = bilinear_interp(alpha_deg, mach, alpha_cl, mach_cl, cl_table)
     CD_base = bilinear_interp(alpha_deg, mach, alpha_cd, mach_cd, cd_table)
     Cm_base = bilinear_interp(alpha_deg, mach, alpha_cm, mach_cm, cm_table)
-    
+
     # Load linear derivatives
     with open(params_path / 'coeffs_airframe.yaml', 'r') as f:
         coeffs = yaml.safe_load(f)
-    
+
     # Load control effectiveness
     with open(params_path / 'control_effectiveness.yaml', 'r') as f:
         control = yaml.safe_load(f)
-    
+
     # Add trim offsets
     CL = CL_base + coeffs['trim']['CL0']
     CD = CD_base + coeffs['trim']['CD0']
     Cm = Cm_base + coeffs['trim']['Cm0']
-    
+
     # Add control surface effects
     CL += control['delta_effectiveness']['CL_delta_e'] * delta_e_rad
     Cm += control['delta_effectiveness']['Cm_delta_e'] * delta_e_rad
-    
+
     return {'CL': CL, 'CD': CD, 'Cm': Cm}
 
 
@@ -210,6 +138,54 @@ def test_golden_data():
     print(f"✓ Golden data test passed ({n_cases} cases)")
 
 
+def test_golden_data_batch():
+    """Test that one batched call reproduces the per-point golden results."""
+    test_dir = Path(__file__).parent
+    inputs = np.load(test_dir / 'golden_inputs.npz')
+    outputs = np.load(test_dir / 'golden_outputs.npz')
+
+    result = AeroDatabase.load().evaluate(
+        inputs['alpha_deg'], inputs['mach'], inputs['delta_e_rad']
+    )
+    for key in ['CL', 'CD', 'Cm']:
+        expected = [reference_aero_coeffs(a, m, d)[key] for a, m, d in zip(
+            inputs['alpha_deg'], inputs['mach'], inputs['delta_e_rad'])]
+        assert np.array_equal(result[key], np.array(expected))
+        assert np.all(np.abs(result[key] - outputs[key]) < 1e-4)
+
+    print("✓ Batched golden data test passed")
+
+
+def test_batch_matches_reference():
+    """Test bit-identical batch results on and off the grid, including extrapolation."""
+    rng = np.random.default_rng(0)
+    alpha = np.concatenate([rng.uniform(-14.0, 19.0, 200), [-10.0, -5.0, 0.0, 15.0]])
+    mach = np.concatenate([rng.uniform(-0.1, 0.9, 200), [0.0, 0.2, 0.4, 0.8]])
+    delta_e = rng.uniform(-0.35, 0.35, alpha.size)
+
+    result = AeroDatabase.load().evaluate(alpha, mach, delta_e)
+    for i in range(alpha.size):
+        expected = reference_aero_coeffs(alpha[i], mach[i], delta_e[i])
+        for key in ['CL', 'CD', 'Cm']:
+            assert result[key][i] == expected[key], (key, alpha[i], mach[i])
+
+    print(f"✓ Batch reference test passed ({alpha.size} points)")
+
+
+def test_batch_broadcasting():
+    """Test that inputs broadcast to a common shape."""
+    db = AeroDatabase.load()
+    alpha = np.linspace(-10.0, 15.0, 7)[:, None]
+    mach = np.linspace(0.0, 0.8, 4)[None, :]
+    result = db.evaluate(alpha, mach, 0.1)
+
+    assert result['CL'].shape == (7, 4)
+    assert result['Cm'][3, 2] == db.evaluate(alpha[3, 0], mach[0, 2], 0.1)['Cm']
+    assert compute_aero_coeffs(alpha[3, 0], mach[0, 2], 0.1)['Cm'] == result['Cm'][3, 2]
+
+    print("✓ Broadcasting test passed")
+
+
 def test_table_loading():
     """Test that CSV tables can be loaded correctly."""
     params_path = Path(__file__).parent.parent / 'PARAMS' / 'tables'
@@ -238,5 +214,8 @@ if __name__ == '__main__':
     test_bilinear_interpolation()
     test_validation_case()
     test_golden_data()
+    test_golden_data_batch()
+    test_batch_matches_reference()
+    test_batch_broadcasting()
     
     print("\n✅ All tests passed!")
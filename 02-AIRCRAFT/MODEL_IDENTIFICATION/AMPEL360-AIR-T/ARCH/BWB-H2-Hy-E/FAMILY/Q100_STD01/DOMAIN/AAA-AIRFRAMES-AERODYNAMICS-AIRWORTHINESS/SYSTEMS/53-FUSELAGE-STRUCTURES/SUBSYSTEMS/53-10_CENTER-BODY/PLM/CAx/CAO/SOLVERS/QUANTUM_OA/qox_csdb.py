@@ -8,9 +8,15 @@ SSoT: UTCS v5.0 metadata on all public outputs
 
 This module implements `solve_qox(...)` with deterministic compile chain
 and testable hooks, as specified in the README.
+
+The QUBO is held in sparse adjacency form and local search evaluates
+single-bit flips incrementally: O(1) per move evaluation and O(degree)
+per accepted flip, with greedy, tabu and simulated-annealing modes run
+over independent, optionally parallel restarts.
 """
 from __future__ import annotations
-from dataclasses import dataclass, asdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict, field
 from typing import Any, Callable, Dict, List, Optional, Tuple
 import hashlib
 import json
@@ -38,23 +44,153 @@ def _utcs_id13() -> str:
     return ":".join(fields)
 
 
+def _stable_index(name: Any, n: int) -> int:
+    """Map a task name to a variable index, identically in every process."""
+    return int(hashlib.sha256(str(name).encode("utf-8")).hexdigest()[:16], 16) % n
+
+
 # ---------- Data classes ----------
 
+REFINE_MODES = ("greedy", "tabu", "sa")
+
+
 @dataclass
 class SolverCfg:
     solver: str = "qaoa"             # "qaoa" | "anneal" | "sa"
     p: int = 1
     shots: int = 4000
     seeds: int = 8
+    refine: str = "greedy"           # "greedy" | "tabu" | "sa"
+    restarts: int = 1                # best samples refined independently
+    workers: int = 1                 # processes for restarts
+    max_iters: int = 100             # sweeps (n move evaluations each) per restart
+
+
+@dataclass
+class SparseQubo:
+    """QUBO in adjacency-list form.
+
+    E(x) = sum_i (Q_ii + c_i) x_i + sum_{i<j} Q_ij x_i x_j, matching
+    `_qubo_energy` on the upper triangle of a dense Q. `adj[i]` lists
+    (j, Q_ij) for every coupled j, in both directions.
+    """
+    diag: List[float]
+    c: List[float]
+    adj: List[List[Tuple[int, float]]]
+    linear: List[float] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.linear = [d + ci for d, ci in zip(self.diag, self.c)]
+
+    @property
+    def n(self) -> int:
+        return len(self.diag)
+
+    @property
+    def nnz(self) -> int:
+        """Number of coupled pairs (i < j)."""
+        return sum(len(a) for a in self.adj) // 2
+
+    @classmethod
+    def from_dense(cls, Q: List[List[float]], c: List[float]) -> "SparseQubo":
+        n = len(c)
+        adj: List[List[Tuple[int, float]]] = [[] for _ in range(n)]
+        for i in range(n):
+            row = Q[i]
+            for j in range(i + 1, n):
+                if row[j] != 0.0:
+                    adj[i].append((j, row[j]))
+                    adj[j].append((i, row[j]))
+        return cls(diag=[Q[i][i] for i in range(n)], c=list(c), adj=adj)
+
+    def to_dense(self) -> List[List[float]]:
+        """Dense upper-triangular Q (for reference checks on small n)."""
+        n = self.n
+        Q = [[0.0] * n for _ in range(n)]
+        for i in range(n):
+            Q[i][i] = self.diag[i]
+            for j, w in self.adj[i]:
+                if j > i:
+                    Q[i][j] = w
+        return Q
+
+    def energy(self, x: List[int]) -> float:
+        """Full energy in O(n + nnz)."""
+        total = 0.0
+        for i, xi in enumerate(x):
+            if xi:
+                total += self.linear[i]
+                for j, w in self.adj[i]:
+                    if j > i and x[j]:
+                        total += w
+        return total
+
+
+class PenaltyModel:
+    """Incremental form of `_penalty`.
+
+    Penalties only depend on three aggregates of x: the number of set
+    bits, the storage weight used (IS) and the number of violated
+    precedence pairs (JSSP-ETL), so a flip updates them in O(degree).
+    """
+
+    def __init__(self, problem: str, constraints: Dict[str, Any], n: int):
+        self.problem = problem
+        self.n = n
+        self.weights = [1.0 + 0.2 * (i % 5) for i in range(n)]
+        self.budget = float(constraints.get("storage_budget_mb", 1e9)) / 100.0
+        self.pairs: List[Tuple[int, int]] = []
+        self.pairs_of: List[List[int]] = [[] for _ in range(n)]
+        if problem == "JSSP-ETL" and constraints.get("precedence"):
+            for k, (a, b) in enumerate(constraints["precedence"]):
+                ia, ib = _stable_index(a, n), _stable_index(b, n)
+                self.pairs.append((ia, ib))
+                self.pairs_of[ia].append(k)
+                if ib != ia:
+                    self.pairs_of[ib].append(k)
+
+    def aggregates(self, x: List[int]) -> Tuple[int, float, int]:
+        """(set bits, storage used, violated pairs) for x."""
+        used = 0.0
+        for xi, w in zip(x, self.weights):
+            used += xi * w
+        violated = sum(1 for a, b in self.pairs if x[a] > x[b])
+        return sum(x), used, violated
+
+    def value(self, count: int, used: float, violated: int) -> float:
+        if self.problem == "IS":
+            return used - self.budget if used > self.budget else 0.0
+        if self.problem == "JOO":
+            return 1.0 if count == 0 else 0.0
+        if self.problem == "JSSP-ETL":
+            return float(violated)
+        if self.problem == "RL":
+            if 1 <= count <= max(1, self.n // 2):
+                return 0.0
+            return float(abs(count - self.n // 3))
+        return 0.0
+
+    def flipped(self, i: int, x: List[int], count: int, used: float, violated: int) -> Tuple[int, float, int]:
+        """Aggregates after flipping bit i of x (x itself is not modified)."""
+        s = 1 - 2 * x[i]
+        count += s
+        used += s * self.weights[i]
+        for k in self.pairs_of[i]:
+            a, b = self.pairs[k]
+            xa = x[a] if a != i else 1 - x[a]
+            xb = x[b] if b != i else 1 - x[b]
+            violated += (xa > xb) - (x[a] > x[b])
+        return count, used, violated
 
 
 @dataclass
 class CompileArtifacts:
-    Q: List[List[float]]              # QUBO matrix (upper triangle allowed)
+    Q: SparseQubo                     # QUBO (sparse, quadratic + linear)
     c: List[float]                    # linear term
     lam: float                        # penalty scalar
     stats_sig: str                    # sha256 of input stats
     clip_info: Dict[str, Any]
+    penalty: Optional[PenaltyModel] = None
 
 
 # ---------- Hooks type ----------
@@ -81,16 +217,24 @@ def _normalize_clip_stats(S: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str,
     return S_norm, clip
 
 
-def _build_qubo(problem: str, S: Dict[str, Any], constraints: Dict[str, Any]) -> CompileArtifacts:
+def _build_qubo(
+    problem: str,
+    S: Dict[str, Any],
+    constraints: Dict[str, Any],
+    n_vars: Optional[int] = None,
+    avg_degree: float = 16.0,
+) -> CompileArtifacts:
     """UE: Build a simple QUBO template for the problem kind.
-    For stub: generate small dense Q and linear c with penalties.
+    For stub: generate sparse Q and linear c with penalties. Template sizes
+    couple each pair with probability 0.2; scaled instances (`n_vars`) keep
+    the expected degree near `avg_degree`.
     """
     S_norm, clip = _normalize_clip_stats(S)
     stats_sig = _sha256(S_norm)
     rng = random.Random(1337)
 
     # Size by problem type (kept tiny for tests)
-    n = {
+    n = n_vars or {
         "JOO": 10,
         "IS": 12,
         "JSSP-ETL": 14,
@@ -101,16 +245,23 @@ def _build_qubo(problem: str, S: Dict[str, Any], constraints: Dict[str, Any]) ->
     base = sum(t.get("card", 1.0) for t in S_norm.get("tables", []))
     base = math.log10(max(base, 10.0))
 
-    # QUBO: positive definite-ish with small off-diagonals
-    Q = [[0.0 for _ in range(n)] for _ in range(n)]
+    # QUBO: positive definite-ish with small off-diagonals. Coupled pairs
+    # are drawn by geometric skips, O(n + nnz) instead of O(n^2) draws.
+    density = min(0.2, avg_degree / max(n - 1, 1))
+    log_q = math.log(1.0 - density)
+    off = 0.02 * base
+    adj: List[List[Tuple[int, float]]] = [[] for _ in range(n)]
     for i in range(n):
-        Q[i][i] = 1.0 + 0.2 * base
-        for j in range(i + 1, n):
-            val = 0.02 * base * (1.0 if rng.random() < 0.2 else 0.0)
-            Q[i][j] = val
-            Q[j][i] = val
+        j = i
+        while True:
+            j += 1 + int(math.log(1.0 - rng.random()) / log_q)
+            if j >= n:
+                break
+            adj[i].append((j, off))
+            adj[j].append((i, off))
 
     c = [0.1 * base for _ in range(n)]
+    Q = SparseQubo(diag=[1.0 + 0.2 * base] * n, c=c, adj=adj)
 
     # Penalty scalar from constraints scale
     lam = 5.0
@@ -119,12 +270,16 @@ def _build_qubo(problem: str, S: Dict[str, Any], constraints: Dict[str, Any]) ->
     if problem == "JSSP-ETL":
         lam += 10.0  # precedence tighter
 
-    return CompileArtifacts(Q=Q, c=c, lam=lam, stats_sig=stats_sig, clip_info=clip)
+    return CompileArtifacts(
+        Q=Q, c=c, lam=lam, stats_sig=stats_sig, clip_info=clip,
+        penalty=PenaltyModel(problem, constraints or {}, n),
+    )
 
 
 # ---------- FE: Hybrid solve + classical refine ----------
 
 def _qubo_energy(Q: List[List[float]], c: List[float], x: List[int]) -> float:
+    # Dense reference; solver paths use SparseQubo.energy
     # x in {0,1}^n
     n = len(x)
     quad = 0.0
@@ -161,8 +316,8 @@ def _penalty(problem: str, constraints: Dict[str, Any], x: List[int]) -> Tuple[f
         # mock precedence: later index must be >= earlier index activation
         if constraints.get("precedence"):
             for (a, b) in constraints["precedence"]:
-                ia = abs(hash(a)) % len(x)
-                ib = abs(hash(b)) % len(x)
+                ia = _stable_index(a, len(x))
+                ib = _stable_index(b, len(x))
                 if x[ia] > x[ib]:
                     viol.setdefault("precedence", 0)
                     viol["precedence"] += 1
@@ -178,42 +333,224 @@ def _penalty(problem: str, constraints: Dict[str, Any], x: List[int]) -> Tuple[f
 
 def _sample_hybrid(art: CompileArtifacts, cfg: SolverCfg, hooks: Optional[Dict[str, Hook]]) -> Tuple[List[int], float, Dict[str, Any]]:
     # Stub sampler: generate `cfg.seeds` Bernoulli samples biased by diag(Q)
+    samples = _sample_candidates(art, cfg, hooks)
+    best_x, best_cost, best_meta = samples[0]
+    return best_x, float(best_cost), best_meta
+
+
+def _sample_candidates(art: CompileArtifacts, cfg: SolverCfg, hooks: Optional[Dict[str, Hook]]) -> List[Tuple[List[int], float, Dict[str, Any]]]:
+    """All `cfg.seeds` samples as (x, cost, meta), best first (ties keep sample order)."""
     n = len(art.c)
     rng = random.Random(4242)
-    best_x, best_cost, best_meta = None, float("inf"), {}
+    prob = [1.0 / (1.0 + math.exp(0.5 * d)) for d in art.Q.diag]
+    samples = []
     for s in range(cfg.seeds):
-        prob = [1.0 / (1.0 + math.exp(0.5 * art.Q[i][i])) for i in range(n)]
         x = [1 if rng.random() < p else 0 for p in prob]
         pen, viol = _penalty(problem_meta["problem"], problem_meta["constraints"], x)
-        cost = _qubo_energy(art.Q, art.c, x) + art.lam * pen
+        cost = art.Q.energy(x) + art.lam * pen
         if hooks and hooks.get("on_sample"):
             hooks["on_sample"](s, float(cost))
-        if cost < best_cost:
-            best_x, best_cost, best_meta = x, cost, {"viol": viol}
-    return best_x or [0]*n, float(best_cost), best_meta
+        samples.append((x, cost, {"viol": viol}))
+    if not samples:
+        return [([0] * n, float("inf"), {})]
+    order = sorted(range(len(samples)), key=lambda k: (samples[k][1], k))
+    return [samples[k] for k in order]
 
 
-def _local_refine(art: CompileArtifacts, x: List[int], max_iters: int = 100, hooks: Optional[Dict[str, Hook]] = None) -> Tuple[List[int], float, Dict[str, Any]]:
-    # Simple 1-bit flip hill-climb with penalty awareness
-    best_x = x[:]
-    best_pen, best_viol = _penalty(problem_meta["problem"], problem_meta["constraints"], best_x)
-    best_cost = _qubo_energy(art.Q, art.c, best_x) + art.lam * best_pen
-    n = len(x)
+class FlipState:
+    """Current assignment with incremental objective bookkeeping.
+
+    `field[i]` is the energy change rate of bit i given the other bits,
+    so the energy delta of flipping i is (1 - 2 x_i) * field[i].
+    """
+
+    def __init__(self, qubo: SparseQubo, penalty: PenaltyModel, lam: float, x: List[int]):
+        self.qubo = qubo
+        self.penalty = penalty
+        self.lam = lam
+        self.x = list(x)
+        self.field = list(qubo.linear)
+        for i, xi in enumerate(self.x):
+            if xi:
+                for j, w in qubo.adj[i]:
+                    self.field[j] += w
+        self.energy = qubo.energy(self.x)
+        self.aggr = penalty.aggregates(self.x)
+        self.pen = penalty.value(*self.aggr)
+        self.flips = 0
+        self.evals = 0
+
+    @property
+    def cost(self) -> float:
+        return self.energy + self.lam * self.pen
+
+    def delta(self, i: int) -> float:
+        """Objective change from flipping bit i, without flipping it."""
+        self.evals += 1
+        d_energy = self.field[i] if self.x[i] == 0 else -self.field[i]
+        aggr = self.penalty.flipped(i, self.x, *self.aggr)
+        return d_energy + self.lam * (self.penalty.value(*aggr) - self.pen)
+
+    def flip(self, i: int) -> None:
+        """Flip bit i and update fields of its neighbours."""
+        s = 1 - 2 * self.x[i]
+        self.energy += s * self.field[i]
+        self.aggr = self.penalty.flipped(i, self.x, *self.aggr)
+        self.pen = self.penalty.value(*self.aggr)
+        self.x[i] ^= 1
+        field_ = self.field
+        for j, w in self.qubo.adj[i]:
+            field_[j] += s * w
+        self.flips += 1
+
+
+def _greedy_search(state: FlipState, max_iters: int, rng: random.Random, trace: List[Tuple[float, bool]]) -> Tuple[List[int], float]:
+    # 1-bit flip first-improvement hill climb (the original refine)
+    n = len(state.x)
     for it in range(max_iters):
         improved = False
         for i in range(n):
-            cand = best_x[:]
-            cand[i] ^= 1
-            pen, viol = _penalty(problem_meta["problem"], problem_meta["constraints"], cand)
-            cost = _qubo_energy(art.Q, art.c, cand) + art.lam * pen
-            if cost + 1e-9 < best_cost:
-                best_x, best_cost, best_pen, best_viol = cand, cost, pen, viol
+            if state.delta(i) < -1e-9:
+                state.flip(i)
                 improved = True
-        if hooks and hooks.get("on_refine"):
-            hooks["on_refine"](float(best_cost), best_pen == 0.0)
+        trace.append((state.cost, state.pen == 0.0))
         if not improved:
             break
-    return best_x, float(best_cost), {"viol": best_viol}
+    return state.x[:], state.cost
+
+
+def _tabu_search(state: FlipState, max_iters: int, rng: random.Random, trace: List[Tuple[float, bool]],
+                 tenure: Optional[int] = None, candidates: int = 128) -> Tuple[List[int], float]:
+    # Greedy descent to a local optimum, then best-move tabu search over a
+    # sampled neighbourhood (all n moves when n <= candidates); each sweep
+    # takes min(n, candidates) tabu steps so its cost stays bounded in n
+    n = len(state.x)
+    _greedy_search(state, max_iters, rng, [])
+    tenure = tenure or max(1, min(20, n // 4))
+    tabu_until = [0] * n
+    best_x, best_cost, best_feasible = state.x[:], state.cost, state.pen == 0.0
+    steps = min(n, candidates)
+    step = 0
+    stale = 0
+    for it in range(max_iters):
+        improved = False
+        for _ in range(steps):
+            step += 1
+            moves = range(n) if n <= candidates else rng.sample(range(n), candidates)
+            move, move_delta = -1, float("inf")
+            for i in moves:
+                d = state.delta(i)
+                # Aspiration: a tabu move is allowed if it beats the best so far
+                if tabu_until[i] > step and state.cost + d >= best_cost - 1e-9:
+                    continue
+                if d < move_delta:
+                    move, move_delta = i, d
+            if move < 0:
+                break
+            state.flip(move)
+            tabu_until[move] = step + tenure
+            if state.cost < best_cost - 1e-9:
+                best_x, best_cost, best_feasible = state.x[:], state.cost, state.pen == 0.0
+                improved = True
+        trace.append((best_cost, best_feasible))
+        stale = 0 if improved else stale + 1
+        if stale >= 3:
+            break
+    return best_x, best_cost
+
+
+def _anneal_search(state: FlipState, max_iters: int, rng: random.Random, trace: List[Tuple[float, bool]]) -> Tuple[List[int], float]:
+    # Simulated annealing with a geometric schedule, then a greedy polish
+    n = len(state.x)
+    scale = sum(abs(state.delta(i)) for i in range(n)) / max(n, 1)
+    t_start = 2.0 * scale if scale > 0 else 1.0
+    t_end = 1e-3 * t_start
+    alpha = (t_end / t_start) ** (1.0 / max(max_iters - 1, 1))
+    best_x, best_cost, best_feasible = state.x[:], state.cost, state.pen == 0.0
+    temp = t_start
+    for it in range(max_iters):
+        for _ in range(n):
+            i = rng.randrange(n)
+            d = state.delta(i)
+            if d <= 0.0 or rng.random() < math.exp(-d / temp):
+                state.flip(i)
+        if state.cost < best_cost - 1e-9:
+            best_x, best_cost, best_feasible = state.x[:], state.cost, state.pen == 0.0
+        trace.append((best_cost, best_feasible))
+        temp *= alpha
+
+    polish = FlipState(state.qubo, state.penalty, state.lam, best_x)
+    x, cost = _greedy_search(polish, max_iters, rng, [])
+    state.flips += polish.flips
+    state.evals += polish.evals
+    if cost < best_cost - 1e-9:
+        best_x, best_cost = x, cost
+    return best_x, best_cost
+
+
+_SEARCHES = {
+    "greedy": _greedy_search,
+    "tabu": _tabu_search,
+    "sa": _anneal_search,
+}
+
+
+def _restart_seed(restart: int) -> int:
+    """Per-restart RNG seed; depends only on the restart index."""
+    return 4242 * 1_000_003 + restart
+
+
+def _run_restart(task: Tuple[SparseQubo, PenaltyModel, float, List[int], str, int, int]) -> Dict[str, Any]:
+    """Refine one start point. Top-level so it can run in a worker process."""
+    qubo, penalty, lam, x0, mode, max_iters, restart = task
+    state = FlipState(qubo, penalty, lam, x0)
+    trace: List[Tuple[float, bool]] = []
+    x, cost = _SEARCHES[mode](state, max_iters, random.Random(_restart_seed(restart)), trace)
+    return {"x": x, "cost": cost, "trace": trace, "flips": state.flips, "evals": state.evals}
+
+
+def _refine_restarts(art: CompileArtifacts, starts: List[List[int]], cfg: SolverCfg,
+                     hooks: Optional[Dict[str, Hook]] = None) -> Tuple[List[int], float, Dict[str, Any]]:
+    """Refine each start independently and keep the best.
+
+    Results do not depend on `cfg.workers`: each restart has its own RNG,
+    ties go to the lowest restart index, and `on_refine` hooks are replayed
+    in restart order.
+    """
+    if cfg.refine not in _SEARCHES:
+        raise ValueError(f"unknown refine mode {cfg.refine!r}; expected one of {REFINE_MODES}")
+    penalty = art.penalty or PenaltyModel(problem_meta["problem"], problem_meta["constraints"], len(art.c))
+    tasks = [(art.Q, penalty, art.lam, x0, cfg.refine, cfg.max_iters, r) for r, x0 in enumerate(starts)]
+
+    if cfg.workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(cfg.workers, len(tasks))) as pool:
+            results = list(pool.map(_run_restart, tasks))
+    else:
+        results = [_run_restart(t) for t in tasks]
+
+    if hooks and hooks.get("on_refine"):
+        for res in results:
+            for cost, feasible in res["trace"]:
+                hooks["on_refine"](float(cost), feasible)
+
+    best = min(range(len(results)), key=lambda r: (results[r]["cost"], r))
+    best_x = results[best]["x"]
+    pen, viol = _penalty(problem_meta["problem"], problem_meta["constraints"], best_x)
+    cost = art.Q.energy(best_x) + art.lam * pen
+    stats = {
+        "viol": viol,
+        "restart": best,
+        "flips": sum(r["flips"] for r in results),
+        "evals": sum(r["evals"] for r in results),
+    }
+    return best_x, float(cost), stats
+
+
+def _local_refine(art: CompileArtifacts, x: List[int], max_iters: int = 100, hooks: Optional[Dict[str, Hook]] = None,
+                  mode: str = "greedy") -> Tuple[List[int], float, Dict[str, Any]]:
+    # Single-start refine; 1-bit flip hill-climb with penalty awareness by default
+    cfg = SolverCfg(refine=mode, max_iters=max_iters)
+    return _refine_restarts(art, [x], cfg, hooks)
 
 
 # ---------- Global meta for stub (keeps function signature clean) ----------
@@ -237,10 +574,21 @@ def solve_qox(
     hooks: Optional[Dict[str, Hook]] = None,
     uid: str = "QOx-CSDB_20251014",
     calib_sig: Optional[str] = None,
+    refine: str = "greedy",
+    restarts: int = 1,
+    workers: int = 1,
+    max_iters: int = 100,
+    n_vars: Optional[int] = None,
 ) -> Dict[str, Any]:
     """Compile, solve, refine, verify and emit UTCS-bound artifacts.
     Returns a dict with solution `x`, `cost`, lower-bound gap estimate, feasibility,
     violations, and UTCS `meta` including KPIs.
+
+    `refine` selects the local search ("greedy" 1-bit hill climb, "tabu" or
+    "sa"); the best `restarts` of the `seeds` samples are refined
+    independently, across `workers` processes. `n_vars` overrides the
+    template problem size. The result is reproducible for fixed arguments
+    and does not depend on `workers`.
     """
     # Store problem meta for internal helpers
     problem_meta["problem"] = problem
@@ -248,29 +596,36 @@ def solve_qox(
 
     # CI/NISQ budgets
     assert shots <= 8000, "shots budget exceeded"
+    if refine not in REFINE_MODES:
+        raise ValueError(f"unknown refine mode {refine!r}; expected one of {REFINE_MODES}")
 
     # QS→FWD→UE: compile
-    art = _build_qubo(problem, S, constraints)
+    art = _build_qubo(problem, S, constraints, n_vars=n_vars)
     qubo_stats = {
         "n": len(art.c),
         "lam": art.lam,
-        "diag_mean": sum(art.Q[i][i] for i in range(len(art.c))) / len(art.c),
+        "diag_mean": sum(art.Q.diag) / len(art.c),
+        "nnz": art.Q.nnz,
     }
     if hooks and hooks.get("on_compile"):
         hooks["on_compile"](qubo_stats)
 
     # FE: hybrid sample
-    cfg = SolverCfg(solver=solver, p=p, shots=shots, seeds=seeds)
-    x0, cost0, meta0 = _sample_hybrid(art, cfg, hooks)
+    cfg = SolverCfg(
+        solver=solver, p=p, shots=shots, seeds=seeds,
+        refine=refine, restarts=restarts, workers=workers, max_iters=max_iters,
+    )
+    samples = _sample_candidates(art, cfg, hooks)
 
-    # Classical local refine
-    x1, cost1, meta1 = _local_refine(art, x0, 100, hooks)
+    # Classical local refine from the best `restarts` samples
+    starts = [x for x, _, _ in samples[:max(1, restarts)]]
+    x1, cost1, meta1 = _refine_restarts(art, starts, cfg, hooks)
 
     # CB: feasibility and gap bound (mock LB via relaxation proxy)
     pen1, viol1 = _penalty(problem, constraints, x1)
     feasible = (pen1 == 0.0) and (not viol1)
     # crude LB: take cost without penalties using continuous relaxation proxy
-    lb = _qubo_energy(art.Q, art.c, [min(1, xi) for xi in x1])  # same as x1 since binary; placeholder
+    lb = art.Q.energy([min(1, xi) for xi in x1])  # same as x1 since binary; placeholder
     gap_lb = 0.0 if lb == 0 else max(0.0, (cost1 - lb) / max(1.0, abs(cost1)))
 
     # KPIs (placeholders; to be wired to real backends in impl)
@@ -298,6 +653,7 @@ def solve_qox(
         "bench_case": problem,
         "kpi": kpi,
         "solver": asdict(cfg),
+        "search": {k: meta1[k] for k in ("restart", "flips", "evals")},
         "stats_sig": art.stats_sig,
     }
 
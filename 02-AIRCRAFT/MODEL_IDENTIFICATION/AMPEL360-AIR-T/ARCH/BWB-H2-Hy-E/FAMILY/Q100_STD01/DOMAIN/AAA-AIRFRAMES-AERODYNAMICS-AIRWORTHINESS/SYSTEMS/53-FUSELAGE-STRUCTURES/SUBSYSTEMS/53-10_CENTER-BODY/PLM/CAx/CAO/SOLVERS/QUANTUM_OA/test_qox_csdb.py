@@ -9,7 +9,12 @@ from pathlib import Path
 # Add parent directory to path to import qox_csdb
 sys.path.insert(0, str(Path(__file__).parent))
 
-from qox_csdb import solve_qox
+import random
+
+import pytest
+
+import qox_csdb
+from qox_csdb import solve_qox, SparseQubo, FlipState, _build_qubo, _penalty, _qubo_energy
 
 
 def _dummy_stats():
@@ -198,6 +203,88 @@ def test_different_problems_produce_different_solutions():
     assert rec_joo["meta"]["solver"]["solver"] == rec_is["meta"]["solver"]["solver"]
 
 
+_PROBLEM_CONSTRAINTS = {
+    "JOO": {"sla_ms_p95": 300},
+    "IS": {"storage_budget_mb": 500},
+    "JSSP-ETL": {"precedence": [["extract", "transform"], ["transform", "load"], ["load", "load"]]},
+    "RL": {"precision_min": 0.9},
+}
+
+
+def test_sparse_energy_matches_dense():
+    """Test that the sparse QUBO energy matches the dense reference."""
+    rng = random.Random(0)
+    for problem, constraints in _PROBLEM_CONSTRAINTS.items():
+        art = _build_qubo(problem, _dummy_stats(), constraints)
+        Q = art.Q.to_dense()
+        assert SparseQubo.from_dense(Q, art.c).adj == art.Q.adj
+        for _ in range(20):
+            x = [rng.randint(0, 1) for _ in art.c]
+            assert art.Q.energy(x) == pytest.approx(_qubo_energy(Q, art.c, x), abs=1e-12)
+
+
+@pytest.mark.parametrize("problem", sorted(_PROBLEM_CONSTRAINTS))
+def test_flip_delta_matches_full_recompute(problem):
+    """Test incremental flip deltas against full energy + penalty recomputation."""
+    constraints = _PROBLEM_CONSTRAINTS[problem]
+    art = _build_qubo(problem, _dummy_stats(), constraints, n_vars=40)
+    rng = random.Random(1)
+
+    def full_cost(x):
+        pen, _ = _penalty(problem, constraints, x)
+        return art.Q.energy(x) + art.lam * pen
+
+    state = FlipState(art.Q, art.penalty, art.lam, [rng.randint(0, 1) for _ in art.c])
+    for _ in range(300):
+        i = rng.randrange(len(art.c))
+        before = full_cost(state.x)
+        delta = state.delta(i)
+        state.flip(i)
+        assert full_cost(state.x) - before == pytest.approx(delta, abs=1e-9)
+        assert state.cost == pytest.approx(full_cost(state.x), abs=1e-9)
+
+
+@pytest.mark.parametrize("refine", ["greedy", "tabu", "sa"])
+def test_refine_modes_are_reproducible(refine):
+    """Test that each refine mode is deterministic and independent of worker count."""
+    S = _dummy_stats()
+    constraints = _PROBLEM_CONSTRAINTS["JSSP-ETL"]
+    kwargs = dict(refine=refine, restarts=3, max_iters=20, n_vars=60)
+    rec1 = solve_qox("JSSP-ETL", S, constraints, **kwargs)
+    rec2 = solve_qox("JSSP-ETL", S, constraints, **kwargs)
+    rec3 = solve_qox("JSSP-ETL", S, constraints, workers=2, **kwargs)
+    assert rec1["x"] == rec2["x"] == rec3["x"]
+    assert rec1["cost"] == rec2["cost"] == rec3["cost"]
+    assert rec1["meta"]["solver"]["refine"] == refine
+
+
+def test_refine_modes_do_not_regress_on_samples():
+    """Test that every refine mode ends at or below the best sampled cost."""
+    S = _dummy_stats()
+    constraints = _PROBLEM_CONSTRAINTS["IS"]
+    sampled = []
+    hooks = {"on_sample": lambda idx, cost: sampled.append(cost)}
+    for refine in ("greedy", "tabu", "sa"):
+        sampled.clear()
+        rec = solve_qox("IS", S, constraints, refine=refine, restarts=2, n_vars=80, hooks=hooks)
+        assert rec["cost"] <= min(sampled) + 1e-9
+
+
+def test_large_instance_is_sparse():
+    """Test that scaled instances keep bounded degree and solve quickly."""
+    rec = solve_qox("JOO", _dummy_stats(), {"sla_ms_p95": 300}, n_vars=5000, max_iters=5)
+    assert len(rec["x"]) == 5000
+    assert rec["meta"]["search"]["evals"] > 0
+    art = _build_qubo("JOO", _dummy_stats(), {}, n_vars=5000)
+    assert art.Q.nnz < 5000 * 12
+
+
+def test_unknown_refine_mode_rejected():
+    """Test that an unknown refine mode raises ValueError."""
+    with pytest.raises(ValueError):
+        solve_qox("JOO", _dummy_stats(), {}, refine="exhaustive")
+
+
 if __name__ == "__main__":
     # Run tests when executed directly
     print("Running QOx-CSDB tests...\n")
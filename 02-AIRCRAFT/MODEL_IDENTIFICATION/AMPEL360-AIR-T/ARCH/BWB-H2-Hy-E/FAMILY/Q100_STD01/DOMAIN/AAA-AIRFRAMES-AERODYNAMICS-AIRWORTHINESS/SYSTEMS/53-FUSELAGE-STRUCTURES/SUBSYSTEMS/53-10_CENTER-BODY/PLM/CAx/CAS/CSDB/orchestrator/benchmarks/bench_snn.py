@@ -0,0 +1,100 @@
+"""
+Spiking GNN Throughput Benchmark
+
+Measures CPU events per second for SpikingGNN.forward with the per-neuron
+reference engine and the tensorized engine (dense and sparse connectivity,
+single events and micro-batches).
+
+Usage:
+    cd benchmarks
+    python bench_snn.py --nodes 500 --steps 100 --batch 32
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import torch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from snn_core import SpikingGNN, create_default_snn
+
+
+def random_edge_index(num_nodes, avg_degree, seed=0):
+    """Random sparse graph with self loops, roughly avg_degree edges per node."""
+    gen = torch.Generator().manual_seed(seed)
+    num_edges = num_nodes * avg_degree
+    source = torch.randint(0, num_nodes, (num_edges,), generator=gen)
+    target = torch.randint(0, num_nodes, (num_edges,), generator=gen)
+    loops = torch.arange(num_nodes)
+    return torch.stack([torch.cat([source, loops]), torch.cat([target, loops])])
+
+
+def random_events(num_events, num_nodes, seed=0):
+    """Event spike vectors with a handful of active nodes each."""
+    gen = torch.Generator().manual_seed(seed)
+    events = torch.zeros(num_events, num_nodes)
+    for i in range(num_events):
+        active = torch.randint(0, num_nodes, (4,), generator=gen)
+        events[i, active] = torch.rand(4, generator=gen)
+    return events
+
+
+def events_per_second(model, events, num_steps, batch_size):
+    """Process all events in batches of batch_size and return events/s."""
+    with torch.no_grad():
+        model(events[:batch_size], num_steps=num_steps)  # warm-up
+        start = time.perf_counter()
+        for i in range(0, len(events), batch_size):
+            model(events[i:i + batch_size], num_steps=num_steps)
+        elapsed = time.perf_counter() - start
+    return len(events) / elapsed
+
+
+def run(num_nodes, num_steps, batch_size, num_events, reference_events, avg_degree):
+    torch.manual_seed(0)
+    events = random_events(num_events, num_nodes)
+    edge_index = random_edge_index(num_nodes, avg_degree)
+
+    dense = create_default_snn(num_nodes)
+    sparse = create_default_snn(num_nodes, edge_index=edge_index)
+
+    print(f"nodes={num_nodes} steps={num_steps} edges={edge_index.shape[1]} "
+          f"threads={torch.get_num_threads()}")
+    print(f"{'engine':<10} {'adjacency':<10} {'batch':>6} {'events/s':>12}")
+
+    rows = []
+    if reference_events:
+        reference = create_default_snn(num_nodes)
+        reference.engine = "neuron"
+        rows.append(("neuron", "dense", 1,
+                     events_per_second(reference, events[:reference_events], num_steps, 1)))
+    rows.append(("tensor", "dense", 1, events_per_second(dense, events, num_steps, 1)))
+    rows.append(("tensor", "sparse", 1, events_per_second(sparse, events, num_steps, 1)))
+    rows.append(("tensor", "dense", batch_size,
+                 events_per_second(dense, events, num_steps, batch_size)))
+    rows.append(("tensor", "sparse", batch_size,
+                 events_per_second(sparse, events, num_steps, batch_size)))
+
+    for engine, adjacency, batch, rate in rows:
+        print(f"{engine:<10} {adjacency:<10} {batch:>6} {rate:>12.1f}")
+
+    print(f"\nparameters: dense={sum(p.numel() for p in dense.parameters())} "
+          f"sparse={sum(p.numel() for p in sparse.parameters())}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Spiking GNN events/s benchmark")
+    parser.add_argument("--nodes", type=int, default=500)
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--batch", type=int, default=32)
+    parser.add_argument("--events", type=int, default=256)
+    parser.add_argument("--reference-events", type=int, default=2,
+                        help="events for the slow per-neuron engine (0 to skip)")
+    parser.add_argument("--avg-degree", type=int, default=8)
+    args = parser.parse_args()
+
+    run(args.nodes, args.steps, args.batch, args.events,
+        args.reference_events, args.avg_degree)
@@ -19,7 +19,7 @@ from typing import Optional
 
 from graph_builder import CSDBGraphBuilder
 from aer_encoder import AEREncoder, create_node_mapping, parse_csdb_event_log
-from snn_core import create_default_snn, STDPLearning
+from snn_core import create_default_snn, graph_edge_index, STDPLearning
 from policy_layer import PolicyLayer, ExplainabilityEngine
 
 
@@ -64,9 +64,18 @@ class S1000DOrchestrator:
         logger.info("Initializing neural models...")
         
         num_nodes = self.graph.number_of_nodes() if self.graph else 500
+        node_ids = list(self.graph.nodes()) if self.graph else []
+        node_mapping = create_node_mapping(node_ids)
         
-        # Create SNN
-        self.snn_model = create_default_snn(num_csdb_nodes=num_nodes)
+        # Create SNN (one weight per CSDB graph edge when sparse)
+        edge_index = None
+        if self.graph and self.config['snn'].get('sparse_adjacency', False):
+            edge_index = graph_edge_index(self.graph, node_mapping)
+            logger.info(f"Sparse adjacency with {edge_index.shape[1]} synapses")
+        self.snn_model = create_default_snn(
+            num_csdb_nodes=num_nodes,
+            edge_index=edge_index
+        )
         logger.info(f"SNN created with {sum(p.numel() for p in self.snn_model.parameters())} parameters")
         
         # Create policy layer
@@ -75,8 +84,6 @@ class S1000DOrchestrator:
         logger.info("Policy layer initialized")
         
         # Create AER encoder
-        node_ids = list(self.graph.nodes()) if self.graph else []
-        node_mapping = create_node_mapping(node_ids)
         self.aer_encoder = AEREncoder(
             node_mapping=node_mapping,
             window_size_ms=self.config['aer']['window_size_ms']
@@ -102,56 +109,67 @@ class S1000DOrchestrator:
         
     def process_event(self, event):
         """Process single CSDB event through the pipeline"""
-        # Encode event to spikes
-        spikes = self.aer_encoder.encode_event(event)
-        
-        # Convert to tensor
-        spike_tensor = torch.zeros(len(self.aer_encoder.node_mapping))
-        for spike in spikes:
-            if 0 <= spike.address < len(spike_tensor):
-                spike_tensor[spike.address] = spike.intensity
-        
-        # Run through SNN
-        spike_tensor = spike_tensor.unsqueeze(0)  # Add batch dim
-        snn_output, spike_traces = self.snn_model(spike_tensor, num_steps=100)
-        
-        # Get policy decisions
-        policy_outputs = self.policy_layer(snn_output)
+        return self.process_events([event])[0]
+    
+    def process_events(self, events):
+        """
+        Process a micro-batch of CSDB events with one SNN simulation
+        
+        Each event is an independent batch row, so results match calling
+        process_event on every event in turn.
+        """
+        # Encode events to spikes, one row per event
+        num_nodes = len(self.aer_encoder.node_mapping)
+        spike_tensor = torch.zeros(len(events), num_nodes)
+        for row, event in enumerate(events):
+            for spike in self.aer_encoder.encode_event(event):
+                if 0 <= spike.address < num_nodes:
+                    spike_tensor[row, spike.address] = spike.intensity
+        
+        # Run through SNN and policy layer
+        num_steps = self.config['snn'].get('num_steps', 100)
+        with torch.no_grad():
+            snn_output, spike_traces = self.snn_model(spike_tensor, num_steps=num_steps)
+            policy_outputs = self.policy_layer(snn_output)
         
         # Decode decisions
         node_ids = list(self.aer_encoder.node_mapping.keys())
         
-        routing = self.policy_layer.decode_routing(
-            policy_outputs['routing'][0],
-            reviewer_ids=[f"reviewer_{i}" for i in range(10)]
-        )
-        
-        priority = self.policy_layer.decode_priority(
-            policy_outputs['priority'][0]
-        )
-        
-        impact = self.policy_layer.decode_impact(
-            policy_outputs['impact'][0],
-            dmc_ids=node_ids
-        )
-        
-        guard = self.policy_layer.decode_guard(
-            policy_outputs['guard'][0],
-            brex_violations=[]  # Would check BREX in real implementation
-        )
-        
-        explanation = self.explainability.explain_decision(
-            snn_output[0],
-            spike_traces
-        )
+        results = []
+        for row in range(len(events)):
+            routing = self.policy_layer.decode_routing(
+                policy_outputs['routing'][row],
+                reviewer_ids=[f"reviewer_{i}" for i in range(10)]
+            )
+            
+            priority = self.policy_layer.decode_priority(
+                policy_outputs['priority'][row]
+            )
+            
+            impact = self.policy_layer.decode_impact(
+                policy_outputs['impact'][row],
+                dmc_ids=node_ids
+            )
+            
+            guard = self.policy_layer.decode_guard(
+                policy_outputs['guard'][row],
+                brex_violations=[]  # Would check BREX in real implementation
+            )
+            
+            explanation = self.explainability.explain_decision(
+                snn_output[row],
+                [trace[row:row + 1] for trace in spike_traces]
+            )
+            
+            results.append({
+                'routing': routing,
+                'priority': priority,
+                'impact': impact,
+                'guard': guard,
+                'explanation': explanation
+            })
         
-        return {
-            'routing': routing,
-            'priority': priority,
-            'impact': impact,
-            'guard': guard,
-            'explanation': explanation
-        }
+        return results
     
     def run_shadow_mode(self, event_log_path: str):
         """Run in shadow mode (compare with baseline)"""
@@ -160,16 +178,19 @@ class S1000DOrchestrator:
         events = parse_csdb_event_log(event_log_path)
         logger.info(f"Loaded {len(events)} events")
         
+        events = events[:100]  # Limit for demo
+        batch_size = self.config.get('performance', {}).get('max_parallel_events', 1)
+        
         results = []
-        for i, event in enumerate(events[:100]):  # Limit for demo
-            if i % 10 == 0:
-                logger.info(f"Processing event {i}/{len(events[:100])}")
+        for i in range(0, len(events), batch_size):
+            logger.info(f"Processing event {i}/{len(events)}")
             
-            decision = self.process_event(event)
-            results.append({
-                'event': event,
-                'decision': decision
-            })
+            batch = events[i:i + batch_size]
+            for event, decision in zip(batch, self.process_events(batch)):
+                results.append({
+                    'event': event,
+                    'decision': decision
+                })
         
         logger.info(f"Shadow mode complete: {len(results)} events processed")
         return results
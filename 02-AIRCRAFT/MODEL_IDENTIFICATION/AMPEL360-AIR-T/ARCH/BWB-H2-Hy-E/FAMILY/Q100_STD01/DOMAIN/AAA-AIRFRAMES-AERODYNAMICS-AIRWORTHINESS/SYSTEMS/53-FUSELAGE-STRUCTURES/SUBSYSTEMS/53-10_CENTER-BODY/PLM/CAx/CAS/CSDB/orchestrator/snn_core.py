@@ -69,6 +69,111 @@ class LIFNeuron(nn.Module):
         return self.v_mem, False
 
 
+@dataclass
+class LIFState:
+    """Membrane state for a whole layer of LIF neurons"""
+    v_mem: torch.Tensor
+    i_syn: torch.Tensor
+    refractory_counter: torch.Tensor
+
+
+class LIFLayer(nn.Module):
+    """
+    Tensorized LIF dynamics for a layer of neurons
+    
+    Applies the same update as LIFNeuron to every neuron and batch element
+    at once, with state held as [batch_size, num_neurons] tensors.
+    """
+    
+    def __init__(self, config: LIFConfig):
+        super().__init__()
+        self.config = config
+        
+    def init_state(self, like: torch.Tensor) -> LIFState:
+        """Resting state shaped, typed and placed like the given tensor"""
+        return LIFState(
+            v_mem=torch.full_like(like, self.config.v_rest),
+            i_syn=torch.zeros_like(like),
+            refractory_counter=torch.zeros_like(like)
+        )
+        
+    def step(self, i_input: torch.Tensor, state: LIFState) -> torch.Tensor:
+        """
+        Simulate one time step for all neurons, updating state in place
+        
+        Args:
+            i_input: Input current [batch_size, num_neurons]
+            state: Layer state from init_state
+            
+        Returns:
+            Spikes as 0/1 tensor [batch_size, num_neurons]
+        """
+        cfg = self.config
+        
+        # Refractory neurons ignore input and only count down
+        active = state.refractory_counter <= 0
+        refractory = torch.where(
+            active, state.refractory_counter, state.refractory_counter - cfg.dt
+        )
+        
+        # Same operation order as LIFNeuron.forward
+        i_syn = state.i_syn + (-state.i_syn / cfg.tau_syn + i_input) * cfg.dt
+        dv = (-(state.v_mem - cfg.v_rest) + i_syn) / cfg.tau_mem
+        v_mem = state.v_mem + dv * cfg.dt
+        i_syn = torch.where(active, i_syn, state.i_syn)
+        v_mem = torch.where(active, v_mem, state.v_mem)
+        
+        # Spike detection and reset
+        spikes = active & (v_mem >= cfg.v_thresh)
+        state.v_mem = v_mem.masked_fill(spikes, cfg.v_reset)
+        state.i_syn = i_syn
+        state.refractory_counter = refractory.masked_fill(spikes, cfg.refractory_period)
+        
+        return spikes.to(i_input.dtype)
+    
+    def forward(self, currents: torch.Tensor) -> torch.Tensor:
+        """
+        Simulate a layer over all timesteps from rest
+        
+        Args:
+            currents: Input currents [num_steps, batch_size, num_neurons]
+            
+        Returns:
+            Spikes [num_steps, batch_size, num_neurons]
+        """
+        state = self.init_state(currents[0])
+        return torch.stack([self.step(i_t, state) for i_t in currents])
+
+
+def graph_edge_index(
+    graph,
+    node_mapping: Dict[str, int],
+    self_loops: bool = True
+) -> torch.Tensor:
+    """
+    Build a sparse edge list for SpikingGNN from a CSDB graph
+    
+    Args:
+        graph: NetworkX graph from CSDBGraphBuilder
+        node_mapping: Map from node ID to input index (see create_node_mapping)
+        self_loops: Add an edge from every node to itself so a node's own
+            spike reaches the hidden layers
+            
+    Returns:
+        LongTensor [2, num_edges] of (source, target) indices
+    """
+    edges = set()
+    for source, target in graph.edges():
+        if source in node_mapping and target in node_mapping:
+            edges.add((node_mapping[source], node_mapping[target]))
+    if self_loops:
+        edges.update((idx, idx) for idx in node_mapping.values())
+    
+    if not edges:
+        return torch.zeros(2, 0, dtype=torch.long)
+    return torch.tensor(sorted(edges), dtype=torch.long).t().contiguous()
+
+
 class SpikingGNN(nn.Module):
     """
     Spiking Graph Neural Network for CSDB workflow orchestration
@@ -77,26 +182,55 @@ class SpikingGNN(nn.Module):
     - Input layer: CSDB events (encoded as spikes)
     - Hidden layers: LIF neurons arranged by graph structure
     - Output layer: Policy decisions (routing, priority, impact)
+    
+    Connectivity is either a dense learned [num_nodes, num_nodes] matrix or,
+    when edge_index is given, one learned weight per graph edge. The default
+    "tensor" engine advances whole layers per timestep; engine="neuron" keeps
+    the original per-neuron LIFNeuron loop as a reference.
     """
     
+    ENGINES = ("tensor", "neuron")
+    
     def __init__(
         self,
         num_nodes: int,
         hidden_dim: int = 256,
         num_layers: int = 3,
-        lif_config: Optional[LIFConfig] = None
+        lif_config: Optional[LIFConfig] = None,
+        edge_index: Optional[torch.Tensor] = None,
+        engine: str = "tensor"
     ):
         super().__init__()
         
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {self.ENGINES}")
+        
         self.num_nodes = num_nodes
         self.hidden_dim = hidden_dim
         self.num_layers = num_layers
         self.lif_config = lif_config or LIFConfig()
+        self.engine = engine
         
         # Graph connectivity (learned)
-        self.adjacency = nn.Parameter(
-            torch.randn(num_nodes, num_nodes) * 0.01
-        )
+        if edge_index is None:
+            self.adjacency = nn.Parameter(
+                torch.randn(num_nodes, num_nodes) * 0.01
+            )
+            self.register_buffer("edge_index", None)
+            self.register_parameter("edge_weight", None)
+        else:
+            edge_index = torch.as_tensor(edge_index, dtype=torch.long)
+            if edge_index.dim() != 2 or edge_index.shape[0] != 2:
+                raise ValueError("edge_index must have shape [2, num_edges]")
+            if edge_index.numel() and not (
+                0 <= int(edge_index.min()) and int(edge_index.max()) < num_nodes
+            ):
+                raise ValueError("edge_index contains out-of-range node indices")
+            self.register_parameter("adjacency", None)
+            self.register_buffer("edge_index", edge_index)
+            self.edge_weight = nn.Parameter(
+                torch.randn(edge_index.shape[1]) * 0.01
+            )
         
         # Hidden layer weights
         self.layers = nn.ModuleList([
@@ -107,18 +241,46 @@ class SpikingGNN(nn.Module):
         # Output layer for policy decisions
         self.policy_head = nn.Linear(hidden_dim, 5)  # 5 policy actions
         
-        # LIF neurons for each layer
+        # Layer-level LIF dynamics (no parameters, shared by all layers)
+        self.lif = LIFLayer(self.lif_config)
+        
+        # Per-neuron LIF modules, only built for the reference engine
+        self.lif_neurons = None
+        if engine == "neuron":
+            self._build_lif_neurons()
+        
+    def _build_lif_neurons(self):
+        """Create per-neuron LIF modules for the reference engine"""
         self.lif_neurons = nn.ModuleList([
-            nn.ModuleList([LIFNeuron(self.lif_config) for _ in range(hidden_dim)])
-            for _ in range(num_layers)
+            nn.ModuleList([LIFNeuron(self.lif_config) for _ in range(self.hidden_dim)])
+            for _ in range(self.num_layers)
         ])
         
     def reset_neurons(self):
         """Reset all neuron states"""
+        if self.lif_neurons is None:
+            return
         for layer in self.lif_neurons:
             for neuron in layer:
                 neuron.reset_state()
                 
+    def propagate(self, node_spikes: torch.Tensor) -> torch.Tensor:
+        """
+        Propagate node spikes through graph connectivity
+        
+        Args:
+            node_spikes: Spike input [batch_size, num_nodes]
+            
+        Returns:
+            Graph input [batch_size, num_nodes]
+        """
+        if self.edge_index is None:
+            return torch.matmul(node_spikes, self.adjacency)
+        
+        source, target = self.edge_index
+        messages = node_spikes[:, source] * self.edge_weight.to(node_spikes.dtype)
+        return node_spikes.new_zeros(node_spikes.shape).index_add_(1, target, messages)
+                
     def forward(
         self,
         node_spikes: torch.Tensor,
@@ -127,13 +289,46 @@ class SpikingGNN(nn.Module):
         """
         Forward pass through spiking GNN
         
+        The tensor engine starts every call from resting state, so each
+        batch element is an independent simulation.
+        
         Args:
-            node_spikes: Initial spike input [num_nodes]
+            node_spikes: Initial spike input [batch_size, num_nodes]
             num_steps: Number of simulation timesteps
             
         Returns:
             (policy_logits, spike_traces)
         """
+        if self.engine == "neuron":
+            return self._forward_per_neuron(node_spikes, num_steps)
+        
+        # Node input is static over the window, so the graph propagation
+        # and first linear layer are computed once rather than per step
+        x = self.layers[0](self.propagate(node_spikes))
+        currents = x.unsqueeze(0).expand(num_steps, *x.shape)
+        
+        # Layer l at step t only depends on layer l-1 at step t, so each
+        # layer runs over all timesteps before the next one starts
+        for layer_idx, linear in enumerate(self.layers):
+            if layer_idx > 0:
+                currents = linear(spikes)
+            spikes = self.lif(currents)
+        
+        # Policy head on accumulated spikes
+        hidden = spikes.sum(dim=0)
+        policy_logits = self.policy_head(hidden / num_steps)
+        
+        return policy_logits, list(spikes.unbind(0))
+    
+    def _forward_per_neuron(
+        self,
+        node_spikes: torch.Tensor,
+        num_steps: int
+    ) -> Tuple[torch.Tensor, List[torch.Tensor]]:
+        """Original scalar simulation loop, kept as the parity reference"""
+        if self.lif_neurons is None:
+            self._build_lif_neurons()
+        
         batch_size = node_spikes.shape[0]
         device = node_spikes.device
         
@@ -141,14 +336,14 @@ class SpikingGNN(nn.Module):
         spike_traces = []
         
         # Initialize hidden state
-        hidden = torch.zeros(batch_size, self.hidden_dim, device=device)
+        hidden = torch.zeros(batch_size, self.hidden_dim, device=device, dtype=node_spikes.dtype)
         
         # Simulate for num_steps timesteps
         for t in range(num_steps):
             layer_spikes = []
             
             # Input layer: propagate through graph
-            graph_input = torch.matmul(node_spikes, self.adjacency)
+            graph_input = self.propagate(node_spikes)
             
             # Process through layers
             x = graph_input
@@ -159,7 +354,7 @@ class SpikingGNN(nn.Module):
                 x = linear(x)
                 
                 # LIF neuron dynamics
-                layer_spike = torch.zeros(batch_size, self.hidden_dim, device=device)
+                layer_spike = torch.zeros(batch_size, self.hidden_dim, device=device, dtype=x.dtype)
                 for neuron_idx, neuron in enumerate(neurons):
                     # Simplified batched neuron update
                     i_input = x[:, neuron_idx]
@@ -269,12 +464,17 @@ class STDPLearning:
                     param.data += self.learning_rate * gradient * reward
 
 
-def create_default_snn(num_csdb_nodes: int) -> SpikingGNN:
+def create_default_snn(
+    num_csdb_nodes: int,
+    edge_index: Optional[torch.Tensor] = None
+) -> SpikingGNN:
     """
     Create SNN with default configuration for S1000D orchestration
     
     Args:
         num_csdb_nodes: Number of nodes in CSDB graph (DMCs, etc.)
+        edge_index: Optional sparse connectivity (see graph_edge_index);
+            dense num_nodes x num_nodes connectivity when omitted
         
     Returns:
         Configured SpikingGNN model
@@ -293,7 +493,8 @@ def create_default_snn(num_csdb_nodes: int) -> SpikingGNN:
         num_nodes=num_csdb_nodes,
         hidden_dim=256,
         num_layers=3,
-        lif_config=lif_config
+        lif_config=lif_config,
+        edge_index=edge_index
     )
     
     return model
@@ -0,0 +1,135 @@
+"""
+Parity tests for the tensorized SpikingGNN engine
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+import torch
+
+# Add orchestrator directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from snn_core import LIFConfig, LIFLayer, LIFNeuron, SpikingGNN, graph_edge_index
+
+
+def make_model(num_nodes=12, hidden_dim=16, num_layers=3, seed=0, **kwargs):
+    """Small float64 model with weights strong enough to make every layer spike."""
+    torch.manual_seed(seed)
+    model = SpikingGNN(num_nodes, hidden_dim=hidden_dim, num_layers=num_layers, **kwargs).double()
+    with torch.no_grad():
+        for linear in model.layers:
+            linear.weight.mul_(8.0)
+            linear.bias.uniform_(2.0, 8.0)
+    return model
+
+
+def run_reference(model, node_spikes, num_steps):
+    """Run the per-neuron engine from resting state."""
+    engine = model.engine
+    model.engine = "neuron"
+    model.reset_neurons()
+    try:
+        return model(node_spikes, num_steps=num_steps)
+    finally:
+        model.engine = engine
+
+
+class TestLIFLayer:
+    """Test layer-level LIF dynamics."""
+
+    def test_matches_lif_neuron(self):
+        """Test that every neuron follows the scalar LIFNeuron trajectory."""
+        config = LIFConfig()
+        layer = LIFLayer(config)
+        currents = torch.rand(60, 1, 8, dtype=torch.float64) * 10.0
+
+        spikes = layer(currents)
+
+        for idx in range(8):
+            neuron = LIFNeuron(config)
+            expected = [float(neuron(currents[t, 0, idx].item())[1]) for t in range(60)]
+            assert spikes[:, 0, idx].tolist() == expected
+        assert spikes.sum() > 0
+
+
+class TestSpikingGNNParity:
+    """Test the tensor engine against the per-neuron engine."""
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_dense_parity(self, seed):
+        """Test identical spikes and logits for dense connectivity."""
+        model = make_model(seed=seed)
+        node_spikes = torch.rand(1, 12, dtype=torch.float64)
+
+        logits, traces = model(node_spikes, num_steps=40)
+        ref_logits, ref_traces = run_reference(model, node_spikes, 40)
+
+        assert len(traces) == len(ref_traces) == 40
+        for trace, ref_trace in zip(traces, ref_traces):
+            assert torch.equal(trace, ref_trace)
+        assert torch.allclose(logits, ref_logits)
+        assert sum(t.sum() for t in traces) > 0
+
+    def test_sparse_parity(self):
+        """Test that the sparse engine matches the reference on the same edges."""
+        edge_index = torch.tensor([[0, 1, 2, 3, 5, 7, 9], [1, 2, 3, 0, 5, 8, 9]])
+        model = make_model(num_nodes=10, edge_index=edge_index)
+        with torch.no_grad():
+            model.edge_weight.uniform_(-2.0, 2.0)
+        node_spikes = torch.rand(1, 10, dtype=torch.float64)
+
+        logits, traces = model(node_spikes, num_steps=30)
+        ref_logits, ref_traces = run_reference(model, node_spikes, 30)
+
+        for trace, ref_trace in zip(traces, ref_traces):
+            assert torch.equal(trace, ref_trace)
+        assert torch.allclose(logits, ref_logits)
+
+    def test_sparse_propagation_matches_dense(self):
+        """Test edge-list propagation against the equivalent dense matrix."""
+        edge_index = torch.tensor([[0, 0, 2, 3, 3], [1, 3, 2, 0, 1]])
+        model = SpikingGNN(4, hidden_dim=8, num_layers=1, edge_index=edge_index)
+        dense = torch.zeros(4, 4)
+        dense[edge_index[0], edge_index[1]] = model.edge_weight.detach()
+        node_spikes = torch.rand(3, 4)
+
+        assert torch.allclose(model.propagate(node_spikes), node_spikes @ dense)
+        assert model.adjacency is None
+
+    def test_batch_rows_are_independent(self):
+        """Test that a batched call equals running each event on its own."""
+        model = make_model()
+        node_spikes = torch.rand(4, 12, dtype=torch.float64)
+
+        logits, traces = model(node_spikes, num_steps=25)
+
+        for b in range(4):
+            row_logits, row_traces = model(node_spikes[b:b + 1], num_steps=25)
+            assert torch.allclose(logits[b:b + 1], row_logits)
+            for trace, row_trace in zip(traces, row_traces):
+                assert torch.equal(trace[b:b + 1], row_trace)
+
+
+class TestGraphEdgeIndex:
+    """Test edge list construction from a CSDB graph."""
+
+    def test_edges_and_self_loops(self):
+        """Test mapping of graph edges to input indices."""
+        nx = pytest.importorskip("networkx")
+        graph = nx.DiGraph()
+        graph.add_edge("DMC-B", "DMC-A")
+        graph.add_edge("DMC-A", "UNKNOWN")
+        mapping = {"DMC-A": 0, "DMC-B": 1}
+
+        edge_index = graph_edge_index(graph, mapping)
+        assert edge_index.tolist() == [[0, 1, 1], [0, 0, 1]]
+
+        edge_index = graph_edge_index(graph, mapping, self_loops=False)
+        assert edge_index.tolist() == [[1], [0]]
+
+    def test_rejects_out_of_range_edges(self):
+        """Test that invalid edge lists are rejected."""
+        with pytest.raises(ValueError):
+            SpikingGNN(3, hidden_dim=4, num_layers=1, edge_index=torch.tensor([[0], [3]]))
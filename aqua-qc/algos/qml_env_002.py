@@ -6,18 +6,363 @@ This module implements quantum machine learning for environmental data analysis:
 - Temporal embedding for time-series data
 - Domain adaptation techniques
 - Hybrid classical-quantum feature fusion
+- Blocked exact kernels, Nyström low-rank kernels and partial spectrum
+  estimation with bounded memory
 
 API conforms to UTCS-MI v5.0 traceability standard.
 """
 
 import hashlib
 import time
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Callable, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 
 import numpy as np
 
 
+@dataclass
+class NystromKernel:
+    """
+    Low-rank Nyström kernel approximation K ≈ L Lᵀ.
+    
+    Only the (n, r) factor is stored, so memory grows linearly with the
+    number of samples instead of quadratically.
+    """
+    landmark_idx: np.ndarray  # Indices of landmarks in the training set
+    landmarks: np.ndarray  # Landmark samples (m, n_features)
+    projection: np.ndarray  # W^(-1/2) on the retained rank (m, r)
+    factor: np.ndarray  # L = C · projection (n, r)
+    
+    @property
+    def shape(self) -> Tuple[int, int]:
+        n = self.factor.shape[0]
+        return (n, n)
+    
+    @property
+    def rank(self) -> int:
+        return self.factor.shape[1]
+    
+    def to_dense(self) -> np.ndarray:
+        """Reconstruct the full (n, n) approximation. O(n²) memory."""
+        return self.factor @ self.factor.T
+    
+    def eigvals(self) -> np.ndarray:
+        """Non-zero eigenvalues of L Lᵀ in descending order, via the (r, r) Gram matrix."""
+        gram = self.factor.T @ self.factor
+        return np.sort(np.linalg.eigvalsh(gram))[::-1]
+
+
+class KernelEngine:
+    """
+    Kernel matrix computation with bounded working memory.
+    
+    - Exact kernels are computed in row blocks sized to max_block_mb, and
+      can be written to a disk-backed memmap instead of RAM.
+    - Nyström approximations pick landmarks by kernel k-means++ seeding
+      and keep only a low-rank factor.
+    - Large spectra are estimated with a partial (Lanczos) eigensolver
+      instead of a full eigendecomposition.
+    """
+    
+    def __init__(
+        self,
+        gamma: float = 0.5,
+        max_block_mb: float = 64.0,
+        block_size: Optional[int] = None,
+        memmap_path: Optional[str] = None,
+        landmark_method: str = "kmeans++",
+        rcond: float = 1e-10,
+        spectrum_method: str = "auto",
+        spectrum_exact_max: int = 2000,
+        lanczos_steps: int = 100,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize kernel engine.
+        
+        Args:
+            gamma: RBF width, k(x, y) = exp(-gamma * ||x - y||²)
+            max_block_mb: Budget for per-block temporaries (MB)
+            block_size: Fixed rows per block (overrides max_block_mb)
+            memmap_path: Write exact kernels to this file instead of RAM
+            landmark_method: 'kmeans++' or 'uniform'
+            rcond: Relative cutoff for landmark eigenvalues in Nyström
+            spectrum_method: 'auto', 'exact' or 'lanczos'
+            spectrum_exact_max: Largest n for exact eigvalsh under 'auto'
+            lanczos_steps: Krylov dimension for partial spectrum estimates
+            seed: Random seed (None uses numpy's global state)
+        """
+        if landmark_method not in ("kmeans++", "uniform"):
+            raise ValueError(f"Unknown landmark_method: {landmark_method}")
+        if spectrum_method not in ("auto", "exact", "lanczos"):
+            raise ValueError(f"Unknown spectrum_method: {spectrum_method}")
+        
+        self.gamma = gamma
+        self.max_block_mb = max_block_mb
+        self.block_size = block_size
+        self.memmap_path = memmap_path
+        self.landmark_method = landmark_method
+        self.rcond = rcond
+        self.spectrum_method = spectrum_method
+        self.spectrum_exact_max = spectrum_exact_max
+        self.lanczos_steps = lanczos_steps
+        self._rng = np.random.default_rng(seed) if seed is not None else np.random
+    
+    def _rows_per_block(self, n_cols: int) -> int:
+        """Rows per block so that a few (rows, n_cols) float64 temporaries fit the budget."""
+        if self.block_size:
+            return max(1, int(self.block_size))
+        budget = self.max_block_mb * 1024 * 1024
+        return max(1, int(budget // (3 * 8 * max(n_cols, 1))))
+    
+    def kernel_block(
+        self,
+        X1: np.ndarray,
+        X2: np.ndarray,
+        sq1: Optional[np.ndarray] = None,
+        sq2: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Compute one dense kernel block.
+        
+        Args:
+            X1: Row samples
+            X2: Column samples
+            sq1: Precomputed squared norms of X1 rows
+            sq2: Precomputed squared norms of X2 rows
+            
+        Returns:
+            Kernel block (len(X1), len(X2))
+        """
+        if sq1 is None:
+            sq1 = np.einsum("ij,ij->i", X1, X1)
+        if sq2 is None:
+            sq2 = np.einsum("ij,ij->i", X2, X2)
+        
+        block = X1 @ X2.T
+        block *= -2.0
+        block += sq1[:, None]
+        block += sq2[None, :]
+        np.maximum(block, 0.0, out=block)
+        block *= -self.gamma
+        return np.exp(block, out=block)
+    
+    def exact(self, X1: np.ndarray, X2: np.ndarray) -> np.ndarray:
+        """
+        Compute the exact kernel matrix block by block.
+        
+        Symmetric inputs (X1 is X2) only compute the upper block triangle
+        and mirror it, with an exact unit diagonal. With memmap_path set,
+        row blocks are streamed to a .npy file instead.
+        
+        Returns:
+            Kernel matrix (n1, n2), a read-only np.memmap when memmap_path is set
+        """
+        symmetric = X2 is X1 or X2 is None
+        X1 = np.asarray(X1, dtype=np.float64)
+        X2 = X1 if symmetric else np.asarray(X2, dtype=np.float64)
+        if self.memmap_path:
+            return self._exact_to_file(X1, X2, symmetric)
+        
+        n1, n2 = len(X1), len(X2)
+        kernel = np.empty((n1, n2))
+        sq1 = np.einsum("ij,ij->i", X1, X1)
+        sq2 = sq1 if symmetric else np.einsum("ij,ij->i", X2, X2)
+        rows = self._rows_per_block(n2)
+        
+        for i0 in range(0, n1, rows):
+            i1 = min(i0 + rows, n1)
+            if symmetric:
+                block = self.kernel_block(X1[i0:i1], X2[i0:], sq1[i0:i1], sq2[i0:])
+                np.fill_diagonal(block[:, :i1 - i0], 1.0)
+                kernel[i0:i1, i0:] = block
+                kernel[i1:, i0:i1] = block[:, i1 - i0:].T
+            else:
+                kernel[i0:i1] = self.kernel_block(X1[i0:i1], X2, sq1[i0:i1], sq2)
+        return kernel
+    
+    def _exact_to_file(self, X1: np.ndarray, X2: np.ndarray, symmetric: bool) -> np.ndarray:
+        """Stream full row blocks to memmap_path so only one block is resident."""
+        n1, n2 = len(X1), len(X2)
+        sq1 = np.einsum("ij,ij->i", X1, X1)
+        sq2 = sq1 if symmetric else np.einsum("ij,ij->i", X2, X2)
+        rows = self._rows_per_block(n2)
+        
+        with open(self.memmap_path, "wb") as f:
+            header = {"descr": "<f8", "fortran_order": False, "shape": (n1, n2)}
+            np.lib.format.write_array_header_1_0(f, header)
+            for i0 in range(0, n1, rows):
+                i1 = min(i0 + rows, n1)
+                block = self.kernel_block(X1[i0:i1], X2, sq1[i0:i1], sq2)
+                if symmetric:
+                    np.fill_diagonal(block[:, i0:i1], 1.0)
+                f.write(block.tobytes())
+        return np.load(self.memmap_path, mmap_mode="r")
+    
+    def _row_blocks(self, kernel: np.ndarray):
+        """
+        Yield (start, block) row blocks of a kernel matrix.
+        
+        Memmapped kernels are read with plain file reads, which do not add
+        mapped pages to the process's resident set.
+        """
+        n1, n2 = kernel.shape
+        rows = self._rows_per_block(n2)
+        if not isinstance(kernel, np.memmap):
+            for i0 in range(0, n1, rows):
+                yield i0, kernel[i0:i0 + rows]
+            return
+        
+        row_bytes = n2 * kernel.dtype.itemsize
+        with open(kernel.filename, "rb") as f:
+            f.seek(kernel.offset)
+            for i0 in range(0, n1, rows):
+                count = min(rows, n1 - i0)
+                block = np.fromfile(f, dtype=kernel.dtype, count=count * n2)
+                yield i0, block.reshape(count, n2)
+    
+    def select_landmarks(self, X: np.ndarray, m: int) -> np.ndarray:
+        """
+        Choose m landmark indices.
+        
+        'kmeans++' samples each new landmark with probability proportional
+        to its squared feature-space distance to the nearest landmark so
+        far, 2 - 2·k(x, l) for an RBF kernel, which spreads landmarks over
+        the data instead of oversampling dense regions.
+        """
+        n = len(X)
+        m = min(m, n)
+        if self.landmark_method == "uniform":
+            return np.sort(self._rng.choice(n, size=m, replace=False))
+        
+        sq = np.einsum("ij,ij->i", X, X)
+        chosen = [int(self._rng.choice(n))]
+        min_dist = np.full(n, np.inf)
+        for _ in range(1, m):
+            last = chosen[-1]
+            k_last = self.kernel_block(X, X[last:last + 1], sq, sq[last:last + 1])[:, 0]
+            np.minimum(min_dist, 2.0 - 2.0 * k_last, out=min_dist)
+            min_dist[chosen] = 0.0
+            total = min_dist.sum()
+            if total <= 0.0:
+                # Remaining points duplicate existing landmarks
+                remaining = np.setdiff1d(np.arange(n), chosen)
+                chosen.extend(self._rng.choice(remaining, size=m - len(chosen), replace=False))
+                break
+            chosen.append(int(self._rng.choice(n, p=min_dist / total)))
+        return np.sort(np.asarray(chosen, dtype=np.int64))
+    
+    def nystrom(self, X: np.ndarray, m: int) -> NystromKernel:
+        """
+        Build a rank ≤ m Nyström approximation of k(X, X).
+        
+        With C = k(X, landmarks) and W = k(landmarks, landmarks), the
+        factor is L = C·W^(-1/2), so K ≈ C W⁺ Cᵀ = L Lᵀ. C is produced in
+        row blocks and never held in full.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        idx = self.select_landmarks(X, m)
+        landmarks = X[idx]
+        
+        W = self.kernel_block(landmarks, landmarks)
+        eigvals, eigvecs = np.linalg.eigh(W)
+        keep = eigvals > self.rcond * max(eigvals[-1], 0.0)
+        projection = eigvecs[:, keep] / np.sqrt(eigvals[keep])
+        
+        factor = self.nystrom_features(X, landmarks, projection)
+        return NystromKernel(
+            landmark_idx=idx,
+            landmarks=landmarks,
+            projection=projection,
+            factor=factor
+        )
+    
+    def nystrom_features(
+        self,
+        X: np.ndarray,
+        landmarks: np.ndarray,
+        projection: np.ndarray
+    ) -> np.ndarray:
+        """Map samples to Nyström features k(X, landmarks)·projection, block by block."""
+        X = np.asarray(X, dtype=np.float64)
+        sq_l = np.einsum("ij,ij->i", landmarks, landmarks)
+        features = np.empty((len(X), projection.shape[1]))
+        rows = self._rows_per_block(len(landmarks))
+        for i0 in range(0, len(X), rows):
+            C = self.kernel_block(X[i0:i0 + rows], landmarks, sq2=sq_l)
+            features[i0:i0 + rows] = C @ projection
+        return features
+    
+    def _matmul(self, kernel: np.ndarray, V: np.ndarray) -> np.ndarray:
+        """kernel @ V in row blocks."""
+        if not isinstance(kernel, np.memmap):
+            return kernel @ V
+        out = np.empty((kernel.shape[0], V.shape[1]))
+        for i0, block in self._row_blocks(kernel):
+            out[i0:i0 + len(block)] = block @ V
+        return out
+    
+    def _lanczos(self, kernel: np.ndarray, steps: int) -> np.ndarray:
+        """
+        Ritz values of a symmetric kernel after `steps` Lanczos iterations.
+        
+        Uses full reorthogonalization; only `steps` vectors of length n are
+        stored. Extreme Ritz values converge first, so the largest are
+        accurate while the smallest is an upper bound on λmin.
+        """
+        n = kernel.shape[0]
+        basis = np.empty((steps, n))
+        alphas, betas = [], []
+        q = self._rng.standard_normal(n)
+        q /= np.linalg.norm(q)
+        
+        for j in range(steps):
+            basis[j] = q
+            w = self._matmul(kernel, q[:, None])[:, 0]
+            alpha = float(q @ w)
+            alphas.append(alpha)
+            
+            w -= basis[:j + 1].T @ (basis[:j + 1] @ w)
+            w -= basis[:j + 1].T @ (basis[:j + 1] @ w)
+            beta = float(np.linalg.norm(w))
+            if j == steps - 1 or beta <= 1e-12 * max(abs(alpha), 1.0):
+                break
+            betas.append(beta)
+            q = w / beta
+        
+        T = np.diag(alphas) + np.diag(betas, 1) + np.diag(betas, -1)
+        return np.sort(np.linalg.eigvalsh(T))[::-1]
+    
+    def spectrum(self, kernel: Union[np.ndarray, NystromKernel]) -> Tuple[np.ndarray, float]:
+        """
+        Estimate the kernel spectrum.
+        
+        Args:
+            kernel: Square kernel matrix or Nyström approximation
+            
+        Returns:
+            (leading eigenvalues in descending order, smallest eigenvalue).
+            For the Lanczos estimate the smallest eigenvalue is an upper
+            bound, so the implied condition number is a lower bound.
+            
+        Raises:
+            np.linalg.LinAlgError: If an eigendecomposition fails
+        """
+        if isinstance(kernel, NystromKernel):
+            eigvals = kernel.eigvals()
+            return eigvals, float(eigvals[-1])
+        
+        n = kernel.shape[0]
+        method = self.spectrum_method
+        if method == "exact" or (method == "auto" and n <= self.spectrum_exact_max):
+            eigvals = np.sort(np.linalg.eigvalsh(kernel))[::-1]
+            return eigvals, float(eigvals[-1])
+        
+        ritz = self._lanczos(kernel, min(n, self.lanczos_steps))
+        return ritz, float(ritz[-1])
+
+
 class QKernelEnv:
     """
     Quantum kernel learning for environmental monitoring.
@@ -34,7 +379,8 @@ class QKernelEnv:
         self,
         feature_map_cfg: Dict[str, Any],
         temporal_embed_cfg: Dict[str, Any],
-        hooks: Optional[Dict[str, Callable]] = None
+        hooks: Optional[Dict[str, Callable]] = None,
+        kernel_cfg: Optional[Dict[str, Any]] = None
     ):
         """
         Initialize quantum kernel for environmental monitoring.
@@ -53,10 +399,14 @@ class QKernelEnv:
                 - on_kernel_spectrum: Called with (cond_num, eig_decay)
                 - on_domain_adapt: Called with (mmd, coral_loss)
                 - on_eval: Called with (f1, rmse, energy_j)
+            kernel_cfg: KernelEngine options (block memory budget, memmap
+                path, landmark method, spectrum method, seed)
         """
         self.feature_map_cfg = feature_map_cfg
         self.temporal_embed_cfg = temporal_embed_cfg
         self.hooks = hooks or {}
+        self.kernel_cfg = kernel_cfg or {}
+        self.kernel_engine = KernelEngine(**self.kernel_cfg)
         self._run_id = self._generate_run_id()
         
     def _generate_run_id(self) -> str:
@@ -184,7 +534,7 @@ class QKernelEnv:
         X1: np.ndarray,
         X2: np.ndarray,
         nyström: Optional[int] = None
-    ) -> np.ndarray:
+    ) -> Union[np.ndarray, NystromKernel]:
         """
         Compute quantum kernel matrix.
         
@@ -194,69 +544,63 @@ class QKernelEnv:
             nyström: Number of landmark points (None for exact)
             
         Returns:
-            Kernel matrix
+            Kernel matrix, or a NystromKernel when X1 is X2 and
+            nyström is smaller than the sample count
         """
         n1, n2 = len(X1), len(X2)
         
         if nyström is not None and nyström < min(n1, n2):
-            # Nyström approximation
-            landmark_idx = np.random.choice(n1, size=nyström, replace=False)
-            K_landmark = self._compute_exact_kernel(X1[landmark_idx], X2)
-            return K_landmark
+            # Nyström approximation built on X1
+            approx = self.kernel_engine.nystrom(X1, nyström)
+            if X2 is X1:
+                return approx
+            features = self.kernel_engine.nystrom_features(
+                X2, approx.landmarks, approx.projection
+            )
+            return approx.factor @ features.T
         else:
             # Exact kernel computation
             return self._compute_exact_kernel(X1, X2)
     
     def _compute_exact_kernel(self, X1: np.ndarray, X2: np.ndarray) -> np.ndarray:
         """Compute exact quantum kernel (simulated)."""
-        # Simulate quantum kernel computation
+        # Simulate quantum kernel computation with an RBF-like kernel
         # In practice, would execute quantum circuits
-        n1, n2 = len(X1), len(X2)
-        kernel = np.zeros((n1, n2))
-        
-        for i in range(n1):
-            for j in range(n2):
-                # Simulate quantum inner product
-                # RBF-like kernel for simulation
-                diff = X1[i] - X2[j]
-                kernel[i, j] = np.exp(-0.5 * np.sum(diff**2))
-        
-        return kernel
+        return self.kernel_engine.exact(X1, X2)
     
-    def _check_kernel_spectrum(self, kernel: np.ndarray) -> None:
+    def _check_kernel_spectrum(self, kernel: Union[np.ndarray, NystromKernel]) -> None:
         """
         Check kernel spectrum for collapse.
         
+        Large exact kernels use a partial (Lanczos) eigensolver; Nyström
+        kernels use the spectrum of their low-rank factor.
+        
         Args:
             kernel: Kernel matrix to check
         """
-        # Only check spectrum for square matrices (not Nyström approximations)
+        if isinstance(kernel, NystromKernel):
+            try:
+                eigenvalues, eig_min = self.kernel_engine.spectrum(kernel)
+            except np.linalg.LinAlgError:
+                raise ValueError("Kernel matrix computation failed")
+            self._check_relaxed_spectrum(eigenvalues, eig_min)
+            return
+        
+        # Rectangular (cross) kernels use singular values
         if kernel.shape[0] != kernel.shape[1]:
-            # For Nyström, use singular values instead
             try:
-                singular_values = np.linalg.svd(kernel, compute_uv=False)
-                singular_values = np.sort(singular_values)[::-1]
-                
-                cond_num = singular_values[0] / max(singular_values[-1], 1e-10)
-                eig_decay = singular_values[1] / max(singular_values[0], 1e-10) if len(singular_values) > 1 else 1.0
-                
-                if "on_kernel_spectrum" in self.hooks:
-                    self.hooks["on_kernel_spectrum"](float(cond_num), float(eig_decay))
-                
-                # Relaxed check for Nyström
-                if cond_num > 1e8:
-                    raise ValueError(f"Kernel collapse detected: cond_num={cond_num:.2e}")
+                singular_values = np.sort(np.linalg.svd(kernel, compute_uv=False))[::-1]
             except np.linalg.LinAlgError:
                 raise ValueError("Kernel matrix computation failed")
+            self._check_relaxed_spectrum(singular_values, singular_values[-1])
             return
         
         # Compute eigenvalues for square matrices
         try:
-            eigenvalues = np.linalg.eigvalsh(kernel)
-            eigenvalues = np.sort(eigenvalues)[::-1]
+            eigenvalues, eig_min = self.kernel_engine.spectrum(kernel)
             
             # Condition number
-            cond_num = eigenvalues[0] / max(eigenvalues[-1], 1e-10)
+            cond_num = eigenvalues[0] / max(eig_min, 1e-10)
             
             # Eigenvalue decay rate
             if len(eigenvalues) > 1:
@@ -277,6 +621,25 @@ class QKernelEnv:
         except np.linalg.LinAlgError:
             raise ValueError("Kernel matrix is singular")
     
+    def _check_relaxed_spectrum(self, spectrum: np.ndarray, minimum: float) -> None:
+        """
+        Collapse check for approximate kernels (Nyström, rectangular).
+        
+        Only the condition number is guarded, with a relaxed 1e8 threshold.
+        
+        Args:
+            spectrum: Eigenvalues or singular values, largest first
+            minimum: Smallest eigenvalue or singular value
+        """
+        cond_num = spectrum[0] / max(minimum, 1e-10)
+        eig_decay = spectrum[1] / max(spectrum[0], 1e-10) if len(spectrum) > 1 else 1.0
+        
+        if "on_kernel_spectrum" in self.hooks:
+            self.hooks["on_kernel_spectrum"](float(cond_num), float(eig_decay))
+        
+        if cond_num > 1e8:
+            raise ValueError(f"Kernel collapse detected: cond_num={cond_num:.2e}")
+    
     def _mix_classical_features(
         self,
         X_quantum: np.ndarray,
@@ -513,11 +876,15 @@ def train_quantum_kernel(
     nyström: Optional[int] = None,
     mix_classical: bool = True,
     hooks: Optional[Dict[str, Callable]] = None,
-    uid: str = "Qiskit_002_20240624_APCGPT"
+    uid: str = "Qiskit_002_20240624_APCGPT",
+    kernel_cfg: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     Public API for quantum kernel training.
     
+    kernel_cfg is passed to KernelEngine, e.g.
+    {"max_block_mb": 64, "memmap_path": "/tmp/K.npy", "seed": 0}.
+    
     Returns dict with:
         - model: trained model object
         - val_metrics: dict with F1, RMSE, energy metrics
@@ -529,5 +896,5 @@ def train_quantum_kernel(
     if temporal_embed_cfg is None:
         temporal_embed_cfg = {"window_size": 5, "stride": 1, "aggregation": "mean"}
     
-    qkernel = QKernelEnv(feature_map_cfg, temporal_embed_cfg, hooks)
+    qkernel = QKernelEnv(feature_map_cfg, temporal_embed_cfg, hooks, kernel_cfg)
     return qkernel.train(X_train, y_train, X_val, y_val, nyström, mix_classical, uid)
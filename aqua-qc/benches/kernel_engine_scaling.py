@@ -0,0 +1,136 @@
+"""
+Kernel Engine Scaling Benchmark
+
+Charts wall time and peak RSS against sample count for the kernel and
+spectrum-check stages of QKernelEnv:
+
+- legacy:  per-pair Python loop + full eigvalsh (original implementation)
+- exact:   blocked exact kernel in RAM + partial spectrum
+- memmap:  blocked exact kernel written to disk + partial spectrum
+- nystrom: k-means++ Nyström factor + low-rank spectrum
+
+Each (mode, n) point runs in a fresh subprocess so peak RSS is isolated.
+
+Usage:
+    python benches/kernel_engine_scaling.py --sizes 1000 2000 5000 10000 --csv scaling.csv
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from algos.qml_env_002 import KernelEngine
+
+MODES = ["legacy", "exact", "memmap", "nystrom"]
+
+
+def legacy_kernel(X):
+    """Original per-pair kernel loop."""
+    n = len(X)
+    kernel = np.zeros((n, n))
+    for i in range(n):
+        for j in range(n):
+            diff = X[i] - X[j]
+            kernel[i, j] = np.exp(-0.5 * np.sum(diff**2))
+    return kernel
+
+
+def run_point(mode, n, n_features, landmarks, max_block_mb):
+    """Run one measurement in this process and return a result dict."""
+    X = np.random.default_rng(0).standard_normal((n, n_features))
+    baseline_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    tmpdir = tempfile.mkdtemp()
+    
+    start = time.perf_counter()
+    if mode == "legacy":
+        kernel = legacy_kernel(X)
+        eigvals = np.linalg.eigvalsh(kernel)
+        top = eigvals[-1]
+    else:
+        engine = KernelEngine(
+            max_block_mb=max_block_mb,
+            memmap_path=os.path.join(tmpdir, "K.npy") if mode == "memmap" else None,
+            seed=0
+        )
+        if mode == "nystrom":
+            kernel = engine.nystrom(X, landmarks)
+        else:
+            kernel = engine.exact(X, X)
+        eigvals, _ = engine.spectrum(kernel)
+        top = eigvals[0]
+    elapsed = time.perf_counter() - start
+    
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {
+        "mode": mode,
+        "n": n,
+        "seconds": elapsed,
+        "peak_rss_mb": peak_mb,
+        "delta_rss_mb": peak_mb - baseline_mb,
+        "lambda_max": float(top),
+    }
+
+
+def measure(mode, n, args):
+    """Run one point in a subprocess."""
+    cmd = [
+        sys.executable, __file__, "--worker", mode, str(n),
+        "--features", str(args.features),
+        "--landmarks", str(args.landmarks),
+        "--max-block-mb", str(args.max_block_mb),
+    ]
+    out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kernel engine time/RSS scaling")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1000, 2000, 5000, 10000])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--features", type=int, default=8)
+    parser.add_argument("--landmarks", type=int, default=200)
+    parser.add_argument("--max-block-mb", type=float, default=64.0)
+    parser.add_argument("--legacy-limit", type=int, default=1000,
+                        help="largest n for the slow per-pair loop")
+    parser.add_argument("--csv", help="write results to this CSV file")
+    parser.add_argument("--worker", nargs=2, metavar=("MODE", "N"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.worker:
+        mode, n = args.worker
+        print(json.dumps(run_point(mode, int(n), args.features, args.landmarks, args.max_block_mb)))
+        return
+    
+    results = []
+    print(f"{'mode':<8} {'n':>8} {'seconds':>10} {'peak_rss_mb':>12} {'delta_mb':>10}")
+    for n in args.sizes:
+        for mode in args.modes:
+            if mode == "legacy" and n > args.legacy_limit:
+                continue
+            r = measure(mode, n, args)
+            results.append(r)
+            print(f"{r['mode']:<8} {r['n']:>8} {r['seconds']:>10.3f} "
+                  f"{r['peak_rss_mb']:>12.1f} {r['delta_rss_mb']:>10.1f}")
+    
+    if args.csv:
+        with open(args.csv, "w") as f:
+            f.write("mode,n,seconds,peak_rss_mb,delta_rss_mb\n")
+            for r in results:
+                f.write(f"{r['mode']},{r['n']},{r['seconds']:.6f},"
+                        f"{r['peak_rss_mb']:.1f},{r['delta_rss_mb']:.1f}\n")
+        print(f"\nWrote {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
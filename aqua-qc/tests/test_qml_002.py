@@ -16,7 +16,7 @@ import pytest
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from algos.qml_env_002 import train_quantum_kernel
+from algos.qml_env_002 import KernelEngine, NystromKernel, train_quantum_kernel
 
 
 @pytest.fixture
@@ -431,6 +431,107 @@ def test_utcs_metadata_compliance(sample_data, feature_map_config, temporal_embe
     print(f"  All required fields present and valid")
 
 
+def _reference_kernel(X1, X2):
+    """Original per-pair kernel loop."""
+    return np.array([[np.exp(-0.5 * np.sum((a - b) ** 2)) for b in X2] for a in X1])
+
+
+def test_blocked_exact_kernel_matches_reference(tmp_path):
+    """
+    Test that the blocked kernel matches the per-pair loop, in RAM and memmap.
+    """
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((53, 5))
+    Y = rng.standard_normal((17, 5))
+    
+    engine = KernelEngine(block_size=7)
+    assert np.allclose(engine.exact(X, X), _reference_kernel(X, X), atol=1e-12)
+    assert np.allclose(engine.exact(Y, X), _reference_kernel(Y, X), atol=1e-12)
+    
+    mapped = KernelEngine(block_size=7, memmap_path=str(tmp_path / "K.npy")).exact(X, X)
+    assert isinstance(mapped, np.memmap)
+    assert np.allclose(np.load(tmp_path / "K.npy"), _reference_kernel(X, X), atol=1e-12)
+    
+    print(f"✓ Blocked exact kernel test passed")
+
+
+def test_nystrom_low_rank_reconstruction():
+    """
+    Test Nyström reconstruction error and landmark selection.
+    """
+    rng = np.random.default_rng(1)
+    # Two clusters of very different size
+    X = np.concatenate([
+        rng.standard_normal((300, 4)) * 0.3,
+        rng.standard_normal((20, 4)) * 0.3 + 4.0
+    ])
+    K = _reference_kernel(X, X)
+    
+    approx = KernelEngine(seed=0).nystrom(X, 30)
+    assert isinstance(approx, NystromKernel)
+    assert approx.factor.shape == (320, approx.rank)
+    assert len(np.unique(approx.landmark_idx)) == 30
+    # k-means++ seeding reaches the small cluster
+    assert np.any(approx.landmark_idx >= 300)
+    
+    rel_err = np.linalg.norm(approx.to_dense() - K) / np.linalg.norm(K)
+    assert rel_err < 0.05
+    
+    # Using every sample as a landmark reproduces the exact kernel
+    full = KernelEngine(seed=0).nystrom(X, len(X))
+    assert np.allclose(full.to_dense(), K, atol=1e-6)
+    
+    # Spectrum of the factor matches the reconstructed matrix
+    dense_eigs = np.sort(np.linalg.eigvalsh(approx.to_dense()))[::-1][:approx.rank]
+    assert np.allclose(approx.eigvals(), dense_eigs, atol=1e-8)
+    
+    print(f"✓ Nyström reconstruction test passed")
+    print(f"  Relative error (30 landmarks): {rel_err:.4f}")
+
+
+def test_partial_spectrum_estimate():
+    """
+    Test Lanczos spectrum estimate against full eigvalsh.
+    """
+    rng = np.random.default_rng(2)
+    X = rng.standard_normal((400, 4))
+    K = _reference_kernel(X, X)
+    eigs = np.sort(np.linalg.eigvalsh(K))[::-1]
+    
+    top, eig_min = KernelEngine(spectrum_method="lanczos", lanczos_steps=80, seed=0).spectrum(K)
+    
+    assert np.allclose(top[:2], eigs[:2], rtol=1e-8)
+    # Smallest Ritz value bounds λmin from above
+    assert eigs[-1] - 1e-10 <= eig_min <= eigs[0]
+    
+    # 'auto' switches to the partial solver above spectrum_exact_max
+    auto_top, _ = KernelEngine(spectrum_exact_max=100, seed=0).spectrum(K)
+    assert len(auto_top) < len(K)
+    assert np.isclose(auto_top[0], eigs[0])
+    
+    print(f"✓ Partial spectrum test passed")
+
+
+def test_large_kernel_spectrum_guard():
+    """
+    Test that collapse detection works on the partial-spectrum path.
+    """
+    rng = np.random.default_rng(3)
+    # Dense 2-D data gives a rapidly decaying, ill-conditioned spectrum
+    X = rng.standard_normal((600, 2))
+    y = rng.choice([0, 1], size=600)
+    
+    with pytest.raises(ValueError, match="Kernel collapse"):
+        train_quantum_kernel(
+            X_train=X,
+            y_train=y,
+            X_val=X[:20],
+            kernel_cfg={"spectrum_exact_max": 100, "seed": 0}
+        )
+    
+    print(f"✓ Large kernel spectrum guard test passed")
+
+
 if __name__ == "__main__":
     # Run tests with pytest
     pytest.main([__file__, "-v"])